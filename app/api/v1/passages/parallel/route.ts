@@ -0,0 +1,93 @@
+import { NextRequest, NextResponse } from "next/server";
+import { createServerSupabase } from "@/lib/supabase/server";
+
+/**
+ * GET /api/v1/passages/parallel
+ *
+ * Fetches one chapter in several translations, aligned on canonical verses
+ * (parallel_chapter RPC, supabase/migrations/20260118_verse_alignment.sql)
+ *
+ * Query Parameters:
+ * - translations: Comma-separated translation codes (e.g., "korHRV,NIV")
+ * - book: English abbreviation (e.g., "Psa")
+ * - chapter: Chapter number
+ *
+ * Returns:
+ * - verses: [{ id, verse, texts: { [code]: text }, native_refs: { [code]: "3:14,3:15" } }]
+ *   native_refs 는 번역본 자체 절 번호가 정규 번호와 다를 때만 있음
+ *
+ * 읽기 화면의 패널(components/passage)은 이 route 를 쓰지 않고 패널마다 /api/v1/passages 를 부름
+ * (패널마다 책/장을 따로 넘기고, 장 스냅샷 / 번역본별 책 이름 / 소제목이 그쪽에만 있음)
+ */
+export async function GET(req: NextRequest) {
+  const supabase = await createServerSupabase();
+  const url = new URL(req.url);
+
+  const codes = (url.searchParams.get("translations") ?? "").split(",").filter(Boolean);
+  const bookAbbr = url.searchParams.get("book");
+  const chapter = Number(url.searchParams.get("chapter") ?? 1);
+
+  if (codes.length === 0 || !bookAbbr) {
+    return NextResponse.json(
+      { error: "translations and book required" },
+      { status: 400 }
+    );
+  }
+
+  // Step 1: Translation IDs and book in parallel
+  const [translationsResult, bookResult] = await Promise.all([
+    supabase.from("translations").select("id, code").in("code", codes),
+    supabase.from("books").select("id, abbr_eng, chapters").eq("abbr_eng", bookAbbr).single(),
+  ]);
+
+  const translations = translationsResult.data || [];
+  const missing = codes.filter((code) => !translations.some((t: any) => t.code === code));
+  if (translationsResult.error || missing.length > 0) {
+    return NextResponse.json(
+      { error: `Translation not found: ${missing.join(", ")}` },
+      { status: 404 }
+    );
+  }
+  if (bookResult.error || !bookResult.data) {
+    return NextResponse.json(
+      { error: `Book not found: ${bookAbbr}` },
+      { status: 404 }
+    );
+  }
+
+  const book = bookResult.data;
+  if (chapter < 1 || chapter > book.chapters) {
+    return NextResponse.json(
+      { error: `Invalid chapter: ${chapter}. Valid range: 1-${book.chapters}` },
+      { status: 400 }
+    );
+  }
+
+  // Step 2: One aligned query for every translation
+  const ids = codes.map((code) => translations.find((t: any) => t.code === code)!.id);
+  const { data: rows, error } = await supabase.rpc("parallel_chapter", {
+    p_book_id: book.id,
+    p_chapter: chapter,
+    p_translation_ids: ids,
+  });
+
+  if (error) return NextResponse.json({ error: error.message }, { status: 500 });
+
+  // Step 3: Group rows by canonical verse
+  const codeById = new Map(translations.map((t: any) => [t.id, t.code]));
+  const verses = new Map<number, { id: number; verse: number; texts: Record<string, string>; native_refs: Record<string, string> }>();
+  for (const row of rows || []) {
+    const entry = verses.get(row.verse_id) ?? { id: row.verse_id, verse: row.verse, texts: {}, native_refs: {} };
+    const code = codeById.get(row.translation_id) as string;
+    entry.texts[code] = row.text;
+    if (row.native_refs) entry.native_refs[code] = row.native_refs;
+    verses.set(row.verse_id, entry);
+  }
+
+  return NextResponse.json({
+    translations: codes,
+    book: book.abbr_eng,
+    chapter,
+    verses: Array.from(verses.values()),
+  });
+}
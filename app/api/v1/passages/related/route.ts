@@ -0,0 +1,105 @@
+import { NextRequest, NextResponse } from "next/server";
+import { createServerSupabase } from "@/lib/supabase/server";
+import { extractLanguageFromTranslation } from "@/lib/books";
+
+/**
+ * GET /api/v1/passages/related
+ *
+ * Verses whose text is most similar to one verse, precomputed per translation
+ * (verse_related, scripts/build_related_verses.py)
+ *
+ * Query Parameters:
+ * - translation: Translation code (e.g., "korHRV", "NIV")
+ * - verse_id: Canonical verse id (the `id` returned by /api/v1/passages)
+ * - limit: Max results (default 10)
+ *
+ * Returns:
+ * - related: [{ id, text, book, book_abbr_eng, chapter, verse, score }] in score order
+ */
+export async function GET(req: NextRequest) {
+  const supabase = await createServerSupabase();
+  const url = new URL(req.url);
+  const translationCode = url.searchParams.get("translation");
+  const verseId = Number(url.searchParams.get("verse_id"));
+  const limit = Math.min(Math.max(Number(url.searchParams.get("limit") ?? 10) || 10, 1), 50);
+
+  if (!translationCode || !Number.isInteger(verseId) || verseId <= 0)
+    return NextResponse.json({ error: "translation and verse_id required" }, { status: 400 });
+
+  // Step 1: Get translation ID
+  const { data: translationData, error: translationError } = await supabase
+    .from("translations")
+    .select("id")
+    .eq("code", translationCode)
+    .single();
+
+  if (translationError || !translationData) {
+    return NextResponse.json(
+      { error: `Translation not found: ${translationCode}` },
+      { status: 404 }
+    );
+  }
+
+  // Step 2: Precomputed neighbours (primary key lookup)
+  const { data: related, error: relatedError } = await supabase
+    .from("verse_related")
+    .select("related_verse_id, score")
+    .eq("translation_id", translationData.id)
+    .eq("verse_id", verseId)
+    .order("score", { ascending: false })
+    .limit(limit);
+
+  if (relatedError) return NextResponse.json({ error: relatedError.message }, { status: 500 });
+
+  const verseIds: number[] = (related || []).map((row: any) => row.related_verse_id);
+  if (verseIds.length === 0) return NextResponse.json({ related: [] });
+
+  // Step 3: Load text, verses and books for the related verses
+  const { data, error } = await supabase
+    .from("verse_translations")
+    .select(`
+      text,
+      verse_id,
+      verses!inner (
+        id,
+        chapter,
+        verse,
+        books!inner (
+          abbr_eng,
+          book_names (
+            language,
+            name
+          )
+        )
+      )
+    `)
+    .eq("translation_id", translationData.id)
+    .in("verse_id", verseIds);
+
+  if (error) return NextResponse.json({ error: error.message }, { status: 500 });
+
+  // Step 4: Format in score order with book names in translation's language
+  const language = extractLanguageFromTranslation(translationCode);
+  const scores = new Map((related || []).map((row: any) => [row.related_verse_id, row.score]));
+  const rank = new Map(verseIds.map((id, i) => [id, i]));
+  const ordered = (data || []).sort((a: any, b: any) => rank.get(a.verse_id)! - rank.get(b.verse_id)!);
+  const results = ordered.map((vt: any) => {
+    const verse = vt.verses;
+    const book = verse.books;
+    const bookName = book.book_names.find((bn: any) => bn.language === language);
+    const displayBookName = bookName ? bookName.name :
+      (book.book_names.find((bn: any) => bn.language === 'en')?.name || book.abbr_eng);
+
+    return {
+      id: verse.id,
+      text: vt.text,
+      book: displayBookName,
+      book_abbr_eng: book.abbr_eng,
+      chapter: verse.chapter,
+      verse: verse.verse,
+      score: scores.get(vt.verse_id),
+    };
+  });
+
+  return NextResponse.json({ related: results });
+}
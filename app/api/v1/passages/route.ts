@@ -1,6 +1,9 @@
+import { gunzipSync } from "zlib";
 import { NextRequest, NextResponse } from "next/server";
 import { createServerSupabase } from "@/lib/supabase/server";
 import type { BookWithNames } from "@/lib/books";
+import { readChapterSnapshot } from "@/lib/snapshots";
+import { fetchChapterVerses } from "@/lib/passages";
 
 /**
  * GET /api/v1/passages
@@ -15,9 +18,11 @@ import type { BookWithNames } from "@/lib/books";
  * Returns:
  * - Verses with translated text
  * - Book name in translation's language
+ *
+ * PASSAGE_SNAPSHOT_DIR 이 설정되어 있으면 미리 만든 장 스냅샷(gzip)을
+ * DB 조회 없이 그대로 돌려줌 (scripts/build_chapter_snapshots.py)
  */
 export async function GET(req: NextRequest) {
-  const supabase = await createServerSupabase();
   const url = new URL(req.url);
 
   const translationCode = url.searchParams.get("translation");
@@ -32,6 +37,22 @@ export async function GET(req: NextRequest) {
     );
   }
 
+  // Step 0: Precompiled snapshot (no database round-trip)
+  const snapshot = await readChapterSnapshot(translationCode, bookAbbr, chapter);
+  if (snapshot) {
+    const acceptsGzip = (req.headers.get("accept-encoding") ?? "").includes("gzip");
+    return new NextResponse(new Uint8Array(acceptsGzip ? snapshot : gunzipSync(snapshot)), {
+      headers: {
+        "Content-Type": "application/json; charset=utf-8",
+        ...(acceptsGzip ? { "Content-Encoding": "gzip" } : {}),
+        "Cache-Control": "public, max-age=3600, stale-while-revalidate=86400",
+        Vary: "Accept-Encoding",
+      },
+    });
+  }
+
+  const supabase = await createServerSupabase();
+
   // Step 1: Verify translation exists
   const { data: translationData, error: translationError } = await supabase
     .from("translations")
@@ -83,21 +104,13 @@ export async function GET(req: NextRequest) {
     );
   }
 
-  // Step 3: Fetch verses with translations
-  const { data: versesData, error: versesError } = await supabase
-    .from("verses")
-    .select(`
-      id,
-      chapter,
-      verse,
-      verse_translations!inner (
-        text
-      )
-    `)
-    .eq("book_id", book.id)
-    .eq("chapter", chapter)
-    .eq("verse_translations.translation_id", translationData.id)
-    .order("verse", { ascending: true });
+  // Step 3: Fetch verses with translations (and headings when the table exists)
+  const { verses, error: versesError } = await fetchChapterVerses(
+    supabase,
+    book.id,
+    chapter,
+    translationData.id
+  );
 
   if (versesError) {
     return NextResponse.json(
@@ -111,13 +124,6 @@ export async function GET(req: NextRequest) {
   const displayBookName = koreanBookName ? koreanBookName.name : book.abbr_eng;
 
   // Step 5: Format response
-  const verses = (versesData || []).map((v: any) => ({
-    id: v.id,
-    chapter: v.chapter,
-    verse: v.verse,
-    text: v.verse_translations[0]?.text || "",
-  }));
-
   return NextResponse.json({
     translation: translationCode,
     translation_name: translationData.name,
@@ -2,6 +2,29 @@ import { NextRequest, NextResponse } from "next/server";
 import { createServerSupabase } from "@/lib/supabase/server";
 import { extractLanguageFromTranslation } from "@/lib/books";
 
+const VERSE_SELECT = `
+  text,
+  verse_id,
+  verses!inner (
+    id,
+    chapter,
+    verse,
+    book_id,
+    books!inner (
+      id,
+      abbr_eng,
+      book_names (
+        language,
+        name
+      )
+    )
+  )
+`;
+
+// search_verses RPC 가 없음 (20260117_search_postings.sql 적용 전):
+// PostgREST 가 함수를 찾지 못함 / 함수나 표가 DB 에 없음
+const MISSING_SEARCH_INDEX = new Set(["PGRST202", "42883", "42P01"]);
+
 export async function GET(req: NextRequest) {
   const supabase = await createServerSupabase();
   const url = new URL(req.url);
@@ -25,36 +48,48 @@ export async function GET(req: NextRequest) {
     );
   }
 
-  // Step 2: Search in verse_translations and join with verses and books
-  const { data, error } = await supabase
-    .from("verse_translations")
-    .select(`
-      text,
-      verse_id,
-      verses!inner (
-        id,
-        chapter,
-        verse,
-        book_id,
-        books!inner (
-          id,
-          abbr_eng,
-          book_names (
-            language,
-            name
-          )
-        )
-      )
-    `)
-    .eq("translation_id", translationData.id)
-    .ilike("text", `%${q}%`)
-    .limit(50);
+  // Step 2: Ranked lookup over the n-gram index (search_postings)
+  const { data: hits, error: searchError } = await supabase.rpc("search_verses", {
+    p_translation_id: translationData.id,
+    p_query: q,
+    p_limit: 50,
+  });
+
+  let ordered: any[];
+  if (searchError && MISSING_SEARCH_INDEX.has(searchError.code)) {
+    // Fallback: substring match without ranking (the query used before the index)
+    console.warn("search_verses unavailable, falling back to ilike:", searchError.message);
+    const { data, error } = await supabase
+      .from("verse_translations")
+      .select(VERSE_SELECT)
+      .eq("translation_id", translationData.id)
+      .ilike("text", `%${q}%`)
+      .limit(50);
 
-  if (error) return NextResponse.json({ error: error.message }, { status: 500 });
+    if (error) return NextResponse.json({ error: error.message }, { status: 500 });
+    ordered = data || [];
+  } else {
+    if (searchError) return NextResponse.json({ error: searchError.message }, { status: 500 });
+
+    const verseIds: number[] = (hits || []).map((hit: any) => hit.verse_id);
+    if (verseIds.length === 0) return NextResponse.json({ results: [] });
+
+    // Step 3: Load text, verses and books for the matched verses
+    const { data, error } = await supabase
+      .from("verse_translations")
+      .select(VERSE_SELECT)
+      .eq("translation_id", translationData.id)
+      .in("verse_id", verseIds);
+
+    if (error) return NextResponse.json({ error: error.message }, { status: 500 });
+
+    const rank = new Map(verseIds.map((id, i) => [id, i]));
+    ordered = (data || []).sort((a: any, b: any) => rank.get(a.verse_id)! - rank.get(b.verse_id)!);
+  }
 
-  // Step 3: Format results with book names in translation's language
+  // Step 4: Format results in rank order with book names in translation's language
   const language = extractLanguageFromTranslation(translationCode);
-  const results = (data || []).map((vt: any) => {
+  const results = ordered.map((vt: any) => {
     const verse = vt.verses;
     const book = verse.books;
     const bookName = book.book_names.find((bn: any) => bn.language === language);
@@ -0,0 +1,48 @@
+import { NextRequest, NextResponse } from "next/server";
+import { createServerSupabase } from "@/lib/supabase/server";
+import { getSuggestDictionary, splitQuery } from "@/lib/suggest";
+
+/**
+ * GET /api/v1/search/suggest
+ *
+ * Type-ahead suggestions for the search box from the in-memory dictionary
+ * (lib/suggest.ts, scripts/build_suggest_index.py)
+ *
+ * Query Parameters:
+ * - q: Text typed so far (only the last word is completed)
+ * - translation: Translation code (e.g., "korHRV", "NIV")
+ * - limit: Max suggestions (default 8)
+ *
+ * Returns:
+ * - suggestions: [{ text, term, count }] - text = q with the last word completed, count = verses containing term
+ */
+export async function GET(req: NextRequest) {
+  const url = new URL(req.url);
+  const q = url.searchParams.get("q") ?? "";
+  const translationCode = url.searchParams.get("translation");
+  const limit = Math.min(Math.max(Number(url.searchParams.get("limit") ?? 8) || 8, 1), 20);
+
+  if (!translationCode)
+    return NextResponse.json({ error: "translation required" }, { status: 400 });
+
+  const parts = splitQuery(q);
+  if (!parts) return NextResponse.json({ suggestions: [] });
+
+  let dictionary;
+  try {
+    dictionary = await getSuggestDictionary(await createServerSupabase(), translationCode);
+  } catch (error: any) {
+    return NextResponse.json({ error: error.message }, { status: 500 });
+  }
+  if (!dictionary) return NextResponse.json({ suggestions: [] });
+
+  const suggestions = dictionary.lookup(parts.token, limit).map(({ term, count }) => ({
+    text: parts.head + term,
+    term,
+    count,
+  }));
+  return NextResponse.json(
+    { suggestions },
+    { headers: { "Cache-Control": "public, max-age=300" } }
+  );
+}
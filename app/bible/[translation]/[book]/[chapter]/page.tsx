@@ -2,6 +2,7 @@ import PassageClient from "@/components/passage/passage-client";
 import { createServerSupabase } from "@/lib/supabase/server";
 import { notFound } from "next/navigation";
 import type { BookWithNames } from "@/lib/books";
+import { fetchChapterVerses } from "@/lib/passages";
 
 export default async function Page(props: {
   params: Promise<{ translation: string; book: string; chapter: string }>;
@@ -65,21 +66,13 @@ export default async function Page(props: {
     return notFound();
   }
 
-  // Step 4: Fetch verses with translation
-  const { data: versesData, error: versesError } = await supabase
-    .from("verses")
-    .select(`
-      id,
-      chapter,
-      verse,
-      verse_translations!inner (
-        text
-      )
-    `)
-    .eq("book_id", book.id)
-    .eq("chapter", chapterNum)
-    .eq("verse_translations.translation_id", translationData.id)
-    .order("verse", { ascending: true });
+  // Step 4: Fetch verses with translation (and headings when the table exists)
+  const { verses: chapterVerses, error: versesError } = await fetchChapterVerses(
+    supabase,
+    book.id,
+    chapterNum,
+    translationData.id
+  );
 
   if (versesError) {
     console.error("Failed to fetch verses:", versesError);
@@ -91,13 +84,7 @@ export default async function Page(props: {
   const displayBookName = koreanBookName ? koreanBookName.name : book.abbr_eng;
 
   // Format verses
-  const verses = (versesData || []).map((v: any) => ({
-    id: v.id,
-    book: displayBookName,
-    chapter: v.chapter,
-    verse: v.verse,
-    text: v.verse_translations[0]?.text || "",
-  }));
+  const verses = chapterVerses.map((v) => ({ ...v, book: displayBookName }));
 
   // Format books for PassageClient - UI는 항상 한국어 고정
   const availableBooks = books.map((b) => {
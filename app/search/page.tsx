@@ -1,10 +1,13 @@
 "use client";
-import { useState, useMemo, useRef } from "react";
+import { useState, useMemo, useRef, useEffect } from "react";
 import Spinner from "@/components/ui/Spinner";
 import Skeleton from "@/components/ui/Skeleton";
 import Badge from "@/components/ui/Badge";
 
 const SUGGESTED_KEYWORDS = ["사랑", "위로", "평안", "믿음", "기도", "은혜", "소망", "감사"];
+const SUGGEST_DEBOUNCE_MS = 80;
+
+type Suggestion = { text: string; term: string; count: number };
 
 export default function SearchPage() {
   const [q, setQ] = useState("");
@@ -14,6 +17,12 @@ export default function SearchPage() {
   const [hasSearched, setHasSearched] = useState(false);
   const [selectedBook, setSelectedBook] = useState<string | null>(null);
 
+  // 자동 완성 (입력할 때마다 /api/v1/search/suggest, 서버 메모리의 사전에서 조회)
+  const [suggestions, setSuggestions] = useState<Suggestion[]>([]);
+  const [showSuggestions, setShowSuggestions] = useState(false);
+  const [activeSuggestion, setActiveSuggestion] = useState(-1);
+  const suggestAbort = useRef<AbortController | null>(null);
+
   // 드래그 스크롤을 위한 ref
   const scrollRef = useRef<HTMLDivElement>(null);
   const [isDragging, setIsDragging] = useState(false);
@@ -42,10 +51,36 @@ export default function SearchPage() {
     return groupedResults[selectedBook] || [];
   }, [selectedBook, groupedResults, results]);
 
+  useEffect(() => {
+    if (!showSuggestions || !q.trim()) {
+      setSuggestions([]);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      suggestAbort.current?.abort();
+      const controller = new AbortController();
+      suggestAbort.current = controller;
+      try {
+        const res = await fetch(
+          `/api/v1/search/suggest?q=${encodeURIComponent(q)}&translation=${translation}`,
+          { signal: controller.signal }
+        );
+        const data = await res.json();
+        setSuggestions(data.suggestions ?? []);
+        setActiveSuggestion(-1);
+      } catch (error) {
+        if ((error as Error).name !== "AbortError") console.error("Suggest failed:", error);
+      }
+    }, SUGGEST_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [q, translation, showSuggestions]);
+
   const search = async (overrideQ?: string) => {
     const query = overrideQ || q;
     if (!query.trim()) return;
 
+    setShowSuggestions(false);
+    suggestAbort.current?.abort();
     setLoading(true);
     setHasSearched(true);
     setSelectedBook(null);
@@ -106,6 +141,26 @@ export default function SearchPage() {
     search(keyword);
   };
 
+  // 자동 완성 키보드 조작: 위/아래로 고르고 Enter 로 검색, Esc 로 닫기
+  const handleInputKeyDown = (e: React.KeyboardEvent<HTMLInputElement>) => {
+    const open = showSuggestions && suggestions.length > 0;
+    if (open && e.key === "ArrowDown") {
+      e.preventDefault();
+      setActiveSuggestion((i) => (i + 1) % suggestions.length);
+    } else if (open && e.key === "ArrowUp") {
+      e.preventDefault();
+      setActiveSuggestion((i) => (i <= 0 ? suggestions.length - 1 : i - 1));
+    } else if (e.key === "Escape") {
+      setShowSuggestions(false);
+    } else if (e.key === "Enter" && !e.nativeEvent.isComposing) {
+      if (open && activeSuggestion >= 0) {
+        handleSuggestedClick(suggestions[activeSuggestion].text);
+      } else {
+        search();
+      }
+    }
+  };
+
   return (
     <div className="min-h-screen bg-paper-50 dark:bg-primary-950 transition-colors duration-500">
       <main className="mx-auto max-w-5xl px-6 py-16">
@@ -122,17 +177,56 @@ export default function SearchPage() {
         {/* 검색 인터페이스 */}
         <div className="max-w-3xl mx-auto space-y-8">
           <div className="flex flex-col sm:flex-row gap-3 p-3 bg-white dark:bg-primary-900 rounded-[2.5rem] border border-stone-200 dark:border-primary-800 shadow-xl shadow-primary-900/5 transition-all focus-within:border-primary-400 dark:focus-within:border-primary-600">
-            <div className="flex-1 flex items-center px-4 gap-3">
+            <div className="relative flex-1 flex items-center px-4 gap-3">
               <svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" strokeWidth={2} stroke="currentColor" className="w-5 h-5 text-stone-400">
                 <path strokeLinecap="round" strokeLinejoin="round" d="M21 21l-5.197-5.197m0 0A7.5 7.5 0 105.196 5.196a7.5 7.5 0 0010.607 10.607z" />
               </svg>
               <input
                 className="w-full bg-transparent text-primary-900 dark:text-primary-50 py-3 focus:outline-none font-medium placeholder-stone-300 dark:placeholder-primary-700"
                 value={q}
-                onChange={(e) => setQ(e.target.value)}
-                onKeyDown={(e) => e.key === "Enter" && search()}
+                onChange={(e) => {
+                  setQ(e.target.value);
+                  setShowSuggestions(true);
+                }}
+                onKeyDown={handleInputKeyDown}
+                onBlur={() => setShowSuggestions(false)}
                 placeholder="어떤 말씀을 찾으시나요?"
+                role="combobox"
+                aria-expanded={showSuggestions && suggestions.length > 0}
+                aria-autocomplete="list"
               />
+
+              {/* 자동 완성 목록 */}
+              {showSuggestions && suggestions.length > 0 && (
+                <ul
+                  role="listbox"
+                  className="absolute left-0 right-0 top-full mt-4 z-20 py-2 bg-white dark:bg-primary-900 rounded-3xl border border-stone-200 dark:border-primary-800 shadow-xl shadow-primary-900/10 overflow-hidden"
+                >
+                  {suggestions.map((suggestion, index) => (
+                    <li key={suggestion.text} role="option" aria-selected={index === activeSuggestion}>
+                      <button
+                        type="button"
+                        // 입력창 blur 보다 먼저 처리되도록 mousedown 에서 선택
+                        onMouseDown={(e) => {
+                          e.preventDefault();
+                          handleSuggestedClick(suggestion.text);
+                        }}
+                        onMouseEnter={() => setActiveSuggestion(index)}
+                        className={`w-full flex items-center justify-between px-6 py-2.5 text-left font-medium transition-colors ${
+                          index === activeSuggestion
+                            ? "bg-paper-50 dark:bg-primary-800 text-primary-700 dark:text-primary-100"
+                            : "text-primary-900 dark:text-primary-50"
+                        }`}
+                      >
+                        <span>{suggestion.text}</span>
+                        <span className="text-xs font-bold text-stone-400 dark:text-primary-500">
+                          {suggestion.count}구절
+                        </span>
+                      </button>
+                    </li>
+                  ))}
+                </ul>
+              )}
             </div>
             
             <div className="flex gap-2">
@@ -9,6 +9,7 @@ export interface Verse {
   book: string;
   chapter: number;
   verse: number;
+  heading?: string; // 이 절 앞의 소제목 (verse_headings)
 }
 
 // Props 타입 정의
@@ -54,6 +55,12 @@ export default function VerseDisplay({
           : ""
       } relative`}
     >
+      {/* 소제목 */}
+      {verse.heading && (
+        <h3 className="font-sans font-semibold text-primary-700 dark:text-primary-300 text-base mt-2 mb-3">
+          {verse.heading}
+        </h3>
+      )}
       <div className="flex items-start gap-4">
         {/* 절 번호 */}
         <span className="font-sans font-medium text-stone-400 dark:text-primary-500 text-sm min-w-[1.5rem] pt-1.5 transition-colors group-hover:text-primary-500">
@@ -0,0 +1,69 @@
+/**
+ * Chapter verse query shared by the passages API and the reader page
+ *
+ * 소제목(verse_headings)은 20260118_text_normalization.sql 로 생기는 표라서, 앱을 먼저 배포하면
+ * PostgREST 가 embed 를 거부함 (PGRST200). 그때는 소제목 없이 다시 조회해서 본문은 그대로 보여 줌.
+ */
+
+import type { SupabaseClient } from "@supabase/supabase-js";
+
+export type ChapterVerse = {
+  id: number;
+  chapter: number;
+  verse: number;
+  text: string;
+  heading?: string;
+};
+
+// PostgREST: embed 할 관계를 schema cache 에서 찾지 못함
+const MISSING_RELATIONSHIP = "PGRST200";
+
+function chapterQuery(
+  supabase: SupabaseClient,
+  bookId: number,
+  chapter: number,
+  translationId: number,
+  withHeadings: boolean
+) {
+  let query = supabase
+    .from("verses")
+    .select(`
+      id,
+      chapter,
+      verse,
+      verse_translations!inner (
+        text
+      )${withHeadings ? ", verse_headings ( heading )" : ""}
+    `)
+    .eq("book_id", bookId)
+    .eq("chapter", chapter)
+    .eq("verse_translations.translation_id", translationId);
+  if (withHeadings) query = query.eq("verse_headings.translation_id", translationId);
+  return query.order("verse", { ascending: true });
+}
+
+/**
+ * 장 하나의 구절 (번역본 본문 + 소제목, 소제목 표가 없으면 소제목 없이)
+ */
+export async function fetchChapterVerses(
+  supabase: SupabaseClient,
+  bookId: number,
+  chapter: number,
+  translationId: number
+): Promise<{ verses: ChapterVerse[]; error: { message: string } | null }> {
+  let { data, error } = await chapterQuery(supabase, bookId, chapter, translationId, true);
+  if (error?.code === MISSING_RELATIONSHIP) {
+    console.warn("verse_headings unavailable, serving chapter without headings:", error.message);
+    ({ data, error } = await chapterQuery(supabase, bookId, chapter, translationId, false));
+  }
+  if (error) return { verses: [], error };
+
+  const verses = (data || []).map((v: any) => ({
+    id: v.id,
+    chapter: v.chapter,
+    verse: v.verse,
+    text: v.verse_translations[0]?.text || "",
+    heading: v.verse_headings?.[0]?.heading ?? undefined,
+  }));
+  return { verses, error: null };
+}
@@ -0,0 +1,40 @@
+/**
+ * Precompiled chapter snapshots (scripts/build_chapter_snapshots.py)
+ *
+ * 스냅샷 폴더 구조:
+ *   <PASSAGE_SNAPSHOT_DIR>/<translation>/<book abbr_eng>/<chapter>.json.gz
+ *
+ * 각 파일은 GET /api/v1/passages 응답과 같은 JSON 을 gzip 한 것.
+ * PASSAGE_SNAPSHOT_DIR 이 없거나 파일이 없으면 null → DB 조회로 fallback.
+ */
+
+import { readFile } from "fs/promises";
+import path from "path";
+
+const SNAPSHOT_DIR = process.env.PASSAGE_SNAPSHOT_DIR;
+
+// 경로 조작 방지: 번역본 코드 / 책 약어는 영문자와 숫자만
+const SAFE_SEGMENT = /^[A-Za-z0-9]+$/;
+
+/**
+ * 장 스냅샷 읽기
+ *
+ * @returns gzip 된 JSON (없으면 null)
+ */
+export async function readChapterSnapshot(
+  translation: string,
+  book: string,
+  chapter: number
+): Promise<Buffer | null> {
+  if (!SNAPSHOT_DIR) return null;
+  if (!SAFE_SEGMENT.test(translation) || !SAFE_SEGMENT.test(book)) return null;
+  if (!Number.isInteger(chapter) || chapter < 1) return null;
+
+  try {
+    return await readFile(
+      path.join(SNAPSHOT_DIR, translation, book, `${chapter}.json.gz`)
+    );
+  } catch {
+    return null;
+  }
+}
@@ -0,0 +1,133 @@
+/**
+ * Search autocomplete dictionary (scripts/build_suggest_index.py → search_suggest_dicts)
+ *
+ * 번역본마다 컴파일된 사전(용어 오름차순 배열 + 같은 순서의 구절 수)을 한 번 읽어 메모리에 두고,
+ * 입력 중인 마지막 단어의 접두어 구간을 이진 탐색으로 찾아 구절 수 상위 N 개를 돌려줌 (요청마다 DB 조회 없음).
+ * RELOAD_MS 가 지나면 다시 읽음 (새 사전을 읽는 동안은 예전 사전으로 응답).
+ *
+ * prefixRange / 접두어 규칙은 scripts/build_suggest_index.py 와 같아야 함.
+ */
+
+import type { SupabaseClient } from "@supabase/supabase-js";
+
+// 한글 음절 = 0xAC00 + (초성 × 21 + 중성) × 28 + 종성
+const CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ";
+const HANGUL_BASE = 0xac00;
+const SYLLABLES_PER_INITIAL = 21 * 28;
+const FINALS = 28;
+// 입력 중인 마지막 단어 (검색어 끝에 붙어 있어야 함, 공백으로 끝나면 제안 없음)
+const PREFIX_PATTERN = /(?:[가-힣]+[ㄱ-ㅎ]?|[ㄱ-ㅎ]|[a-z0-9]+)$/i;
+const RELOAD_MS = 10 * 60 * 1000;
+
+export type Suggestion = { term: string; count: number };
+
+/**
+ * 입력 중인 마지막 단어 → 사전에서 찾을 구간 [lo, hi)
+ *
+ * 받침 없는 마지막 음절은 받침이 붙은 음절까지 (하 → 하~핳),
+ * 끝의 자음 하나는 그 초성으로 시작하는 음절 전체 (하ㄴ → 하나~하닣).
+ */
+export function prefixRange(token: string): [string, string] {
+  const head = token.slice(0, -1);
+  const last = token.slice(-1);
+  const initial = CHOSEONG.indexOf(last);
+  if (initial >= 0) {
+    const start = HANGUL_BASE + initial * SYLLABLES_PER_INITIAL;
+    return [head + String.fromCharCode(start), head + String.fromCharCode(start + SYLLABLES_PER_INITIAL)];
+  }
+  const code = last.charCodeAt(0);
+  if (last >= "가" && last <= "힣" && (code - HANGUL_BASE) % FINALS === 0) {
+    return [token, head + String.fromCharCode(code + FINALS)];
+  }
+  return [token, token + "\uffff"];
+}
+
+/**
+ * 검색어 → 앞부분 + 입력 중인 마지막 단어 (소문자). 끝에 완성할 단어가 없으면 null
+ *
+ * 예: "Kingdom of He" → { head: "Kingdom of ", token: "he" }
+ */
+export function splitQuery(q: string): { head: string; token: string } | null {
+  const normalized = q.normalize("NFC");
+  const match = normalized.match(PREFIX_PATTERN);
+  if (!match || match.index === undefined) return null;
+  return { head: normalized.slice(0, match.index), token: match[0].toLowerCase() };
+}
+
+export class SuggestDictionary {
+  constructor(readonly terms: string[], readonly counts: Uint32Array) {}
+
+  static fromRow(row: { terms: string; counts: number[] }) {
+    return new SuggestDictionary(row.terms ? row.terms.split("\n") : [], Uint32Array.from(row.counts));
+  }
+
+  private lowerBound(key: string, lo = 0) {
+    let hi = this.terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (this.terms[mid] < key) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+
+  /** 마지막 단어(splitQuery 의 token) → 구절 수 내림차순 상위 limit 개 (같으면 용어 순) */
+  lookup(token: string, limit: number): Suggestion[] {
+    const [lo, hi] = prefixRange(token);
+    const start = this.lowerBound(lo);
+    const end = this.lowerBound(hi, start);
+
+    // 구간을 한 번 훑으면서 상위 limit 개만 작은 배열에 삽입 정렬로 유지
+    const top: number[] = [];
+    for (let i = start; i < end; i++) {
+      const count = this.counts[i];
+      if (top.length === limit && count <= this.counts[top[limit - 1]]) continue;
+      let pos = Math.min(top.length, limit - 1);
+      while (pos > 0 && this.counts[top[pos - 1]] < count) pos--;
+      top.splice(pos, 0, i);
+      if (top.length > limit) top.pop();
+    }
+    return top.map((i) => ({ term: this.terms[i], count: this.counts[i] }));
+  }
+}
+
+type CacheEntry = { loadedAt: number; dictionary: Promise<SuggestDictionary | null> };
+const cache = new Map<string, CacheEntry>();
+
+async function loadDictionary(supabase: SupabaseClient, translationCode: string) {
+  const { data: translation, error } = await supabase
+    .from("translations")
+    .select("id")
+    .eq("code", translationCode)
+    .single();
+  if (error || !translation) return null;
+
+  const { data, error: dictionaryError } = await supabase
+    .from("search_suggest_dicts")
+    .select("terms, counts")
+    .eq("translation_id", translation.id)
+    .maybeSingle();
+  if (dictionaryError) throw new Error(dictionaryError.message);
+  return data ? SuggestDictionary.fromRow(data) : null;
+}
+
+/**
+ * 번역본의 사전 (메모리 캐시, 사전이 없는 번역본이면 null)
+ */
+export async function getSuggestDictionary(
+  supabase: SupabaseClient,
+  translationCode: string
+): Promise<SuggestDictionary | null> {
+  const current = cache.get(translationCode);
+  if (current && Date.now() - current.loadedAt < RELOAD_MS) return current.dictionary;
+
+  const next: CacheEntry = { loadedAt: Date.now(), dictionary: loadDictionary(supabase, translationCode) };
+  cache.set(translationCode, next);
+  next.dictionary.catch(() => {
+    // 읽기 실패: 예전 사전으로 되돌림 (없으면 다음 요청에서 다시 시도)
+    if (cache.get(translationCode) !== next) return;
+    if (current) cache.set(translationCode, current);
+    else cache.delete(translationCode);
+  });
+  return current ? current.dictionary : next.dictionary;
+}
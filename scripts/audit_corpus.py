@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+본문 완결성 / 일관성 점검
+
+시편 31편처럼 빠진 장은 예전에는 손으로 찾았고, 임포터의 확인은 번역본 전체 count='exact' 하나라서
+느리고 어디가 비었는지 알 수 없었음.
+
+corpus_audit RPC (supabase/migrations/20260118_corpus_audit.sql, GROUP BY 한 번)로
+(번역본, 책, 장)별 구절 수를 받아서 장 슬롯 배열(books.chapters 로 만든 1,189칸)에 채운 뒤
+배열끼리 비교함:
+    canonical  books.chapters 에 있는데 정규 구절이 없는 장, 절 번호가 비는 장, books.chapters 밖의 장
+    번역본     정규 구절은 있는데 비어 있는 장(missing), 일부 절만 있는 장(partial, 빠진 절 번호 포함), 밖의 장(extra)
+    번역본끼리 모든 번역본이 같은 수인데 정규 구절만 더 많은 장 (정규 구절 쪽이 의심스러운 곳)
+
+결과는 JSON (기본 .cache/audit/corpus-YYYYmmdd-HHMMSS.json).
+"reimport" 항목을 그대로 임포트 엔진에 넘기면 그 장들만 다시 임포트함:
+    python3 scripts/import_engine.py --translation NIV --chapters-from .cache/audit/corpus-....json
+
+문제가 있으면 exit 1 (CI 에서 사용 가능).
+
+사용 예:
+    python3 scripts/audit_corpus.py
+    python3 scripts/audit_corpus.py --translation NIV --out audit.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from metrics import METRICS, add_metrics_arguments, metrics_run
+from supabase_env import create_supabase, load_env
+
+DEFAULT_OUT_DIR = Path(__file__).parent.parent / '.cache' / 'audit'
+
+
+def fetch_audit(supabase, translation_id=None):
+    """corpus_audit RPC 결과 (translation_id 가 None 이면 전체 번역본)"""
+    params = {} if translation_id is None else {'p_translation_id': translation_id}
+    with METRICS.stage('audit_query'):
+        return supabase.rpc('corpus_audit', params).execute().data
+
+
+def _parse_key(key):
+    book_order, chapter = key.split(':')
+    return int(book_order), int(chapter)
+
+
+class CorpusAudit:
+    """
+    corpus_audit 결과를 장 슬롯 배열로 펼쳐서 비교
+
+    Args:
+        books: books 테이블 행 [{abbr_eng, book_order, chapters}, ...]
+        translations: 점검할 translations 행 [{id, code}, ...]
+        raw: fetch_audit() 결과
+    """
+
+    def __init__(self, books, translations, raw):
+        self.books = sorted(books, key=lambda book: book['book_order'])
+        self.translations = translations
+        self.abbr_by_order = {book['book_order']: book['abbr_eng'] for book in self.books}
+        self.order_by_abbr = {book['abbr_eng']: book['book_order'] for book in self.books}
+        self.chapters_by_order = {book['book_order']: book['chapters'] for book in self.books}
+
+        # 장 슬롯: book_order 순서로 1장부터 books.chapters 장까지
+        self.base = {}
+        slot = 0
+        for book in self.books:
+            self.base[book['book_order']] = slot
+            slot += book['chapters']
+        self.slot_count = slot
+        self.slot_refs = [(book['book_order'], chapter)
+                          for book in self.books for chapter in range(1, book['chapters'] + 1)]
+
+        self.canonical, self.canonical_verses, self.canonical_extra = self._fill(raw.get('canonical', {}))
+        self.counts = np.zeros((len(translations), self.slot_count), dtype=np.int32)
+        self.verses = []     # 번역본마다 {slot: [절 번호, ...]} (구절 수가 맞지 않는 장만)
+        self.extra = []
+        for i, translation in enumerate(translations):
+            counts, verses, extra = self._fill(raw.get('translations', {}).get(str(translation['id']), {}))
+            self.counts[i] = counts
+            self.verses.append(verses)
+            self.extra.append(extra)
+
+    def _slot(self, book_order, chapter):
+        """장 슬롯 번호 (books.chapters 밖이면 None)"""
+        if not 1 <= chapter <= self.chapters_by_order.get(book_order, 0):
+            return None
+        return self.base[book_order] + chapter - 1
+
+    def _fill(self, chapters):
+        """{"o:c": 수 | [절, ...]} → (구절 수 배열, {slot: 절 목록}, books.chapters 밖의 장 목록)"""
+        counts = np.zeros(self.slot_count, dtype=np.int32)
+        verses = {}
+        extra = []
+        for key, value in chapters.items():
+            book_order, chapter = _parse_key(key)
+            slot = self._slot(book_order, chapter)
+            count = len(value) if isinstance(value, list) else value
+            if slot is None:
+                extra.append({'book': self.abbr_by_order.get(book_order, str(book_order)),
+                              'book_order': book_order, 'chapter': chapter, 'verses': count})
+                continue
+            counts[slot] = count
+            if isinstance(value, list):
+                verses[slot] = value
+        extra.sort(key=lambda item: (item['book_order'], item['chapter']))
+        return counts, verses, extra
+
+    def _ref(self, slot, **fields):
+        book_order, chapter = self.slot_refs[slot]
+        return {'book': self.abbr_by_order[book_order], 'book_order': book_order, 'chapter': chapter, **fields}
+
+    def _canonical_numbers(self, slot):
+        if slot in self.canonical_verses:
+            return self.canonical_verses[slot]
+        return range(1, int(self.canonical[slot]) + 1)
+
+    def canonical_report(self):
+        missing = np.flatnonzero(self.canonical == 0)
+        gaps = []
+        for slot, numbers in sorted(self.canonical_verses.items()):
+            present = set(numbers)
+            gaps.append(self._ref(slot, missing_verses=[v for v in range(1, max(numbers) + 1) if v not in present]))
+
+        # 기준 번역본(정규 구절과 완전히 같은 번역본)을 뺀 번역본이 둘 이상 있고,
+        # 모두 같은 수인데 정규 구절만 더 많은 장
+        suspects = []
+        others = self.counts[[i for i in range(len(self.translations))
+                              if not np.array_equal(self.counts[i], self.canonical)]]
+        if len(others) >= 2:
+            agree = (others > 0).all(axis=0) & (others.min(axis=0) == others.max(axis=0))
+            for slot in np.flatnonzero(agree & (others[0] < self.canonical)):
+                suspects.append(self._ref(int(slot), canonical_verses=int(self.canonical[slot]),
+                                          translation_verses=int(others[0][slot])))
+
+        return {
+            'verses': int(self.canonical.sum()),
+            'chapters': int((self.canonical > 0).sum()),
+            'missing_chapters': [self._ref(int(slot)) for slot in missing],
+            'verse_gaps': gaps,
+            'extra_chapters': self.canonical_extra,
+            'more_than_every_translation': suspects,
+        }
+
+    def translation_report(self, i):
+        counts = self.counts[i]
+        expected = self.canonical > 0
+        missing = np.flatnonzero(expected & (counts == 0))
+        partial = np.flatnonzero((counts > 0) & (counts < self.canonical))
+
+        partial_items = []
+        for slot in partial:
+            present = set(self.verses[i].get(int(slot), ()))
+            partial_items.append(self._ref(int(slot), verses=int(counts[slot]),
+                                           missing_verses=[v for v in self._canonical_numbers(int(slot))
+                                                           if v not in present]))
+        return {
+            'verses': int(counts.sum()),
+            'chapters': int((counts > 0).sum()),
+            'expected_chapters': int(expected.sum()),
+            'missing_chapters': [self._ref(int(slot)) for slot in missing],
+            'partial_chapters': partial_items,
+            'extra_chapters': self.extra[i],
+        }
+
+    def report(self):
+        translations = {t['code']: self.translation_report(i) for i, t in enumerate(self.translations)}
+        reimport = {
+            code: [[item['book'], item['chapter']] for item in report['missing_chapters'] + report['partial_chapters']]
+            for code, report in translations.items()
+        }
+        return {
+            'canonical': self.canonical_report(),
+            'translations': translations,
+            'reimport': {code: sorted(units, key=lambda unit: (self.order_by_abbr[unit[0]], unit[1]))
+                         for code, units in reimport.items() if units},
+        }
+
+
+def reimport_units(report_path, translation):
+    """
+    점검 보고서의 reimport 항목 → 번역본 하나의 {(abbr, chapter), ...} (임포트 엔진 --chapters-from)
+    """
+    with open(report_path, encoding='utf-8') as f:
+        report = json.load(f)
+    return {(abbr, chapter) for abbr, chapter in report.get('reimport', {}).get(translation, [])}
+
+
+def count_issues(report):
+    canonical = report['canonical']
+    issues = len(canonical['missing_chapters']) + len(canonical['verse_gaps']) + len(canonical['extra_chapters'])
+    for translation in report['translations'].values():
+        issues += (len(translation['missing_chapters']) + len(translation['partial_chapters'])
+                   + len(translation['extra_chapters']))
+    return issues
+
+
+def format_report(report):
+    """사람이 읽을 요약 (번역본마다 한 줄 + 빠진 곳 앞부분)"""
+    def refs(items, limit=8):
+        text = ', '.join(f"{item['book']} {item['chapter']}" for item in items[:limit])
+        return text + (f' ... (+{len(items) - limit})' if len(items) > limit else '')
+
+    canonical = report['canonical']
+    lines = [f"canonical: {canonical['verses']} verses in {canonical['chapters']} chapters, "
+             f"{len(canonical['missing_chapters'])} missing chapters, {len(canonical['verse_gaps'])} verse gaps, "
+             f"{len(canonical['extra_chapters'])} extra chapters"]
+    for key in ('missing_chapters', 'verse_gaps', 'extra_chapters', 'more_than_every_translation'):
+        if canonical[key]:
+            lines.append(f"  {key}: {refs(canonical[key])}")
+
+    for code, translation in report['translations'].items():
+        lines.append(f"{code}: {translation['verses']} verses in {translation['chapters']}/"
+                     f"{translation['expected_chapters']} chapters, {len(translation['missing_chapters'])} missing, "
+                     f"{len(translation['partial_chapters'])} partial, {len(translation['extra_chapters'])} extra")
+        for key in ('missing_chapters', 'extra_chapters'):
+            if translation[key]:
+                lines.append(f"  {key}: {refs(translation[key])}")
+        for item in translation['partial_chapters'][:8]:
+            lines.append(f"  partial: {item['book']} {item['chapter']} missing verses {item['missing_verses']}")
+        if len(translation['partial_chapters']) > 8:
+            lines.append(f"  partial: ... (+{len(translation['partial_chapters']) - 8})")
+    return '\n'.join(lines)
+
+
+def audit_translation(supabase, books, translation):
+    """
+    번역본 하나 점검 (임포트 끝에 쓰는 용도)
+
+    Returns:
+        dict: translation_report 결과
+    """
+    raw = fetch_audit(supabase, translation['id'])
+    return CorpusAudit(books, [translation], raw).translation_report(0)
+
+
+def run(args):
+    """main 본문 (인자 파싱 후, 계측 안에서 실행)"""
+    supabase = create_supabase(load_env())
+    started = time.perf_counter()
+
+    books = supabase.table('books').select('abbr_eng, book_order, chapters').order('book_order').execute().data
+    translations = (supabase.table('translations').select('id, code, available')
+                    .order('display_order').execute().data)
+    if args.translation:
+        missing = set(args.translation) - {t['code'] for t in translations}
+        if missing:
+            print(f"Translation not found: {', '.join(sorted(missing))}")
+            sys.exit(2)
+        translations = [t for t in translations if t['code'] in args.translation]
+
+    translation_id = translations[0]['id'] if args.translation and len(translations) == 1 else None
+    raw = fetch_audit(supabase, translation_id)
+    if not args.translation:
+        # available=false 인데 본문이 하나도 없는 번역본은 점검 대상 아님
+        loaded = set(raw.get('translations', {}))
+        translations = [t for t in translations if t['available'] or str(t['id']) in loaded]
+
+    with METRICS.stage('audit_compare'):
+        audit = CorpusAudit(books, translations, raw)
+        report = audit.report()
+    report = {'generated_at': datetime.now().isoformat(timespec='seconds'), **report}
+
+    out_path = Path(args.out) if args.out else DEFAULT_OUT_DIR / f"corpus-{datetime.now():%Y%m%d-%H%M%S}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, indent=1, ensure_ascii=False) + '\n', encoding='utf-8')
+
+    print(format_report(report))
+    issues = count_issues(report)
+    print(f"\n{issues} issues in {time.perf_counter() - started:.2f}s -> {out_path}", flush=True)
+    if report['reimport']:
+        codes = ' '.join(f'--translation {code}' for code in report['reimport'])
+        print(f"Re-import: python3 scripts/import_engine.py {codes} --chapters-from {out_path}")
+    return issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit corpus completeness per translation/book/chapter')
+    parser.add_argument('--translation', action='append',
+                        help='번역본 코드 (여러 번 지정 가능, 없으면 available=true 이거나 본문이 있는 전체)')
+    parser.add_argument('--out', default=None, help='결과 JSON 경로 (기본: .cache/audit/corpus-<시각>.json)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    with metrics_run(args):
+        issues = run(args)
+    if issues:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
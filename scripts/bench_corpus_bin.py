@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+바이너리 코퍼스(corpus_bin) vs 텍스트 파싱(parse_bible_file) 벤치마크
+
+측정 항목:
+    full read   - 전체 구절을 한 번씩 읽기
+    chapters    - 무작위 장 1,000개 조회
+    peak memory - tracemalloc 기준 최대 할당량
+
+HRV(ver.4) 폴더가 없으면 bench_hrv_parser 의 가짜 66권 코퍼스를 사용.
+
+사용 예:
+    python3 scripts/bench_corpus_bin.py
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from bench_hrv_parser import write_synthetic_corpus
+from corpus_bin import CorpusReader, compile_corpus, hrv_verses
+from hrv_parser import HRV_DIR, book_order_from_code, book_code_from_path, list_corpus_files, parse_bible_file
+
+
+def measure(label, fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {label:<24} best {min(timings) * 1000:8.1f} ms   "
+          f"median {statistics.median(timings) * 1000:8.1f} ms   "
+          f"peak {peak / 1024 / 1024:6.1f} MB   ({result})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the mmap corpus format against text parsing')
+    parser.add_argument('--dir', default=HRV_DIR, help='HRV 텍스트 폴더 (없으면 가짜 코퍼스 사용)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.dir
+        if not list_corpus_files(directory):
+            directory = write_synthetic_corpus(os.path.join(tmp, 'HRV'))
+            print(f"{args.dir} not found, using synthetic corpus")
+
+        files = list_corpus_files(directory)
+        corpus_path = os.path.join(tmp, 'korHRV.bin')
+
+        started = time.perf_counter()
+        count = compile_corpus(hrv_verses(directory), corpus_path, 'korHRV')
+        print(f"Compiled {count} verses in {(time.perf_counter() - started) * 1000:.0f} ms "
+              f"({os.path.getsize(corpus_path) / 1024:.0f} KB)\n")
+
+        with CorpusReader(corpus_path) as corpus:
+            chapters = sorted({(b, c) for b, c, _, _ in corpus.iter_range()})
+        rng = random.Random(0)
+        sample = [rng.choice(chapters) for _ in range(1000)]
+
+        def parse_all():
+            return sum(len(parse_bible_file(path)) for path in files)
+
+        def mmap_all():
+            with CorpusReader(corpus_path) as corpus:
+                return sum(len(text) > 0 for _, _, _, text in corpus.iter_range())
+
+        def parse_chapters():
+            # 텍스트 파일은 장 단위 접근이 불가능하므로 책 전체를 파싱해서 찾음
+            by_order = {book_order_from_code(book_code_from_path(path)): path for path in files}
+            found = 0
+            for book_order, chapter in sample:
+                found += sum(1 for v in parse_bible_file(by_order[book_order]) if v.chapter == chapter)
+            return found
+
+        def mmap_chapters():
+            with CorpusReader(corpus_path) as corpus:
+                return sum(len(corpus.get_chapter(book_order, chapter)) for book_order, chapter in sample)
+
+        measure('full read: parse', parse_all, args.repeat)
+        measure('full read: mmap', mmap_all, args.repeat)
+        measure('1k chapters: parse', parse_chapters, 1)
+        measure('1k chapters: mmap', mmap_chapters, args.repeat)
+
+if __name__ == '__main__':
+    main()
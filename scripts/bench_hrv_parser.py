@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HRV 파서 마이크로 벤치마크
+
+비교 대상:
+    legacy     - 예전 parse_bible_file (줄마다 re.match(문자열 패턴), dict 리스트)
+    current    - hrv_parser.parse_corpus()
+
+HRV(ver.4) 폴더가 없으면 같은 형식의 가짜 66권 코퍼스를 임시 폴더에 만들어서 측정.
+
+사용 예:
+    python3 scripts/bench_hrv_parser.py
+    python3 scripts/bench_hrv_parser.py --dir "HRV(ver.4)" --repeat 10
+"""
+
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+
+from bolls_stub_server import CHAPTERS_PER_BOOK, synthetic_verse_count
+from hrv_parser import HRV_DIR, HRV_ENCODING, list_corpus_files, parse_corpus
+
+SAMPLE_TEXT = '태초에 하나님이 천지를 창조하시니라 땅이 혼돈하고 공허하며 흑암이 깊음 위에 있고'
+
+
+def write_synthetic_corpus(directory):
+    """HRV(ver.4) 와 같은 형식(EUC-KR, 파일명 1-01.txt ...)의 가짜 66권 코퍼스 생성"""
+    os.makedirs(directory, exist_ok=True)
+
+    for book, chapters in enumerate(CHAPTERS_PER_BOOK, start=1):
+        testament, number = (1, book) if book <= 39 else (2, book - 39)
+        path = os.path.join(directory, f'{testament}-{number:02d}.txt')
+
+        lines = []
+        for chapter in range(1, chapters + 1):
+            for verse in range(1, synthetic_verse_count(book, chapter) + 1):
+                heading = '<소제목> ' if verse == 1 else ''
+                lines.append(f'창{chapter}:{verse} {heading}{SAMPLE_TEXT}\n')
+
+        with open(path, 'w', encoding=HRV_ENCODING) as f:
+            f.writelines(lines)
+
+    return directory
+
+
+def legacy_parse_bible_file(file_path):
+    """예전 구현 (비교용으로 그대로 옮김)"""
+    verses = []
+
+    with open(file_path, 'r', encoding='euc-kr') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            match = re.match(r'^[가-힣]+(\d+):(\d+)\s+(<[^>]+>)?\s*(.+)', line)
+            if match:
+                verses.append({
+                    'chapter': int(match.group(1)),
+                    'verse': int(match.group(2)),
+                    'text': match.group(4).strip()
+                })
+
+    return verses
+
+
+def measure(label, fn, repeat):
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = fn()
+        timings.append(time.perf_counter() - started)
+
+    print(f"  {label:<12} best {min(timings) * 1000:8.1f} ms   "
+          f"median {statistics.median(timings) * 1000:8.1f} ms   ({count} verses)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HRV corpus parsing')
+    parser.add_argument('--dir', default=HRV_DIR, help='HRV 텍스트 폴더 (없으면 가짜 코퍼스 사용)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.dir
+        if not list_corpus_files(directory):
+            directory = write_synthetic_corpus(os.path.join(tmp, 'HRV'))
+            print(f"{args.dir} not found, using synthetic corpus")
+
+        files = list_corpus_files(directory)
+        size = sum(os.path.getsize(path) for path in files)
+        print(f"Corpus: {len(files)} files, {size / 1024 / 1024:.1f} MB\n")
+
+        measure('legacy', lambda: sum(len(legacy_parse_bible_file(p)) for p in files), args.repeat)
+        measure('current', lambda: sum(len(v) for _, _, v in parse_corpus(directory)), args.repeat)
+
+if __name__ == '__main__':
+    main()
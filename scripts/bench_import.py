@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임포트 파이프라인 end-to-end 벤치마크
+
+실제 임포트 스크립트를 그대로 (하위 프로세스로) 실행하되, 외부 의존성은 로컬 스텁으로 바꿈:
+    - HRV(ver.4)     → bench_hrv_parser 의 가짜 66권 코퍼스
+    - bolls.life     → bolls_stub_server (지연/지터, 429 제한 / 503 / 지연 폭증 설정 가능)
+    - Supabase REST  → postgrest_stub_server (인메모리 PostgREST)
+
+scripts/ 를 임시 작업 폴더로 복사하고 그 폴더에 .env.local 을 만들어서 실행하므로
+저장소의 .env.local / .cache 는 건드리지 않음.
+
+단계별로 측정:
+    wall 시간, 쓴 행 수와 rows/s, 스크립트 최대 RSS (metrics 의 peak_rss_bytes, 번역본당 값도),
+    스텁 서버가 받은 요청 수와 p50/p99 처리 시간(엔드포인트별),
+    스크립트 쪽 계측(--metrics-out, metrics.py)의 단계별 시간
+
+결과는 JSON 으로 저장 (기본 .cache/bench/import-YYYYmmdd-HHMMSS.json).
+--baseline 으로 예전 결과를 주면 단계별 wall 시간을 비교하고, --threshold 보다 느려지면 exit 1.
+
+사용 예:
+    python3 scripts/bench_import.py
+    python3 scripts/bench_import.py --stages hrv,hrv-delta
+    python3 scripts/bench_import.py --stages hrv,niv,multi        # 번역본 1개 vs 3개 동시 (wall 시간, 최대 RSS)
+    python3 scripts/bench_import.py --stages hrv,niv,niv-dump     # 장 요청 1,189번 vs 덤프 파일 하나
+    python3 scripts/bench_import.py --stages hrv,niv,related,related-incremental   # 관련 구절 전체 → 증분
+    python3 scripts/bench_import.py --stages hrv,suggest,suggest-incremental       # 자동 완성 사전 전체 → 증분
+    python3 scripts/bench_import.py --stages niv --bolls-latency 0.08 --rate 50 --concurrency 8
+    python3 scripts/bench_import.py --stages hrv,niv --bolls-limit 150 --bolls-spike-every 5 \
+        --bolls-spike-seconds 1 --bolls-spike-latency 0.5       # 업스트림 제한에 맞춰 속도 조절
+    python3 scripts/bench_import.py --baseline .cache/bench/import-20260117-101500.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_hrv_parser import write_synthetic_corpus
+from bolls_stub_server import (RequestLog, add_throttle_arguments, start_stub_server, throttle_from_args,
+                               write_synthetic_dump)
+from hrv_parser import HRV_DIR
+from postgrest_stub_server import FakeDatabase, start_postgrest_stub
+
+SCRIPTS_DIR = Path(__file__).parent
+REPO_DIR = SCRIPTS_DIR.parent
+DEFAULT_RESULTS_DIR = REPO_DIR / '.cache' / 'bench'
+
+# PostgREST 스텁은 키 형식만 확인하므로 아무 JWT 모양 문자열이면 됨
+FAKE_SERVICE_ROLE_KEY = 'bench.service.role'
+
+# 작업 폴더 안 가짜 bolls.life 번역본 덤프 (niv-dump 단계)
+DUMP_PATH = Path('dumps') / 'NIV2011.zip'
+
+
+def bolls_args(args, urls):
+    """bolls.life 소스를 쓰는 단계의 공통 인자"""
+    extra = ['--no-cache', '--base-url', urls['bolls'], '--concurrency', str(args.concurrency), '--rate', str(args.rate)]
+    if args.max_rate:
+        extra += ['--max-rate', str(args.max_rate)]
+    if args.fixed_rate:
+        extra.append('--fixed-rate')
+    return extra
+
+
+# 단계 이름 → (스크립트, 추가 인자를 만드는 함수)
+STAGES = {
+    # 임포트 단계는 자동 완성 사전 갱신 없이 측정 (suggest 단계에서 따로)
+    'hrv': ('import_normalized_hrv.py', lambda args, urls: ['--restart', '--skip-suggest']),
+    'niv': ('import_normalized_niv.py', lambda args, urls: ['--restart', '--skip-suggest', *bolls_args(args, urls)]),
+    # 바뀐 게 없는 재임포트: 해시만 비교하고 아무 것도 쓰지 않아야 함
+    'hrv-delta': ('import_normalized_hrv.py', lambda args, urls: ['--delta']),
+    'niv-delta': ('import_normalized_niv.py', lambda args, urls: ['--delta', *bolls_args(args, urls)]),
+    # 번역본 덤프 하나(.zip)로 NIV: 장 요청 없이 로컬 파싱만 (niv 단계와 비교)
+    'niv-dump': ('import_normalized_niv.py', lambda args, urls: ['--restart', '--skip-suggest', '--dump', str(DUMP_PATH)]),
+    # bolls.life 번역본 세 개를 한 번에 (동시 임포트). 스텁 두 개와 임포터가 같은 머신의 CPU 를 나눠 쓰므로
+    # 코어가 적으면 CPU 가 한계라서 niv 단계의 약 3배가 나옴 (코어 1개: niv 15.5s, multi 38.7s).
+    # 겹침이 보이려면 코어가 여럿이어야 함. 요청 속도 상한(--max-rate)은 세 번역본이 같이 씀
+    'multi': ('import_engine.py', lambda args, urls: [
+        '--translation', 'NIV', '--translation', 'korRV', '--translation', 'korNRSV',
+        '--restart', '--skip-suggest', *bolls_args(args, urls),
+    ]),
+    'search-index': ('build_search_index.py', lambda args, urls: []),
+    # 장 스냅샷: 전체 빌드 다음 증분 빌드 (바뀐 장이 없으면 해시 RPC 만 부르고 아무 것도 쓰지 않아야 함)
+    'snapshots': ('build_chapter_snapshots.py', lambda args, urls: ['--full']),
+    'snapshots-incremental': ('build_chapter_snapshots.py', lambda args, urls: []),
+    # 관련 구절: 전체 계산 다음 증분 (바뀐 장이 없으면 아무 것도 쓰지 않아야 함)
+    'related': ('build_related_verses.py', lambda args, urls: ['--full']),
+    'related-incremental': ('build_related_verses.py', lambda args, urls: []),
+    # 자동 완성 사전: 전체 빌드 다음 증분 (바뀐 장이 없으면 해시 RPC 만 부르고 쓰지 않아야 함)
+    'suggest': ('build_suggest_index.py', lambda args, urls: ['--full']),
+    'suggest-incremental': ('build_suggest_index.py', lambda args, urls: []),
+    # 코퍼스 점검: 임포트가 끝난 뒤 빠진 장 / 일부만 있는 장이 없어야 함 (exit 0)
+    'audit': ('audit_corpus.py', lambda args, urls: []),
+}
+
+
+def prepare_workspace(workdir, rest_url):
+    """scripts/ 복사 + .env.local + 가짜 HRV 코퍼스 + 가짜 NIV 덤프"""
+    shutil.copytree(SCRIPTS_DIR, workdir / 'scripts', ignore=shutil.ignore_patterns('__pycache__'))
+    (workdir / '.env.local').write_text(
+        f"NEXT_PUBLIC_SUPABASE_URL={rest_url}\n"
+        f"SUPABASE_SERVICE_ROLE_KEY={FAKE_SERVICE_ROLE_KEY}\n",
+        encoding='utf-8',
+    )
+    write_synthetic_corpus(workdir / HRV_DIR)
+    write_synthetic_dump(workdir / DUMP_PATH, 'NIV2011')
+
+
+def run_stage(name, workdir, extra_args, db, logs, log_path):
+    """
+    임포트 스크립트 하나를 실행하고 측정
+
+    Returns:
+        dict: 단계 결과 (JSON 직렬화 가능)
+    """
+    script, _ = STAGES[name]
+    for log in logs.values():
+        log.reset()
+    before = {table: db.count(table) for table in db.tables}
+
+    metrics_path = workdir / f'{name}.metrics.json'
+    command = [sys.executable, str(workdir / 'scripts' / script), *extra_args, '--metrics-out', str(metrics_path)]
+    print(f"[{name}] {' '.join(command[1:])}", flush=True)
+
+    started = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as out:
+        exit_code = subprocess.call(command, cwd=workdir, stdout=out, stderr=subprocess.STDOUT,
+                                    env={**os.environ, 'PYTHONUNBUFFERED': '1'})
+    wall = time.perf_counter() - started
+
+    http = {}
+    for source, log in logs.items():
+        for label, summary in log.summary().items():
+            http[f'{source}: {label}'] = summary
+    rows_written = sum(s['rows'] for label, s in http.items() if label.startswith(('rest: POST', 'rest: PATCH')))
+
+    # 스크립트 쪽 계측 (metrics.py): 단계별 시간, 재시도, 바이트
+    script_metrics = None
+    if metrics_path.exists():
+        script_metrics = json.loads(metrics_path.read_text(encoding='utf-8'))
+    # 최대 RSS 는 스크립트가 직접 잰 값 (bench 프로세스의 RSS 는 fork/exec 로 ru_maxrss 에 섞여 들어가므로)
+    peak_rss_mb = next((g['value'] / 1024 / 1024 for g in (script_metrics or {}).get('gauges', [])
+                        if g['name'] == 'peak_rss_bytes'), 0.0)
+    translations = max(1, extra_args.count('--translation'))
+
+    return {
+        'name': name,
+        'script': script,
+        'args': extra_args,
+        'exit_code': exit_code,
+        'wall_seconds': round(wall, 3),
+        'peak_rss_mb': round(peak_rss_mb, 1),
+        'translations': translations,
+        'peak_rss_mb_per_translation': round(peak_rss_mb / translations, 1),
+        'rows_written': rows_written,
+        'rows_per_second': round(rows_written / wall, 1) if wall else 0.0,
+        'table_rows': {table: db.count(table) - before[table] for table in db.tables
+                       if db.count(table) != before[table]},
+        'http_requests': sum(s['count'] for s in http.values()),
+        'http': http,
+        'script_metrics': script_metrics,
+        'log': str(log_path),
+    }
+
+
+def print_stage(stage):
+    status = 'OK' if stage['exit_code'] == 0 else f"FAILED (exit {stage['exit_code']}, see {stage['log']})"
+    print(f"  {stage['wall_seconds']:8.2f}s  {stage['rows_written']:>8} rows  "
+          f"{stage['rows_per_second']:>10,.0f} rows/s  {stage['http_requests']:>6} requests  {status}")
+    print(f"    peak RSS {stage['peak_rss_mb']:.1f} MB ({stage['translations']} translation(s), "
+          f"{stage['peak_rss_mb_per_translation']:.1f} MB each)")
+    for label, s in stage['http'].items():
+        print(f"    {label:<32} {s['count']:>6} req  p50 {s['p50_ms']:8.2f} ms  p99 {s['p99_ms']:8.2f} ms  "
+              f"{(s['bytes_in'] + s['bytes_out']) / 1024:9.0f} KB  {s['errors']} errors")
+    for h in (stage['script_metrics'] or {}).get('histograms', []):
+        if h['name'] == 'stage_seconds':
+            label = ' '.join(f'{k}={v}' for k, v in h['labels'].items())
+            print(f"    {label:<32} {h['sum']:8.2f}s total  {h['count']:>6} x  p50 {h['p50'] * 1000:8.2f} ms  "
+                  f"p99 {h['p99'] * 1000:8.2f} ms")
+    metrics = stage['script_metrics'] or {}
+    for c in metrics.get('counters', []):
+        if c['name'] in ('rate_changes_total', 'throttled_total'):
+            label = ' '.join(f'{k}={v}' for k, v in c['labels'].items())
+            print(f"    {c['name']} {label}: {c['value']}")
+    for g in metrics.get('gauges', []):
+        if g['name'] == 'peak_rss_bytes':
+            continue
+        label = ' '.join(f'{k}={v}' for k, v in g['labels'].items())
+        print(f"    {g['name']} {label}: {g['value']}")
+
+
+def compare(result, baseline_path, threshold):
+    """단계별 wall 시간을 baseline 과 비교. 느려진 단계 이름 목록 반환"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {stage['name']: stage for stage in json.load(f)['stages']}
+
+    print(f"\nCompared to {baseline_path}:")
+    regressions = []
+    for stage in result['stages']:
+        old = baseline.get(stage['name'])
+        if not old or not old['wall_seconds']:
+            continue
+        change = stage['wall_seconds'] / old['wall_seconds'] - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(stage['name'])
+            flag = '  <-- regression'
+        print(f"  {stage['name']:<14} {old['wall_seconds']:8.2f}s -> {stage['wall_seconds']:8.2f}s "
+              f"({change:+.1%}){flag}")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end import benchmark against local stubs')
+    parser.add_argument('--stages', default='hrv,niv,hrv-delta,niv-delta,search-index',
+                        help=f"실행할 단계 (쉼표 구분, 순서대로): {', '.join(STAGES)}")
+    parser.add_argument('--bolls-latency', type=float, default=0.05, help='bolls.life 스텁 응답 지연 (초)')
+    parser.add_argument('--bolls-jitter', type=float, default=0.02, help='bolls.life 스텁 추가 무작위 지연 (초)')
+    parser.add_argument('--db-latency', type=float, default=0.005, help='PostgREST 스텁 요청당 지연 (초)')
+    add_throttle_arguments(parser, prefix='bolls-')
+    parser.add_argument('--concurrency', type=int, default=8, help='NIV 단계 시작 동시 요청 수')
+    parser.add_argument('--rate', type=float, default=100.0, help='NIV 단계 시작 초당 요청 수')
+    parser.add_argument('--max-rate', type=float, default=None, help='NIV 단계 초당 요청 수 상한 (기본: --rate x 4)')
+    parser.add_argument('--fixed-rate', action='store_true', help='NIV 단계 속도 조절 끔')
+    parser.add_argument('--out', default=None, help='결과 JSON 경로 (기본: .cache/bench/import-<시각>.json)')
+    parser.add_argument('--baseline', default=None, help='비교할 예전 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=0.2, help='회귀로 볼 wall 시간 증가율 (기본 0.2 = 20%%)')
+    parser.add_argument('--keep', action='store_true', help='임시 작업 폴더를 지우지 않음 (로그 확인용)')
+    args = parser.parse_args()
+
+    stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage: {', '.join(unknown)}")
+
+    logs = {'bolls': RequestLog(), 'rest': RequestLog()}
+    db = FakeDatabase()
+    bolls_server, bolls_url = start_stub_server(latency=args.bolls_latency, jitter=args.bolls_jitter,
+                                                log=logs['bolls'], throttle=throttle_from_args(args, 'bolls-'))
+    rest_server, rest_url = start_postgrest_stub(db=db, latency=args.db_latency, log=logs['rest'])
+    urls = {'bolls': bolls_url, 'rest': rest_url}
+
+    workdir = Path(tempfile.mkdtemp(prefix='bench-import-'))
+    started_at = datetime.now()
+    try:
+        prepare_workspace(workdir, rest_url)
+        print(f"Workspace: {workdir}\n", flush=True)
+
+        result = {
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': sys.version.split()[0],
+            'params': {k: v for k, v in vars(args).items() if k not in ('out', 'baseline', 'keep')},
+            'stages': [],
+        }
+        for name in stages:
+            stage = run_stage(name, workdir, STAGES[name][1](args, urls), db, logs,
+                              workdir / f'{name}.log')
+            print_stage(stage)
+            result['stages'].append(stage)
+        result['total_wall_seconds'] = round(sum(s['wall_seconds'] for s in result['stages']), 3)
+    finally:
+        bolls_server.shutdown()
+        rest_server.shutdown()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    out_path = Path(args.out) if args.out else DEFAULT_RESULTS_DIR / f"import-{started_at:%Y%m%d-%H%M%S}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(result, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    print(f"\nTotal {result['total_wall_seconds']:.2f}s -> {out_path}")
+
+    failed = [s['name'] for s in result['stages'] if s['exit_code'] != 0]
+    if failed and not args.keep:
+        print(f"Failed stages: {', '.join(failed)} (rerun with --keep to inspect the logs)")
+    regressions = compare(result, args.baseline, args.threshold) if args.baseline else []
+    if failed or regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
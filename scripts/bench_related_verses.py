@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+관련 구절 계산 벤치마크 (build_related_verses.build_related, DB 없이)
+
+성경 한 권 크기(66권, 31,102 구절)의 가짜 번역본을 만들어서 측정:
+    full         전체 계산 시간 (벡터화 + 블록 top-k), 최대 RSS
+    incremental  장 하나의 본문을 바꾼 뒤 증분 계산 시간, 다시 계산한 구절 수
+    agreement    증분 결과가 같은 본문의 전체 계산 결과와 이웃 목록이 같은 구절 비율
+                 (다르면 idf 가 조금 바뀐 탓, --full 로 다시 만들면 같아짐)
+
+본문은 단어 빈도가 Zipf 분포인 가짜 문장 (스텁 서버 본문은 구절마다 거의 같아서 유사도 측정에 맞지 않음).
+
+사용 예:
+    python3 scripts/bench_related_verses.py
+    python3 scripts/bench_related_verses.py --language en --top-k 20
+"""
+
+import argparse
+import random
+import resource
+import time
+
+import numpy as np
+
+from bolls_stub_server import CHAPTERS_PER_BOOK, synthetic_verse_count
+from build_related_verses import DEFAULT_MAX_DF, DEFAULT_MIN_SCORE, DEFAULT_TOP_K, build_related
+
+KOREAN_SYLLABLES = '가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호구누두루무부수우주추'
+KOREAN_PARTICLES = ['', '이', '가', '을', '를', '의', '에', '에서', '께서', '으로', '하시니라', '하고', '이라']
+ENGLISH_LETTERS = 'abcdefghiklmnoprstuwy'
+VOCABULARY_SIZE = 12000
+
+
+def vocabulary(rng, language):
+    """Zipf 순위 순의 단어 목록"""
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        if language == 'ko':
+            words.add(''.join(rng.choice(KOREAN_SYLLABLES) for _ in range(rng.randint(1, 3))))
+        else:
+            words.add(''.join(rng.choice(ENGLISH_LETTERS) for _ in range(rng.randint(2, 8))))
+    return sorted(words)
+
+
+def synthetic_corpus(language, seed=0):
+    """(verse_ids, chapter_keys, texts) - 구절 길이 8~30 단어, 단어 빈도 1/순위"""
+    rng = random.Random(seed)
+    words = vocabulary(rng, language)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    verse_ids, chapter_keys, texts = [], [], []
+    for book, chapters in enumerate(CHAPTERS_PER_BOOK, start=1):
+        for chapter in range(1, chapters + 1):
+            for verse in range(1, synthetic_verse_count(book, chapter) + 1):
+                chosen = rng.choices(words, weights, k=rng.randint(8, 30))
+                if language == 'ko':
+                    chosen = [word + rng.choice(KOREAN_PARTICLES) for word in chosen]
+                verse_ids.append(len(verse_ids) + 1)
+                chapter_keys.append(f'{book}:{chapter}')
+                texts.append(' '.join(chosen))
+    return verse_ids, chapter_keys, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the related-verses TF-IDF top-k build')
+    parser.add_argument('--language', choices=['ko', 'en'], action='append', help='가짜 본문 언어 (기본: 둘 다)')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K)
+    parser.add_argument('--max-df', type=float, default=DEFAULT_MAX_DF)
+    parser.add_argument('--same-chapter', action='store_true', help='같은 장의 구절도 이웃으로')
+    args = parser.parse_args()
+    params = {'top_k': args.top_k, 'min_score': DEFAULT_MIN_SCORE, 'max_df': args.max_df,
+              'same_chapter': args.same_chapter}
+
+    for language in args.language or ['ko', 'en']:
+        verse_ids, chapter_keys, texts = synthetic_corpus(language)
+        print(f"\n[{language}] {len(verse_ids)} synthetic verses, top-k {args.top_k}", flush=True)
+
+        started = time.perf_counter()
+        state, _ = build_related(verse_ids, chapter_keys, texts, params)
+        full_seconds = time.perf_counter() - started
+
+        # 장 하나(창세기 1장)의 본문을 다른 장 본문으로 바꿈
+        changed = [i for i, key in enumerate(chapter_keys) if key == '1:1']
+        edited = list(texts)
+        for i in changed:
+            edited[i] = texts[-1 - i]
+        started = time.perf_counter()
+        incremental, updated = build_related(verse_ids, chapter_keys, edited, params, previous=state)
+        incremental_seconds = time.perf_counter() - started
+
+        fresh, _ = build_related(verse_ids, chapter_keys, edited, params)
+        same = np.mean([set(a) == set(b) for a, b in zip(incremental['neighbors'].tolist(), fresh['neighbors'].tolist())])
+
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"  full         {full_seconds:6.1f}s  ({np.count_nonzero(state['neighbors'])} pairs)")
+        print(f"  incremental  {incremental_seconds:6.1f}s  ({len(changed)} verses edited, {len(updated)} recomputed)")
+        print(f"  agreement    {same * 100:6.2f}% of verses have the same neighbours as a full rebuild")
+        print(f"  peak RSS     {peak_mb:6.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오프라인 번들 검색 벤치마크: FTS5 trigram (sqlite_bundle.search) vs ilike '%q%' 스캔
+
+ilike 는 예전 검색 API 가 쓰던 방식 (verse_translations.text ilike '%q%', 인덱스 없이 전체를 훑음).
+Postgres 없이 같은 번들에서 같은 부분 문자열 조건을 LIKE 로 훑어서 비교하므로
+차이는 "구절을 찾는 방법" 하나뿐 (본문 / 책 조인은 같은 쿼리).
+
+측정 항목:
+    build   - 가짜 번역본 두 개(한글 / 영문)로 번들 빌드 시간과 파일 크기 (--bundle 이 없을 때)
+    쿼리별  - FTS5 와 LIKE 각각 best / median (ms), 결과 수, 전체 결과가 같은지
+
+--bundle 을 주면 그 번들(import_engine.py --sink sqlite 로 만든 실제 본문)의 번역본으로 측정.
+없으면 단어 빈도가 고르지 않은 가짜 본문(흔한 단어 / 드문 단어 / 없는 단어)으로 번들을 만들어서 측정.
+
+사용 예:
+    python3 scripts/bench_sqlite_bundle.py
+    python3 scripts/bench_sqlite_bundle.py --bundle .cache/bundle/bible.sqlite --repeat 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from bolls_stub_server import CHAPTERS_PER_BOOK, synthetic_verse_count
+from sqlite_bundle import SqliteBundle, open_bundle, search, search_needle, translation_id
+from text_normalize import search_folds
+
+# 번역본별 검색어: 흔한 말 / 구절 / 드문 말 / 없는 말 (한글 2글자 '사랑' 은 trigram 으로 못 찾아서 훑는 경로)
+QUERIES = {
+    'korHRV': ['하나님', '여호와께서 이르시되', '사랑', '므두셀라', '빛이 있으라', '없는말입니다'],
+    'NIV': ['the lord', 'kingdom of heaven', 'love', 'methuselah', 'let there be light', 'xylophone'],
+}
+
+# 가짜 본문 단어 (앞쪽일수록 자주 나옴)
+SYNTHETIC_WORDS = {
+    'korHRV': ['그', '하나님이', '여호와께서', '이르시되', '백성', '사랑', '땅에', '빛이', '있으라',
+               '예수', '그리스도'],
+    'NIV': ['the', 'and', 'lord', 'of', 'said', 'kingdom', 'heaven', 'love', 'let', 'there', 'be', 'light'],
+}
+# 드문 단어 (구절 2,000개에 하나 꼴)
+SYNTHETIC_RARE = {'korHRV': '므두셀라', 'NIV': 'methuselah'}
+SYNTHETIC_SYLLABLES = '가나다라마바사아자차카타파하거너더러머버서어저처'
+SYNTHETIC_LETTERS = 'abcdefghiklmnoprstuw'
+
+
+def synthetic_text(rng, translation):
+    """단어 빈도가 Zipf 비슷한 가짜 구절 하나 (사이사이 무작위 단어로 trigram 종류를 늘림)"""
+    words = SYNTHETIC_WORDS[translation]
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    alphabet = SYNTHETIC_SYLLABLES if translation == 'korHRV' else SYNTHETIC_LETTERS
+    out = []
+    for _ in range(rng.randint(8, 20)):
+        if rng.random() < 0.5:
+            out.append(rng.choices(words, weights)[0])
+        else:
+            out.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(2, 6))))
+    if rng.random() < 1 / 2000:
+        out.insert(rng.randrange(len(out)), SYNTHETIC_RARE[translation])
+    return ' '.join(out)
+
+
+def build_synthetic_bundle(path):
+    """가짜 korHRV / NIV 로 번들 빌드 → 빌드 시간 (초)"""
+    rng = random.Random(0)
+    started = time.perf_counter()
+    bundle = SqliteBundle(path)
+    bundle.begin()
+    ids = bundle.translation_ids()
+    for translation in QUERIES:
+        bundle.start_translation(ids[translation])
+    for book, chapters in enumerate(CHAPTERS_PER_BOOK, start=1):
+        for chapter in range(1, chapters + 1):
+            count = synthetic_verse_count(book, chapter)
+            verses = [(book << 20 | chapter << 10 | verse, book, chapter, verse) for verse in range(1, count + 1)]
+            for translation in QUERIES:
+                texts = [synthetic_text(rng, translation) for _ in range(count)]
+                rows = [(verse_id, text, folded)
+                        for (verse_id, *_), text, folded in zip(verses, texts, search_folds(texts))]
+                bundle.load_rows(ids[translation], verses, rows, [])
+    bundle.finish()
+    return time.perf_counter() - started
+
+
+def like_search(conn, translation_id, query, limit):
+    """ilike '%q%' 와 같은 스캔 (search 와 같은 조인, 구절 찾는 부분만 LIKE)"""
+    needle = search_needle(query)
+    pattern = '%' + needle.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    return conn.execute(
+        'SELECT vt.verse_id, b.abbr_eng, v.chapter, v.verse, vt.text FROM ('
+        "  SELECT verse_id FROM verse_translations WHERE translation_id = ? AND search_text LIKE ? ESCAPE '\\' "
+        '  ORDER BY verse_id LIMIT ?) h '
+        'JOIN verse_translations vt ON vt.translation_id = ? AND vt.verse_id = h.verse_id '
+        'JOIN verses v ON v.id = vt.verse_id '
+        'JOIN books b ON b.id = v.book_id '
+        'ORDER BY vt.verse_id',
+        (translation_id, pattern, limit, translation_id)).fetchall()
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return result, min(timings) * 1000, statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FTS5 bundle search against an ilike-style scan')
+    parser.add_argument('--bundle', default=None, help='측정할 번들 (없으면 가짜 번들을 만들어서)')
+    parser.add_argument('--translation', action='append', choices=sorted(QUERIES),
+                        help='측정할 번역본 (여러 번 지정 가능, 기본: 전부)')
+    parser.add_argument('--limit', type=int, default=50, help='검색 결과 수 (검색 API 와 같은 50)')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.bundle
+        if path is None:
+            path = os.path.join(tmp, 'bench.sqlite')
+            seconds = build_synthetic_bundle(path)
+            print(f"Built synthetic bundle in {seconds:.1f}s ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+        conn = open_bundle(path)
+        for translation in args.translation or list(QUERIES):
+            tid = translation_id(conn, translation)
+            print(f"\n[{translation}] limit {args.limit}, best / median of {args.repeat}")
+            print(f"  {'query':<22} {'hits':>6}  {'fts5 ms':>15}  {'like ms':>15}  {'speedup':>7}")
+            for query in QUERIES[translation]:
+                # 결과가 같은지는 limit 없이 전체로 확인
+                matches = search(conn, tid, query, -1)
+                if matches != like_search(conn, tid, query, -1):
+                    raise AssertionError(f'{translation} {query!r}: FTS5 and LIKE results differ')
+                _, fts_best, fts_median = timed(lambda: search(conn, tid, query, args.limit), args.repeat)
+                _, like_best, like_median = timed(lambda: like_search(conn, tid, query, args.limit), args.repeat)
+                print(f"  {query:<22} {len(matches):>6}  {fts_best:6.2f} / {fts_median:6.2f}  "
+                      f"{like_best:6.2f} / {like_median:6.2f}  {like_median / fts_median:6.1f}x")
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
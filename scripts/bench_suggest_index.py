@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+자동 완성 사전 벤치마크 (build_suggest_index, DB 없이)
+
+성경 한 권 크기의 가짜 번역본(bench_related_verses.synthetic_corpus, 단어 빈도 Zipf)으로 측정:
+    build        장별 용어 수 세기 + 컴파일 시간, 용어 수, 컴파일한 크기 (search_suggest_dicts 한 행)
+    incremental  장 하나의 본문을 바꾼 뒤 그 장만 다시 세고 컴파일하는 시간
+    lookup       무작위 접두어(1~3글자, 한글은 끝이 자음 하나인 입력 중 접두어 포함)의 조회 시간 p50 / p99 / max
+                 (서버는 lib/suggest.ts 로 같은 이진 탐색 + 구간 훑기, V8 에서는 이보다 빠름)
+
+사용 예:
+    python3 scripts/bench_suggest_index.py
+    python3 scripts/bench_suggest_index.py --language ko --lookups 20000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from bench_related_verses import synthetic_corpus
+from build_suggest_index import CHOSEONG, HANGUL_BASE, SYLLABLES_PER_INITIAL, SuggestDictionary, chapter_words
+
+
+def sample_prefixes(rng, dictionary, count):
+    """사전 용어에서 뽑은 접두어 (한글 접두어의 절반은 다음 음절의 초성 자음을 붙인 입력 중 형태)"""
+    prefixes = []
+    for _ in range(count):
+        term = rng.choice(dictionary.terms)
+        size = rng.randint(1, min(3, len(term)))
+        prefix = term[:size]
+        if '가' <= term[0] <= '힣' and size < len(term) and rng.random() < 0.5:
+            prefix += CHOSEONG[(ord(term[size]) - HANGUL_BASE) // SYLLABLES_PER_INITIAL]
+        prefixes.append(prefix)
+    return prefixes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the search autocomplete dictionary')
+    parser.add_argument('--language', choices=['ko', 'en'], action='append', help='가짜 본문 언어 (기본: 둘 다)')
+    parser.add_argument('--lookups', type=int, default=5000, help='측정할 조회 수')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for language in args.language or ['ko', 'en']:
+        verse_ids, chapter_keys, texts = synthetic_corpus(language)
+        chapters = {}
+        for key, text in zip(chapter_keys, texts):
+            chapters.setdefault(key, []).append(text)
+        print(f"\n[{language}] {len(texts)} synthetic verses in {len(chapters)} chapters", flush=True)
+
+        started = time.perf_counter()
+        words = {key: chapter_words(chapter_texts) for key, chapter_texts in chapters.items()}
+        dictionary = SuggestDictionary.compile(words.values())
+        build_seconds = time.perf_counter() - started
+        row_bytes = len(json.dumps(dictionary.row(1), ensure_ascii=False).encode('utf-8'))
+
+        started = time.perf_counter()
+        words['1:1'] = chapter_words(chapters['1:2'])
+        SuggestDictionary.compile(words.values())
+        incremental_seconds = time.perf_counter() - started
+
+        prefixes = sample_prefixes(rng, dictionary, args.lookups)
+        timings = []
+        for prefix in prefixes:
+            started = time.perf_counter()
+            dictionary.lookup(prefix)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+
+        print(f"  build        {build_seconds:7.2f}s  ({len(dictionary.terms)} terms, {row_bytes / 1024:,.0f} KB as JSON)")
+        print(f"  incremental  {incremental_seconds:7.2f}s  (1 chapter recounted + compile)")
+        print(f"  lookup       p50 {statistics.median(timings) * 1e6:6.0f} us  "
+              f"p99 {timings[int(len(timings) * 0.99)] * 1e6:6.0f} us  max {timings[-1] * 1e6:6.0f} us "
+              f"({len(prefixes)} prefixes)")
+        for prefix in prefixes[:3]:
+            listed = ', '.join(f'{term}({count})' for term, count in dictionary.lookup(prefix)[:5])
+            print(f"    {prefix!r} -> {listed}")
+
+
+if __name__ == '__main__':
+    main()
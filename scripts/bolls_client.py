@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bolls.life API 비동기 장(chapter) 수집 엔진
+
+- httpx.AsyncClient 하나로 keep-alive 커넥션 풀을 공유
+- 동시 요청 수 / 초당 요청 수는 AIMD 로 조절 (rate_controller: 에러 없이 빠르면 올리고,
+  429 / 5xx / 타임아웃이면 반으로, Retry-After 는 모든 워커가 지킴)
+- 응답이 도착하는 순서대로 장을 흘려보냄 (업서트 단계와 겹쳐서 실행)
+
+사용 예:
+    for book, chapter, verses in stream_chapters(units, translation='NIV2011'):
+        ...
+"""
+
+import asyncio
+import queue
+import threading
+import time
+
+import httpx
+
+from chapter_cache import CacheMiss
+from metrics import METRICS
+from rate_controller import AimdRateController, parse_retry_after
+
+BOLLS_BASE_URL = "https://bolls.life"
+CHAPTER_PATH = "/get-text/{translation}/{book}/{chapter}/"
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 10.0      # 시작 초당 요청 수 (AIMD 로 조절)
+DEFAULT_TIMEOUT = 10.0   # 초 (적응 타임아웃의 상한)
+DEFAULT_RETRIES = 3
+RETRY_STATUSES = {408, 429}   # 4xx 중에 다시 시도할 것 (나머지 4xx 는 다시 보내도 같음)
+
+
+def is_retryable(error):
+    """다시 시도할 에러인지: 타임아웃 / 연결 에러, 408 / 429, 5xx"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status in RETRY_STATUSES or status >= 500
+    return False
+
+
+async def fetch_chapter(client, translation, book, chapter, controller, retries=DEFAULT_RETRIES, cache=None):
+    """
+    한 장을 가져옴 (실패 시 지수 백오프로 재시도, Retry-After 가 더 길면 그만큼)
+
+    재시도는 is_retryable 인 에러만. 404 같은 나머지 4xx 와 JSON 이 아닌 응답은 바로 실패로 끝냄.
+
+    요청마다 controller(AimdRateController)의 동시 요청 한도 / 속도 / 타임아웃을 따르고,
+    응답(상태 코드, 지연)을 controller 에 알려서 속도를 조절하게 함.
+    cache(ChapterCache)가 주어지면 캐시에 있는 장은 요청 없이 바로 반환하고,
+    새로 받은 장은 캐시에 저장함.
+
+    Returns:
+        list: [{"pk": ..., "verse": 1, "text": "..."}, ...] 또는 실패 시 None
+    """
+    path = CHAPTER_PATH.format(translation=translation, book=book, chapter=chapter)
+
+    if cache is not None:
+        try:
+            data = cache.lookup(translation, book, chapter)
+        except CacheMiss:
+            print(f"  Not in cache (offline): {path}", flush=True)
+            return None
+        if data is not None:
+            METRICS.inc('cache_hits_total', target='bolls')
+            return data
+
+    for attempt in range(retries + 1):
+        retry_after = None
+        async with controller.slot():
+            await asyncio.sleep(controller.reserve())
+            started = time.perf_counter()
+            status = 'error'
+            try:
+                response = await client.get(path, timeout=controller.timeout())
+                status = response.status_code
+                METRICS.inc('http_bytes_total', len(response.content), target='bolls', direction='received')
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                controller.record(status, time.perf_counter() - started, retry_after)
+                response.raise_for_status()
+                if cache is not None:
+                    cache.store(translation, book, chapter, response.content)
+                return response.json()
+            except Exception as e:
+                if isinstance(e, httpx.TransportError):
+                    # 타임아웃 / 연결 에러
+                    controller.record(None, time.perf_counter() - started)
+                if attempt == retries or not is_retryable(e):
+                    print(f"  Error fetching {path}: {e}", flush=True)
+                    return None
+                METRICS.inc('retries_total', target='bolls')
+            finally:
+                METRICS.observe('http_request_seconds', time.perf_counter() - started, target='bolls', method='GET')
+                METRICS.inc('http_requests_total', target='bolls', method='GET', status=status)
+        # 슬롯을 놓고 기다림 (Retry-After 동안은 controller.reserve 도 다른 워커를 막음)
+        await asyncio.sleep(max(0.5 * (2 ** attempt), retry_after or 0.0))
+
+
+async def iter_chapters(units, translation='NIV2011', base_url=BOLLS_BASE_URL,
+                        concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                        timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, cache=None, controller=None):
+    """
+    (book, chapter) 목록을 동시에 가져와서 도착 순서대로 yield 하는 async generator
+
+    Args:
+        units: [(book_number, chapter), ...]
+        translation: bolls.life 번역 코드 (예: NIV2011)
+        base_url: API 주소 (로컬 스텁 서버 주소로 바꿔서 테스트 가능)
+        concurrency: 시작 동시 요청 수
+        rate: 시작 초당 요청 수
+        cache: ChapterCache (선택)
+        controller: AimdRateController (여러 번역본이 같이 쓸 때, 없으면 concurrency / rate 로 새로 만듦)
+
+    Yields:
+        (book_number, chapter, verses_data or None)
+    """
+    pending = asyncio.Queue()
+    for unit in units:
+        pending.put_nowait(unit)
+
+    if controller is None:
+        controller = AimdRateController(rate, concurrency, timeout=timeout)
+    # 워커 / 커넥션 풀은 한도 상한만큼, 실제 동시 요청 수는 controller.slot 이 제한
+    workers_count = controller.max_concurrency
+    results = asyncio.Queue(maxsize=workers_count * 2)
+    limits = httpx.Limits(max_connections=workers_count, max_keepalive_connections=workers_count)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+
+        async def worker():
+            while True:
+                try:
+                    book, chapter = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                data = await fetch_chapter(client, translation, book, chapter, controller, retries, cache)
+                await results.put((book, chapter, data))
+
+        workers = [asyncio.create_task(worker()) for _ in range(workers_count)]
+        done = asyncio.gather(*workers)
+
+        try:
+            while not (done.done() and results.empty()):
+                getter = asyncio.ensure_future(results.get())
+                await asyncio.wait({getter, done}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            await done
+        finally:
+            for w in workers:
+                w.cancel()
+
+
+def stream_chapters(units, max_buffered=64, **kwargs):
+    """
+    iter_chapters 를 백그라운드 스레드의 이벤트 루프에서 돌리고,
+    결과를 동기 generator 로 넘겨줌 (supabase 클라이언트는 동기 방식이므로)
+
+    max_buffered 만큼 쌓이면 수집 쪽이 기다리므로 메모리가 무한히 늘지 않음.
+    """
+    out = queue.Queue(maxsize=max_buffered)
+    sentinel = object()
+    errors = []
+
+    async def pump():
+        async for item in iter_chapters(units, **kwargs):
+            await asyncio.to_thread(out.put, item)
+
+    def run():
+        try:
+            asyncio.run(pump())
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            out.put(sentinel)
+
+    thread = threading.Thread(target=run, name='bolls-fetch', daemon=True)
+    thread.start()
+
+    while True:
+        # 소비 쪽이 다음 장을 기다린 시간 (크면 수집이 병목)
+        with METRICS.stage('fetch_wait'):
+            item = out.get()
+        if item is sentinel:
+            break
+        yield item
+
+    thread.join()
+    if errors:
+        raise errors[0]
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bolls.life API 로컬 스텁 서버
+
+실제 bolls.life 의 /get-text/{translation}/{book}/{chapter}/ 엔드포인트를 흉내냄.
+가짜 구절 데이터를 결정적으로 만들어서 돌려주므로 네트워크 없이
+bolls_client / import_normalized_niv.py 를 돌려볼 수 있음.
+latency/jitter 로 실제 API 응답 시간을 흉내낼 수 있음.
+ServerThrottle 로 업스트림 제한도 흉내냄 (rate_controller 시험용):
+    --limit        초당 limit 개를 넘는 요청은 429 + Retry-After
+    --error-rate   이 확률로 503
+    --spike-every / --spike-seconds / --spike-latency
+                   spike_every 초마다 spike_seconds 동안 응답마다 spike_latency 초 추가
+
+사용 예:
+    python3 scripts/bolls_stub_server.py --port 8765 --latency 0.08 --jitter 0.04
+    python3 scripts/bolls_stub_server.py --limit 50 --error-rate 0.01 --spike-every 10 --spike-seconds 2 --spike-latency 1
+    python3 scripts/import_normalized_niv.py --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import io
+import json
+import math
+import random
+import re
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+CHAPTER_RE = re.compile(r'^/get-text/([^/]+)/(\d+)/(\d+)/?$')
+
+# 책 순서(1-66) → 장 수 (supabase/migrations/20260116_clean_schema.sql 과 동일)
+CHAPTERS_PER_BOOK = [
+    50, 40, 27, 36, 34, 24, 21, 4, 31, 24, 22, 25, 29, 36, 10, 13, 10, 42, 150, 31,
+    12, 8, 66, 52, 5, 48, 12, 14, 3, 9, 1, 4, 7, 3, 3, 3, 2, 14, 4,
+    28, 16, 24, 21, 28, 16, 16, 13, 6, 6, 4, 4, 5, 3, 6, 4, 3, 1, 13, 5, 5, 3, 5, 1, 1, 1, 22,
+]
+
+
+def synthetic_verse_count(book, chapter):
+    """스텁용 장별 구절 수 (10-40 사이, 결정적)"""
+    return 10 + (book * 31 + chapter * 7) % 31
+
+
+def synthetic_chapter(translation, book, chapter):
+    """bolls.life 응답과 같은 모양의 가짜 장 데이터 (본문에 bolls.life 처럼 인라인 마크업이 섞여 있음)"""
+    return [
+        {
+            'pk': book * 1_000_000 + chapter * 1_000 + verse,
+            'verse': verse,
+            'text': f'{translation} {book}:{chapter}:{verse} In the <i>beginning</i><S>7225</S> was the stub.<br/>',
+        }
+        for verse in range(1, synthetic_verse_count(book, chapter) + 1)
+    ]
+
+
+def write_synthetic_dump(path, translation):
+    """
+    bolls.life 번역본 덤프와 같은 모양의 가짜 덤프 (.zip 안에 <translation>.json 배열 하나)
+
+    본문은 스텁 서버가 장마다 돌려주는 것과 같음 (덤프로 임포트한 결과 = API 로 임포트한 결과).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(f'{translation}.json', 'w') as raw, io.TextIOWrapper(raw, encoding='utf-8') as f:
+            f.write('[')
+            first = True
+            for book, chapters in enumerate(CHAPTERS_PER_BOOK, start=1):
+                for chapter in range(1, chapters + 1):
+                    for item in synthetic_chapter(translation, book, chapter):
+                        row = {'pk': item['pk'], 'translation': translation, 'book': book,
+                               'chapter': chapter, 'verse': item['verse'], 'text': item['text']}
+                        f.write(('' if first else ',\n') + json.dumps(row, ensure_ascii=False))
+                        first = False
+            f.write(']\n')
+    return path
+
+
+def percentile(sorted_values, q):
+    """정렬된 값의 q 분위수 (nearest-rank, 0 <= q <= 1)"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+class RequestLog:
+    """
+    스텁 서버가 받은 요청 기록 (스레드 안전)
+
+    label 별로 요청 수, 처리 시간, 주고받은 바이트, 쓴 행 수를 모음.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._entries = {}
+
+    def record(self, label, seconds, bytes_in=0, bytes_out=0, rows=0, status=200):
+        with self._lock:
+            entry = self._entries.setdefault(label, {
+                'latencies': [], 'errors': 0, 'bytes_in': 0, 'bytes_out': 0, 'rows': 0,
+            })
+            entry['latencies'].append(seconds)
+            entry['errors'] += status >= 400
+            entry['bytes_in'] += bytes_in
+            entry['bytes_out'] += bytes_out
+            entry['rows'] += rows
+
+    def summary(self):
+        """{label: {count, errors, p50_ms, p99_ms, max_ms, bytes_in, bytes_out, rows}}"""
+        with self._lock:
+            result = {}
+            for label, entry in sorted(self._entries.items()):
+                latencies = sorted(entry['latencies'])
+                result[label] = {
+                    'count': len(latencies),
+                    'errors': entry['errors'],
+                    'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+                    'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+                    'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+                    'bytes_in': entry['bytes_in'],
+                    'bytes_out': entry['bytes_out'],
+                    'rows': entry['rows'],
+                }
+            return result
+
+
+class ServerThrottle:
+    """
+    스텁 서버 쪽 제한 (스레드 안전)
+
+    Args:
+        limit: 초당 허용 요청 수 (1초 버스트, 0 = 제한 없음). 넘으면 429 + Retry-After
+        retry_after: 429 에 보내는 Retry-After (초)
+        error_rate: 이 확률로 503
+        spike_every / spike_seconds / spike_latency: 주기적인 지연 폭증
+    """
+
+    def __init__(self, limit=0.0, retry_after=1, error_rate=0.0, spike_every=0.0, spike_seconds=0.0,
+                 spike_latency=0.0):
+        self.limit = limit
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.spike_every = spike_every
+        self.spike_seconds = spike_seconds
+        self.spike_latency = spike_latency
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._tokens = float(limit)
+        self._updated = self.started
+
+    def extra_latency(self):
+        """지금이 지연 폭증 구간이면 추가 지연 (초)"""
+        if not self.spike_every:
+            return 0.0
+        return self.spike_latency if (time.monotonic() - self.started) % self.spike_every < self.spike_seconds else 0.0
+
+    def check(self):
+        """
+        요청 하나를 받을지
+
+        Returns:
+            (status, headers): 받으면 (None, {}), 아니면 429 / 503 과 응답 헤더
+        """
+        if self.limit:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(float(self.limit), self._tokens + (now - self._updated) * self.limit)
+                self._updated = now
+                if self._tokens < 1.0:
+                    return 429, {'Retry-After': str(self.retry_after)}
+                self._tokens -= 1.0
+        if self.error_rate and random.random() < self.error_rate:
+            return 503, {}
+        return None, {}
+
+
+class BollsStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive 커넥션 재사용 확인용
+    disable_nagle_algorithm = True  # 헤더/본문을 따로 쓸 때 delayed ACK 로 40ms 씩 멈추지 않게
+
+    latency = 0.0   # 응답마다 기다리는 시간 (초)
+    jitter = 0.0    # 0-jitter 초 사이 무작위 추가 지연
+    log = None      # RequestLog
+    throttle = None  # ServerThrottle
+
+    def do_GET(self):
+        started = time.perf_counter()
+        rejected, headers = self.throttle.check() if self.throttle is not None else (None, {})
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.throttle is not None and not rejected:
+            delay += self.throttle.extra_latency()
+        if delay:
+            time.sleep(delay)
+
+        match = CHAPTER_RE.match(self.path)
+        if rejected:
+            status, payload = rejected, {'detail': 'Too many requests' if rejected == 429 else 'Service unavailable'}
+        elif not match:
+            status, payload = 404, {'detail': 'Not found'}
+        else:
+            translation = match.group(1)
+            book = int(match.group(2))
+            chapter = int(match.group(3))
+
+            if not 1 <= book <= len(CHAPTERS_PER_BOOK) or not 1 <= chapter <= CHAPTERS_PER_BOOK[book - 1]:
+                status, payload = 200, []
+            else:
+                status, payload = 200, synthetic_chapter(translation, book, chapter)
+
+        sent = self._send(status, payload, headers)
+        if self.log is not None:
+            self.log.record('GET chapter', time.perf_counter() - started, bytes_out=sent, status=status)
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(host='127.0.0.1', port=0, latency=0.0, jitter=0.0, log=None, throttle=None):
+    """
+    백그라운드 스레드에서 스텁 서버 시작
+
+    Args:
+        latency: 응답마다 기다리는 시간 (초)
+        jitter: 0-jitter 초 사이 무작위 추가 지연
+        log: RequestLog (요청 수/지연 기록, 선택)
+        throttle: ServerThrottle (429 / 503 / 지연 폭증, 선택)
+
+    Returns:
+        (server, base_url) - 끝나면 server.shutdown() 호출
+    """
+    handler = type('Handler', (BollsStubHandler,),
+                   {'latency': latency, 'jitter': jitter, 'log': log, 'throttle': throttle})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='bolls-stub', daemon=True)
+    thread.start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def add_throttle_arguments(parser, prefix=''):
+    """ServerThrottle 인자 (prefix 는 벤치마크에서 --bolls-limit 처럼 붙일 때)"""
+    parser.add_argument(f'--{prefix}limit', type=float, default=0.0,
+                        help='초당 허용 요청 수, 넘으면 429 + Retry-After (0 = 제한 없음)')
+    parser.add_argument(f'--{prefix}retry-after', type=int, default=1, help='429 응답의 Retry-After (초)')
+    parser.add_argument(f'--{prefix}error-rate', type=float, default=0.0, help='503 을 돌려줄 확률')
+    parser.add_argument(f'--{prefix}spike-every', type=float, default=0.0, help='지연 폭증 주기 (초, 0 = 없음)')
+    parser.add_argument(f'--{prefix}spike-seconds', type=float, default=0.0, help='지연 폭증이 이어지는 시간 (초)')
+    parser.add_argument(f'--{prefix}spike-latency', type=float, default=0.0, help='지연 폭증 구간의 추가 지연 (초)')
+
+
+def throttle_from_args(args, prefix=''):
+    """add_throttle_arguments 인자 → ServerThrottle (아무 것도 켜지 않았으면 None)"""
+    prefix = prefix.replace('-', '_')
+    values = {name: getattr(args, prefix + name) for name in
+              ('limit', 'retry_after', 'error_rate', 'spike_every', 'spike_seconds', 'spike_latency')}
+    if not (values['limit'] or values['error_rate'] or values['spike_every']):
+        return None
+    return ServerThrottle(**values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='bolls.life API local stub server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='응답마다 기다리는 시간 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='0-jitter 초 사이 무작위 추가 지연')
+    add_throttle_arguments(parser)
+    args = parser.parse_args()
+
+    handler = type('Handler', (BollsStubHandler,), {'latency': args.latency, 'jitter': args.jitter,
+                                                   'throttle': throttle_from_args(args)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"bolls.life stub listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+성경 66권 매핑 (모든 임포트 스크립트 공용)
+
+HRV 파일명의 책 코드(1-01 ~ 2-27), 정경 순서(books.book_order), 영어 약어(books.abbr_eng),
+한글 이름을 한 표로 관리함. 예전에는 import_normalized_hrv.py 의 BOOK_CODE_TO_ABBR 와
+import_hrv_wide_table.py 의 BOOK_MAPPING 에 따로 있던 것.
+
+DB 없이 books / book_names / translations 행이 필요한 곳(postgrest_stub_server, sqlite_bundle)은
+seed_rows() 로 마이그레이션의 INSERT 문을 읽음.
+"""
+
+import re
+from pathlib import Path
+
+SEED_SQL = Path(__file__).parent.parent / 'supabase' / 'migrations' / '20260116_clean_schema.sql'
+
+# (HRV 책 코드, 영어 약어, 한글 이름), 정경 순서대로 (index + 1 = book_order)
+BOOKS = [
+    ('1-01', 'Gen', '창세기'),
+    ('1-02', 'Exo', '출애굽기'),
+    ('1-03', 'Lev', '레위기'),
+    ('1-04', 'Num', '민수기'),
+    ('1-05', 'Deu', '신명기'),
+    ('1-06', 'Jos', '여호수아'),
+    ('1-07', 'Jdg', '사사기'),
+    ('1-08', 'Rut', '룻기'),
+    ('1-09', '1Sa', '사무엘상'),
+    ('1-10', '2Sa', '사무엘하'),
+    ('1-11', '1Ki', '열왕기상'),
+    ('1-12', '2Ki', '열왕기하'),
+    ('1-13', '1Ch', '역대상'),
+    ('1-14', '2Ch', '역대하'),
+    ('1-15', 'Ezr', '에스라'),
+    ('1-16', 'Neh', '느헤미야'),
+    ('1-17', 'Est', '에스더'),
+    ('1-18', 'Job', '욥기'),
+    ('1-19', 'Psa', '시편'),
+    ('1-20', 'Pro', '잠언'),
+    ('1-21', 'Ecc', '전도서'),
+    ('1-22', 'Sng', '아가'),
+    ('1-23', 'Isa', '이사야'),
+    ('1-24', 'Jer', '예레미야'),
+    ('1-25', 'Lam', '예레미야애가'),
+    ('1-26', 'Eze', '에스겔'),
+    ('1-27', 'Dan', '다니엘'),
+    ('1-28', 'Hos', '호세아'),
+    ('1-29', 'Joe', '요엘'),
+    ('1-30', 'Amo', '아모스'),
+    ('1-31', 'Oba', '오바댜'),
+    ('1-32', 'Jon', '요나'),
+    ('1-33', 'Mic', '미가'),
+    ('1-34', 'Nah', '나훔'),
+    ('1-35', 'Hab', '하박국'),
+    ('1-36', 'Zep', '스바냐'),
+    ('1-37', 'Hag', '학개'),
+    ('1-38', 'Zec', '스가랴'),
+    ('1-39', 'Mal', '말라기'),
+    ('2-01', 'Mat', '마태복음'),
+    ('2-02', 'Mar', '마가복음'),
+    ('2-03', 'Luk', '누가복음'),
+    ('2-04', 'Joh', '요한복음'),
+    ('2-05', 'Act', '사도행전'),
+    ('2-06', 'Rom', '로마서'),
+    ('2-07', '1Co', '고린도전서'),
+    ('2-08', '2Co', '고린도후서'),
+    ('2-09', 'Gal', '갈라디아서'),
+    ('2-10', 'Eph', '에베소서'),
+    ('2-11', 'Phi', '빌립보서'),
+    ('2-12', 'Col', '골로새서'),
+    ('2-13', '1Th', '데살로니가전서'),
+    ('2-14', '2Th', '데살로니가후서'),
+    ('2-15', '1Ti', '디모데전서'),
+    ('2-16', '2Ti', '디모데후서'),
+    ('2-17', 'Tit', '디도서'),
+    ('2-18', 'Phm', '빌레몬서'),
+    ('2-19', 'Heb', '히브리서'),
+    ('2-20', 'Jam', '야고보서'),
+    ('2-21', '1Pe', '베드로전서'),
+    ('2-22', '2Pe', '베드로후서'),
+    ('2-23', '1Jo', '요한1서'),
+    ('2-24', '2Jo', '요한2서'),
+    ('2-25', '3Jo', '요한3서'),
+    ('2-26', 'Jud', '유다서'),
+    ('2-27', 'Rev', '요한계시록'),
+]
+
+BOOK_CODE_TO_ABBR = {code: abbr for code, abbr, _ in BOOKS}
+BOOK_CODE_TO_KOREAN = {code: name for code, _, name in BOOKS}
+BOOK_ORDER_TO_ABBR = {order: abbr for order, (_, abbr, _) in enumerate(BOOKS, start=1)}
+ABBR_TO_BOOK_ORDER = {abbr: order for order, abbr in BOOK_ORDER_TO_ABBR.items()}
+
+
+def seed_rows(sql_path=SEED_SQL):
+    """
+    20260116_clean_schema.sql 의 INSERT 문 → books / book_names / translations 행
+
+    Returns:
+        dict: {'books': [...], 'book_names': [...], 'translations': [...]}
+            (INSERT 순서 그대로, id 는 없음 = 순서대로 1부터)
+    """
+    sql = Path(sql_path).read_text(encoding='utf-8')
+    rows = {'books': [], 'book_names': [], 'translations': []}
+
+    books = re.search(r'INSERT INTO books .*?;', sql, re.S).group(0)
+    for abbr, testament, order, chapters in re.findall(r"\('([^']+)', '(OT|NT)', (\d+), (\d+)\)", books):
+        rows['books'].append({
+            'abbr_eng': abbr, 'testament': testament, 'book_order': int(order), 'chapters': int(chapters),
+        })
+
+    for names in re.findall(r'INSERT INTO book_names .*?;', sql, re.S):
+        for book_id, language, name, abbr in re.findall(r"\((\d+), '([^']+)', '([^']+)', '([^']+)'\)", names):
+            rows['book_names'].append({'book_id': int(book_id), 'language': language, 'name': name, 'abbr': abbr})
+
+    translations = re.search(r'INSERT INTO translations .*?;', sql, re.S).group(0)
+    for code, name, language, available, order in re.findall(
+        r"\('([^']+)', '([^']*)', '([^']+)', (true|false), (\d+)\)", translations
+    ):
+        rows['translations'].append({
+            'code': code, 'name': name, 'language': language,
+            'available': available == 'true', 'display_order': int(order),
+        })
+    return rows
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+장별 정적 스냅샷 생성 (임포트 후 실행)
+
+GET /api/v1/passages 는 장 하나를 보여줄 때마다 Supabase 를 세 번 차례로 조회함
+(translations → books + book_names → verses + verse_translations). 본문은 임포트 후 바뀌지 않으므로
+API 응답과 같은 JSON 을 (번역본, 책, 장)마다 미리 만들어 gzip 으로 저장해 둠.
+API 는 PASSAGE_SNAPSHOT_DIR 이 설정되어 있으면 이 파일을 DB 조회 없이 그대로 돌려주고
+(lib/snapshots.ts), 폴더째 CDN 에 올려도 됨.
+
+출력 폴더 구조:
+    meta.json                         books(이름 포함) / translations 메타데이터 (클라이언트용, 작게)
+    manifest.json                     빌드 상태: 장별 본문 해시 + 메타데이터 해시 (증분 빌드용)
+    <번역본>/<책 abbr_eng>/<장>.json.gz   passages API 응답과 같은 JSON (소제목이 있는 절은 heading 포함)
+
+증분 빌드:
+    chapter_checksums RPC(집계 쿼리 한 번)로 서버의 장별 해시를 받아 manifest 와 비교해서
+    해시가 바뀐 장 / 파일이 없는 장만 다시 만들고, 서버에서 없어진 장의 파일은 지움.
+    책 이름이나 번역본 이름이 바뀌면(메타데이터 해시) 그 번역본 전체를 다시 만듦.
+    소제목(verse_headings)은 번역본마다 한 번에 읽어서 장 해시에 섞음 (소제목만 바뀐 장도 다시 만듦).
+    바뀐 장이 적으면 그 장의 구절만 verse_id 로 골라 읽고, 많으면 번역본 전체를 한 번에 읽음.
+
+사용 예:
+    python3 scripts/build_chapter_snapshots.py                        # available=true 인 번역본 전체
+    python3 scripts/build_chapter_snapshots.py --translation NIV --out .cache/snapshots
+    python3 scripts/build_chapter_snapshots.py --full                 # 해시와 상관없이 전부 다시
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from build_common import PAGE_SIZE, add_translation_argument, load_verse_positions, read_chapters, write_atomic
+from chapter_checksum import chapter_checksum, fetch_server_checksums
+from metrics import METRICS, add_metrics_arguments, metrics_run
+from supabase_env import create_supabase, load_env
+
+DEFAULT_OUT_DIR = Path(__file__).parent.parent / '.cache' / 'snapshots'
+MANIFEST_VERSION = 1
+
+
+def load_metadata(supabase):
+    """books(+ book_names) / translations → meta.json 내용"""
+    books = supabase.table('books').select('id, abbr_eng, testament, book_order, chapters').order('book_order').execute().data
+    names = supabase.table('book_names').select('book_id, language, name, abbr').execute().data
+    translations = (supabase.table('translations')
+                    .select('id, code, name, language, available, display_order')
+                    .order('display_order').execute().data)
+
+    names_by_book = {}
+    for row in names:
+        names_by_book.setdefault(row['book_id'], {})[row['language']] = {'name': row['name'], 'abbr': row['abbr']}
+
+    return {
+        'books': [{
+            'id': book['id'],
+            'abbr': book['abbr_eng'],
+            'testament': book['testament'],
+            'order': book['book_order'],
+            'chapters': book['chapters'],
+            'names': dict(sorted(names_by_book.get(book['id'], {}).items())),
+        } for book in books],
+        'translations': [{
+            'id': t['id'],
+            'code': t['code'],
+            'name': t['name'],
+            'language': t['language'],
+            'available': t['available'],
+        } for t in translations],
+    }
+
+
+def dumps(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), sort_keys=False)
+
+
+def load_headings(supabase, translation_id, page_size=PAGE_SIZE):
+    """verse_headings 한 번역본 → {verse_id: heading} (verse_id 기준 keyset 페이지네이션)"""
+    headings = {}
+    last_id = 0
+    while True:
+        page = (supabase.table('verse_headings').select('verse_id, heading')
+                .eq('translation_id', translation_id).gt('verse_id', last_id)
+                .order('verse_id').limit(page_size).execute()).data
+        for row in page:
+            headings[row['verse_id']] = row['heading']
+        if len(page) < page_size:
+            return headings
+        last_id = page[-1]['verse_id']
+
+
+def with_headings(checksum, headings):
+    """장 본문 해시 + 그 장의 소제목 [(verse, heading), ...] → 장 해시 (소제목이 없으면 본문 해시 그대로)"""
+    if not headings:
+        return checksum
+    return hashlib.md5(dumps([checksum, sorted(headings)]).encode('utf-8')).hexdigest()
+
+
+class SnapshotBuilder:
+    """
+    출력 폴더 하나의 스냅샷 빌드 (manifest.json 을 읽고, 번역본마다 갱신해서 저장)
+
+    Args:
+        supabase: supabase Client
+        out_dir: 출력 폴더
+        full: True 면 해시와 상관없이 모든 장을 다시 만듦
+    """
+
+    def __init__(self, supabase, out_dir, full=False):
+        self.supabase = supabase
+        self.out_dir = Path(out_dir)
+        self.full = full
+        self.manifest_path = self.out_dir / 'manifest.json'
+        self.manifest = self._load_manifest()
+        self.meta = load_metadata(supabase)
+        self.books_by_order = {book['order']: book for book in self.meta['books']}
+        self.order_by_book_id = {book['id']: book['order'] for book in self.meta['books']}
+        self._positions = None
+
+    def _load_manifest(self):
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {'version': MANIFEST_VERSION, 'translations': {}}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {'version': MANIFEST_VERSION, 'translations': {}}
+        return manifest
+
+    def _save_manifest(self):
+        self.manifest['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        write_atomic(self.manifest_path, json.dumps(self.manifest, ensure_ascii=False, indent=1).encode('utf-8'))
+
+    def write_meta(self):
+        write_atomic(self.out_dir / 'meta.json', dumps(self.meta).encode('utf-8'))
+
+    def positions(self):
+        if self._positions is None:
+            self._positions = load_verse_positions(self.supabase)
+            print(f"  Loaded {len(self._positions)} verse positions", flush=True)
+        return self._positions
+
+    def meta_checksum(self, translation):
+        """장 JSON 에 들어가는 메타데이터(번역본 이름, 책 abbr / 한국어 이름)의 해시"""
+        used = [translation['name']] + [(book['abbr'], book['names'].get('ko', {}).get('name'))
+                                          for book in self.meta['books']]
+        return hashlib.md5(dumps(used).encode('utf-8')).hexdigest()
+
+    def chapter_path(self, code, book_order, chapter):
+        return self.out_dir / code / self.books_by_order[book_order]['abbr'] / f'{chapter}.json.gz'
+
+    def _chapter_headings(self, headings):
+        """{verse_id: heading} → {(book_order, chapter): [(verse, heading), ...]}"""
+        if not headings:
+            return {}
+        positions = self.positions()
+        chapters = {}
+        for verse_id, heading in headings.items():
+            if verse_id in positions:
+                book_id, chapter, verse = positions[verse_id]
+                chapters.setdefault((self.order_by_book_id.get(book_id), chapter), []).append((verse, heading))
+        return chapters
+
+    def _payload(self, translation, book_order, chapter, verses, headings=None):
+        """passages API 응답과 같은 모양 (책 이름은 UI 언어인 한국어 고정)"""
+        book = self.books_by_order[book_order]
+        return {
+            'translation': translation['code'],
+            'translation_name': translation['name'],
+            'book': book['abbr'],
+            'book_name': book['names'].get('ko', {}).get('name', book['abbr']),
+            'chapter': chapter,
+            'verses': [{'id': verse_id, 'chapter': chapter, 'verse': verse, 'text': text,
+                        **({'heading': headings[verse_id]} if verse_id in (headings or {}) else {})}
+                       for verse_id, verse, text in sorted(verses, key=lambda item: item[1])],
+        }
+
+    def build_translation(self, translation):
+        """
+        번역본 하나 증분 빌드
+
+        Returns:
+            dict: {written, unchanged, removed, bytes}
+        """
+        code = translation['code']
+        with METRICS.stage('checksum'):
+            server = fetch_server_checksums(self.supabase, translation['id'])
+            headings = load_headings(self.supabase, translation['id'])
+        chapter_headings = self._chapter_headings(headings)
+        server = {key: with_headings(checksum, chapter_headings.get(key)) for key, checksum in server.items()}
+
+        state = self.manifest['translations'].get(code, {})
+        meta_checksum = self.meta_checksum(translation)
+        previous = state.get('chapters', {}) if state.get('meta') == meta_checksum and not self.full else {}
+        server = {key: checksum for key, checksum in server.items() if key[0] in self.books_by_order}
+        changed = {key for key, checksum in server.items()
+                   if previous.get(f'{key[0]}:{key[1]}') != checksum or not self.chapter_path(code, *key).exists()}
+        removed = [key for key in state.get('chapters', {})
+                   if tuple(map(int, key.split(':'))) not in server]
+        print(f"\n[{code}] {len(server)} chapters on server, {len(changed)} to build, {len(removed)} removed",
+              flush=True)
+
+        chapters_state = {f'{o}:{c}': checksum for (o, c), checksum in server.items() if (o, c) not in changed}
+        stats = {'written': 0, 'unchanged': len(server) - len(changed), 'removed': 0, 'bytes': 0}
+
+        if changed:
+            with METRICS.stage('read_texts'):
+                chapters = read_chapters(self.supabase, translation['id'], self.positions(),
+                                         self.order_by_book_id, changed, len(server))
+            with METRICS.stage('write_snapshots'):
+                for (book_order, chapter), verses in sorted(chapters.items()):
+                    body = dumps(self._payload(translation, book_order, chapter, verses, headings)).encode('utf-8')
+                    data = gzip.compress(body, compresslevel=9, mtime=0)
+                    write_atomic(self.chapter_path(code, book_order, chapter), data)
+                    # 읽는 사이에 바뀌었으면 서버 해시가 아닌 실제로 쓴 내용의 해시를 기록 (다음 빌드에서 다시 만듦)
+                    chapters_state[f'{book_order}:{chapter}'] = with_headings(
+                        chapter_checksum([(verse, text) for _, verse, text in verses]),
+                        chapter_headings.get((book_order, chapter)))
+                    stats['written'] += 1
+                    stats['bytes'] += len(data)
+            METRICS.inc('chapters_total', stats['written'], stage='snapshot', result='written')
+
+        for key in removed:
+            book_order, chapter = map(int, key.split(':'))
+            if book_order in self.books_by_order:
+                self.chapter_path(code, book_order, chapter).unlink(missing_ok=True)
+            stats['removed'] += 1
+
+        self.manifest['translations'][code] = {'meta': meta_checksum, 'chapters': chapters_state}
+        self._save_manifest()
+        METRICS.inc('chapters_total', stats['unchanged'], stage='snapshot', result='unchanged')
+        print(f"  [{code}] {stats['written']} written ({stats['bytes'] / 1024:,.0f} KB gzip), "
+              f"{stats['unchanged']} unchanged, {stats['removed']} removed", flush=True)
+        return stats
+
+
+def run(args):
+    """main 본문 (인자 파싱 후, 계측 안에서 실행)"""
+    supabase = create_supabase(load_env())
+    builder = SnapshotBuilder(supabase, args.out, full=args.full)
+
+    translations = builder.meta['translations']
+    if args.translation:
+        missing = set(args.translation) - {t['code'] for t in translations}
+        if missing:
+            print(f"Translation not found: {', '.join(sorted(missing))}")
+            return
+        translations = [t for t in translations if t['code'] in args.translation]
+    else:
+        translations = [t for t in translations if t['available']]
+
+    builder.write_meta()
+    print(f"Snapshots -> {builder.out_dir} ({len(builder.meta['books'])} books, "
+          f"{len(builder.meta['translations'])} translations in meta.json)", flush=True)
+    for translation in translations:
+        builder.build_translation(translation)
+
+    print("\n[OK] Chapter snapshots built", flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build static gzip chapter snapshots for the passages API')
+    add_translation_argument(parser)
+    parser.add_argument('--out', default=str(DEFAULT_OUT_DIR), help=f'출력 폴더 (기본: {DEFAULT_OUT_DIR})')
+    parser.add_argument('--full', action='store_true', help='해시와 상관없이 모든 장을 다시 만듦')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    with metrics_run(args):
+        run(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+색인 / 스냅샷 빌더(build_*.py)가 같이 쓰는 것
+
+    읽기    iter_translation_texts  번역본 전체 본문 (keyset 페이지네이션)
+            load_verse_positions    verses 전체의 (book_id, chapter, verse)
+            read_chapters           고른 장의 구절만 (많으면 전체를 읽고 거름)
+    쓰기    write_atomic            임시 파일 → 이름 바꾸기
+    명령행  select_translations     --translation 으로 고른 번역본 (없으면 available=true 전체)
+            add_translation_argument / add_sink_arguments / sink_connection   --translation / --sink / --dry-run
+
+CLI 스크립트끼리 서로 import 하지 않도록 여기에 둠 (import_engine 이 build_suggest_index 를 불러도
+다른 빌더까지 딸려 오지 않음).
+"""
+
+import os
+from contextlib import contextmanager
+
+from metrics import METRICS
+from pg_copy_sink import connect
+
+PAGE_SIZE = 1000
+ID_BATCH = 300            # verse_id=in.(...) 한 번에 넣을 id 수 (URL 길이)
+FULL_SCAN_RATIO = 0.2     # 바뀐 장이 이 비율보다 많으면 번역본 전체를 읽음
+
+
+def write_atomic(path, data):
+    """임시 파일에 쓰고 이름 바꾸기 (서빙 중인 파일이 반쯤 쓰인 채로 읽히지 않도록)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def iter_translation_texts(supabase, translation_id, page_size=PAGE_SIZE):
+    """verse_translations 한 번역본을 verse_id 기준 keyset 페이지네이션으로 읽음 → (verse_id, text)"""
+    last_id = 0
+    while True:
+        page = (supabase.table('verse_translations')
+                .select('verse_id, text')
+                .eq('translation_id', translation_id)
+                .gt('verse_id', last_id)
+                .order('verse_id')
+                .limit(page_size)
+                .execute()).data
+        if not page:
+            return
+        for row in page:
+            yield row['verse_id'], row['text']
+        last_id = page[-1]['verse_id']
+        if len(page) < page_size:
+            return
+
+
+def load_verse_positions(supabase, page_size=PAGE_SIZE):
+    """verses 전체 → {verse_id: (book_id, chapter, verse)} (id 기준 keyset 페이지네이션)"""
+    positions = {}
+    last_id = 0
+    with METRICS.stage('verse_positions_load'):
+        while True:
+            page = (supabase.table('verses').select('id, book_id, chapter, verse')
+                    .gt('id', last_id).order('id').limit(page_size).execute()).data
+            for row in page:
+                positions[row['id']] = (row['book_id'], row['chapter'], row['verse'])
+            if len(page) < page_size:
+                return positions
+            last_id = page[-1]['id']
+
+
+def iter_chapter_texts(supabase, translation_id, verse_ids):
+    """고른 구절만 읽기 (verse_id=in.(...) 를 ID_BATCH 개씩) → (verse_id, text)"""
+    verse_ids = sorted(verse_ids)
+    for start in range(0, len(verse_ids), ID_BATCH):
+        batch = verse_ids[start:start + ID_BATCH]
+        page = (supabase.table('verse_translations').select('verse_id, text')
+                .eq('translation_id', translation_id).in_('verse_id', batch).execute()).data
+        for row in page:
+            yield row['verse_id'], row['text']
+
+
+def read_chapters(supabase, translation_id, positions, order_by_book_id, changed, total):
+    """
+    고른 장의 구절만 읽기 (바뀐 장이 FULL_SCAN_RATIO 보다 많으면 번역본 전체를 한 번에 읽고 거름)
+
+    Args:
+        positions: load_verse_positions 결과
+        order_by_book_id: {book_id: book_order}
+        changed: {(book_order, chapter), ...}
+        total: 번역본의 전체 장 수
+
+    Returns:
+        dict: {(book_order, chapter): [(verse_id, verse, text), ...]}
+    """
+    if len(changed) > total * FULL_SCAN_RATIO:
+        texts = iter_translation_texts(supabase, translation_id)
+    else:
+        verse_ids = [verse_id for verse_id, (book_id, chapter, _) in positions.items()
+                     if (order_by_book_id.get(book_id), chapter) in changed]
+        texts = iter_chapter_texts(supabase, translation_id, verse_ids)
+
+    chapters = {}
+    for verse_id, text in texts:
+        if verse_id not in positions:
+            continue
+        book_id, chapter, verse = positions[verse_id]
+        key = (order_by_book_id.get(book_id), chapter)
+        if key in changed:
+            chapters.setdefault(key, []).append((verse_id, verse, text))
+    return chapters
+
+
+def select_translations(supabase, codes=None):
+    """
+    빌드할 번역본 [{id, code}, ...] (display_order 순)
+
+    Args:
+        codes: --translation 값 (없으면 available=true 인 전체)
+
+    Returns:
+        list, 없는 코드가 있으면 출력하고 None
+    """
+    query = supabase.table('translations').select('id, code')
+    if codes:
+        query = query.in_('code', codes)
+    else:
+        query = query.eq('available', True)
+    translations = query.order('display_order').execute().data
+
+    missing = set(codes or []) - {t['code'] for t in translations}
+    if missing:
+        print(f"Translation not found: {', '.join(sorted(missing))}")
+        return None
+    return translations
+
+
+def add_translation_argument(parser):
+    parser.add_argument('--translation', action='append',
+                        help='번역본 코드 (여러 번 지정 가능, 없으면 available=true 인 전체)')
+
+
+def add_sink_arguments(parser, dry_run_help):
+    """--sink rest|pg 와 --dry-run (sink_connection 과 같이 씀)"""
+    parser.add_argument('--sink', choices=['rest', 'pg'], default='rest',
+                        help='쓰기 경로: rest=PostgREST, pg=Postgres 직접 연결 (SUPABASE_DB_URL 필요)')
+    parser.add_argument('--dry-run', action='store_true', help=dry_run_help)
+
+
+@contextmanager
+def sink_connection(env, args):
+    """--sink pg 면 Postgres 연결 (끝나면 닫음), 아니면 / --dry-run 이면 None"""
+    conn = connect(env=env) if args.sink == 'pg' and not args.dry_run else None
+    try:
+        yield conn
+    finally:
+        if conn is not None:
+            conn.close()
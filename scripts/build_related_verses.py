@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+번역본별 "관련 구절" 색인(verse_related) 생성 - 희소 TF-IDF 코사인 유사도 top-k
+
+구절 본문을 ngram_tokenizer 용어(한글: 음절 bigram/trigram, 영문: 단어)로 쪼개서
+TF-IDF 벡터(scipy CSR, 행마다 L2 정규화)를 만들고, 구절마다 코사인 유사도가 가장 높은 k 개를
+verse_related 에 저장함 (supabase/migrations/20260119_verse_related.sql).
+
+    가중치     tf = 1 + ln(등장 횟수), idf = ln((1 + N) / (1 + df)) + 1
+    제외 용어  한 구절에만 나오는 용어 (유사도에 기여 못 함), --max-df 보다 흔한 용어 (조사 / 관사)
+    유사도     행 BLOCK_SIZE 개씩 희소 곱 X[블록] @ X.T → min_score 이상인 후보만 정렬해서 top-k
+               → 구절 × 구절 행렬 전체도, 블록의 dense 행렬도 만들지 않음
+    제외 구절  자기 자신, 같은 장의 구절 (--include-same-chapter 면 자기 자신만)
+
+증분 빌드:
+    번역본마다 .cache/related/<번역본>.npz 에 장별 본문 해시와 구절별 이웃 / 점수를 저장해 둠.
+    다시 실행하면 먼저 chapter_checksums RPC(집계 쿼리 한 번)의 결과를 지난 빌드 때 값과 비교해서
+    같으면 본문을 읽지 않고 끝냄. 다르면 본문을 전부 읽고, 장별 해시가 모두 같으면 행렬을 만들지 않고 끝냄.
+    바뀐 장이 있으면 행렬은 다시 만들지만 (수 초), top-k 는 다음 구절만 다시 계산함:
+        - 해시가 바뀐 장 / 새 장의 구절
+        - 이웃 중에 바뀐 구절 / 없어진 구절이 있는 구절
+        - 바뀐 구절과의 유사도가 지금 k 번째 점수보다 높아진 구절
+    나머지 구절의 점수는 예전 idf 로 계산한 값 그대로 (바뀐 장이 많으면 --full 로 전부 다시).
+    DB 에는 다시 계산한 구절의 행만 지우고 다시 씀.
+
+사용 예:
+    python3 scripts/build_related_verses.py                        # available=true 인 번역본 전체
+    python3 scripts/build_related_verses.py --translation korHRV --top-k 20
+    python3 scripts/build_related_verses.py --translation NIV --sink pg --full
+    python3 scripts/build_related_verses.py --translation NIV --dry-run   # 계산과 통계만
+
+필요 패키지: numpy, scipy (scripts/requirements.txt)
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from array import array
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from build_common import (ID_BATCH, add_sink_arguments, add_translation_argument, iter_translation_texts,
+                          load_verse_positions, select_translations, sink_connection)
+from chapter_checksum import chapter_checksum, fetch_server_checksums
+from metrics import METRICS, add_metrics_arguments, metrics_run
+from ngram_tokenizer import index_terms
+from supabase_env import create_supabase, load_env
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'related'
+CACHE_VERSION = 1
+DEFAULT_TOP_K = 10
+DEFAULT_MIN_SCORE = 0.1   # 이보다 낮은 이웃은 저장하지 않음
+DEFAULT_MAX_DF = 0.05     # 구절의 5% 넘게 나오는 용어는 제외
+BLOCK_SIZE = 256
+REST_BATCH_ROWS = 1000
+
+
+def tfidf_matrix(texts, max_df=DEFAULT_MAX_DF):
+    """
+    구절 본문 목록 → TF-IDF 행렬
+
+    Args:
+        texts: 본문 시퀀스 (행 순서)
+        max_df: 이 비율보다 많은 구절에 나오는 용어는 제외
+
+    Returns:
+        (scipy.sparse.csr_matrix float32 (구절 × 용어, 행마다 L2 정규화), 남은 용어 수)
+    """
+    vocabulary = {}
+    indptr = array('q', [0])
+    indices = array('i')
+    data = array('f')
+    for text in texts:
+        for term, tf in index_terms(text).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(1 + math.log(tf))
+        indptr.append(len(indices))
+
+    n = len(indptr) - 1
+    matrix = sparse.csr_matrix(
+        (np.frombuffer(data, dtype=np.float32), np.frombuffer(indices, dtype=np.int32), np.frombuffer(indptr, dtype=np.int64)),
+        shape=(n, len(vocabulary)))
+    df = np.bincount(matrix.indices, minlength=len(vocabulary))
+    keep = (df >= 2) & (df <= max(2, max_df * n))
+    weights = np.where(keep, np.log((1 + n) / (1 + df)) + 1, 0).astype(np.float32)
+    matrix.data *= weights[matrix.indices]
+    matrix.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()).astype(np.float32)
+    norms[norms == 0] = 1
+    matrix.data /= np.repeat(norms, np.diff(matrix.indptr))
+    return matrix, int(keep.sum())
+
+
+def _blocks(rows, block_size):
+    for start in range(0, len(rows), block_size):
+        yield rows[start:start + block_size]
+
+
+def top_k_neighbors(matrix, rows, groups, k, min_score=DEFAULT_MIN_SCORE, block_size=BLOCK_SIZE):
+    """
+    고른 행의 코사인 유사도 top-k (블록 단위 희소 행렬 곱)
+
+    곱한 결과를 dense 로 펼치지 않고, 희소 결과에서 제외 구절과 min_score 미만을 먼저 버린 뒤
+    남은 후보만 (행, 점수 내림차순) 으로 정렬해서 행마다 앞의 k 개를 가져옴.
+
+    Args:
+        matrix: tfidf_matrix 결과 (행마다 L2 정규화)
+        rows: 계산할 행 번호 배열
+        groups: 행마다 제외 그룹 번호 (같은 그룹 = 같은 장은 이웃에서 뺌, None 이면 자기 자신만)
+        k: 이웃 수
+        min_score: 이보다 낮은 이웃은 버림
+        block_size: 한 번에 곱할 행 수
+
+    Returns:
+        (neighbors int64 (len(rows) × k) 행 번호 (-1 = 없음), scores float32 (len(rows) × k)) 점수 내림차순
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    neighbors = np.full((len(rows), k), -1, dtype=np.int64)
+    scores = np.zeros((len(rows), k), dtype=np.float32)
+    if not len(rows):
+        return neighbors, scores
+
+    transposed = matrix.T.tocsr()
+    done = 0
+    for block in _blocks(rows, block_size):
+        product = matrix[block] @ transposed
+        owner = np.repeat(np.arange(len(block)), np.diff(product.indptr))
+        columns, values = product.indices, product.data
+        if groups is None:
+            keep = columns != block[owner]
+        else:
+            keep = groups[columns] != groups[block[owner]]
+        keep &= values >= min_score
+        owner, columns, values = owner[keep], columns[keep], values[keep]
+
+        # 행 → 점수 내림차순 → 구절 순 (점수가 같으면 앞 구절)
+        order = np.lexsort((columns, -values, owner))
+        owner, columns, values = owner[order], columns[order], values[order]
+        rank = np.arange(len(owner)) - np.searchsorted(owner, owner)
+        top = rank < k
+        neighbors[done + owner[top], rank[top]] = columns[top]
+        scores[done + owner[top], rank[top]] = values[top]
+        done += len(block)
+    return neighbors, scores
+
+
+def max_similarity(matrix, rows, block_size=BLOCK_SIZE):
+    """고른 행들과의 유사도 중 최댓값 → 열(구절)마다 하나 (N,)"""
+    best = np.zeros(matrix.shape[0], dtype=np.float32)
+    transposed = matrix.T.tocsr()
+    for block in _blocks(np.asarray(rows, dtype=np.int64), block_size):
+        np.maximum(best, (matrix[block] @ transposed).max(axis=0).toarray().ravel(), out=best)
+    return best
+
+
+def load_state(path, params):
+    """
+    캐시 파일 → 예전 빌드 상태 (없거나 설정이 다르면 None)
+
+    Returns:
+        dict: {verse_ids (N,), neighbors (N × k) verse_id (0 = 없음), scores (N × k), chapters {키: 해시},
+               server {'book_order:chapter': 해시} 빌드할 때의 chapter_checksums (예전 캐시면 None)}
+    """
+    try:
+        with np.load(path, allow_pickle=False) as cached:
+            meta = json.loads(str(cached['meta']))
+            if meta.get('version') != CACHE_VERSION or meta.get('params') != params:
+                return None
+            return {
+                'verse_ids': cached['verse_ids'],
+                'neighbors': cached['neighbors'],
+                'scores': cached['scores'],
+                'chapters': meta['chapters'],
+                'server': meta.get('server'),
+            }
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
+
+
+def save_state(path, params, state):
+    """빌드 상태 → 캐시 파일 (임시 파일에 쓰고 이름 바꾸기)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp.npz')
+    meta = {'version': CACHE_VERSION, 'params': params, 'chapters': state['chapters'], 'server': state.get('server')}
+    np.savez(tmp, meta=np.array(json.dumps(meta, sort_keys=True)),
+             verse_ids=state['verse_ids'], neighbors=state['neighbors'], scores=state['scores'])
+    os.replace(tmp, path)
+
+
+def build_related(verse_ids, chapter_keys, texts, params, previous=None):
+    """
+    번역본 하나의 관련 구절 계산 (previous 가 있으면 증분)
+
+    Args:
+        verse_ids: 구절 id 배열 (오름차순)
+        chapter_keys: 구절마다 장 키 'book_id:chapter'
+        texts: 구절마다 본문
+        params: {top_k, min_score, max_df, same_chapter}
+        previous: load_state 결과 (None 이면 전부 계산)
+
+    Returns:
+        (state, updated) - state 는 save_state 에 넘길 상태,
+        updated 는 DB 에 다시 써야 하는 verse_id 배열 (전부 다시면 None)
+    """
+    verse_ids = np.asarray(verse_ids, dtype=np.int64)
+    n = len(verse_ids)
+    k = params['top_k']
+
+    chapter_verses = {}
+    for key, verse_id, text in zip(chapter_keys, verse_ids.tolist(), texts):
+        chapter_verses.setdefault(key, []).append((verse_id, text))
+    chapters = {key: chapter_checksum(verses) for key, verses in chapter_verses.items()}
+    if previous is not None and chapters == previous['chapters'] and np.array_equal(verse_ids, previous['verse_ids']):
+        print("  0 changed chapters -> 0 verses to recompute", flush=True)
+        return {**previous, 'chapters': chapters}, verse_ids[:0]
+    group_of = {key: i for i, key in enumerate(chapters)}
+    groups = np.array([group_of[key] for key in chapter_keys], dtype=np.int64)
+
+    with METRICS.stage('vectorize'):
+        matrix, terms = tfidf_matrix(texts, params['max_df'])
+    print(f"  TF-IDF: {n} verses x {terms} terms, {matrix.nnz} non-zeros", flush=True)
+
+    exclude = None if params['same_chapter'] else groups
+    neighbors = np.zeros((n, k), dtype=np.int64)
+    scores = np.zeros((n, k), dtype=np.float32)
+
+    if previous is None:
+        rows = np.arange(n)
+        updated = None
+    else:
+        # 예전 결과를 지금 행 순서로 옮김 (예전에 없던 구절은 새로 계산)
+        known = np.isin(verse_ids, previous['verse_ids'])
+        at = np.searchsorted(previous['verse_ids'], verse_ids[known])
+        neighbors[known] = previous['neighbors'][at]
+        scores[known] = previous['scores'][at]
+
+        changed_groups = [group_of[key] for key, checksum in chapters.items()
+                          if previous['chapters'].get(key) != checksum]
+        affected = np.isin(groups, changed_groups) | ~known
+        changed_ids = np.concatenate([verse_ids[affected], np.setdiff1d(previous['verse_ids'], verse_ids)])
+        affected |= np.isin(neighbors, changed_ids).any(axis=1)
+        if changed_ids.size:
+            # 바뀐 구절이 지금 k 번째 이웃보다 가까워진 구절 (이웃이 k 개보다 적으면 min_score 가 기준)
+            kth = np.where(neighbors[:, -1] > 0, scores[:, -1], params['min_score'])
+            with METRICS.stage('similarity'):
+                closest = max_similarity(matrix, np.flatnonzero(np.isin(groups, changed_groups) | ~known))
+            affected |= closest > kth
+        rows = np.flatnonzero(affected)
+        updated = verse_ids[rows]
+        print(f"  {len(changed_groups)} changed chapters -> {len(rows)} verses to recompute", flush=True)
+
+    with METRICS.stage('similarity'):
+        found, found_scores = top_k_neighbors(matrix, rows, exclude, k, params['min_score'])
+    neighbors[rows] = np.where(found >= 0, verse_ids[np.maximum(found, 0)], 0)
+    scores[rows] = found_scores
+    METRICS.inc('rows_total', len(rows), stage='similarity')
+
+    state = {'verse_ids': verse_ids, 'neighbors': neighbors, 'scores': scores, 'chapters': chapters}
+    return state, updated
+
+
+def related_rows(translation_id, state, verse_ids=None):
+    """verse_related 행 (translation_id, verse_id, related_verse_id, score), 구절 순 / 점수 내림차순"""
+    rows = np.arange(len(state['verse_ids']))
+    if verse_ids is not None:
+        rows = np.flatnonzero(np.isin(state['verse_ids'], verse_ids))
+    for row in rows.tolist():
+        verse_id = int(state['verse_ids'][row])
+        for related, score in zip(state['neighbors'][row].tolist(), state['scores'][row].tolist()):
+            if related:
+                yield translation_id, verse_id, related, round(score, 4)
+
+
+def write_rest(supabase, translation_id, state, updated):
+    """PostgREST 로 다시 계산한 구절의 행만 교체 (updated 가 None 이면 번역본 전체, 원자적이지 않음 → 실패하면 다시 실행)"""
+    table = supabase.table('verse_related')
+    supabase.table('verse_related_builds').delete().eq('translation_id', translation_id).execute()
+    if updated is None:
+        table.delete().eq('translation_id', translation_id).execute()
+    else:
+        ids = updated.tolist()
+        for start in range(0, len(ids), ID_BATCH):
+            table.delete().eq('translation_id', translation_id).in_('verse_id', ids[start:start + ID_BATCH]).execute()
+
+    batch = []
+    written = 0
+    for tid, verse_id, related, score in related_rows(translation_id, state, updated):
+        batch.append({'translation_id': tid, 'verse_id': verse_id, 'related_verse_id': related, 'score': score})
+        if len(batch) >= REST_BATCH_ROWS:
+            table.insert(batch).execute()
+            written += len(batch)
+            batch.clear()
+    if batch:
+        table.insert(batch).execute()
+        written += len(batch)
+
+    supabase.table('verse_related_builds').insert(build_record(translation_id, state)).execute()
+    return written
+
+
+def write_pg(conn, translation_id, state, updated):
+    """Postgres 직접 연결: 삭제 + COPY + 빌드 기록을 한 트랜잭션으로 교체"""
+    written = 0
+    with conn.transaction(), conn.cursor() as cur:
+        cur.execute("DELETE FROM verse_related_builds WHERE translation_id = %s", (translation_id,))
+        if updated is None:
+            cur.execute("DELETE FROM verse_related WHERE translation_id = %s", (translation_id,))
+        else:
+            cur.execute("DELETE FROM verse_related WHERE translation_id = %s AND verse_id = ANY(%s)",
+                        (translation_id, updated.tolist()))
+        with cur.copy("COPY verse_related (translation_id, verse_id, related_verse_id, score) FROM STDIN") as copy:
+            for row in related_rows(translation_id, state, updated):
+                copy.write_row(row)
+                written += 1
+        record = build_record(translation_id, state)
+        cur.execute(
+            "INSERT INTO verse_related_builds (translation_id, verse_count, top_k, pair_count) "
+            "VALUES (%s, %s, %s, %s)",
+            (translation_id, record['verse_count'], record['top_k'], record['pair_count']),
+        )
+    return written
+
+
+def build_record(translation_id, state):
+    return {
+        'translation_id': translation_id,
+        'verse_count': len(state['verse_ids']),
+        'top_k': state['neighbors'].shape[1],
+        'pair_count': int(np.count_nonzero(state['neighbors'])),
+    }
+
+
+def build_translation(supabase, translation, positions, args, conn=None):
+    """
+    번역본 하나의 관련 구절을 계산해서 저장
+
+    positions 는 load_verse_positions 결과를 담을 dict (번역본끼리 같이 쓰고, 본문을 읽어야 할 때 처음 채움)
+    """
+    code = translation['code']
+    started = time.perf_counter()
+    params = {'top_k': args.top_k, 'min_score': args.min_score, 'max_df': args.max_df,
+              'same_chapter': args.include_same_chapter}
+    cache_path = Path(args.cache_dir) / f'{code}.npz'
+    previous = None if args.full else load_state(cache_path, params)
+
+    with METRICS.stage('checksum'):
+        server = {f'{book_order}:{chapter}': checksum for (book_order, chapter), checksum
+                  in fetch_server_checksums(supabase, translation['id']).items()}
+    if previous is not None and previous['server'] == server:
+        print(f"\n[{code}] [OK] unchanged (chapter checksums match the last build)", flush=True)
+        return
+
+    if not positions:
+        positions.update(load_verse_positions(supabase))
+        print(f"Loaded {len(positions)} verse positions", flush=True)
+    print(f"\n[{code}] reading verse_translations...", flush=True)
+
+    verse_ids, chapter_keys, texts = [], [], []
+    with METRICS.stage('read_texts'):
+        for verse_id, text in iter_translation_texts(supabase, translation['id']):
+            if verse_id in positions:
+                book_id, chapter, verse = positions[verse_id]
+                verse_ids.append(verse_id)
+                chapter_keys.append(f'{book_id}:{chapter}')
+                texts.append(text)
+    if not verse_ids:
+        print(f"  [SKIP] {code} has no verses", flush=True)
+        return
+
+    if previous is None:
+        print(f"  Full build ({len(verse_ids)} verses)", flush=True)
+
+    state, updated = build_related(verse_ids, chapter_keys, texts, params, previous)
+    state['server'] = server
+    pairs = int(np.count_nonzero(state['neighbors']))
+    built = time.perf_counter()
+    print(f"  {pairs} related pairs ({pairs / len(verse_ids):.1f} per verse) in {built - started:.1f}s", flush=True)
+
+    if args.dry_run:
+        return
+    if updated is not None and not len(updated):
+        # 다음 실행이 본문을 읽지 않고 끝낼 수 있도록 체크섬만 갱신
+        save_state(cache_path, params, state)
+        print(f"  [OK] {code} unchanged", flush=True)
+        return
+
+    with METRICS.stage('write', table='verse_related'):
+        if args.sink == 'pg':
+            written = write_pg(conn, translation['id'], state, updated)
+        else:
+            written = write_rest(supabase, translation['id'], state, updated)
+    METRICS.inc('rows_total', written, stage='write', table='verse_related')
+    # DB 에 쓴 뒤에만 캐시 갱신 (쓰다 실패하면 다음 실행이 같은 구절을 다시 씀)
+    save_state(cache_path, params, state)
+    scope = 'all verses' if updated is None else f'{len(updated)} verses'
+    print(f"  [OK] Wrote {written} rows for {scope} in {time.perf_counter() - built:.1f}s ({args.sink})", flush=True)
+
+
+def run(args):
+    """main 본문 (인자 파싱 후, 계측 안에서 실행)"""
+    env = load_env()
+    supabase = create_supabase(env)
+
+    translations = select_translations(supabase, args.translation)
+    if translations is None:
+        return
+
+    positions = {}
+    with sink_connection(env, args) as conn:
+        for translation in translations:
+            build_translation(supabase, translation, positions, args, conn)
+
+    print("\n[OK] Related verses build completed", flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the related-verses index (verse_related) from TF-IDF similarity')
+    add_translation_argument(parser)
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, help=f'구절마다 저장할 이웃 수 (기본: {DEFAULT_TOP_K})')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE,
+                        help=f'이보다 낮은 코사인 유사도는 버림 (기본: {DEFAULT_MIN_SCORE})')
+    parser.add_argument('--max-df', type=float, default=DEFAULT_MAX_DF,
+                        help=f'이 비율보다 많은 구절에 나오는 용어는 제외 (기본: {DEFAULT_MAX_DF})')
+    parser.add_argument('--include-same-chapter', action='store_true', help='같은 장의 구절도 이웃으로 (기본: 제외)')
+    parser.add_argument('--full', action='store_true', help='캐시와 상관없이 모든 구절을 다시 계산')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help=f'증분 빌드 캐시 폴더 (기본: {DEFAULT_CACHE_DIR})')
+    add_sink_arguments(parser, '계산만 하고 통계 출력 (DB / 캐시에 쓰지 않음)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    with metrics_run(args):
+        run(args)
+
+if __name__ == '__main__':
+    main()
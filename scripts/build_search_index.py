@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+번역본별 n-gram 역색인(search_postings) 생성
+
+verse_translations 를 번역본 단위로 읽어서 ngram_tokenizer 로 쪼갠 뒤
+용어마다 (verse_ids[], tfs[]) posting list 한 행으로 묶어 저장함.
+검색은 search_verses RPC 가 이 표를 읽음
+(supabase/migrations/20260117_search_postings.sql).
+
+번역본 텍스트를 다시 임포트했으면 이 스크립트도 다시 실행할 것 (번역본 단위로 통째로 교체).
+
+사용 예:
+    python3 scripts/build_search_index.py                       # 사용 가능한 모든 번역본
+    python3 scripts/build_search_index.py --translation korHRV
+    python3 scripts/build_search_index.py --translation NIV --sink pg
+    python3 scripts/build_search_index.py --translation korHRV --dry-run   # 통계만 출력
+"""
+
+import argparse
+import math
+import time
+from array import array
+
+from build_common import (add_sink_arguments, add_translation_argument, iter_translation_texts,
+                          select_translations, sink_connection)
+from metrics import METRICS, add_metrics_arguments, metrics_run
+from ngram_tokenizer import index_terms
+from supabase_env import create_supabase, load_env
+
+MAX_TF = 32767              # SMALLINT
+REST_BATCH_POSTINGS = 20000  # PostgREST 요청 하나에 담을 최대 posting 수
+REST_BATCH_ROWS = 500
+
+
+class PostingIndex:
+    """
+    메모리 안의 역색인: 용어 → (verse_ids array('q'), tfs array('h'))
+
+    verse_id 오름차순으로 add() 하면 posting list 도 오름차순이 됨.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.verse_count = 0
+
+    def add(self, verse_id, text):
+        for term, tf in index_terms(text).items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array('q'), array('h'))
+            entry[0].append(verse_id)
+            entry[1].append(min(tf, MAX_TF))
+        self.verse_count += 1
+
+    @property
+    def posting_count(self):
+        return sum(len(ids) for ids, _ in self.postings.values())
+
+    def idf(self, doc_freq):
+        return math.log(self.verse_count / doc_freq)
+
+    def rows(self, translation_id):
+        """search_postings 행 (translation_id, term, doc_freq, idf, verse_ids, tfs), 용어 순"""
+        for term in sorted(self.postings):
+            ids, tfs = self.postings[term]
+            yield translation_id, term, len(ids), self.idf(len(ids)), ids.tolist(), tfs.tolist()
+
+    def stats_line(self):
+        postings = self.posting_count
+        # verse_id 8 bytes + tf 2 bytes (배열 헤더 제외)
+        approx_mb = postings * 10 / 1024 / 1024
+        return (f"{self.verse_count} verses, {len(self.postings)} terms, {postings} postings "
+                f"(~{approx_mb:.1f} MB of arrays)")
+
+
+def write_rest(supabase, index, translation_id):
+    """PostgREST 로 기존 색인 삭제 후 배치 insert (원자적이지 않음 → 실패하면 다시 실행)"""
+    supabase.table('search_index_builds').delete().eq('translation_id', translation_id).execute()
+    supabase.table('search_postings').delete().eq('translation_id', translation_id).execute()
+
+    batch = []
+    batch_postings = 0
+
+    def flush():
+        supabase.table('search_postings').insert(batch).execute()
+        batch.clear()
+
+    for tid, term, doc_freq, idf, ids, tfs in index.rows(translation_id):
+        batch.append({
+            'translation_id': tid,
+            'term': term,
+            'doc_freq': doc_freq,
+            'idf': idf,
+            'verse_ids': ids,
+            'tfs': tfs,
+        })
+        batch_postings += doc_freq
+        if len(batch) >= REST_BATCH_ROWS or batch_postings >= REST_BATCH_POSTINGS:
+            flush()
+            batch_postings = 0
+    if batch:
+        flush()
+
+    supabase.table('search_index_builds').insert({
+        'translation_id': translation_id,
+        'verse_count': index.verse_count,
+        'term_count': len(index.postings),
+        'posting_count': index.posting_count,
+    }).execute()
+
+
+def write_pg(conn, index, translation_id):
+    """Postgres 직접 연결: 삭제 + COPY + 빌드 기록을 한 트랜잭션으로 교체"""
+    with conn.transaction(), conn.cursor() as cur:
+        cur.execute("DELETE FROM search_index_builds WHERE translation_id = %s", (translation_id,))
+        cur.execute("DELETE FROM search_postings WHERE translation_id = %s", (translation_id,))
+        with cur.copy(
+            "COPY search_postings (translation_id, term, doc_freq, idf, verse_ids, tfs) FROM STDIN"
+        ) as copy:
+            for row in index.rows(translation_id):
+                copy.write_row(row)
+        cur.execute(
+            "INSERT INTO search_index_builds (translation_id, verse_count, term_count, posting_count) "
+            "VALUES (%s, %s, %s, %s)",
+            (translation_id, index.verse_count, len(index.postings), index.posting_count),
+        )
+
+
+def build_translation(supabase, translation, sink, conn=None, dry_run=False):
+    """번역본 하나의 색인을 만들어 저장"""
+    print(f"\n[{translation['code']}] reading verse_translations...", flush=True)
+    started = time.perf_counter()
+
+    index = PostingIndex()
+    with METRICS.stage('index_build'):
+        for verse_id, text in iter_translation_texts(supabase, translation['id']):
+            index.add(verse_id, text)
+            if index.verse_count % 10000 == 0:
+                print(f"  {index.verse_count} verses tokenized", flush=True)
+    METRICS.inc('rows_total', index.verse_count, stage='index_build')
+
+    built = time.perf_counter()
+    print(f"  Built {index.stats_line()} in {built - started:.1f}s", flush=True)
+
+    if not index.verse_count:
+        print(f"  [SKIP] {translation['code']} has no verses", flush=True)
+        return
+    if dry_run:
+        return
+
+    with METRICS.stage('write', table='search_postings'):
+        if sink == 'pg':
+            write_pg(conn, index, translation['id'])
+        else:
+            write_rest(supabase, index, translation['id'])
+    METRICS.inc('rows_total', len(index.postings), stage='write', table='search_postings')
+    print(f"  [OK] Wrote {len(index.postings)} terms in {time.perf_counter() - built:.1f}s ({sink})", flush=True)
+
+
+def run(args):
+    """main 본문 (인자 파싱 후, 계측 안에서 실행)"""
+    env = load_env()
+    supabase = create_supabase(env)
+
+    translations = select_translations(supabase, args.translation)
+    if translations is None:
+        return
+
+    with sink_connection(env, args) as conn:
+        for translation in translations:
+            build_translation(supabase, translation, args.sink, conn, args.dry_run)
+
+    print("\n[OK] Search index build completed", flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the n-gram search index (search_postings)')
+    add_translation_argument(parser)
+    add_sink_arguments(parser, '색인만 만들고 통계 출력 (DB 에 쓰지 않음)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    with metrics_run(args):
+        run(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+검색창 자동 완성 사전(search_suggest_dicts) 생성
+
+번역본마다 본문의 한글 어절 / 영문 단어(ngram_tokenizer.suggest_words)와 그 단어가 나오는 구절 수를 세어서
+용어 오름차순 배열 + 같은 순서의 구절 수 배열로 컴파일해 번역본당 한 행으로 저장함
+(supabase/migrations/20260119_search_suggest.sql).
+/api/v1/search/suggest (lib/suggest.ts) 는 이 행을 번역본마다 한 번 읽어 메모리에 두고
+입력 중인 마지막 단어 → 이진 탐색으로 사전 구간 → 구간에서 구절 수 상위 N 개 (요청마다 DB 조회 없음).
+
+한글 입력 중인 접두어 (lib/suggest.ts 의 prefixRange 와 규칙이 같아야 함):
+    "하"    받침 없는 마지막 음절에는 받침이 붙을 수 있으므로 하~핳 으로 시작하는 어절 (한, 할, 함 ...)
+    "하ㄴ"  끝이 자음 하나면 그 초성의 음절 (나~닣)
+
+증분 빌드:
+    .cache/suggest/<번역본>.json 에 장별 본문 해시와 장별 용어 → 구절 수를 저장해 둠.
+    chapter_checksums RPC 로 서버의 장별 해시를 받아서 바뀐 장만 읽고, 그 장의 용어 수만 바꿔서 다시 컴파일.
+    import_engine.py 가 번역본 임포트가 끝날 때 update_suggest_index 를 부름 (쓴 장이 있을 때, --skip-suggest 로 끔).
+
+사용 예:
+    python3 scripts/build_suggest_index.py                        # available=true 인 번역본 전체
+    python3 scripts/build_suggest_index.py --translation korHRV --full
+    python3 scripts/build_suggest_index.py --translation korHRV --lookup 하나 --lookup 믿ㅇ   # 조회 결과 / 시간도 출력
+"""
+
+import argparse
+import heapq
+import json
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+
+from build_common import (add_sink_arguments, add_translation_argument, load_verse_positions, read_chapters,
+                          select_translations, sink_connection, write_atomic)
+from chapter_checksum import chapter_checksum, fetch_server_checksums
+from metrics import METRICS, add_metrics_arguments, metrics_run
+from ngram_tokenizer import normalize, suggest_words
+from supabase_env import create_supabase, load_env
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'suggest'
+CACHE_VERSION = 1
+DEFAULT_LIMIT = 8
+
+# 한글 음절 = 0xAC00 + (초성 × 21 + 중성) × 28 + 종성
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_BASE = 0xAC00
+SYLLABLES_PER_INITIAL = 21 * 28
+FINALS = 28
+# 입력 중인 마지막 단어 (검색어 끝에 붙어 있어야 함, 공백으로 끝나면 제안 없음)
+PREFIX_PATTERN = re.compile(r'(?:[가-힣]+[ㄱ-ㅎ]?|[ㄱ-ㅎ]|[a-z0-9]+)$')
+
+
+def chapter_words(texts):
+    """장 하나의 본문들 → {용어: 나오는 구절 수}"""
+    counts = Counter()
+    for text in texts:
+        counts.update(suggest_words(text))
+    return counts
+
+
+def prefix_range(token):
+    """
+    입력 중인 마지막 단어 → 사전에서 찾을 구간 [lo, hi)
+
+    받침 없는 마지막 음절은 받침이 붙은 음절까지 (하 → [하, 핳 다음)),
+    끝의 자음 하나는 그 초성으로 시작하는 음절 전체 (하ㄴ → [하나, 하닣 다음)).
+    """
+    head, last = token[:-1], token[-1]
+    if last in CHOSEONG:
+        start = HANGUL_BASE + CHOSEONG.index(last) * SYLLABLES_PER_INITIAL
+        return head + chr(start), head + chr(start + SYLLABLES_PER_INITIAL)
+    if '가' <= last <= '힣' and (ord(last) - HANGUL_BASE) % FINALS == 0:
+        return token, head + chr(ord(last) + FINALS)
+    return token, token + '\uffff'
+
+
+class SuggestDictionary:
+    """
+    컴파일한 자동 완성 사전: 용어 오름차순 배열 + 같은 순서의 구절 수 (lib/suggest.ts 와 같은 구조)
+
+    용어는 한글 음절 / 영문 소문자 / 숫자뿐이라 (BMP) 파이썬 정렬과 JS 문자열 비교 순서가 같음.
+    """
+
+    def __init__(self, terms, counts):
+        self.terms = terms
+        self.counts = counts
+
+    @classmethod
+    def compile(cls, chapters):
+        """장별 {용어: 구절 수} 들 → 사전"""
+        totals = Counter()
+        for words in chapters:
+            totals.update(words)
+        terms = sorted(totals)
+        return cls(terms, [totals[term] for term in terms])
+
+    def lookup(self, query, limit=DEFAULT_LIMIT):
+        """
+        검색어 → [(용어, 구절 수), ...] 구절 수 내림차순 (같으면 용어 순)
+
+        검색어의 마지막 단어만 보고 완성함 (앞부분은 호출 측에서 그대로 붙임).
+        """
+        match = PREFIX_PATTERN.search(normalize(query))
+        if not match:
+            return []
+        lo, hi = prefix_range(match.group())
+        start = bisect_left(self.terms, lo)
+        end = bisect_left(self.terms, hi, start)
+        best = heapq.nlargest(limit, range(start, end), key=self.counts.__getitem__)
+        return [(self.terms[i], self.counts[i]) for i in best]
+
+    def row(self, translation_id):
+        """search_suggest_dicts 행 (용어는 줄바꿈으로 이어 붙인 문자열 하나)"""
+        return {
+            'translation_id': translation_id,
+            'term_count': len(self.terms),
+            'terms': '\n'.join(self.terms),
+            'counts': self.counts,
+        }
+
+
+def write_rest(supabase, dictionary, translation_id):
+    supabase.table('search_suggest_dicts').upsert(dictionary.row(translation_id), on_conflict='translation_id').execute()
+
+
+def write_pg(conn, dictionary, translation_id):
+    row = dictionary.row(translation_id)
+    with conn.transaction(), conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO search_suggest_dicts (translation_id, term_count, terms, counts) VALUES (%s, %s, %s, %s) "
+            "ON CONFLICT (translation_id) DO UPDATE SET term_count = EXCLUDED.term_count, terms = EXCLUDED.terms, "
+            "counts = EXCLUDED.counts, built_at = NOW()",
+            (translation_id, row['term_count'], row['terms'], row['counts']),
+        )
+
+
+class SuggestBuilder:
+    """
+    번역본별 자동 완성 사전 증분 빌드 (.cache/suggest/<번역본>.json 을 읽고 갱신)
+
+    Args:
+        supabase: supabase Client
+        cache_dir: 장별 용어 수 캐시 폴더
+        full: True 면 캐시와 상관없이 모든 장을 다시 읽음
+    """
+
+    def __init__(self, supabase, cache_dir=DEFAULT_CACHE_DIR, full=False):
+        self.supabase = supabase
+        self.cache_dir = Path(cache_dir)
+        self.full = full
+        books = supabase.table('books').select('id, book_order').execute().data
+        self.order_by_book_id = {book['id']: book['book_order'] for book in books}
+        self._positions = None
+
+    def positions(self):
+        if self._positions is None:
+            self._positions = load_verse_positions(self.supabase)
+        return self._positions
+
+    def _load_cache(self, code):
+        """캐시의 장별 상태 {'book_order:chapter': {checksum, words}} (없거나 버전이 다르면 None)"""
+        if self.full:
+            return None
+        try:
+            cache = json.loads((self.cache_dir / f'{code}.json').read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return None
+        return cache['chapters'] if cache.get('version') == CACHE_VERSION else None
+
+    def build_translation(self, translation, sink='rest', conn=None, dry_run=False):
+        """
+        번역본 하나 증분 빌드
+
+        Returns:
+            (SuggestDictionary, stats) - stats: {read, unchanged, removed, written}
+        """
+        code = translation['code']
+        with METRICS.stage('checksum'):
+            server = fetch_server_checksums(self.supabase, translation['id'])
+        cached = self._load_cache(code)
+        previous = cached or {}
+        keys = {f'{book_order}:{chapter}': (book_order, chapter) for book_order, chapter in server}
+        changed = {key for name, key in keys.items() if previous.get(name, {}).get('checksum') != server[key]}
+        chapters = {name: previous[name] for name, key in keys.items() if key not in changed}
+        stats = {'read': len(changed), 'unchanged': len(chapters), 'removed': len(set(previous) - set(keys)),
+                 'written': False}
+
+        if changed:
+            with METRICS.stage('read_texts'):
+                texts = read_chapters(self.supabase, translation['id'], self.positions(),
+                                      self.order_by_book_id, changed, len(server))
+            for (book_order, chapter), verses in texts.items():
+                # 읽는 사이에 바뀌었으면 실제로 읽은 내용의 해시를 기록 (다음 빌드에서 다시 읽음)
+                chapters[f'{book_order}:{chapter}'] = {
+                    'checksum': chapter_checksum([(verse, text) for _, verse, text in verses]),
+                    'words': chapter_words([text for _, _, text in verses]),
+                }
+            METRICS.inc('chapters_total', len(texts), stage='suggest', result='read')
+
+        with METRICS.stage('compile'):
+            dictionary = SuggestDictionary.compile(state['words'] for state in chapters.values())
+
+        if not dry_run and (changed or stats['removed'] or cached is None):
+            with METRICS.stage('write', table='search_suggest_dicts'):
+                if sink == 'pg':
+                    write_pg(conn, dictionary, translation['id'])
+                else:
+                    write_rest(self.supabase, dictionary, translation['id'])
+            # DB 에 쓴 뒤에만 캐시 갱신
+            write_atomic(self.cache_dir / f'{code}.json',
+                         json.dumps({'version': CACHE_VERSION, 'chapters': chapters},
+                                    ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            stats['written'] = True
+        return dictionary, stats
+
+
+def format_stats(code, dictionary, stats):
+    size = sum(len(term.encode('utf-8')) + 1 for term in dictionary.terms) + 4 * len(dictionary.counts)
+    written = 'written' if stats['written'] else 'not written'
+    return (f"  [{code}] {len(dictionary.terms)} terms (~{size / 1024:,.0f} KB compiled), {stats['read']} chapters read, "
+            f"{stats['unchanged']} unchanged, {stats['removed']} removed, {written}")
+
+
+def update_suggest_index(supabase, translation):
+    """임포트가 끝난 번역본의 사전을 증분 갱신 (import_engine.py 에서 호출, PostgREST 로 씀)"""
+    dictionary, stats = SuggestBuilder(supabase).build_translation(translation)
+    print(format_stats(translation['code'], dictionary, stats), flush=True)
+
+
+def print_lookups(dictionary, queries):
+    for query in queries:
+        started = time.perf_counter()
+        suggestions = dictionary.lookup(query)
+        micros = (time.perf_counter() - started) * 1e6
+        listed = ', '.join(f'{term}({count})' for term, count in suggestions) or '-'
+        print(f"    {query!r} -> {listed}  [{micros:.0f} us]", flush=True)
+
+
+def run(args):
+    """main 본문 (인자 파싱 후, 계측 안에서 실행)"""
+    env = load_env()
+    supabase = create_supabase(env)
+
+    translations = select_translations(supabase, args.translation)
+    if translations is None:
+        return
+
+    builder = SuggestBuilder(supabase, args.cache_dir, full=args.full)
+    with sink_connection(env, args) as conn:
+        for translation in translations:
+            print(f"\n[{translation['code']}] building suggest dictionary...", flush=True)
+            started = time.perf_counter()
+            dictionary, stats = builder.build_translation(translation, args.sink, conn, args.dry_run)
+            print(format_stats(translation['code'], dictionary, stats) + f" in {time.perf_counter() - started:.1f}s",
+                  flush=True)
+            print_lookups(dictionary, args.lookup or [])
+
+    print("\n[OK] Suggest dictionary build completed", flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the search autocomplete dictionary (search_suggest_dicts)')
+    add_translation_argument(parser)
+    parser.add_argument('--full', action='store_true', help='캐시와 상관없이 모든 장을 다시 읽음')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help=f'장별 용어 수 캐시 폴더 (기본: {DEFAULT_CACHE_DIR})')
+    add_sink_arguments(parser, '사전만 만들고 통계 출력 (DB / 캐시에 쓰지 않음)')
+    parser.add_argument('--lookup', action='append', help='빌드한 사전으로 조회해 볼 검색어 (여러 번 지정 가능)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    with metrics_run(args):
+        run(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bolls.life 장(chapter) 응답 로컬 디스크 캐시
+
+성경 본문은 바뀌지 않으므로 한 번 받은 장 JSON 을 디스크에 저장해 두고,
+재실행/스키마 변경/새 DB 로의 재임포트 때는 네트워크 없이 읽음.
+
+구조 (기본 위치: .cache/bolls/):
+    objects/ab/abcdef...   - 응답 본문 (sha256 으로 주소 지정, 같은 내용은 한 번만 저장)
+    index.json             - "NIV2011/19/31" -> {sha256, size, used}
+
+- 읽을 때마다 sha256 을 다시 계산해서 깨진 파일은 버리고 새로 받음
+- 전체 크기가 max_bytes 를 넘으면 가장 오래 안 쓴 항목부터 삭제 (LRU)
+- index.json 은 SAVE_EVERY 번 저장할 때마다 기록함 (수집 중에 죽어도 받은 장은 다음 실행에서 씀).
+  기록할 때 디스크의 index.json 과 합침 (같은 폴더를 쓰는 다른 캐시 객체 / 프로세스의 항목을 덮어쓰지 않음)
+- 열 때 index 에 없는 objects/ 파일 중 ORPHAN_AGE 보다 오래된 것은 지움 (예전 버전에서 기록 전에 죽은 실행의 잔재)
+- offline=True 면 캐시에 없는 장은 네트워크 대신 CacheMiss 예외
+
+사용 예:
+    cache = ChapterCache()
+    data = cache.get_or_fetch('NIV2011', 19, 31, lambda: requests.get(url).content)
+    print(cache.stats_line())
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'bolls'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+SAVE_EVERY = 25            # 저장 몇 번마다 index.json 을 기록할지
+ORPHAN_AGE = 60 * 60       # 초, index 에 없는 object 를 지우기 전에 기다리는 시간 (아직 기록 전인 다른 실행 보호)
+
+
+class CacheMiss(Exception):
+    """offline 모드에서 캐시에 없는 장을 요청함"""
+
+
+class ChapterCache:
+    """(translation, book, chapter) 기준 콘텐츠 주소 지정 캐시"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, offline=False):
+        self.directory = Path(directory)
+        self.objects_dir = self.directory / 'objects'
+        self.index_path = self.directory / 'index.json'
+        self.max_bytes = max_bytes
+        self.offline = offline
+
+        self.hits = 0
+        self.misses = 0
+        self.corrupt = 0
+        self.bytes_saved = 0
+
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._unsaved = 0          # 마지막 기록 뒤 저장한 장 수
+        self._removed = set()      # 마지막 기록 뒤 index 에서 뺀 키 (합칠 때 디스크에서도 뺌)
+        self._index = self._load_index()
+        self.orphans_removed = self._sweep_orphans()
+
+    @staticmethod
+    def key(translation, book, chapter):
+        return f"{translation}/{book}/{chapter}"
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _sweep_orphans(self):
+        """index 에 없고 ORPHAN_AGE 보다 오래된 object 삭제 (max_bytes 에 안 잡히고 다시 쓰이지도 않으므로)"""
+        if not self.objects_dir.is_dir():
+            return 0
+        referenced = {entry['sha256'] for entry in self._index.values()}
+        cutoff = time.time() - ORPHAN_AGE
+        removed = 0
+        for path in self.objects_dir.glob('*/*'):
+            if path.name in referenced or path.name.startswith('.tmp-'):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest
+
+    def _write_atomic(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _read(self, key):
+        """캐시된 응답 본문(bytes), 없거나 해시가 맞지 않으면 None (lock 안에서 호출)"""
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+
+        try:
+            body = self._object_path(entry['sha256']).read_bytes()
+        except OSError:
+            body = None
+
+        if body is None or hashlib.sha256(body).hexdigest() != entry['sha256']:
+            self.corrupt += 1
+            del self._index[key]
+            self._removed.add(key)
+            self._dirty = True
+            return None
+
+        entry['used'] = time.time()
+        self._dirty = True
+        return body
+
+    def lookup(self, translation, book, chapter):
+        """
+        캐시에서 장을 찾아서 디코드된 JSON 반환, 없으면 None
+
+        offline 모드에서는 없을 때 CacheMiss 예외
+        """
+        key = self.key(translation, book, chapter)
+        with self._lock:
+            body = self._read(key)
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.bytes_saved += len(body)
+
+        if body is not None:
+            return json.loads(body)
+        if self.offline:
+            raise CacheMiss(key)
+        return None
+
+    def store(self, translation, book, chapter, body):
+        """
+        응답 본문(bytes) 저장
+
+        빈 응답('[]')은 일시적인 오류일 수 있으므로 저장하지 않음
+        """
+        if not json.loads(body):
+            return
+
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+
+        with self._lock:
+            if not path.exists():
+                self._write_atomic(path, body)
+            self._index[self.key(translation, book, chapter)] = {
+                'sha256': digest,
+                'size': len(body),
+                'used': time.time(),
+            }
+            self._dirty = True
+            self._evict()
+            self._unsaved += 1
+            if self._unsaved >= SAVE_EVERY:
+                self._save_locked()
+
+    def get_or_fetch(self, translation, book, chapter, fetch):
+        """
+        캐시에 있으면 그대로, 없으면 fetch() 로 받아서 저장
+
+        Args:
+            fetch: 응답 본문(bytes)을 돌려주는 함수 (실패 시 예외)
+
+        Returns:
+            디코드된 JSON (bolls.life: [{"verse": 1, "text": "..."}, ...])
+        """
+        data = self.lookup(translation, book, chapter)
+        if data is not None:
+            return data
+
+        body = fetch()
+        self.store(translation, book, chapter, body)
+        return json.loads(body)
+
+    def iter_translation(self, translation):
+        """
+        캐시에 있는 번역본의 장들을 (book, chapter) 순서로 yield
+
+        Yields:
+            (book, chapter, 디코드된 JSON)
+        """
+        prefix = f"{translation}/"
+        with self._lock:
+            units = sorted(
+                tuple(int(part) for part in key[len(prefix):].split('/'))
+                for key in self._index if key.startswith(prefix)
+            )
+
+        for book, chapter in units:
+            data = self.lookup(translation, book, chapter)
+            if data is not None:
+                yield book, chapter, data
+
+    def _evict(self):
+        """max_bytes 를 넘으면 오래 안 쓴 항목부터 삭제 (lock 안에서 호출)"""
+        sizes = {}
+        for entry in self._index.values():
+            sizes[entry['sha256']] = entry['size']
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]['used']):
+            if total <= self.max_bytes:
+                break
+            del self._index[key]
+            self._removed.add(key)
+            digest = entry['sha256']
+            if any(e['sha256'] == digest for e in self._index.values()):
+                continue
+            self._object_path(digest).unlink(missing_ok=True)
+            total -= entry['size']
+
+    def save(self):
+        """index.json 기록 (변경이 있을 때만)"""
+        with self._lock:
+            if self._dirty:
+                self._save_locked()
+
+    def _save_locked(self):
+        """디스크의 index.json 과 합쳐서 기록 (lock 안에서 호출, 이 객체의 항목이 우선)"""
+        merged = self._load_index()
+        for key in self._removed:
+            merged.pop(key, None)
+        merged.update(self._index)
+        data = json.dumps(merged, separators=(',', ':')).encode('utf-8')
+        self._write_atomic(self.index_path, data)
+        self._index = merged
+        self._removed.clear()
+        self._unsaved = 0
+        self._dirty = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.save()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'corrupt': self.corrupt,
+            'hit_rate': self.hit_rate,
+            'bytes_saved': self.bytes_saved,
+            'entries': len(self._index),
+        }
+
+    def stats_line(self):
+        return (f"Cache: {self.hits} hits / {self.misses} misses "
+                f"({self.hit_rate:.0%} hit rate), {self.bytes_saved / 1024:.0f} KB saved, "
+                f"{self.corrupt} corrupt entries dropped")
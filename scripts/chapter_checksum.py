@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+장 단위 내용 해시 (delta 임포트용)
+
+재임포트할 때 모든 구절을 다시 upsert 하면 바뀐 게 없어도 번역본마다 3만 행을 다시 쓰고
+(테이블 bloat, 텍스트 GIN 색인 갱신) 시간이 오래 걸림.
+로컬에서 장별 해시를 계산하고, 서버에서 같은 규칙으로 계산한 해시
+(chapter_checksums RPC, supabase/migrations/20260117_chapter_checksums.sql)와
+한 번에 비교해서 달라진 장만 다시 씀.
+
+해시 규칙 (RPC 와 반드시 같아야 함):
+    md5( 절 번호 순으로 "{verse}\\t{text}" 를 "\\n" 으로 이어 붙인 UTF-8 문자열 )
+
+사용 예:
+    local = {}
+    for book_order, chapter, verse, text in rows:
+        local.setdefault((book_order, chapter), []).append((verse, text))
+    local = {key: chapter_checksum(verses) for key, verses in local.items()}
+    server = fetch_server_checksums(supabase, translation_id)
+    changed = changed_chapters(local, server)
+"""
+
+import hashlib
+
+
+def chapter_checksum(verses):
+    """
+    한 장의 해시
+
+    Args:
+        verses: [(verse, text), ...] (순서 무관)
+
+    Returns:
+        str: md5 hex
+    """
+    body = '\n'.join(f'{verse}\t{text}' for verse, text in sorted(verses, key=lambda item: item[0]))
+    return hashlib.md5(body.encode('utf-8')).hexdigest()
+
+
+def local_checksums(rows):
+    """
+    (book_order, chapter, verse, text) 행들 → {(book_order, chapter): md5}
+    """
+    chapters = {}
+    for book_order, chapter, verse, text in rows:
+        chapters.setdefault((book_order, chapter), []).append((verse, text))
+    return {key: chapter_checksum(verses) for key, verses in chapters.items()}
+
+
+def fetch_server_checksums(supabase, translation_id):
+    """
+    서버에 저장된 번역본의 장별 해시 (집계 쿼리 한 번)
+
+    Returns:
+        dict: {(book_order, chapter): md5}  (구절이 하나도 없는 장은 없음)
+    """
+    data = supabase.rpc('chapter_checksums', {'p_translation_id': translation_id}).execute().data or {}
+    checksums = {}
+    for key, checksum in data.items():
+        book_order, chapter = key.split(':')
+        checksums[(int(book_order), int(chapter))] = checksum
+    return checksums
+
+
+def changed_chapters(local, server):
+    """로컬 해시가 서버와 다른(또는 서버에 없는) 장 키 집합"""
+    return {key for key, checksum in local.items() if server.get(key) != checksum}
+
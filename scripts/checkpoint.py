@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임포트 체크포인트 매니페스트
+
+(translation, book, chapter) 단위로 커밋이 끝난 장과 구절 수를 로컬 파일에 기록해서,
+중간에 끊기거나 일부 장이 실패한 임포트를 다시 실행하면 빠진/실패한 장만 처리함.
+(예전처럼 import_psalm31_niv.py 같은 일회성 복구 스크립트를 따로 만들 필요 없음)
+
+파일 형식 (.cache/checkpoints/{translation}.jsonl, 한 줄에 이벤트 하나, 뒤에 온 줄이 우선):
+    {"book": "Psa", "chapter": 31, "status": "done", "verses": 24, "at": 1768550000.0}
+    {"book": "Psa", "chapter": 32, "status": "failed", "error": "...", "at": ...}
+    {"book": "Psa", "chapter": 33, "status": "pending", "reason": "checksum changed", "at": ...}
+
+추가만 하는 로그라서 프로세스가 죽어도 이미 기록된 줄은 그대로 남음.
+
+사용 예:
+    with CheckpointManifest('NIV') as manifest:
+        if not manifest.is_done('Gen', 1):
+            ...
+            manifest.mark_done('Gen', 1, 31)
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CHECKPOINT_DIR = Path(__file__).parent.parent / '.cache' / 'checkpoints'
+
+
+class CheckpointManifest:
+    """번역본 하나의 장 단위 진행 상황"""
+
+    def __init__(self, translation, directory=DEFAULT_CHECKPOINT_DIR, restart=False):
+        self.translation = translation
+        self.path = Path(directory) / f'{translation}.jsonl'
+        self.units = {}
+        self._lock = threading.Lock()  # 임포트 엔진의 쓰기 스레드들이 동시에 기록함
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if restart:
+            self.path.unlink(missing_ok=True)
+        self._load()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self._file.tell() and self._needs_newline():
+            self._file.write('\n')
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # 기록 도중 끊긴 마지막 줄
+                        continue
+                    self.units[(event['book'], event['chapter'])] = event
+        except FileNotFoundError:
+            pass
+
+    def _needs_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, 2)
+            return f.read(1) != b'\n'
+
+    def _append(self, event):
+        event['at'] = time.time()
+        with self._lock:
+            self.units[(event['book'], event['chapter'])] = event
+            self._file.write(json.dumps(event, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    def is_done(self, book, chapter):
+        event = self.units.get((book, chapter))
+        return event is not None and event['status'] == 'done'
+
+    def mark_done(self, book, chapter, verses):
+        self._append({'book': book, 'chapter': chapter, 'status': 'done', 'verses': verses})
+
+    def mark_failed(self, book, chapter, error):
+        self._append({'book': book, 'chapter': chapter, 'status': 'failed', 'error': str(error)})
+
+    def mark_pending(self, book, chapter, reason):
+        """완료로 기록된 장을 다시 처리 대상으로 되돌림 (예: delta 모드에서 서버 내용이 다를 때)"""
+        self._append({'book': book, 'chapter': chapter, 'status': 'pending', 'reason': reason})
+
+    def pending(self, units):
+        """[(book, chapter), ...] 중 아직 완료되지 않은 것만"""
+        return [unit for unit in units if not self.is_done(*unit)]
+
+    def summary(self):
+        done = sum(1 for e in self.units.values() if e['status'] == 'done')
+        failed = sum(1 for e in self.units.values() if e['status'] == 'failed')
+        verses = sum(e.get('verses', 0) for e in self.units.values() if e['status'] == 'done')
+        return (f"Checkpoint {self.translation}: {done} chapters done ({verses} verses), "
+                f"{failed} failed -> {self.path}")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+번역본별 바이너리 코퍼스 (mmap)
+
+번역본 하나를 파일 하나로 컴파일해 두고, 임포터/검증기/내보내기/검색 인덱스 빌더가
+파싱 없이 mmap 으로 바로 읽도록 함.
+
+파일 형식 (little-endian):
+    header  (40 bytes)  magic 'BSCORP1\\0', version u32, count u32,
+                        translation 16s (utf-8, 0 패딩), text_offset u64
+    records (16 bytes x count)
+                        book_order u16, chapter u16, verse u16, reserved u16,
+                        offset u32, length u32   ((book, chapter, verse) 순 정렬)
+    text    UTF-8 본문을 이어 붙인 blob (offset/length 는 blob 기준 바이트 단위)
+
+사용 예:
+    python3 scripts/corpus_bin.py build --source hrv --translation korHRV
+    python3 scripts/corpus_bin.py build --source bolls-cache --translation NIV2011
+
+    with CorpusReader('.cache/corpus/korHRV.bin') as corpus:
+        for verse, text in corpus.get_chapter(1, 1):
+            ...
+        for book, chapter, verse, text in corpus.iter_range((40, 5, 1), (40, 7, 29)):
+            ...
+"""
+
+import argparse
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from chapter_cache import DEFAULT_CACHE_DIR, ChapterCache
+from hrv_parser import HRV_DIR, book_order_from_code, parse_corpus
+
+MAGIC = b'BSCORP1\0'
+VERSION = 1
+HEADER = struct.Struct('<8sII16sQ')
+RECORD = struct.Struct('<HHHHII')
+
+DEFAULT_CORPUS_DIR = Path(__file__).parent.parent / '.cache' / 'corpus'
+
+
+def compile_corpus(verses, out_path, translation):
+    """
+    구절들을 바이너리 코퍼스 파일 하나로 컴파일
+
+    Args:
+        verses: (book_order, chapter, verse, text) iterable (순서 무관)
+        out_path: 출력 파일 경로
+        translation: 번역본 코드 (헤더에 기록)
+
+    Returns:
+        int: 기록한 구절 수
+    """
+    rows = sorted(verses, key=lambda row: (row[0], row[1], row[2]))
+
+    records = bytearray(RECORD.size * len(rows))
+    blob = bytearray()
+    for i, (book_order, chapter, verse, text) in enumerate(rows):
+        encoded = text.encode('utf-8')
+        RECORD.pack_into(records, i * RECORD.size, book_order, chapter, verse, 0, len(blob), len(encoded))
+        blob += encoded
+
+    text_offset = HEADER.size + len(records)
+    header = HEADER.pack(MAGIC, VERSION, len(rows), translation.encode('utf-8')[:16], text_offset)
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(records)
+        f.write(blob)
+    os.replace(tmp_path, out_path)
+
+    return len(rows)
+
+
+class CorpusReader:
+    """mmap 으로 연 바이너리 코퍼스 (읽기 전용)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+
+        magic, version, count, translation, text_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'Not a corpus file (v{VERSION}): {self.path}')
+
+        self.count = count
+        self.translation = translation.rstrip(b'\0').decode('utf-8')
+        self._text_offset = text_offset
+
+    def __len__(self):
+        return self.count
+
+    def record(self, i):
+        """i 번째 레코드: (book_order, chapter, verse, offset, length)"""
+        book_order, chapter, verse, _, offset, length = RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+        return book_order, chapter, verse, offset, length
+
+    def text_bytes(self, i):
+        """i 번째 구절 본문 (복사 없는 memoryview, close() 전에 release 필요)"""
+        _, _, _, offset, length = self.record(i)
+        start = self._text_offset + offset
+        return self._view[start:start + length]
+
+    def text(self, i):
+        return str(self.text_bytes(i), 'utf-8')
+
+    def _key(self, i):
+        book_order, chapter, verse, _, _, _ = RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+        return book_order, chapter, verse
+
+    def bisect(self, key):
+        """key=(book_order, chapter, verse) 이상인 첫 레코드 위치"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get_chapter(self, book_order, chapter):
+        """한 장의 [(verse, text), ...]"""
+        return [(verse, text) for _, _, verse, text in self.iter_range((book_order, chapter, 0), (book_order, chapter, 0xFFFF))]
+
+    def iter_range(self, start=(0, 0, 0), end=(0xFFFF, 0xFFFF, 0xFFFF)):
+        """
+        start 이상 end 이하 (book_order, chapter, verse) 구절을 순서대로 yield
+
+        Yields:
+            (book_order, chapter, verse, text)
+        """
+        for i in range(self.bisect(start), self.count):
+            book_order, chapter, verse, offset, length = self.record(i)
+            if (book_order, chapter, verse) > end:
+                break
+            begin = self._text_offset + offset
+            yield book_order, chapter, verse, str(self._view[begin:begin + length], 'utf-8')
+
+    def close(self):
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def hrv_verses(directory):
+    """HRV 텍스트 파일 → (book_order, chapter, verse, text)"""
+    for book_code, file_path, verses in parse_corpus(directory):
+        if verses is None:
+            raise ValueError(f'Failed to parse {file_path}')
+        book_order = book_order_from_code(book_code)
+        for v in verses:
+            yield book_order, v.chapter, v.verse, v.text
+
+
+def bolls_cache_verses(cache_dir, translation):
+    """캐시된 bolls.life 장 JSON → (book_order, chapter, verse, text)"""
+    cache = ChapterCache(cache_dir, offline=True)
+    for book, chapter, verses_data in cache.iter_translation(translation):
+        for verse_item in verses_data:
+            yield book, chapter, verse_item['verse'], verse_item['text']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile a translation into a memory-mapped corpus file')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='코퍼스 파일 생성')
+    build.add_argument('--source', choices=['hrv', 'bolls-cache'], required=True)
+    build.add_argument('--translation', required=True, help='번역본 코드 (예: korHRV, NIV2011)')
+    build.add_argument('--hrv-dir', default=HRV_DIR)
+    build.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='bolls.life 장 캐시 폴더')
+    build.add_argument('--out', default=None, help='출력 파일 (기본: .cache/corpus/{translation}.bin)')
+
+    info = sub.add_parser('info', help='코퍼스 파일 정보')
+    info.add_argument('path')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        if args.source == 'hrv':
+            verses = hrv_verses(args.hrv_dir)
+        else:
+            verses = bolls_cache_verses(args.cache_dir, args.translation)
+
+        out_path = args.out or DEFAULT_CORPUS_DIR / f'{args.translation}.bin'
+        count = compile_corpus(verses, out_path, args.translation)
+        print(f"[OK] {args.translation}: {count} verses -> {out_path} ({os.path.getsize(out_path) / 1024:.0f} KB)")
+
+    elif args.command == 'info':
+        with CorpusReader(args.path) as corpus:
+            first = corpus.record(0)[:3] if len(corpus) else None
+            last = corpus.record(len(corpus) - 1)[:3] if len(corpus) else None
+            print(f"{corpus.path}: {corpus.translation}, {len(corpus)} verses, {first} .. {last}")
+
+if __name__ == '__main__':
+    main()
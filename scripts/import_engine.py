@@ -0,0 +1,865 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+번역본 임포트 엔진 (소스 → 제한된 큐 → 싱크 파이프라인)
+
+소스(import_sources: HRV 파일 / bolls.life / 덤프 파일)가 장(Chapter)을 만들어 큐에 넣고,
+쓰기 스레드들이 꺼내서 싱크(import_sinks: PostgREST / Postgres COPY / SQLite 번들)에 씀.
+
+    [소스 스레드]  parse/fetch → normalize → delta 비교 → queue.put (가득 차면 대기 = backpressure)
+    [쓰기 스레드 x N]  queue.get → 장 여러 개를 batch_rows 까지 모아서 write → 체크포인트 기록
+
+normalize 는 text_normalize.normalize_chapter (마크업 정리 + NFC, 소제목 포함). delta 해시와 싱크는
+정리된 본문을 보므로 마크업만 바뀐 장은 다시 쓰지 않고, 싱크는 검색용 본문(search_text)을 같이 씀.
+
+파싱/수집과 쓰기가 겹쳐서 돌아가므로 전체 시간 ≈ 가장 느린 단계의 시간.
+끝나면 단계별 바쁜 시간과 큐 대기 시간을 출력함 (어느 쪽이 병목인지).
+    queue_put_wait 가 크면 싱크가 병목, queue_get_wait 가 크면 소스가 병목.
+
+번역본 여러 개는 한 번에 --parallel 개씩 동시에 임포트함 (번역본마다 파이프라인 하나).
+    - books / translations / 정규 구절 ID 인덱스(VerseIdIndex)는 ImportContext 에서 한 번만 읽어서 같이 씀
+    - 큐에 들어가서 아직 쓰지 않은 구절 수는 RowBudget 하나로 모든 번역본을 합쳐 --max-buffered-rows 까지
+      (번역본 수와 상관없이 버퍼 메모리가 일정함. 번역본마다 남는 것은 장 단위 키와 체크포인트뿐)
+    - Supabase 클라이언트(HTTP 연결 풀) 하나를 같이 쓰고, WriteLimiter 하나로
+      동시 쓰기 요청 수(--write-concurrency)와 초당 쓰는 행 수(--write-rate)의 합을 제한함
+    - 정규 구절을 만드는 기준 번역본(create_verses)이 있으면 그것부터 끝내고 나머지를 동시에 임포트
+      (나머지 번역본은 기준 번역본이 만든 구절 ID 를 써야 하므로, 기준 번역본이 실패하면 나머지는 건너뜀)
+    - --sink pg 로 여러 번역본이면 번역본마다 전역 본문 GIN 인덱스를 지웠다 만들지 않음 (INSERT 가 갱신).
+      --defer-text-index 면 시작 전에 한 번 지우고 모두 끝난 뒤 한 번 다시 만듦 (ImportContext)
+
+번역본 추가 = TRANSLATION_SOURCES 에 항목 하나 (translations 테이블에 코드가 있어야 함).
+
+번역본 임포트가 끝나면 장별 점검(audit_corpus)을 하고, 쓴 장이 있으면 검색 자동 완성 사전도
+갱신함 (build_suggest_index, 바뀐 장만 다시 읽음. --skip-suggest 로 끔).
+
+--sink sqlite 는 Supabase 대신 오프라인 번들 파일(sqlite_bundle)에 씀 (.env.local / 네트워크 필요 없음,
+bolls.life 번역본은 --offline 으로 장 캐시에서). books / translations / 정규 구절도 번들에서 읽고,
+실행 전체가 번들 트랜잭션 하나라서 번역본은 항상 처음부터 다시 만듦 (--delta / --chapters-from 없음).
+
+사용 예:
+    python3 scripts/import_engine.py --translation korHRV
+    python3 scripts/import_engine.py --translation NIV --concurrency 8 --rate 10 --max-rate 40
+    python3 scripts/import_engine.py --translation NIV --dump dumps/NIV2011.json --sink pg
+    python3 scripts/import_engine.py --translation NIV --dump dumps/NIV2011.zip    # bolls.life 번역본 덤프
+    python3 scripts/import_engine.py --sink sqlite --translation korHRV --translation NIV --offline
+    python3 scripts/import_engine.py                                 # 설정된 번역본 전부 (동시에)
+    python3 scripts/import_engine.py --translation NIV --translation korRV --translation korNRSV \
+        --parallel 3 --write-concurrency 4 --write-rate 2000
+"""
+
+import argparse
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from postgrest.exceptions import APIError
+
+from audit_corpus import audit_translation, reimport_units
+from bolls_client import BOLLS_BASE_URL, DEFAULT_CONCURRENCY, DEFAULT_RATE
+from build_suggest_index import update_suggest_index
+from chapter_cache import DEFAULT_CACHE_DIR, ChapterCache
+from chapter_checksum import chapter_checksum, fetch_server_checksums
+from checkpoint import DEFAULT_CHECKPOINT_DIR, CheckpointManifest
+from hrv_parser import HRV_DIR
+from import_sinks import BundleSink, PgSink, RestSink, WriteLimiter
+from pg_copy_sink import connect, create_text_index, drop_text_index
+from import_sources import BollsSource, ChapterKey, DumpSource, HrvSource
+from metrics import METRICS, add_metrics_arguments, metrics_run, peak_rss_bytes
+from rate_controller import AimdRateController
+from sqlite_bundle import DEFAULT_BUNDLE_PATH, SqliteBundle
+from supabase_env import create_supabase, load_env
+from text_normalize import normalize_chapter
+from verse_index import VerseIdIndex
+from versification import VerseAligner
+
+# 번역본 코드(translations.code) → 소스 설정
+#   source: hrv | bolls | dump
+#   create_verses: 정규 구절(verses)을 만드는 기준 번역본이면 True
+#                  (나머지는 versification.VerseAligner 로 정규 절 번호에 맞춰서 씀)
+#   versification: 절 번호를 옮기는 규칙 [(book_order, chapter, first_verse, last_verse, verse_offset), ...]
+#                  (규칙이 없어도 정규 구절에 없는 절은 같은 장의 앞 구절에 합쳐짐)
+TRANSLATION_SOURCES = {
+    'korHRV': {'source': 'hrv', 'directory': HRV_DIR, 'create_verses': True},
+    'NIV': {'source': 'bolls', 'bolls_code': 'NIV2011'},
+    'korRV': {'source': 'bolls', 'bolls_code': 'KRV'},      # 개역한글
+    'korNRSV': {'source': 'bolls', 'bolls_code': 'RNKSV'},  # 새번역
+    # 예: 'korRV': {'source': 'dump', 'path': 'dumps/korRV.json'},
+}
+
+DEFAULT_QUEUE_SIZE = 64    # 큐에 쌓아둘 최대 장 수
+DEFAULT_WRITERS = 4        # PostgREST 쓰기 스레드 수 (COPY 싱크는 항상 1)
+DEFAULT_BATCH_ROWS = 500   # 요청 하나에 담을 최대 구절 수 (장 단위로 모음)
+PROGRESS_EVERY = 100       # 장
+DEFAULT_PARALLEL = 4       # 동시에 임포트할 번역본 수
+DEFAULT_WRITE_CONCURRENCY = 8   # 번역본 전체에서 동시에 진행 중인 쓰기 요청 수
+DEFAULT_BUFFERED_ROWS = 5000    # 번역본 전체에서 읽었지만 아직 쓰지 않은 최대 구절 수
+
+_END = object()
+
+
+def peak_rss_mb():
+    """이 프로세스의 지금까지 최대 RSS (MB, 알 수 없으면 None)"""
+    rss = peak_rss_bytes()
+    return rss / 1024 / 1024 if rss else None
+
+
+class RowBudget:
+    """
+    읽었지만 아직 쓰지 않은 구절 수 제한 (스레드 공용, 모든 번역본의 파이프라인이 같이 씀)
+
+    소스 스레드가 장을 큐에 넣기 전에 그 장의 구절 수만큼 acquire 하고, 쓰기 스레드가 쓰고 나서 release 함.
+    장 하나가 한도보다 크면 한도만큼만 잡음 (혼자서는 항상 지나갈 수 있음).
+
+    Args:
+        max_rows: 최대 구절 수 (0 이면 제한 없음)
+    """
+
+    def __init__(self, max_rows=0):
+        self.max_rows = max_rows
+        self.in_flight = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+
+    def cost(self, rows):
+        return min(rows, self.max_rows) if self.max_rows > 0 else rows
+
+    def acquire(self, rows, stop):
+        """rows 만큼 자리가 날 때까지 대기 (stop 이 set 되면 False)"""
+        rows = self.cost(rows)
+        with self._cond:
+            while self.max_rows > 0 and self.in_flight + rows > self.max_rows:
+                if stop.is_set():
+                    return False
+                self._cond.wait(0.1)
+            self.in_flight += rows
+            self.peak = max(self.peak, self.in_flight)
+        METRICS.set('buffered_rows', self.in_flight)
+        return True
+
+    def release(self, rows):
+        with self._cond:
+            self.in_flight -= self.cost(rows)
+            self._cond.notify_all()
+        METRICS.set('buffered_rows', self.in_flight)
+
+    def describe(self):
+        limit = f'{self.max_rows:,}' if self.max_rows > 0 else 'unlimited'
+        return f'{limit} buffered rows (peak {self.peak:,})'
+
+
+UNBUDGETED = RowBudget()
+
+
+class ImportPipeline:
+    """
+    번역본 하나의 소스 → 싱크 파이프라인
+
+    Args:
+        translation: 번역본 코드 (체크포인트 이름)
+        source: import_sources 의 소스
+        sink: import_sinks 의 싱크
+        books: books 테이블 행 [{id, abbr_eng, book_order, chapters}, ...]
+        manifest: CheckpointManifest
+        server_checksums: delta 모드면 fetch_server_checksums() 결과 (체크포인트 대신 해시로 건너뜀)
+        aligner: 기준 번역본이 아니면 VerseAligner (쓰기 전에, 그리고 delta 해시 전에 정규 절 번호로 정렬)
+        only: (abbr, chapter) 집합이면 그 장만 (audit_corpus 보고서로 다시 임포트할 때)
+        budget: 다른 번역본과 같이 쓰는 RowBudget (큐 + 쓰는 중인 배치의 구절 수 제한)
+    """
+
+    def __init__(self, translation, source, sink, books, manifest, server_checksums=None, aligner=None, only=None,
+                 queue_size=DEFAULT_QUEUE_SIZE, writers=DEFAULT_WRITERS, batch_rows=DEFAULT_BATCH_ROWS,
+                 budget=UNBUDGETED):
+        self.translation = translation
+        self.source = source
+        self.sink = sink
+        self.books = books
+        self.abbr_by_order = {book['book_order']: book['abbr_eng'] for book in books}
+        self.manifest = manifest
+        self.server_checksums = server_checksums
+        self.aligner = aligner
+        self.only = only
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.writers = 1 if sink.streaming else max(1, writers)
+        self.batch_rows = batch_rows
+        self.budget = budget
+
+        self._stop = threading.Event()
+        self._errors = []
+        self._lock = threading.Lock()
+        self.stats = {'chapters_read': 0, 'chapters_skipped': 0, 'chapters_written': 0,
+                      'chapters_failed': 0, 'verses_written': 0,
+                      'source_seconds': 0.0, 'sink_seconds': 0.0}
+
+    def _count(self, **deltas):
+        with self._lock:
+            before = self.stats['chapters_written']
+            for key, value in deltas.items():
+                self.stats[key] += value
+            written = self.stats['chapters_written']
+        if written // PROGRESS_EVERY > before // PROGRESS_EVERY:
+            print(f"  [{self.translation}] {written} chapters written "
+                  f"({self.stats['verses_written']} verses)", flush=True)
+
+    # ---- 소스 단계 ----
+
+    def _wanted(self, book_order, chapter):
+        if self.only is not None and (self.abbr_by_order.get(book_order), chapter) not in self.only:
+            return False
+        if self.server_checksums is not None:
+            return True  # delta: 전부 보고 해시로 판단
+        return not self.manifest.is_done(self.abbr_by_order.get(book_order), chapter)
+
+    def _unchanged(self, ch, abbr):
+        """delta 모드: 서버 해시와 같으면 True (체크포인트도 서버 내용에 맞춤)"""
+        verses = ch.verses
+        if self.aligner is not None:
+            verses = self.aligner.align([ch])[0][0].verses
+        done = self.manifest.is_done(abbr, ch.chapter)
+        if chapter_checksum(verses) == self.server_checksums.get((ch.book_order, ch.chapter)):
+            METRICS.inc('chapters_total', stage='delta', result='unchanged')
+            if not done:
+                self.manifest.mark_done(abbr, ch.chapter, len(verses))
+            return True
+        METRICS.inc('chapters_total', stage='delta', result='changed')
+        if done:
+            self.manifest.mark_pending(abbr, ch.chapter, 'checksum changed')
+        return False
+
+    def _put(self, item):
+        with METRICS.stage('row_budget_wait'):
+            if not self.budget.acquire(len(item.verses), self._stop):
+                return False
+        with METRICS.stage('queue_put_wait'):
+            while not self._stop.is_set():
+                try:
+                    self.queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+        self.budget.release(len(item.verses))
+        return False
+
+    def _produce(self):
+        try:
+            chapters = self.source.iter_chapters(self.books, self._wanted)
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                ch = next(chapters, None)
+                if ch is not None and ch.verses:
+                    with METRICS.stage('normalize'):
+                        ch = normalize_chapter(ch)
+                if ch is not None and ch.verses and self.server_checksums is not None:
+                    skip = self._unchanged(ch, self.abbr_by_order.get(ch.book_order))
+                else:
+                    skip = False
+                self._count(source_seconds=time.perf_counter() - started)
+                if ch is None:
+                    break
+
+                abbr = self.abbr_by_order.get(ch.book_order)
+                self._count(chapters_read=1)
+                if not ch.verses:
+                    self.manifest.mark_failed(abbr, ch.chapter, 'no verses from source')
+                    METRICS.inc('errors_total', stage='source')
+                    self._count(chapters_failed=1)
+                elif skip:
+                    self._count(chapters_skipped=1)
+                elif not self._put(ch):
+                    break
+        except BaseException as e:
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            for _ in range(self.writers):
+                self.queue.put(_END)
+
+    # ---- 싱크 단계 ----
+
+    def _align(self, chapters):
+        """정규 절 번호로 정렬 → (정렬된 장들, verse_alignment 행들). 정렬 못한 절은 경고 + 실패로 기록"""
+        if self.aligner is None:
+            return chapters, None
+        with METRICS.stage('align'):
+            aligned, alignment, unaligned = self.aligner.align(chapters)
+        merged = sum(1 for row in alignment if row.kind == 'merge')
+        if merged:
+            METRICS.inc('verses_total', merged, stage='align', result='merged')
+        if unaligned:
+            METRICS.inc('verses_total', len(unaligned), stage='align', result='unaligned')
+            counts = {}
+            for order, chapter, _ in unaligned:
+                counts[(order, chapter)] = counts.get((order, chapter), 0) + 1
+            for (order, chapter), count in counts.items():
+                print(f"  [{self.translation}] {self.abbr_by_order.get(order)} {chapter}: {count} verses have no "
+                      f"canonical chapter to align to (add a versification rule)", flush=True)
+        return aligned, alignment
+
+    def _get(self):
+        with METRICS.stage('queue_get_wait'):
+            return self.queue.get()
+
+    def _record(self, chapters, written):
+        verses = 0
+        for ch in chapters:
+            abbr = self.abbr_by_order.get(ch.book_order)
+            count = written.get((ch.book_order, ch.chapter), 0)
+            if count:
+                self.manifest.mark_done(abbr, ch.chapter, count)
+                verses += count
+            elif self.aligner is not None:
+                self.manifest.mark_failed(abbr, ch.chapter, 'no canonical chapter to align to')
+            else:
+                self.manifest.mark_failed(abbr, ch.chapter, 'no canonical verses')
+        self._count(chapters_written=sum(1 for ch in chapters if written.get((ch.book_order, ch.chapter))),
+                    chapters_failed=sum(1 for ch in chapters if not written.get((ch.book_order, ch.chapter))),
+                    verses_written=verses)
+
+    def _write_batches(self):
+        """배치 싱크 쓰기 스레드: 큐에서 장을 batch_rows 까지 모아서 write"""
+        finished = False
+        while not finished:
+            item = self._get()
+            if item is _END:
+                return
+            batch, rows = [item], len(item.verses)
+            while rows < self.batch_rows:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                batch.append(item)
+                rows += len(item.verses)
+
+            started = time.perf_counter()
+            budgeted = [len(ch.verses) for ch in batch]
+            try:
+                batch, alignment = self._align(batch)
+                written = self.sink.write(batch)
+                if alignment is not None:
+                    self.sink.write_alignment(batch, alignment)
+            except Exception as e:
+                print(f"  Error writing {len(batch)} chapters ({rows} verses): {e}", flush=True)
+                METRICS.inc('errors_total', stage='upsert')
+                for ch in batch:
+                    self.manifest.mark_failed(self.abbr_by_order.get(ch.book_order), ch.chapter, e)
+                self._count(chapters_failed=len(batch))
+            else:
+                self._record(batch, written)
+            finally:
+                for rows in budgeted:
+                    self.budget.release(rows)
+                self._count(sink_seconds=time.perf_counter() - started)
+
+    def _drain(self):
+        """큐의 장을 하나씩 (다음 장을 꺼낼 때 앞 장의 예산을 돌려줌 = 싱크가 앞 장을 다 흘려보낸 뒤)"""
+        while True:
+            item = self._get()
+            if item is _END:
+                return
+            try:
+                yield item
+            finally:
+                self.budget.release(len(item.verses))
+
+    def _write_stream(self):
+        """
+        스트림 싱크 쓰기 스레드: 큐 전체를 싱크 하나에 흘려보내고 커밋 후 기록
+
+        커밋 후 기록에 필요한 것은 장 번호뿐이라 본문 없는 ChapterKey 만 모아 둠
+        (번역본 전체 본문을 커밋할 때까지 들고 있지 않음).
+        """
+        started = time.perf_counter()
+        drained = []
+        alignment = [] if self.aligner is not None else None
+
+        def chapters():
+            for ch in self._drain():
+                aligned, rows = self._align([ch])
+                if rows:
+                    alignment.extend(rows)
+                drained.append(ChapterKey(ch.book_order, ch.chapter))
+                yield aligned[0]
+
+        try:
+            written = self.sink.write_stream(chapters())
+            if alignment is not None:
+                self.sink.write_alignment(drained, alignment)
+        except BaseException as e:
+            self._errors.append(e)
+            self._stop.set()
+            # 소스 스레드가 put 에서 막혀 있지 않도록 큐를 비움
+            for _ in self._drain():
+                pass
+            return
+        finally:
+            self._count(sink_seconds=time.perf_counter() - started)
+        self._record(drained, written)
+
+    def run(self):
+        """파이프라인 실행 (끝날 때까지 대기). Returns: stats dict"""
+        started = time.perf_counter()
+        target = self._write_stream if self.sink.streaming else self._write_batches
+        threads = [threading.Thread(target=self._produce, name=f'{self.translation}-source', daemon=True)]
+        threads += [threading.Thread(target=target, name=f'{self.translation}-writer-{i}', daemon=True)
+                    for i in range(self.writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.stats['wall_seconds'] = time.perf_counter() - started
+        if self._errors:
+            raise self._errors[0]
+        return self.stats
+
+
+def format_pipeline_stats(translation, stats, writers):
+    """파이프라인 결과 요약 (소스/싱크 중 병목 표시)"""
+    sink_seconds = stats['sink_seconds'] / writers
+    bottleneck = 'sink' if sink_seconds > stats['source_seconds'] else 'source'
+    return (f"[{translation}] {stats['chapters_written']} chapters / {stats['verses_written']} verses written, "
+            f"{stats['chapters_skipped']} unchanged, {stats['chapters_failed']} failed in "
+            f"{stats['wall_seconds']:.1f}s (source busy {stats['source_seconds']:.1f}s, "
+            f"sink busy {sink_seconds:.1f}s x {writers} writers -> {bottleneck}-bound)")
+
+
+class ImportContext:
+    """
+    번역본 여러 개를 임포트할 때 같이 쓰는 것 (스레드 공용, 처음 필요할 때 한 번만 읽음)
+
+    Args:
+        supabase: supabase Client (HTTP 연결 풀 하나를 모든 번역본이 같이 씀)
+        env: load_env() 결과
+        limiter: 모든 싱크가 같이 쓰는 WriteLimiter
+        fetch_controller: 모든 bolls.life 소스가 같이 쓰는 AimdRateController (업스트림 전체 요청 속도)
+        budget: 모든 파이프라인이 같이 쓰는 RowBudget (읽었지만 아직 쓰지 않은 구절 수)
+    """
+
+    checkpoint_dir = DEFAULT_CHECKPOINT_DIR
+    resumable = True   # False 면 체크포인트를 무시하고 번역본마다 처음부터
+    defer_text_index = None   # PgSink 에 넘길 값 (None = 적재 크기를 보고 싱크가 정함)
+
+    def __init__(self, supabase, env, limiter=None, fetch_controller=None, budget=None):
+        self.supabase = supabase
+        self.env = env
+        self.limiter = limiter or WriteLimiter()
+        self.fetch_controller = fetch_controller
+        self.budget = budget or UNBUDGETED
+        self._lock = threading.Lock()
+        self._books = None
+        self._translation_ids = None
+        self._verse_index = None
+        self._text_index_conn = None
+
+    def books(self):
+        with self._lock:
+            if self._books is None:
+                self._books = (self.supabase.table('books').select('id, abbr_eng, book_order, chapters')
+                               .order('book_order').execute().data)
+            return self._books
+
+    def translation_id(self, code):
+        with self._lock:
+            if self._translation_ids is None:
+                rows = self.supabase.table('translations').select('id, code').execute().data
+                self._translation_ids = {row['code']: row['id'] for row in rows}
+        if code not in self._translation_ids:
+            raise ValueError(f"{code} is not in the translations table")
+        return self._translation_ids[code]
+
+    def verse_index(self):
+        """정규 구절 ID 인덱스 (모든 번역본이 같은 것을 씀)"""
+        with self._lock:
+            if self._verse_index is None:
+                self._verse_index = VerseIdIndex.load(self.supabase)
+                print(f"  Loaded {len(self._verse_index)} canonical verse IDs", flush=True)
+            return self._verse_index
+
+    def invalidate_verse_index(self):
+        """기준 번역본이 구절을 새로 만들었으면 다음 번역본을 위해 다시 읽도록"""
+        with self._lock:
+            self._verse_index = None
+
+    def defer_text_index_once(self, force):
+        """
+        --sink pg 로 번역본 여러 개: 번역본마다 같은 전역 인덱스를 지웠다 만들지 않게 함
+        (동시 적재가 그 lock 에 줄을 서고 인덱스를 번역본 수만큼 다시 만들게 되므로)
+
+        Args:
+            force: True 면 여기서 한 번 지우고 restore_text_index() 에서 한 번 다시 만듦
+                   (False 면 적재 중 INSERT 가 인덱스를 갱신)
+        """
+        self.defer_text_index = False
+        if not force:
+            return
+        conn = connect(env=self.env)
+        if drop_text_index(conn):
+            self._text_index_conn = conn
+            print("  Text index dropped for the run (rebuilt after all translations)", flush=True)
+        else:
+            conn.close()
+
+    def restore_text_index(self):
+        """defer_text_index_once 로 지운 인덱스를 다시 만듦 (실패한 번역본이 있어도)"""
+        conn, self._text_index_conn = self._text_index_conn, None
+        if conn is None:
+            return
+        started = time.perf_counter()
+        try:
+            with METRICS.stage('pg_rebuild_index'):
+                create_text_index(conn)
+        finally:
+            conn.close()
+        print(f"  Text index rebuilt in {time.perf_counter() - started:.1f}s", flush=True)
+
+    def finish(self, failures):
+        """모든 번역본이 끝난 뒤 (failures: {번역본: 예외})"""
+
+
+class BundleContext(ImportContext):
+    """
+    --sink sqlite 용 ImportContext: books / translations / 정규 구절을 Supabase 대신 번들에서 읽음
+
+    번들은 실행 전체가 트랜잭션 하나라서 커밋 전 체크포인트로 이어서 할 수 없음 → 번역본마다 처음부터
+    (체크포인트는 번들 옆 폴더에 기록만). 번역본이 하나라도 실패하면 finish() 가 롤백 (예전 번들 그대로).
+
+    Args:
+        bundle: sqlite_bundle.SqliteBundle (begin() 을 여기서 부름)
+    """
+
+    resumable = False
+
+    def __init__(self, bundle, limiter=None, fetch_controller=None, budget=None):
+        super().__init__(None, {}, limiter, fetch_controller, budget)
+        self.bundle = bundle
+        self.checkpoint_dir = bundle.path.with_name(bundle.path.name + '.checkpoints')
+        bundle.begin()
+        self._books = bundle.books()
+        self._translation_ids = bundle.translation_ids()
+
+    def verse_index(self):
+        with self._lock:
+            if self._verse_index is None:
+                self._verse_index = self.bundle.verse_index()
+                if not len(self._verse_index):
+                    raise ValueError('bundle has no canonical verses yet: import the base translation (korHRV) first')
+                print(f"  Loaded {len(self._verse_index)} canonical verse IDs from {self.bundle.path}", flush=True)
+            return self._verse_index
+
+    def finish(self, failures):
+        if failures:
+            self.bundle.abort()
+            print(f"  Bundle: rolled back, {self.bundle.path} unchanged", flush=True)
+            return
+        started = time.perf_counter()
+        built = self.bundle.finish()
+        codes = {tid: code for code, tid in self._translation_ids.items()}
+        size = self.bundle.path.stat().st_size / 1024 / 1024
+        print(f"  Bundle: {self.bundle.path} ({size:.1f} MB), indexes + FTS in "
+              f"{time.perf_counter() - started:.1f}s", flush=True)
+        for tid, (verses, headings) in built.items():
+            print(f"    {codes.get(tid, tid):<10} {verses:>7} verses  {headings:>5} headings", flush=True)
+
+
+def build_source(translation, config, args, controller=None):
+    """설정 + 명령행 인자 → 소스 어댑터 (--dump 가 있으면 덤프 파일이 우선)"""
+    dump = getattr(args, 'dump', None)
+    if dump or config['source'] == 'dump':
+        return DumpSource(dump or config['path'])
+    if config['source'] == 'hrv':
+        return HrvSource(getattr(args, 'hrv_dir', None) or config.get('directory', HRV_DIR))
+    if config['source'] == 'bolls':
+        cache = None
+        if not getattr(args, 'no_cache', False):
+            cache = ChapterCache(getattr(args, 'cache_dir', DEFAULT_CACHE_DIR), offline=getattr(args, 'offline', False))
+        return BollsSource(
+            config.get('bolls_code', translation),
+            base_url=getattr(args, 'base_url', BOLLS_BASE_URL),
+            concurrency=getattr(args, 'concurrency', DEFAULT_CONCURRENCY),
+            rate=getattr(args, 'rate', DEFAULT_RATE),
+            cache=cache,
+            controller=controller,
+        )
+    raise ValueError(f"Unknown source for {translation}: {config['source']}")
+
+
+def import_translation(translation, args, context):
+    """
+    번역본 하나 임포트
+
+    Args:
+        context: ImportContext (books / 구절 ID 인덱스 / 쓰기 제한을 다른 번역본과 같이 씀)
+
+    Returns:
+        dict: 파이프라인 stats (할 일이 없으면 None)
+    """
+    config = TRANSLATION_SOURCES.get(translation)
+    if config is None:
+        raise ValueError(f"{translation} is not configured in TRANSLATION_SOURCES")
+    create_verses = config.get('create_verses', False)
+    supabase = context.supabase
+
+    books = context.books()
+    translation_id = context.translation_id(translation)
+    print(f"\n[{translation}] translation_id={translation_id}, {len(books)} books, "
+          f"source={config['source'] if not getattr(args, 'dump', None) else 'dump'}, sink={args.sink}", flush=True)
+
+    # 체크포인트에서 이미 끝난 장은 건너뜀 (--delta 는 모든 장을 보고 서버 해시와 다른 장만 씀)
+    manifest = CheckpointManifest(translation, directory=context.checkpoint_dir,
+                                  restart=args.restart or not context.resumable)
+    units = [(book['abbr_eng'], chapter) for book in books for chapter in range(1, book['chapters'] + 1)]
+    only = None
+    if args.chapters_from:
+        # 점검 보고서의 장만, 체크포인트에 끝났다고 되어 있어도 다시
+        only = reimport_units(args.chapters_from, translation)
+        for abbr, chapter in only:
+            manifest.mark_pending(abbr, chapter, 'audit')
+        units = [unit for unit in units if unit in only]
+        print(f"  [{translation}] {len(only)} chapters from {args.chapters_from}", flush=True)
+    pending = len(manifest.pending(units))
+    print(f"  [{translation}] {pending} chapters pending ({manifest.summary()})", flush=True)
+    if not pending and not args.delta:
+        manifest.close()
+        print(f"[OK] {translation}: nothing to do, all chapters already imported", flush=True)
+        return None
+
+    server_checksums = None
+    if args.delta:
+        with METRICS.stage('checksum'):
+            server_checksums = fetch_server_checksums(supabase, translation_id)
+        print(f"  [{translation}] Delta: loaded checksums for {len(server_checksums)} stored chapters", flush=True)
+
+    # 정규 구절 ID (PostgREST 싱크, 또는 기준 번역본이 아니어서 정규 절 번호로 정렬해야 할 때)
+    verse_index = None
+    if args.sink == 'rest' or not create_verses:
+        verse_index = context.verse_index()
+
+    aligner = None
+    if not create_verses:
+        with METRICS.stage('aligner_build'):
+            aligner = VerseAligner.from_index(verse_index, books, config.get('versification', ()))
+
+    source = build_source(translation, config, args, context.fetch_controller)
+    if args.sink == 'pg':
+        defer_text_index = context.defer_text_index
+        if defer_text_index is None and args.defer_text_index:
+            defer_text_index = True
+        sink = PgSink(context.env, translation, create_verses=create_verses, limiter=context.limiter,
+                      defer_text_index=defer_text_index)
+    elif args.sink == 'sqlite':
+        sink = BundleSink(context.bundle, translation_id, books, verse_index, create_verses=create_verses)
+    else:
+        sink = RestSink(supabase, translation_id, books, verse_index, create_verses=create_verses,
+                        limiter=context.limiter)
+
+    pipeline = ImportPipeline(
+        translation, source, sink, books, manifest,
+        server_checksums=server_checksums, aligner=aligner, only=only,
+        queue_size=args.queue_size, writers=args.writers, batch_rows=args.batch_rows, budget=context.budget,
+    )
+    try:
+        with manifest:
+            stats = pipeline.run()
+            print(f"  [{translation}] {manifest.summary()}", flush=True)
+    finally:
+        source.close()
+        sink.close()
+
+    stats['peak_rss_mb'] = peak_rss_mb()
+    print(format_pipeline_stats(translation, stats, pipeline.writers), flush=True)
+    if create_verses and stats['chapters_written']:
+        context.invalidate_verse_index()
+    if args.sink == 'sqlite':
+        return stats   # 번들 구절 수는 BundleContext.finish() 가 출력
+
+    # 전체 count 대신 장별 점검 (빠진 장 / 일부만 있는 장)
+    try:
+        audit = audit_translation(supabase, books, {'id': translation_id, 'code': translation})
+    except APIError as e:
+        print(f"  Audit skipped ({e.message}; apply supabase/migrations/20260118_corpus_audit.sql)", flush=True)
+    else:
+        print(f"  [{translation}] audit: {audit['verses']} verses in {audit['chapters']}/"
+              f"{audit['expected_chapters']} chapters, {len(audit['missing_chapters'])} missing, "
+              f"{len(audit['partial_chapters'])} partial", flush=True)
+
+    # 검색창 자동 완성 사전: 바뀐 장만 다시 읽어서 갱신 (build_suggest_index.py)
+    if stats['chapters_written'] and not args.skip_suggest:
+        try:
+            with METRICS.stage('suggest'):
+                update_suggest_index(supabase, {'id': translation_id, 'code': translation})
+        except APIError as e:
+            print(f"  Suggest dictionary skipped ({e.message}; apply supabase/migrations/20260119_search_suggest.sql)",
+                  flush=True)
+    return stats
+
+
+def add_import_arguments(parser):
+    """모든 임포트 공통 인자 (체크포인트 / delta / 싱크 / 파이프라인)"""
+    parser.add_argument('--restart', action='store_true', help='체크포인트를 지우고 처음부터 다시 임포트')
+    parser.add_argument('--delta', action='store_true',
+                        help='장별 해시를 서버와 비교해서 내용이 바뀐 장만 다시 씀 (체크포인트보다 우선)')
+    parser.add_argument('--sink', choices=['rest', 'pg', 'sqlite'], default='rest',
+                        help='쓰기 경로: rest=PostgREST upsert, pg=Postgres 직접 연결 COPY (SUPABASE_DB_URL 필요), '
+                             'sqlite=오프라인 번들 파일 (--bundle)')
+    parser.add_argument('--defer-text-index', action='store_true',
+                        help='--sink pg: 병합 전에 본문 GIN 인덱스를 지우고 병합 후 다시 만듦 (그동안 읽기도 막힘, '
+                             '기본은 새로 생길 행이 테이블의 1/4 이상일 때만. 번역본 여러 개면 실행 전체에서 한 번)')
+    parser.add_argument('--bundle', default=DEFAULT_BUNDLE_PATH,
+                        help=f'--sink sqlite 의 번들 파일 (기본: {DEFAULT_BUNDLE_PATH})')
+    group = parser.add_argument_group('pipeline')
+    group.add_argument('--writers', type=int, default=DEFAULT_WRITERS, help='PostgREST 쓰기 스레드 수')
+    group.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                       help='소스와 싱크 사이 큐에 쌓아둘 최대 장 수 (가득 차면 소스가 기다림)')
+    group.add_argument('--batch-rows', type=int, default=DEFAULT_BATCH_ROWS, help='쓰기 요청 하나에 담을 최대 구절 수')
+    group.add_argument('--max-buffered-rows', type=int, default=DEFAULT_BUFFERED_ROWS,
+                       help='모든 번역본을 합쳐 읽었지만 아직 쓰지 않은 최대 구절 수 (0 = 제한 없음, 큐 크기와 별개)')
+    group.add_argument('--skip-suggest', action='store_true',
+                       help='임포트 후 검색 자동 완성 사전(build_suggest_index.py)을 갱신하지 않음')
+    group.add_argument('--chapters-from', default=None,
+                       help='audit_corpus.py 보고서(JSON)의 reimport 에 있는 장만 다시 임포트')
+    group.add_argument('--parallel', type=int, default=DEFAULT_PARALLEL, help='동시에 임포트할 번역본 수')
+    group.add_argument('--write-concurrency', type=int, default=DEFAULT_WRITE_CONCURRENCY,
+                       help='모든 번역본을 합쳐 동시에 진행 중인 쓰기 요청 수 (0 = 제한 없음)')
+    group.add_argument('--write-rate', type=float, default=0.0,
+                       help='모든 번역본을 합쳐 초당 쓰는 최대 행 수 (0 = 제한 없음)')
+
+
+def add_bolls_arguments(parser):
+    """bolls.life 소스 인자"""
+    group = parser.add_argument_group('bolls.life')
+    group.add_argument('--base-url', default=BOLLS_BASE_URL, help='bolls.life API 주소 (로컬 스텁 서버 테스트용)')
+    group.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help='시작 동시 요청 수 (모든 번역본 합계, 응답을 보고 조절)')
+    group.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                       help='시작 초당 요청 수 (모든 번역본 합계, 응답을 보고 조절)')
+    group.add_argument('--max-concurrency', type=int, default=None, help='동시 요청 수 상한 (기본: --concurrency x 4)')
+    group.add_argument('--max-rate', type=float, default=None, help='초당 요청 수 상한 (기본: --rate x 4)')
+    group.add_argument('--fixed-rate', action='store_true',
+                       help='속도 조절 끔 (--rate / --concurrency 고정, Retry-After 는 지킴)')
+    group.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='장 응답 캐시 폴더')
+    group.add_argument('--no-cache', action='store_true', help='캐시 사용 안 함')
+    group.add_argument('--offline', action='store_true', help='캐시에 있는 장만 사용 (네트워크 요청 없음)')
+
+
+def _import_all(translations, args, context):
+    """
+    번역본들을 --parallel 개씩 동시에 임포트
+
+    Returns:
+        (results, failures): {번역본: stats}, {번역본: 예외}
+    """
+    results, failures = {}, {}
+    if not translations:
+        return results, failures
+
+    def run_one(translation):
+        try:
+            results[translation] = import_translation(translation, args, context)
+        except Exception as e:
+            print(f"[FAILED] {translation}: {e}", flush=True)
+            failures[translation] = e
+
+    workers = max(1, min(args.parallel, len(translations)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='import') as pool:
+        list(pool.map(run_one, translations))
+    return results, failures
+
+
+def format_import_summary(results, failures, wall_seconds):
+    """번역본별 wall 시간 + 전체 wall 시간 (동시 임포트가 얼마나 겹쳤는지) + 번역본이 끝났을 때까지의 최대 RSS"""
+    lines = [f"\nImported {len(results)} translation(s) in {wall_seconds:.1f}s:"]
+    for translation, stats in results.items():
+        if stats is None:
+            lines.append(f"  {translation:<10} nothing to do")
+        else:
+            rss = f"  peak RSS {stats['peak_rss_mb']:6.1f} MB" if stats.get('peak_rss_mb') is not None else ''
+            lines.append(f"  {translation:<10} {stats['wall_seconds']:7.1f}s  {stats['verses_written']:>7} verses{rss}")
+    for translation, error in failures.items():
+        lines.append(f"  {translation:<10} FAILED: {error}")
+    return '\n'.join(lines)
+
+
+def run_import(translations, args):
+    """
+    번역본들을 임포트 (임포트 스크립트들의 run 본문)
+
+    정규 구절을 만드는 기준 번역본을 먼저 끝내고, 나머지는 --parallel 개씩 동시에.
+    기준 번역본이 실패하면 나머지는 임포트하지 않고 실패로 기록함 (빠진 / 예전 구절 ID 에 쓰지 않도록).
+    """
+    controller = None
+    if hasattr(args, 'rate') and not getattr(args, 'dump', None):
+        controller = AimdRateController(
+            args.rate, args.concurrency, max_rate=args.max_rate, max_concurrency=args.max_concurrency,
+            adaptive=not args.fixed_rate,
+        )
+    limiter = WriteLimiter(args.write_concurrency, args.write_rate)
+    budget = RowBudget(args.max_buffered_rows)
+    if args.sink == 'sqlite':
+        if args.delta or args.chapters_from:
+            raise ValueError('--sink sqlite rebuilds whole translations: --delta / --chapters-from are not supported')
+        context = BundleContext(SqliteBundle(args.bundle), limiter, controller, budget)
+    else:
+        env = load_env()
+        context = ImportContext(create_supabase(env), env, limiter, controller, budget)
+    base = [t for t in translations if TRANSLATION_SOURCES.get(t, {}).get('create_verses')]
+    rest = [t for t in translations if t not in base]
+    if len(translations) > 1:
+        print(f"Importing {', '.join(translations)} (parallel {args.parallel}, {context.limiter.describe()}, "
+              f"{context.budget.max_rows or 'unlimited'} buffered rows)", flush=True)
+
+    if args.sink == 'pg' and len(translations) > 1:
+        context.defer_text_index_once(args.defer_text_index)
+
+    started = time.perf_counter()
+    try:
+        results, failures = _import_all(base, args, context)
+        if failures and rest:
+            skipped = RuntimeError(f"skipped: base translation {', '.join(failures)} failed")
+            print(f"[SKIPPED] {', '.join(rest)}: {skipped}", flush=True)
+            more_results, more_failures = {}, {translation: skipped for translation in rest}
+        else:
+            more_results, more_failures = _import_all(rest, args, context)
+    finally:
+        context.restore_text_index()
+    results.update(more_results)
+    failures.update(more_failures)
+    context.finish(failures)
+
+    if len(translations) > 1:
+        print(format_import_summary(results, failures, time.perf_counter() - started), flush=True)
+    rss = peak_rss_mb()
+    print(f"  Memory: {context.budget.describe()}" + (f", peak RSS {rss:.1f} MB" if rss else ''), flush=True)
+    if controller is not None and (controller.increases or controller.decreases or controller.paused_seconds):
+        print(f"  Fetch: {controller.describe()}", flush=True)
+    if failures and len(translations) == 1:
+        raise next(iter(failures.values()))
+    if failures:
+        raise RuntimeError(f"Import failed for {', '.join(failures)}")
+    print("\n[OK] Import completed!", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import translations through the source -> sink pipeline')
+    parser.add_argument('--translation', action='append', choices=sorted(TRANSLATION_SOURCES),
+                        help='번역본 코드 (여러 번 지정 가능, 없으면 설정된 번역본 전부)')
+    parser.add_argument('--dump', default=None,
+                        help='설정된 소스 대신 읽을 덤프 파일 (.json / .jsonl / .gz / bolls.life 번역본 .zip)')
+    parser.add_argument('--hrv-dir', default=None, help=f'HRV 텍스트 폴더 (기본: {HRV_DIR})')
+    add_import_arguments(parser)
+    add_bolls_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    translations = args.translation or list(TRANSLATION_SOURCES)
+    if args.dump and len(translations) != 1:
+        parser.error('--dump 는 번역본 하나에만 쓸 수 있음')
+
+    with metrics_run(args):
+        run_import(translations, args)
+
+if __name__ == '__main__':
+    main()
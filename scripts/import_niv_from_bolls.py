@@ -4,102 +4,216 @@
 bolls.life API에서 NIV2011 성경을 가져와서 데이터베이스에 삽입하는 스크립트
 """
 
-import os
+import json
 import time
+import argparse
 import requests
-from supabase import create_client, Client
-from dotenv import load_dotenv
 
-# .env.local 파일 로드
-load_dotenv('.env.local')
+from chapter_cache import DEFAULT_CACHE_DIR, ChapterCache
+from bolls_client import DEFAULT_RATE
+from metrics import METRICS, add_metrics_arguments, metrics_run
+from rate_controller import AimdRateController
+from supabase_env import create_supabase
 
-# Supabase 설정
-SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise Exception("환경 변수가 설정되지 않았습니다")
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = create_supabase()
 
 # bolls.life API URL
 BOLLS_API_URL = "https://bolls.life/get-text/NIV2011/{book}/{chapter}/"
 
-def fetch_chapter_from_bolls(book_number, chapter):
+PAGE_SIZE = 1000   # PostgREST 기본 max-rows
+
+# 요청 간격 / 타임아웃은 응답을 보고 조절 (429 / 5xx / 타임아웃이면 느리게, Retry-After 지킴)
+RATE = AimdRateController(DEFAULT_RATE)
+
+def fetch_chapter_from_bolls(book_number, chapter, cache=None):
     """
     bolls.life API에서 특정 장의 NIV2011 데이터를 가져옴
 
     Args:
         book_number: 책 번호 (1-66)
         chapter: 장 번호
+        cache: ChapterCache (있으면 캐시된 장은 요청 없이 반환)
 
     Returns:
         list: [{"verse": 1, "text": "..."}, ...]
     """
     url = BOLLS_API_URL.format(book=book_number, chapter=chapter)
 
-    try:
-        response = requests.get(url, timeout=10)
+    def download():
+        with METRICS.timer('http_request_seconds', target='bolls', method='GET'):
+            response = RATE.send(lambda timeout: requests.get(url, timeout=timeout))
+        METRICS.inc('http_requests_total', target='bolls', method='GET', status=response.status_code)
+        METRICS.inc('http_bytes_total', len(response.content), target='bolls', direction='received')
         response.raise_for_status()
-        data = response.json()
+        return response.content
 
+    try:
         # API 응답: [{"pk": ..., "verse": 1, "text": "..."}, ...]
-        return data
+        if cache is None:
+            return json.loads(download())
+        return cache.get_or_fetch('NIV2011', book_number, chapter, download)
     except Exception as e:
         print(f"  Error fetching {url}: {e}")
         return None
 
-def import_book_niv(book_info):
+def format_rate(rows, seconds):
+    """쓰기 처리량 표시 (rows/s)"""
+    if seconds <= 0:
+        return f"{rows} rows"
+    return f"{rows} rows in {seconds:.2f}s, {rows / seconds:,.0f} rows/s"
+
+def update_verses_per_verse(book_name, chapter, verses_data):
+    """
+    기존 방식: 구절마다 UPDATE 요청 하나씩 (비교용)
+
+    Returns:
+        int: 갱신된 구절 수
+    """
+    updated = 0
+
+    for verse_item in verses_data:
+        verse_number = verse_item['verse']
+        text = verse_item['text']
+
+        try:
+            # verses 테이블의 niv 컬럼 업데이트
+            with METRICS.stage('upsert', table='verses'):
+                supabase.table('verses').update({
+                    'niv': text
+                }).eq('book', book_name).eq('chapter', chapter).eq('verse', verse_number).execute()
+
+            updated += 1
+        except Exception as e:
+            print(f"  Error updating {book_name} {chapter}:{verse_number}: {e}", flush=True)
+            METRICS.inc('errors_total', stage='upsert')
+
+    METRICS.inc('rows_total', updated, stage='upsert', table='verses')
+    return updated
+
+def fetch_existing_keys(book_name):
+    """
+    verses 테이블에 이미 있는 이 책의 (chapter, verse) 들
+
+    bulk upsert 는 없는 행을 새로 만들므로, 구절별 UPDATE 처럼 기존 행에만 쓰도록 거르는 데 씀.
+    """
+    keys = set()
+    offset = 0
+    while True:
+        page = (supabase.table('verses').select('chapter, verse').eq('book', book_name)
+                .order('chapter').order('verse').range(offset, offset + PAGE_SIZE - 1).execute()).data
+        keys.update((row['chapter'], row['verse']) for row in page)
+        if len(page) < PAGE_SIZE:
+            return keys
+        offset += PAGE_SIZE
+
+def upsert_verses_bulk(rows):
+    """
+    버퍼에 모인 구절들을 (book, chapter, verse) 기준 upsert 한 번으로 반영
+
+    niv 컬럼만 보내므로 기존 행의 다른 번역 컬럼(korhrv 등)은 그대로 유지됨.
+    upsert 는 없는 (book, chapter, verse) 행을 새로 만들므로, 호출하는 쪽이 기존 행만 넘김
+    (fetch_existing_keys, 구절별 UPDATE 와 같은 결과).
+
+    Args:
+        rows: [{'book': ..., 'chapter': ..., 'verse': ..., 'niv': ...}, ...]
+
+    Returns:
+        int: 반영된 구절 수 (요청이 실패하면 0)
+    """
+    if not rows:
+        return 0
+
+    try:
+        with METRICS.stage('upsert', table='verses'):
+            supabase.table('verses').upsert(
+                rows,
+                on_conflict='book,chapter,verse'
+            ).execute()
+        METRICS.inc('rows_total', len(rows), stage='upsert', table='verses')
+        return len(rows)
+    except Exception as e:
+        print(f"  Error upserting {len(rows)} verses: {e}", flush=True)
+        METRICS.inc('errors_total', stage='upsert')
+        return 0
+
+def import_book_niv(book_info, mode='book', cache=None):
     """
     한 권의 성경 NIV2011 데이터를 데이터베이스에 삽입
 
     Args:
         book_info: {name, book_order, chapters} from books table
+        mode: 'verse'   - 구절마다 UPDATE (기존 방식)
+              'chapter' - 장 단위로 모아서 upsert 한 번
+              'book'    - 책 전체를 모아서 upsert 한 번 (실패하면 장 단위로 다시)
+              chapter / book 은 verses 에 이미 있는 구절만 씀 (없는 구절은 건너뜀, UPDATE 와 같음)
+        cache: ChapterCache (선택)
+
+    Returns:
+        (updated, write_seconds): 반영된 구절 수, DB 쓰기에 걸린 시간
     """
     book_name = book_info['name']
     book_order = book_info['book_order']
     total_chapters = book_info['chapters']
 
-    print(f"\n[{book_order}/66] Importing {book_name} (NIV2011)...", flush=True)
+    print(f"\n[{book_order}/66] Importing {book_name} (NIV2011, mode={mode})...", flush=True)
 
     total_updated = 0
+    write_seconds = 0.0
+    book_buffer = []
+    existing = fetch_existing_keys(book_name) if mode != 'verse' else None
+    skipped = 0
 
     for chapter in range(1, total_chapters + 1):
         # bolls.life API에서 데이터 가져오기
-        verses_data = fetch_chapter_from_bolls(book_order, chapter)
+        with METRICS.stage('fetch'):
+            verses_data = fetch_chapter_from_bolls(book_order, chapter, cache)
 
         if not verses_data:
             print(f"  Failed to fetch {book_name} {chapter}", flush=True)
             continue
 
-        # 배치로 업데이트
-        batch_size = 50
-        for i in range(0, len(verses_data), batch_size):
-            batch = verses_data[i:i+batch_size]
-
-            for verse_item in batch:
-                verse_number = verse_item['verse']
-                text = verse_item['text']
-
-                try:
-                    # verses 테이블의 niv 컬럼 업데이트
-                    supabase.table('verses').update({
-                        'niv': text
-                    }).eq('book', book_name).eq('chapter', chapter).eq('verse', verse_number).execute()
-
-                    total_updated += 1
-                except Exception as e:
-                    print(f"  Error updating {book_name} {chapter}:{verse_number}: {e}", flush=True)
-
-        print(f"  Chapter {chapter}/{total_chapters} - {len(verses_data)} verses updated", flush=True)
-
-        # API Rate Limit 방지
-        time.sleep(0.1)
-
-    print(f"  [OK] Completed {book_name}: {total_updated} verses", flush=True)
-
-def main():
-    """전체 성경 66권 NIV2011 가져오기"""
+        rows = [
+            {'book': book_name, 'chapter': chapter, 'verse': v['verse'], 'niv': v['text']}
+            for v in verses_data
+            if existing is None or (chapter, v['verse']) in existing
+        ]
+        skipped += len(verses_data) - len(rows) if existing is not None else 0
+
+        started = time.perf_counter()
+        if mode == 'verse':
+            total_updated += update_verses_per_verse(book_name, chapter, verses_data)
+        elif mode == 'chapter':
+            total_updated += upsert_verses_bulk(rows)
+        else:
+            book_buffer.extend(rows)
+        write_seconds += time.perf_counter() - started
+
+        print(f"  Chapter {chapter}/{total_chapters} - {len(verses_data)} verses fetched", flush=True)
+
+    if mode == 'book':
+        started = time.perf_counter()
+        updated = upsert_verses_bulk(book_buffer)
+        if book_buffer and not updated:
+            # 요청 하나가 실패해도 책 전체를 버리지 않도록 장 단위로 다시
+            print(f"  Retrying {book_name} chapter by chapter", flush=True)
+            chapters = {}
+            for row in book_buffer:
+                chapters.setdefault(row['chapter'], []).append(row)
+            updated = sum(upsert_verses_bulk(chapter_rows) for chapter_rows in chapters.values())
+        total_updated += updated
+        write_seconds += time.perf_counter() - started
+
+    if skipped:
+        print(f"  Skipped {skipped} verses with no row in verses", flush=True)
+
+    print(f"  [OK] Completed {book_name}: {total_updated} verses "
+          f"({format_rate(total_updated, write_seconds)})", flush=True)
+
+    return total_updated, write_seconds
+
+def run(args):
+    """main 본문 (인자 파싱 후, 계측 안에서 실행)"""
+    cache = None if args.no_cache else ChapterCache(args.cache_dir, offline=args.offline)
 
     print("Fetching books from database...", flush=True)
 
@@ -109,17 +223,41 @@ def main():
     books = result.data
     print(f"Found {len(books)} books\n", flush=True)
 
-    print("Starting NIV2011 import from bolls.life API...", flush=True)
+    print(f"Starting NIV2011 import from bolls.life API (mode={args.mode})...", flush=True)
 
     # 전체 66권 임포트
+    total_updated = 0
+    total_write_seconds = 0.0
     for book in books:
-        import_book_niv(book)
+        updated, write_seconds = import_book_niv(book, mode=args.mode, cache=cache)
+        total_updated += updated
+        total_write_seconds += write_seconds
 
     print("\n[OK] NIV2011 Import completed!", flush=True)
+    print(f"Write throughput: {format_rate(total_updated, total_write_seconds)}", flush=True)
+
+    if cache is not None:
+        cache.save()
+        print(cache.stats_line(), flush=True)
 
     # 데이터 확인
     result = supabase.table('verses').select('id', count='exact').not_.is_('niv', 'null').execute()
     print(f"Total verses with NIV translation: {result.count}")
 
+def main():
+    """전체 성경 66권 NIV2011 가져오기"""
+
+    parser = argparse.ArgumentParser(description='Import NIV2011 from bolls.life into the wide verses table')
+    parser.add_argument('--mode', choices=['verse', 'chapter', 'book'], default='book',
+                        help='쓰기 방식: verse=구절별 UPDATE, chapter/book=단위별 bulk upsert')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='장 응답 캐시 폴더')
+    parser.add_argument('--no-cache', action='store_true', help='캐시 사용 안 함')
+    parser.add_argument('--offline', action='store_true', help='캐시에 있는 장만 사용 (네트워크 요청 없음)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    with metrics_run(args):
+        run(args)
+
 if __name__ == '__main__':
     main()
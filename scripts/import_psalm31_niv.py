@@ -1,39 +1,45 @@
 #!/usr/bin/env python3
 """
 Psalm 31 NIV import - 누락된 장 재시도
+
+참고: import_normalized_niv.py 는 체크포인트(.cache/checkpoints/NIV.jsonl)로
+실패한 장만 다시 처리하므로, 새로 빠진 장은 그 스크립트를 다시 실행하면 됨.
 """
-import os
 import sys
-import time
+import json
+import argparse
 import requests
-from supabase import create_client, Client
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv('.env.local')
 
-SUPABASE_URL = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+from bolls_client import DEFAULT_RATE
+from chapter_cache import ChapterCache
+from rate_controller import AimdRateController
+from supabase_env import create_supabase
+from text_normalize import clean_texts, search_folds
+from verse_index import VerseIdIndex
 
-if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-    print("Error: Missing Supabase credentials in .env.local")
-    sys.exit(1)
+supabase = create_supabase(instrument=False)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+# 요청 간격 / 타임아웃은 응답을 보고 조절 (Retry-After 지킴)
+RATE = AimdRateController(DEFAULT_RATE)
 
-def fetch_chapter_from_bolls(book_number, chapter):
-    """bolls.life API에서 특정 장 가져오기"""
+def fetch_chapter_from_bolls(book_number, chapter, cache=None):
+    """bolls.life API에서 특정 장 가져오기 (cache 가 있으면 캐시 우선)"""
     url = f"https://bolls.life/get-text/NIV2011/{book_number}/{chapter}/"
-    try:
-        response = requests.get(url, timeout=30)
+
+    def download():
+        response = RATE.send(lambda timeout: requests.get(url, timeout=timeout))
         response.raise_for_status()
-        data = response.json()
-        return data
+        return response.content
+
+    try:
+        if cache is None:
+            return json.loads(download())
+        return cache.get_or_fetch('NIV2011', book_number, chapter, download)
     except Exception as e:
         print(f"Error fetching chapter {chapter}: {e}")
         return None
 
-def import_psalm31():
+def import_psalm31(cache=None):
     """Psalm 31 재import"""
     print("=" * 60)
     print("Psalm 31 NIV Re-import")
@@ -55,7 +61,7 @@ def import_psalm31():
     chapter = 31
     print(f"\nFetching Psalm {chapter}...")
 
-    verses_data = fetch_chapter_from_bolls(book['book_order'], chapter)
+    verses_data = fetch_chapter_from_bolls(book['book_order'], chapter, cache)
 
     if not verses_data:
         print(f"Failed to fetch Psalm {chapter}")
@@ -63,33 +69,30 @@ def import_psalm31():
 
     print(f"✓ Fetched {len(verses_data)} verses")
 
-    # Get canonical verse IDs from database
-    canonical_result = supabase.table('verses').select('id, verse').eq('book_id', book_id).eq('chapter', chapter).execute()
-    canonical_verses = canonical_result.data
+    # Get canonical verse IDs from the index (Psalms only)
+    verse_index = VerseIdIndex.load(supabase, book_ids=[book_id])
+    canonical_count = verse_index.chapter_verse_count(book_id, chapter)
 
-    if not canonical_verses:
+    if not canonical_count:
         print(f"No canonical verses found for Psalm {chapter}")
         return False
 
-    print(f"✓ Found {len(canonical_verses)} canonical verses in DB")
-
-    # Create verse_id mapping
-    verse_id_map = {}
-    for cv in canonical_verses:
-        verse_id_map[cv['verse']] = cv['id']
+    print(f"✓ Found {canonical_count} canonical verses in index")
 
     # Prepare translations batch
+    # 본문은 임포트 엔진과 같게 정리 (마크업 제거 + NFC) 하고 검색용 본문도 같이 씀
+    texts = clean_texts([verse_item['text'] for verse_item in verses_data])
     translations_batch = []
-    for verse_item in verses_data:
+    for verse_item, text, search_text in zip(verses_data, texts, search_folds(texts)):
         verse_number = verse_item['verse']
-        text = verse_item['text']
-        verse_id = verse_id_map.get(verse_number)
+        verse_id = verse_index.get(book_id, chapter, verse_number)
 
         if verse_id:
             translations_batch.append({
                 'verse_id': verse_id,
                 'translation_id': translation_id,
-                'text': text
+                'text': text,
+                'search_text': search_text
             })
 
     # Insert/update verse_translations
@@ -105,8 +108,13 @@ def import_psalm31():
     return True
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-import Psalm 31 (NIV2011)')
+    parser.add_argument('--offline', action='store_true', help='캐시에 있는 장만 사용 (네트워크 요청 없음)')
+    args = parser.parse_args()
+
     try:
-        success = import_psalm31()
+        with ChapterCache(offline=args.offline) as cache:
+            success = import_psalm31(cache)
         if success:
             # Verify
             print("\n" + "=" * 60)
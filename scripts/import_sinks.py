@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임포트 엔진 싱크 어댑터 (import_engine.py)
+
+    RestSink  PostgREST upsert. 장 여러 개를 모아 요청 하나로 쓰고, 쓰기 스레드 여러 개가 동시에 호출함
+    PgSink    Postgres 직접 연결 COPY (pg_copy_sink). 장 스트림 전체를 트랜잭션 하나로 적재
+    BundleSink  SQLite 오프라인 번들 (sqlite_bundle). 번역본 전부가 번들 트랜잭션 하나에 장 단위로 넣음
+
+배치 싱크 (streaming = False):
+    write(chapters) -> {(book_order, chapter): 쓴 구절 수}   (여러 스레드에서 동시에 불림)
+스트림 싱크 (streaming = True):
+    write_stream(chapters_iter) -> {(book_order, chapter): 구절 수}   (쓰기 스레드 하나, 커밋 후 반환)
+verse_translations 에는 본문(text, 엔진이 정리한 표시용)과 검색용 본문(search_text, text_normalize.search_fold)을 같이 쓰고,
+소제목이 있는 소스(Chapter.headings 가 None 이 아님)면 그 장들의 verse_headings 도 교체함.
+
+공통:
+    write_alignment(chapters, rows)   기준 번역본이 아닐 때 그 장들의 verse_alignment 를 rows 로 교체
+                                      (rows: versification.AlignmentRow, 번호가 같은 절 하나뿐인 구절은 없음)
+
+번역본 여러 개를 같이 임포트할 때는 싱크들이 WriteLimiter 하나를 같이 써서
+DB 로 가는 동시 쓰기 요청 수와 초당 쓰는 행 수의 합이 제한됨.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import METRICS
+from pg_copy_sink import NORMALIZATION_MIGRATION, PgCopySink, connect, format_stats
+from text_normalize import search_folds
+from verse_index import verse_key
+
+ALIGNMENT_PAGE_SIZE = 1000
+
+
+class WriteLimiter:
+    """
+    싱크 전체에 걸친 쓰기 제한 (스레드 공용)
+
+    Args:
+        max_concurrent: 동시에 진행 중인 쓰기 요청 수 (0 이면 제한 없음)
+        rows_per_second: 초당 쓰는 행 수 (0 이면 제한 없음). 토큰 버킷, 큰 배치는 빚으로 달아두고
+            다음 요청이 그만큼 기다림 → 평균이 rows_per_second 를 넘지 않음
+    """
+
+    def __init__(self, max_concurrent=0, rows_per_second=0.0):
+        self.max_concurrent = max_concurrent
+        self.rows_per_second = float(rows_per_second)
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent > 0 else None
+        self._lock = threading.Lock()
+        self._tokens = self.rows_per_second
+        self._updated = time.monotonic()
+
+    def throttle(self, rows):
+        """rows 행을 쓸 차례가 될 때까지 대기 (행 수 제한만)"""
+        if self.rows_per_second <= 0 or rows <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rows_per_second, self._tokens + (now - self._updated) * self.rows_per_second)
+            self._updated = now
+            self._tokens -= rows
+            wait = -self._tokens / self.rows_per_second if self._tokens < 0 else 0.0
+        if wait:
+            with METRICS.stage('write_rate_wait'):
+                time.sleep(wait)
+
+    @contextmanager
+    def slot(self, rows):
+        """쓰기 요청 하나: 행 수 제한 + 동시 요청 자리 하나"""
+        self.throttle(rows)
+        if self._slots is None:
+            yield
+            return
+        with METRICS.stage('write_slot_wait'):
+            self._slots.acquire()
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def describe(self):
+        concurrent = self.max_concurrent or 'unlimited'
+        rate = f'{self.rows_per_second:,.0f} rows/s' if self.rows_per_second > 0 else 'unlimited rows/s'
+        return f'{concurrent} concurrent writes, {rate}'
+
+
+UNLIMITED = WriteLimiter()
+
+
+class RestSink:
+    """
+    PostgREST upsert 싱크
+
+    verse_index(VerseIdIndex)에서 정규 구절 ID 를 찾고, 없는 구절은 create_verses=True 일 때만
+    verses upsert 로 만들어서 씀 (False 면 엔진이 미리 정규 절 번호로 정렬해서 넘김).
+    supabase 클라이언트(= HTTP 연결 풀)와 verse_index, limiter 는 번역본끼리 같이 써도 됨.
+    """
+
+    streaming = False
+
+    def __init__(self, supabase, translation_id, books, verse_index, create_verses=False, limiter=UNLIMITED):
+        self.supabase = supabase
+        self.limiter = limiter
+        self.translation_id = translation_id
+        self.book_ids = {book['book_order']: book['id'] for book in books}
+        self.verse_index = verse_index
+        self.create_verses = create_verses
+        self._created = {}   # 이번 실행에서 만든 정규 구절 verse_key(book_id, chapter, verse) → id
+        self._aligned_chapters = None   # verse_alignment 에 행이 있는 (book_id, chapter)
+        self._heading_verses = None     # verse_headings 에 행이 있는 verse_id
+        self._lock = threading.Lock()
+
+    def _verse_id(self, book_id, chapter, verse):
+        return self.verse_index.get(book_id, chapter, verse) or self._created.get(verse_key(book_id, chapter, verse))
+
+    def _create_verses(self, keys):
+        with self.limiter.slot(len(keys)), METRICS.stage('upsert', table='verses'):
+            result = self.supabase.table('verses').upsert(
+                [{'book_id': b, 'chapter': c, 'verse': v} for b, c, v in keys],
+                on_conflict='book_id,chapter,verse'
+            ).execute()
+        METRICS.inc('rows_total', len(keys), stage='upsert', table='verses')
+        with self._lock:
+            for row in result.data:
+                self._created[verse_key(row['book_id'], row['chapter'], row['verse'])] = row['id']
+
+    def write(self, chapters):
+        if self.create_verses:
+            with METRICS.stage('resolve'):
+                missing = []
+                for ch in chapters:
+                    book_id = self.book_ids.get(ch.book_order)
+                    for verse, _ in ch.verses:
+                        if book_id and not self._verse_id(book_id, ch.chapter, verse):
+                            missing.append((book_id, ch.chapter, verse))
+            if missing:
+                self._create_verses(list(dict.fromkeys(missing)))
+
+        # 같은 구절이 두 번 나오면 ON CONFLICT 가 한 문장에서 같은 행을 두 번 고치려다 실패하므로 마지막 것만
+        rows = {}
+        written = {}
+        with METRICS.stage('resolve'):
+            for ch in chapters:
+                book_id = self.book_ids.get(ch.book_order)
+                count = 0
+                folded = search_folds([text for _, text in ch.verses])
+                for (verse, text), search_text in zip(ch.verses, folded):
+                    verse_id = book_id and self._verse_id(book_id, ch.chapter, verse)
+                    if verse_id:
+                        rows[verse_id] = {'verse_id': verse_id, 'translation_id': self.translation_id,
+                                          'text': text, 'search_text': search_text}
+                        count += 1
+                written[(ch.book_order, ch.chapter)] = count
+
+        if rows:
+            with self.limiter.slot(len(rows)), METRICS.stage('upsert', table='verse_translations'):
+                self.supabase.table('verse_translations').upsert(
+                    list(rows.values()),
+                    on_conflict='verse_id,translation_id'
+                ).execute()
+            METRICS.inc('rows_total', len(rows), stage='upsert', table='verse_translations')
+        self._write_headings(chapters)
+        return written
+
+    def _load_heading_verses(self):
+        """이 번역본의 verse_headings 에 행이 있는 verse_id (소제목은 장마다 몇 개라 offset 페이지로 충분)"""
+        verse_ids = set()
+        offset = 0
+        while True:
+            page = (self.supabase.table('verse_headings').select('verse_id')
+                    .eq('translation_id', self.translation_id).order('verse_id')
+                    .range(offset, offset + ALIGNMENT_PAGE_SIZE - 1).execute()).data
+            verse_ids.update(row['verse_id'] for row in page)
+            if len(page) < ALIGNMENT_PAGE_SIZE:
+                return verse_ids
+            offset += len(page)
+
+    def _write_headings(self, chapters):
+        """소제목이 있는 소스면 그 장들의 verse_headings 를 교체 (없어진 소제목은 지움)"""
+        chapters = [ch for ch in chapters if ch.headings is not None]
+        if not chapters:
+            return
+        with self._lock:
+            if self._heading_verses is None:
+                self._heading_verses = self._load_heading_verses()
+
+        rows, verse_ids = {}, set()
+        for ch in chapters:
+            book_id = self.book_ids.get(ch.book_order)
+            if not book_id:
+                continue
+            verse_ids.update(self._verse_id(book_id, ch.chapter, verse) for verse, _ in ch.verses)
+            for verse, heading in ch.headings:
+                verse_id = self._verse_id(book_id, ch.chapter, verse)
+                if verse_id:
+                    rows[verse_id] = {'translation_id': self.translation_id, 'verse_id': verse_id, 'heading': heading}
+
+        stale = sorted((verse_ids & self._heading_verses) - rows.keys())
+        if stale:
+            with self.limiter.slot(len(stale)), METRICS.stage('delete', table='verse_headings'):
+                (self.supabase.table('verse_headings').delete()
+                 .eq('translation_id', self.translation_id).in_('verse_id', stale).execute())
+            with self._lock:
+                self._heading_verses.difference_update(stale)
+
+        if rows:
+            with self.limiter.slot(len(rows)), METRICS.stage('upsert', table='verse_headings'):
+                self.supabase.table('verse_headings').upsert(
+                    list(rows.values()), on_conflict='translation_id,verse_id'
+                ).execute()
+            METRICS.inc('rows_total', len(rows), stage='upsert', table='verse_headings')
+            with self._lock:
+                self._heading_verses.update(rows)
+
+    def _load_aligned_chapters(self):
+        """이 번역본의 verse_alignment 에 행이 있는 (book_id, chapter) (행이 많지 않아 offset 페이지로 충분)"""
+        chapters = set()
+        offset = 0
+        while True:
+            page = (self.supabase.table('verse_alignment').select('book_id, chapter, verse')
+                    .eq('translation_id', self.translation_id)
+                    .order('book_id').order('chapter').order('verse')
+                    .range(offset, offset + ALIGNMENT_PAGE_SIZE - 1).execute()).data
+            chapters.update((row['book_id'], row['chapter']) for row in page)
+            if len(page) < ALIGNMENT_PAGE_SIZE:
+                return chapters
+            offset += len(page)
+
+    def write_alignment(self, chapters, rows):
+        with self._lock:
+            if self._aligned_chapters is None:
+                self._aligned_chapters = self._load_aligned_chapters()
+
+        # 예전에 정렬 행이 있던 장은 지우고 다시 씀 (이제 번호가 같아진 절의 행이 남지 않도록)
+        for ch in chapters:
+            book_id = self.book_ids.get(ch.book_order)
+            if (book_id, ch.chapter) in self._aligned_chapters:
+                with self.limiter.slot(1), METRICS.stage('delete', table='verse_alignment'):
+                    (self.supabase.table('verse_alignment').delete()
+                     .eq('translation_id', self.translation_id).eq('book_id', book_id).eq('chapter', ch.chapter)
+                     .execute())
+                self._aligned_chapters.discard((book_id, ch.chapter))
+
+        if rows:
+            with self.limiter.slot(len(rows)), METRICS.stage('upsert', table='verse_alignment'):
+                self.supabase.table('verse_alignment').upsert(
+                    [{'translation_id': self.translation_id, **row._asdict()} for row in rows],
+                    on_conflict='translation_id,book_id,chapter,verse'
+                ).execute()
+            METRICS.inc('rows_total', len(rows), stage='upsert', table='verse_alignment')
+            with self._lock:
+                self._aligned_chapters.update((row.book_id, row.chapter) for row in rows)
+
+    def close(self):
+        pass
+
+
+class PgSink:
+    """
+    Postgres COPY 싱크 (SUPABASE_DB_URL 필요, 번역본 하나 = 연결 하나 = 트랜잭션 하나)
+
+    COPY 는 스트림 하나라 limiter 의 동시 요청 자리는 쓰지 않고 행 수 제한만 따름
+    (연결 수는 동시에 임포트하는 번역본 수).
+    """
+
+    streaming = True
+
+    def __init__(self, env, translation_code, create_verses=False, limiter=UNLIMITED, defer_text_index=None):
+        self.translation_code = translation_code
+        self.create_verses = create_verses
+        self.limiter = limiter
+        self.sink = PgCopySink(connect(env=env), defer_text_index=defer_text_index)
+
+    def write_stream(self, chapters):
+        written = {}
+        headed, headings = [], []
+
+        def rows():
+            for ch in chapters:
+                written[(ch.book_order, ch.chapter)] = len(ch.verses)
+                if ch.headings is not None:
+                    headed.append((ch.book_order, ch.chapter))
+                    headings.extend((ch.book_order, ch.chapter, verse, heading) for verse, heading in ch.headings)
+                self.limiter.throttle(len(ch.verses))
+                folded = search_folds([text for _, text in ch.verses])
+                for (verse, text), search_text in zip(ch.verses, folded):
+                    yield ch.book_order, ch.chapter, verse, text, search_text
+
+        stats = self.sink.load_translation(self.translation_code, rows(), create_verses=self.create_verses)
+        print(format_stats(self.translation_code, stats), flush=True)
+        if headed:
+            count = self.sink.load_headings(self.translation_code, headed, headings)
+            if count is None:
+                print(f"[pg] {self.translation_code}: verse_headings table missing, {len(headings)} headings skipped "
+                      f"(apply {NORMALIZATION_MIGRATION})", flush=True)
+            else:
+                print(f"[pg] {self.translation_code}: {count} verse_headings rows", flush=True)
+        return written
+
+    def write_alignment(self, chapters, rows):
+        count = self.sink.load_alignment(self.translation_code, [(ch.book_order, ch.chapter) for ch in chapters], rows)
+        print(f"[pg] {self.translation_code}: {count} verse_alignment rows", flush=True)
+
+    def close(self):
+        self.sink.conn.close()
+
+
+class BundleSink:
+    """
+    SQLite 오프라인 번들 싱크 (--sink sqlite, sqlite_bundle.SqliteBundle)
+
+    만들 때 이 번역본의 예전 행을 지우고, 장마다 넣음 (번들 연결 하나를 번역본끼리 lock 으로 나눠 씀).
+    인덱스 / FTS / 커밋은 모든 번역본이 끝난 뒤 SqliteBundle.finish() 에서 한 번.
+    번들의 정규 구절 ID 는 verse_key(book_id, chapter, verse): 기준 번역본(create_verses)은 계산해서 만들고,
+    나머지는 엔진이 정규 절 번호로 정렬해서 넘기므로 verse_index 로 있는 구절인지만 확인함.
+    번들에는 정렬된 본문만 넣음 (verse_alignment 없음).
+    """
+
+    streaming = True
+
+    def __init__(self, bundle, translation_id, books, verse_index=None, create_verses=False):
+        self.bundle = bundle
+        self.translation_id = translation_id
+        self.book_ids = {book['book_order']: book['id'] for book in books}
+        self.verse_index = verse_index
+        self.create_verses = create_verses
+        bundle.start_translation(translation_id)
+
+    def _verse_id(self, book_id, chapter, verse):
+        if self.create_verses:
+            return verse_key(book_id, chapter, verse)
+        return self.verse_index.get(book_id, chapter, verse)
+
+    def write_stream(self, chapters):
+        written = {}
+        for ch in chapters:
+            book_id = self.book_ids.get(ch.book_order)
+            verses, rows = [], {}
+            folded = search_folds([text for _, text in ch.verses])
+            for (verse, text), search_text in zip(ch.verses, folded):
+                verse_id = book_id and self._verse_id(book_id, ch.chapter, verse)
+                if verse_id:
+                    if self.create_verses and verse_id not in rows:
+                        verses.append((verse_id, book_id, ch.chapter, verse))
+                    rows[verse_id] = (verse_id, text, search_text)
+            headings = {}
+            for verse, heading in ch.headings or ():
+                verse_id = book_id and self._verse_id(book_id, ch.chapter, verse)
+                if verse_id:
+                    headings[verse_id] = heading
+            self.bundle.load_rows(self.translation_id, verses, list(rows.values()), list(headings.items()))
+            written[(ch.book_order, ch.chapter)] = len(rows)
+        return written
+
+    def write_alignment(self, chapters, rows):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임포트 엔진 소스 어댑터 (import_engine.py)
+
+소스는 번역본 하나의 본문을 장(Chapter) 단위로 흘려보냄:
+    HrvSource    HRV(ver.4)/*.txt (파일 하나 = 책 하나, 파일 단위로 파싱하면서 바로 내보냄)
+    BollsSource  bolls.life API (bolls_client.stream_chapters, 캐시 사용)
+    DumpSource   로컬 덤프 파일 (.json 배열 / .jsonl / .gz / .zip, bolls.life 번역본 덤프 형식, 스트리밍)
+
+공통 인터페이스:
+    iter_chapters(books, wanted) -> Chapter 들
+        books:  books 테이블 행 [{id, abbr_eng, book_order, chapters}, ...]
+        wanted: (book_order, chapter) -> bool. False 인 장은 (가능하면 가져오지도 않고) 건너뜀
+    close()   캐시 저장 등 마무리
+
+가져오지 못한 장은 verses=None 인 Chapter 로 내보냄 (엔진이 실패로 기록).
+본문은 소스에 있는 그대로 내보냄 (마크업 정리 / 유니코드 정규화는 엔진의 normalize 단계, text_normalize).
+"""
+
+import gzip
+import io
+import json
+import time
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from bolls_client import BOLLS_BASE_URL, DEFAULT_CONCURRENCY, DEFAULT_RATE, stream_chapters
+from hrv_parser import HRV_DIR, book_code_from_path, book_order_from_code, iter_verses, list_corpus_files
+from json_stream import iter_array
+from metrics import METRICS
+
+
+class Chapter(NamedTuple):
+    book_order: int
+    chapter: int
+    verses: Optional[List[Tuple[int, str]]]  # [(verse, text), ...], 가져오지 못했으면 None
+    headings: Optional[List[Tuple[int, str]]] = None  # [(verse, 소제목), ...] 그 절 앞의 소제목, 소스에 없으면 None
+
+
+class ChapterKey(NamedTuple):
+    """본문 없는 장 번호 (쓴 뒤 체크포인트 기록용으로 모아 둘 때)"""
+    book_order: int
+    chapter: int
+
+
+def group_chapters(book_order, rows):
+    """
+    (chapter, verse, text, heading) 를 장 순서대로 묶어서 Chapter 로 (같은 장이 연속해 있다고 가정)
+
+    heading 은 없으면 None. 소제목이 있는 소스라 headings 는 소제목이 없는 장도 [] 임.
+    """
+    current, verses, headings = None, [], []
+    for chapter, verse, text, heading in rows:
+        if chapter != current and verses:
+            yield Chapter(book_order, current, verses, headings)
+            verses, headings = [], []
+        current = chapter
+        verses.append((verse, text))
+        if heading:
+            headings.append((verse, heading))
+    if verses:
+        yield Chapter(book_order, current, verses, headings)
+
+
+class HrvSource:
+    """개역개정 텍스트 파일 (책 하나씩 파싱해서 바로 내보냄 → 파싱과 쓰기가 겹침)"""
+
+    name = 'hrv'
+
+    def __init__(self, directory=HRV_DIR):
+        self.directory = directory
+
+    def iter_chapters(self, books, wanted):
+        files = list_corpus_files(self.directory)
+        if not files:
+            raise FileNotFoundError(f'No HRV text files found in {self.directory}/')
+
+        for file_path in files:
+            book_order = book_order_from_code(book_code_from_path(file_path))
+            with METRICS.stage('parse'):
+                records = list(iter_verses(file_path))
+            METRICS.inc('rows_total', len(records), stage='parse')
+
+            for chapter in group_chapters(book_order, records):
+                if wanted(chapter.book_order, chapter.chapter):
+                    yield chapter
+
+    def close(self):
+        pass
+
+
+class BollsSource:
+    """bolls.life API (동시 요청 + AIMD 속도 조절, 남은 장만 요청)"""
+
+    name = 'bolls'
+
+    def __init__(self, translation, base_url=BOLLS_BASE_URL, concurrency=DEFAULT_CONCURRENCY,
+                 rate=DEFAULT_RATE, cache=None, controller=None):
+        self.translation = translation
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.rate = rate
+        self.cache = cache
+        self.controller = controller
+
+    def iter_chapters(self, books, wanted):
+        units = [(book['book_order'], chapter)
+                 for book in books for chapter in range(1, book['chapters'] + 1)
+                 if wanted(book['book_order'], chapter)]
+
+        for book_order, chapter, verses_data in stream_chapters(
+            units,
+            translation=self.translation,
+            base_url=self.base_url,
+            concurrency=self.concurrency,
+            rate=self.rate,
+            cache=self.cache,
+            controller=self.controller,
+        ):
+            verses = None
+            if verses_data:
+                verses = [(item['verse'], item['text']) for item in verses_data]
+            yield Chapter(book_order, chapter, verses)
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.save()
+            print(self.cache.stats_line(), flush=True)
+
+
+class DumpSource:
+    """
+    번역본 전체 덤프 파일 (장 1,189번 요청하는 대신 파일 하나를 한 번 훑음)
+
+    .json / .json.gz    : [{"book": 1, "chapter": 1, "verse": 1, "text": "..."}, ...]
+    .jsonl / .jsonl.gz  : 한 줄에 위와 같은 객체 하나
+    .zip                : 위 형식 파일 하나가 든 압축 파일 (bolls.life 번역본 덤프, 예: NIV2011.zip)
+    (bolls.life 번역본 덤프의 pk / translation 필드는 무시)
+
+    json_stream.iter_array 로 구절을 하나씩 읽고 장이 바뀔 때마다 앞 장을 바로 내보내므로
+    메모리는 장 하나 분량임. 덤프는 장끼리 모여 있다고 보지만(bolls.life 덤프는 그러함),
+    이미 내보낸 장의 구절이 뒤에 또 나오면 끝에서 파일을 한 번 더 읽어서 그 장들만 완전히 모아 다시 내보냄.
+    """
+
+    name = 'dump'
+
+    def __init__(self, path, member=None):
+        self.path = Path(path)
+        self.member = member
+
+    @contextmanager
+    def _open(self):
+        """(텍스트 스트림, 'json' | 'jsonl')"""
+        if self.path.suffix == '.zip':
+            with zipfile.ZipFile(self.path) as archive:
+                member = self.member or self._zip_member(archive)
+                with archive.open(member) as raw, io.TextIOWrapper(raw, encoding='utf-8') as f:
+                    yield f, 'jsonl' if member.endswith('.jsonl') else 'json'
+        elif self.path.suffix == '.gz':
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                yield f, 'jsonl' if self.path.stem.endswith('.jsonl') else 'json'
+        else:
+            with open(self.path, encoding='utf-8') as f:
+                yield f, 'jsonl' if self.path.suffix == '.jsonl' else 'json'
+
+    def _zip_member(self, archive):
+        names = [name for name in archive.namelist()
+                 if name.endswith(('.json', '.jsonl')) and not name.startswith('__MACOSX/')]
+        if len(names) != 1:
+            raise ValueError(f"{self.path}: expected one .json/.jsonl file in the archive, found {names or 'none'}")
+        return names[0]
+
+    def _iter_verses(self):
+        """(book_order, chapter, verse, text) 를 파일 순서대로"""
+        with self._open() as (f, kind):
+            rows = (json.loads(line) for line in f if line.strip()) if kind == 'jsonl' else iter_array(f)
+            for row in rows:
+                yield int(row['book']), int(row['chapter']), int(row['verse']), row['text']
+
+    def iter_chapters(self, books, wanted):
+        emitted, late = set(), set()
+        current, verses = None, []
+        rows = 0
+        started = time.perf_counter()
+
+        for book_order, chapter, verse, text in self._iter_verses():
+            rows += 1
+            key = (book_order, chapter)
+            if key != current:
+                if verses:
+                    METRICS.observe('stage_seconds', time.perf_counter() - started, stage='parse')
+                    yield Chapter(*current, sorted(verses))
+                    started = time.perf_counter()
+                    emitted.add(current)
+                current, verses = key, []
+                if key in emitted:
+                    late.add(key)
+            if key not in late and wanted(book_order, chapter):
+                verses.append((verse, text))
+        if verses:
+            METRICS.observe('stage_seconds', time.perf_counter() - started, stage='parse')
+            yield Chapter(*current, sorted(verses))
+        METRICS.inc('rows_total', rows, stage='parse')
+
+        if late:
+            # 흩어져 있던 장: 그 장들만 다시 모아서 완전한 장으로 한 번 더 (upsert 라 같은 구절은 덮어씀)
+            print(f"  {self.path.name}: {len(late)} chapters are not contiguous, re-reading them", flush=True)
+            with METRICS.stage('parse'):
+                scattered = {}
+                for book_order, chapter, verse, text in self._iter_verses():
+                    if (book_order, chapter) in late:
+                        scattered.setdefault((book_order, chapter), []).append((verse, text))
+            for (book_order, chapter), chapter_verses in sorted(scattered.items()):
+                yield Chapter(book_order, chapter, sorted(chapter_verses))
+
+    def close(self):
+        pass
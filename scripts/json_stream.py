@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+큰 JSON 배열을 요소 하나씩 읽는 스트리밍 파서 (표준 라이브러리만)
+
+json.load 는 번역본 덤프(구절 3만여 개, 수십 MB) 전체를 dict 리스트로 메모리에 올림.
+iter_array 는 chunk_size 씩 읽으면서 json.JSONDecoder.raw_decode (C 스캐너)로
+최상위 배열의 요소를 하나씩 꺼내므로, 메모리는 읽기 버퍼 + 요소 하나 분량으로 일정함.
+
+사용 예:
+    with open('NIV2011.json', encoding='utf-8') as f:
+        for row in iter_array(f):
+            ...
+"""
+
+import json
+import re
+
+CHUNK_SIZE = 1 << 16      # 한 번에 읽는 문자 수
+WHITESPACE = ' \t\n\r'
+# 숫자 뒤에 버퍼 끝까지 숫자 문자만 남았으면 청크 경계에서 잘린 숫자일 수 있음 (예: "12." | "5e3")
+NUMBER_TAIL = re.compile(r'[0-9eE.+-]*\Z')
+
+
+def iter_array(stream, chunk_size=CHUNK_SIZE):
+    """
+    텍스트 스트림의 최상위 JSON 배열 → 요소를 하나씩 yield
+
+    Args:
+        stream: read(n) 이 str 을 돌려주는 파일 객체
+        chunk_size: 한 번에 읽는 문자 수
+
+    Raises:
+        ValueError: 배열이 아니거나 중간에 끝났거나 형식이 잘못된 경우 (json.JSONDecodeError 포함)
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+
+    def more():
+        """버퍼를 앞으로 당기고 더 읽음 (파일 끝이면 False)"""
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    expect = '['    # '[' → 'first' (값 또는 ']') → ',' 또는 ']' → 'value' → ...
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or not more():
+                break
+        if pos >= len(buffer):
+            raise ValueError('JSON array ended early' if expect != '[' else 'empty JSON input')
+
+        char = buffer[pos]
+        if expect == '[':
+            if char != '[':
+                raise ValueError(f'expected a JSON array, got {char!r}')
+            pos += 1
+            expect = 'first'
+            continue
+        if expect in ('first', ',') and char == ']':
+            return
+        if expect == ',':
+            if char != ',':
+                raise ValueError(f"expected ',' or ']' in JSON array, got {char!r}")
+            pos += 1
+            expect = 'value'
+            continue
+
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 요소가 버퍼 끝에서 잘렸으면 더 읽고 다시 (파일 끝이면 진짜 형식 오류)
+                if not more():
+                    raise
+                continue
+            # 숫자는 청크 경계에서 잘려도 앞부분만으로 디코딩되므로 더 읽어서 다시
+            if (isinstance(item, (int, float)) and not isinstance(item, bool)
+                    and NUMBER_TAIL.match(buffer, end) and more()):
+                continue
+            break
+        pos = end
+        expect = ','
+        yield item
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임포트 스크립트 공통 계측 (단계별 시간 / 재시도 / 바이트 / 행 수)
+
+모듈 전역 METRICS 하나에 모아두고, 실행이 끝나면 JSON 또는 Prometheus 텍스트 파일로 저장.
+어느 단계(parse, fetch, resolve, upsert ...)가 전체 임포트 시간을 잡아먹는지 보기 위한 것.
+
+기록하는 값:
+    stage_seconds{stage}                     단계별 소요 시간 히스토그램
+    http_request_seconds{target,method,...}  HTTP 요청 지연 히스토그램 (bolls, rest)
+    http_requests_total{target,...,status}   HTTP 요청 수
+    http_bytes_total{target,direction}       주고받은 바이트
+    retries_total{target}                    재시도 횟수
+    rows_total{stage,table}                  처리/기록한 행 수
+    chapters_total{stage,result}             delta 모드에서 바뀐/그대로인 장 수
+    fetch_rate{target} (게이지)              업스트림 초당 요청 수 (rate_controller, 마지막 값)
+    fetch_concurrency{target} (게이지)       업스트림 동시 요청 한도
+    rate_changes_total{target,direction}     요청 속도를 올린/내린 횟수
+    throttled_total{target,reason}           429 / 5xx / 타임아웃 응답 수
+    peak_rss_bytes (게이지)                  프로세스 최대 RSS (metrics_run 이 끝날 때 기록)
+
+스크립트 쪽 사용 예:
+    from metrics import METRICS, add_metrics_arguments, instrument_supabase, metrics_run
+
+    parser = argparse.ArgumentParser(...)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    with metrics_run(args):
+        instrument_supabase(supabase)
+        with METRICS.stage('parse'):
+            ...
+        METRICS.inc('rows_total', len(batch), stage='upsert', table='verse_translations')
+
+명령행:
+    --metrics-out run.json | run.prom   끝나면 JSON / Prometheus 텍스트로 저장
+    --profile run.pstats                cProfile 결과 저장 (python3 -m pstats run.pstats)
+    --tracemalloc 20                    메모리 할당 상위 20곳 출력
+"""
+
+import bisect
+import cProfile
+import json
+import math
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+
+PROMETHEUS_PREFIX = 'bible_import_'
+
+# 초 단위 히스토그램 버킷 (Prometheus 기본값보다 짧은 쪽/긴 쪽을 조금 더 넓힘)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# 분위수 계산용으로 보관하는 최대 샘플 수 (넘으면 reservoir sampling)
+MAX_SAMPLES = 10000
+
+
+class Histogram:
+    """누적 버킷 + 분위수용 샘플"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # 마지막 칸 = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._samples = []
+        self._random = random.Random(0)
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+        if len(self._samples) < MAX_SAMPLES:
+            self._samples.append(value)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < MAX_SAMPLES:
+                self._samples[slot] = value
+
+    def quantile(self, q):
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'p50': round(self.quantile(0.50), 6),
+            'p90': round(self.quantile(0.90), 6),
+            'p99': round(self.quantile(0.99), 6),
+            'max': round(self.max, 6),
+        }
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ''
+    escaped = (f'{k}="{v}"'.replace('\\', '\\\\').replace('\n', '\\n') for k, v in items)
+    return '{' + ','.join(escaped) + '}'
+
+
+class Metrics:
+    """카운터 / 게이지 / 히스토그램 모음 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}     # (name, label_key) → 값
+        self.gauges = {}       # (name, label_key) → 마지막 값
+        self.histograms = {}   # (name, label_key) → Histogram
+        self.started = time.time()
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.started = time.time()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """with 블록 소요 시간을 name 히스토그램에 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def stage(self, stage, **labels):
+        """stage_seconds{stage=...} 타이머"""
+        return self.timer('stage_seconds', stage=stage, **labels)
+
+    def snapshot(self):
+        """JSON 직렬화 가능한 dict"""
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(key), 'value': value}
+                for (name, key), value in sorted(self.counters.items())
+            ]
+            gauges = [
+                {'name': name, 'labels': dict(key), 'value': value}
+                for (name, key), value in sorted(self.gauges.items())
+            ]
+            histograms = [
+                {'name': name, 'labels': dict(key), **histogram.to_dict()}
+                for (name, key), histogram in sorted(self.histograms.items())
+            ]
+        return {
+            'started_at': self.started,
+            'elapsed_seconds': round(time.time() - self.started, 3),
+            'counters': counters,
+            'gauges': gauges,
+            'histograms': histograms,
+        }
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식 (node_exporter textfile collector 로 바로 읽을 수 있음)"""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, key), value in sorted(self.counters.items()):
+                metric = PROMETHEUS_PREFIX + name
+                if metric not in typed:
+                    lines.append(f'# TYPE {metric} counter')
+                    typed.add(metric)
+                lines.append(f'{metric}{_format_labels(key)} {value}')
+
+            for (name, key), value in sorted(self.gauges.items()):
+                metric = PROMETHEUS_PREFIX + name
+                if metric not in typed:
+                    lines.append(f'# TYPE {metric} gauge')
+                    typed.add(metric)
+                lines.append(f'{metric}{_format_labels(key)} {value}')
+
+            for (name, key), histogram in sorted(self.histograms.items()):
+                metric = PROMETHEUS_PREFIX + name
+                if metric not in typed:
+                    lines.append(f'# TYPE {metric} histogram')
+                    typed.add(metric)
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{_format_labels(key, [("le", bound)])} {cumulative}')
+                lines.append(f'{metric}_sum{_format_labels(key)} {histogram.sum}')
+                lines.append(f'{metric}_count{_format_labels(key)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """확장자가 .prom 이면 Prometheus 텍스트, 그 외에는 JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == '.prom':
+            path.write_text(self.to_prometheus(), encoding='utf-8')
+        else:
+            path.write_text(json.dumps(self.snapshot(), indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+
+    def summary_lines(self):
+        """단계별 시간 요약 (총 시간이 큰 순서)"""
+        with self._lock:
+            stages = sorted(
+                ((dict(key), h) for (name, key), h in self.histograms.items() if name == 'stage_seconds'),
+                key=lambda item: -item[1].sum,
+            )
+            requests = sorted(
+                ((dict(key), h) for (name, key), h in self.histograms.items() if name == 'http_request_seconds'),
+                key=lambda item: -item[1].sum,
+            )
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+
+        lines = ['Stage timings:']
+        for labels, h in stages:
+            label = ' '.join(f'{k}={v}' for k, v in labels.items())
+            lines.append(f'  {label:<40} {h.sum:9.2f}s total  {h.count:>7} x  '
+                         f'p50 {h.quantile(0.5) * 1000:8.1f} ms  p99 {h.quantile(0.99) * 1000:8.1f} ms')
+        for labels, h in requests:
+            label = ' '.join(f'{k}={v}' for k, v in labels.items())
+            lines.append(f'  http {label:<35} {h.sum:9.2f}s total  {h.count:>7} x  '
+                         f'p50 {h.quantile(0.5) * 1000:8.1f} ms  p99 {h.quantile(0.99) * 1000:8.1f} ms')
+        for (name, key), value in sorted(counters.items()):
+            if name in ('retries_total', 'rows_total', 'chapters_total', 'http_bytes_total',
+                        'rate_changes_total', 'throttled_total'):
+                label = ' '.join(f'{k}={v}' for k, v in key)
+                lines.append(f'  {name} {label}: {value:,}')
+        for (name, key), value in sorted(gauges.items()):
+            label = ' '.join(f'{k}={v}' for k, v in key)
+            lines.append(f'  {name} {label}: {value:,}')
+        return lines
+
+
+METRICS = Metrics()
+
+
+def instrument_supabase(client, metrics=METRICS):
+    """
+    supabase Client 의 PostgREST 요청마다 지연/바이트/상태 코드를 기록 (httpx event hook)
+
+    응답 헤더가 도착한 시점까지의 시간을 잼. 응답 바이트는 Content-Length 기준.
+    """
+    session = client.postgrest.session
+
+    def on_request(request):
+        request.extensions['metrics_started'] = time.perf_counter()
+
+    def on_response(response):
+        request = response.request
+        started = request.extensions.get('metrics_started')
+        path = urlsplit(str(request.url)).path
+        table = path.rsplit('/', 1)[-1]
+        labels = {'target': 'rest', 'method': request.method, 'table': table}
+
+        if started is not None:
+            metrics.observe('http_request_seconds', time.perf_counter() - started, **labels)
+        metrics.inc('http_requests_total', status=response.status_code, **labels)
+        metrics.inc('http_bytes_total', len(request.content or b''), target='rest', direction='sent')
+        metrics.inc('http_bytes_total', int(response.headers.get('content-length') or 0),
+                    target='rest', direction='received')
+
+    hooks = session.event_hooks
+    session.event_hooks = {
+        'request': [*hooks.get('request', []), on_request],
+        'response': [*hooks.get('response', []), on_response],
+    }
+    return client
+
+
+def peak_rss_bytes():
+    """
+    이 프로세스의 최대 RSS (bytes, 알 수 없으면 None)
+
+    리눅스는 /proc/self/status 의 VmHWM (exec 할 때 새로 시작함). getrusage 의 ru_maxrss 는
+    fork/exec 전 부모 프로세스의 RSS 까지 이어받아서 하위 프로세스로 실행하면 부풀려짐.
+    """
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+@contextmanager
+def profiling(profile_path=None, tracemalloc_top=0):
+    """opt-in cProfile / tracemalloc (둘 다 꺼져 있으면 아무 것도 안 함)"""
+    profiler = cProfile.Profile() if profile_path else None
+    if tracemalloc_top:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            print(f"cProfile stats -> {profile_path} (python3 -m pstats {profile_path})", flush=True)
+        if tracemalloc_top:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"tracemalloc peak {peak / 1024 / 1024:.1f} MB, top {tracemalloc_top}:", flush=True)
+            for stat in snapshot.statistics('lineno')[:tracemalloc_top]:
+                print(f"  {stat}", flush=True)
+
+
+def add_metrics_arguments(parser):
+    """--metrics-out / --profile / --tracemalloc 인자 추가"""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--metrics-out', default=None,
+                       help='끝나면 계측 결과 저장 (.json 또는 .prom = Prometheus 텍스트)')
+    group.add_argument('--profile', default=None, help='cProfile 결과 파일 (.pstats)')
+    group.add_argument('--tracemalloc', type=int, default=0, metavar='N',
+                       help='메모리 할당 상위 N곳 출력')
+
+
+@contextmanager
+def metrics_run(args, metrics=METRICS):
+    """
+    스크립트 main 전체를 감싸서 profiling 을 켜고, 끝나면(실패해도) 요약 출력 + 파일 저장
+    """
+    try:
+        with profiling(getattr(args, 'profile', None), getattr(args, 'tracemalloc', 0)):
+            yield metrics
+    finally:
+        rss = peak_rss_bytes()
+        if rss:
+            metrics.set('peak_rss_bytes', rss)
+        print('\n' + '\n'.join(metrics.summary_lines()), flush=True)
+        out = getattr(args, 'metrics_out', None)
+        if out:
+            metrics.write(out)
+            print(f"Metrics -> {out}", flush=True)
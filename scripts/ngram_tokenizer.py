@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+검색 색인용 토크나이저
+
+- 한글: 음절 단위 bigram + trigram ("하나님의" → 하나, 나님, 님의, 하나님, 나님의)
+  교착어라 조사/어미가 붙어도 부분 문자열로 찾을 수 있음
+- 영문/숫자: 소문자 단어 (두 글자 이상)
+
+자동 완성 사전(build_suggest_index.py)은 n-gram 대신 어절 / 단어를 통째로 씀 (suggest_words).
+
+DB 쪽 search_query_terms() (supabase/migrations/20260117_search_postings.sql,
+정규화는 20260118_text_normalization.sql 의 search_fold)와 규칙이 같아야 함. 한쪽을 바꾸면 다른 쪽도 같이 바꾸고 색인을 다시 만들 것.
+"""
+
+import re
+from collections import Counter
+
+from text_normalize import search_fold
+
+TOKEN_PATTERN = re.compile(r'[가-힣]+|[a-z0-9]+')
+HANGUL_NGRAM_SIZES = (2, 3)
+MIN_WORD_LENGTH = 2
+
+
+def normalize(text):
+    """검색용 정규화 (text_normalize.search_fold, DB: search_fold(q))"""
+    return search_fold(text)
+
+
+def _is_hangul(token):
+    return '가' <= token[0] <= '힣'
+
+
+def iter_index_terms(text):
+    """
+    구절 본문 → 색인 용어 (중복 포함, 등장 순서대로)
+
+    한글 한 덩어리가 n 보다 짧으면 그 n-gram 은 만들지 않음 (한 음절 단어는 색인 대상 아님).
+    """
+    for token in TOKEN_PATTERN.findall(normalize(text)):
+        if _is_hangul(token):
+            for n in HANGUL_NGRAM_SIZES:
+                for i in range(len(token) - n + 1):
+                    yield token[i:i + n]
+        elif len(token) >= MIN_WORD_LENGTH:
+            yield token
+
+
+def index_terms(text):
+    """구절 본문 → {용어: 등장 횟수}"""
+    return Counter(iter_index_terms(text))
+
+
+def suggest_words(text):
+    """
+    구절 본문 → 자동 완성 사전 용어 집합 (한글 어절 / 영문 단어, 두 글자 이상)
+
+    "하나님의 사랑이" → {하나님의, 사랑이}. 어절의 구두점은 TOKEN_PATTERN 이 떼어냄.
+    """
+    return {token for token in TOKEN_PATTERN.findall(normalize(text)) if len(token) >= MIN_WORD_LENGTH}
+
+
+def query_terms(query):
+    """
+    검색어 → 모두 포함되어야 하는 용어 목록 (중복 제거, 순서 유지)
+
+    한글 덩어리는 3음절 이상이면 trigram, 2음절이면 bigram 으로 쪼갬.
+    빈 목록이면 색인으로 찾을 수 없는 검색어 (예: 한 음절) → 호출 측에서 부분 문자열 검색으로 대체.
+    """
+    terms = []
+    for token in TOKEN_PATTERN.findall(normalize(query)):
+        if _is_hangul(token):
+            n = 3 if len(token) >= 3 else 2
+            grams = [token[i:i + n] for i in range(len(token) - n + 1)]
+        else:
+            grams = [token] if len(token) >= MIN_WORD_LENGTH else []
+        for gram in grams:
+            if gram not in terms:
+                terms.append(gram)
+    return terms
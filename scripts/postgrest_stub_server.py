@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Supabase REST(PostgREST) 로컬 스텁 서버 (인메모리)
+
+임포트 스크립트가 쓰는 만큼만 PostgREST 를 흉내냄:
+    GET    /rest/v1/{table}?select=..&col=eq.1&order=id.asc&limit=..   (count=exact, .single() 포함)
+    POST   /rest/v1/{table}                insert / upsert(on_conflict, merge/ignore-duplicates)
+    PATCH  /rest/v1/{table}?col=eq.1       update
+    DELETE /rest/v1/{table}?col=eq.1
+    POST   /rest/v1/rpc/{function}         RPC_FUNCTIONS 에 있는 함수만 (파이썬으로 다시 구현)
+
+books / book_names / translations 는 supabase/migrations/20260116_clean_schema.sql 의 INSERT 문에서 읽어 채움.
+외래 키, 트리거, 임베드(select=verses(...))는 지원하지 않음.
+
+.env.local 의 NEXT_PUBLIC_SUPABASE_URL 을 이 서버 주소로 바꾸면 실제 임포트 스크립트를
+그대로 돌려볼 수 있음 (bench_import.py 가 그렇게 사용).
+
+사용 예:
+    python3 scripts/postgrest_stub_server.py --port 54321 --latency 0.02
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from books import SEED_SQL, seed_rows
+from chapter_checksum import chapter_checksum
+
+# 테이블 → UNIQUE 키 (upsert 의 on_conflict 기본값), id 자동 증가 여부
+TABLES = {
+    'books': (('abbr_eng',), True),
+    'book_names': (('book_id', 'language'), True),
+    'translations': (('code',), True),
+    'verses': (('book_id', 'chapter', 'verse'), True),
+    'verse_translations': (('verse_id', 'translation_id'), True),
+    'verse_alignment': (('translation_id', 'book_id', 'chapter', 'verse'), False),
+    'verse_headings': (('translation_id', 'verse_id'), False),
+    'search_postings': (('translation_id', 'term'), False),
+    'search_index_builds': (('translation_id',), False),
+    'verse_related': (('translation_id', 'verse_id', 'related_verse_id'), False),
+    'verse_related_builds': (('translation_id',), False),
+    'search_suggest_dicts': (('translation_id',), False),
+}
+
+RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+OBJECT_MEDIA_TYPE = 'application/vnd.pgrst.object+json'
+MAX_ROWS = 1000  # Supabase 기본 max-rows
+
+
+class StubError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Table:
+    def __init__(self, name, unique, serial):
+        self.name = name
+        self.unique = unique
+        self.serial = serial
+        self.rows = {}       # pk → row (삽입 순서 = id 순서)
+        self.by_key = {}     # unique 값 → pk
+        self.next_id = 1
+
+    def _pk(self, row):
+        return row['id'] if self.serial else tuple(row[c] for c in self.unique)
+
+    def insert(self, values, conflict=None, resolution=None):
+        """
+        행 하나 insert (resolution='merge' 면 upsert, 'ignore' 면 충돌 시 건너뜀)
+
+        Returns:
+            저장된 행 또는 None (ignore 로 건너뛴 경우)
+        """
+        conflict = tuple(conflict or self.unique)
+        key = tuple(values.get(c) for c in conflict)
+
+        if conflict == self.unique and key in self.by_key:
+            if resolution is None:
+                raise StubError(409, f'duplicate key value violates unique constraint on {self.name}')
+            existing = self.rows[self.by_key[key]]
+            if resolution == 'ignore':
+                return None
+            existing.update({k: v for k, v in values.items() if k != 'id'})
+            return existing
+
+        row = dict(values)
+        if self.serial and row.get('id') is None:
+            row['id'] = self.next_id
+        if self.serial:
+            self.next_id = max(self.next_id, row['id'] + 1)
+        self.rows[self._pk(row)] = row
+        self.by_key[tuple(row.get(c) for c in self.unique)] = self._pk(row)
+        return row
+
+    def delete(self, row):
+        del self.rows[self._pk(row)]
+        del self.by_key[tuple(row.get(c) for c in self.unique)]
+
+
+def _coerce(raw, sample):
+    """쿼리 문자열 값을 비교 대상 컬럼 타입에 맞춤"""
+    if raw == 'null':
+        return None
+    if raw in ('true', 'false'):
+        return raw == 'true'
+    if isinstance(sample, bool):
+        return raw == 'true'
+    if isinstance(sample, int):
+        return int(raw)
+    if isinstance(sample, float):
+        return float(raw)
+    return raw.strip('"')
+
+
+def _matches(row, column, expr):
+    negate = expr.startswith('not.')
+    if negate:
+        expr = expr[4:]
+    op, _, raw = expr.partition('.')
+    value = row.get(column)
+
+    if op == 'is':
+        result = value is None if raw == 'null' else value == _coerce(raw, value)
+    elif op == 'in':
+        items = [item for item in raw.strip('()').split(',') if item]
+        result = value in {_coerce(item, value) for item in items}
+    elif value is None:
+        result = False
+    else:
+        other = _coerce(raw, value)
+        result = {
+            'eq': value == other, 'neq': value != other,
+            'gt': value > other, 'gte': value >= other,
+            'lt': value < other, 'lte': value <= other,
+        }.get(op)
+        if result is None:
+            raise StubError(400, f'unsupported operator: {op}')
+    return not result if negate else result
+
+
+class FakeDatabase:
+    """스텁 서버가 공유하는 인메모리 테이블들"""
+
+    def __init__(self, seed_sql=SEED_SQL):
+        self.lock = threading.Lock()
+        self.tables = {name: Table(name, unique, serial) for name, (unique, serial) in TABLES.items()}
+        if seed_sql:
+            self.seed(seed_sql)
+
+    def seed(self, sql_path):
+        for table, rows in seed_rows(sql_path).items():
+            for row in rows:
+                self.tables[table].insert(row)
+
+    def table(self, name):
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise StubError(404, f'relation "{name}" does not exist')
+
+    def count(self, name):
+        return len(self.table(name).rows)
+
+    def select(self, name, filters, order=None, limit=None, offset=0):
+        rows = [row for row in self.table(name).rows.values()
+                if all(_matches(row, column, expr) for column, expr in filters)]
+        for term in reversed((order or '').split(',') if order else []):
+            column, _, direction = term.partition('.')
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)),
+                      reverse=direction.startswith('desc'))
+        total = len(rows)
+        rows = rows[offset:]
+        if limit is not None:
+            rows = rows[:limit]
+        return rows, total
+
+
+def _rpc_chapter_checksums(db, params):
+    """chapter_checksums(p_translation_id) (20260117_chapter_checksums.sql) 와 같은 결과"""
+    translation_id = params['p_translation_id']
+    book_orders = {row['id']: row['book_order'] for row in db.table('books').rows.values()}
+    verses = db.table('verses').rows
+    chapters = {}
+    for row in db.table('verse_translations').rows.values():
+        if row['translation_id'] != translation_id:
+            continue
+        verse = verses[row['verse_id']]
+        key = f"{book_orders[verse['book_id']]}:{verse['chapter']}"
+        chapters.setdefault(key, []).append((verse['verse'], row['text']))
+    return {key: chapter_checksum(items) for key, items in chapters.items()}
+
+
+def _rpc_corpus_audit(db, params):
+    """corpus_audit(p_translation_id) (20260118_corpus_audit.sql) 와 같은 결과"""
+    translation_id = params.get('p_translation_id')
+    book_orders = {row['id']: row['book_order'] for row in db.table('books').rows.values()}
+    verses = db.table('verses').rows
+
+    canonical = {}
+    for verse in verses.values():
+        canonical.setdefault(f"{book_orders[verse['book_id']]}:{verse['chapter']}", []).append(verse['verse'])
+
+    translations = {}
+    for row in db.table('verse_translations').rows.values():
+        if translation_id is not None and row['translation_id'] != translation_id:
+            continue
+        verse = verses[row['verse_id']]
+        chapters = translations.setdefault(str(row['translation_id']), {})
+        chapters.setdefault(f"{book_orders[verse['book_id']]}:{verse['chapter']}", []).append(verse['verse'])
+
+    def compact(numbers, complete):
+        numbers = sorted(numbers)
+        return len(numbers) if complete(numbers) else numbers
+
+    return {
+        'canonical': {key: compact(numbers, lambda n: len(n) == n[-1]) for key, numbers in canonical.items()},
+        'translations': {
+            tid: {key: compact(numbers, lambda n, key=key: len(n) == len(canonical.get(key, ())))
+                  for key, numbers in chapters.items()}
+            for tid, chapters in translations.items()
+        },
+    }
+
+
+# RPC 이름 → (db, 인자 dict) 를 받아 JSON 결과를 돌려주는 함수
+RPC_FUNCTIONS = {
+    'chapter_checksums': _rpc_chapter_checksums,
+    'corpus_audit': _rpc_corpus_audit,
+}
+
+
+def _project(row, select):
+    if not select or select == '*':
+        return dict(row)
+    columns = [c.strip().strip('"') for c in select.split(',')]
+    return {c: row.get(c) for c in columns}
+
+
+class PostgrestStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # 헤더/본문을 따로 쓸 때 delayed ACK 로 40ms 씩 멈추지 않게
+
+    db = None          # FakeDatabase
+    latency = 0.0      # 요청마다 추가로 기다리는 시간 (초)
+    log = None         # bolls_stub_server.RequestLog
+
+    def _parse(self):
+        parts = urlsplit(self.path)
+        match = re.match(r'^/rest/v1/((?:rpc/)?[A-Za-z0-9_]+)$', parts.path)
+        if not match:
+            raise StubError(404, f'unknown path {parts.path}')
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        filters = [(k, v) for k, v in params if k not in RESERVED_PARAMS]
+        options = {k: v for k, v in params if k in RESERVED_PARAMS}
+        return match.group(1), filters, options
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        self._bytes_in = len(raw)
+        return json.loads(raw) if raw else None
+
+    def _prefer(self):
+        return {item.strip() for item in (self.headers.get('Prefer') or '').split(',') if item.strip()}
+
+    def _handle(self, method):
+        started = time.perf_counter()
+        self._bytes_in = 0
+        table, rows_written = '?', 0
+        try:
+            # 본문은 항상 끝까지 읽어야 keep-alive 커넥션의 다음 요청이 깨지지 않음
+            body = self._body()
+            table, filters, options = self._parse()
+            if self.latency:
+                time.sleep(self.latency)
+            handler = self._rpc if table.startswith('rpc/') else getattr(self, '_' + method.lower())
+            status, payload, headers, rows_written = handler(table, filters, options, body)
+        except StubError as e:
+            status, payload, headers = e.status, {'message': str(e), 'code': str(e.status)}, {}
+        except (ValueError, KeyError, TypeError) as e:
+            status, payload, headers = 400, {'message': f'{type(e).__name__}: {e}'}, {}
+
+        sent = self._send(status, payload, headers)
+        if self.log is not None:
+            self.log.record(f'{method} {table}', time.perf_counter() - started,
+                            bytes_in=self._bytes_in, bytes_out=sent, rows=rows_written, status=status)
+
+    def _rpc(self, table, filters, options, body):
+        name = table[len('rpc/'):]
+        function = RPC_FUNCTIONS.get(name)
+        if function is None:
+            raise StubError(404, f'function {name} does not exist')
+        with self.db.lock:
+            return 200, function(self.db, body or dict(filters)), {}, 0
+
+    def _get(self, table, filters, options, body):
+        prefer = self._prefer()
+        limit = min(int(options.get('limit', MAX_ROWS)), MAX_ROWS)
+        with self.db.lock:
+            rows, total = self.db.select(table, filters, options.get('order'), limit, int(options.get('offset', 0)))
+            rows = [_project(row, options.get('select')) for row in rows]
+
+        headers = {}
+        if 'count=exact' in prefer:
+            end = len(rows) - 1
+            headers['Content-Range'] = f"{'*' if end < 0 else f'0-{end}'}/{total}"
+
+        if OBJECT_MEDIA_TYPE in (self.headers.get('Accept') or ''):
+            if len(rows) != 1:
+                raise StubError(406, f'JSON object requested, multiple (or no) rows returned ({len(rows)})')
+            return 200, rows[0], headers, 0
+        return 200, rows, headers, 0
+
+    def _post(self, table, filters, options, body):
+        values = body if isinstance(body, list) else [body]
+        prefer = self._prefer()
+        resolution = ('merge' if 'resolution=merge-duplicates' in prefer
+                      else 'ignore' if 'resolution=ignore-duplicates' in prefer else None)
+        conflict = options['on_conflict'].split(',') if options.get('on_conflict') else None
+
+        with self.db.lock:
+            target = self.db.table(table)
+            written = [target.insert(row, conflict, resolution) for row in values]
+            written = [dict(row) for row in written if row is not None]
+
+        if 'return=minimal' in prefer:
+            return 201, None, {}, len(values)
+        return 201, written, {}, len(values)
+
+    def _patch(self, table, filters, options, body):
+        with self.db.lock:
+            rows, _ = self.db.select(table, filters)
+            for row in rows:
+                row.update(body)
+            updated = [dict(row) for row in rows]
+        if 'return=minimal' in self._prefer():
+            return 204, None, {}, len(updated)
+        return 200, updated, {}, len(updated)
+
+    def _delete(self, table, filters, options, body):
+        with self.db.lock:
+            rows, _ = self.db.select(table, filters)
+            target = self.db.table(table)
+            for row in rows:
+                target.delete(row)
+        if 'return=minimal' in self._prefer():
+            return 204, None, {}, len(rows)
+        return 200, rows, {}, len(rows)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_HEAD(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def _send(self, status, payload, headers):
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+        return len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_postgrest_stub(host='127.0.0.1', port=0, db=None, latency=0.0, log=None):
+    """
+    백그라운드 스레드에서 PostgREST 스텁 시작
+
+    Returns:
+        (server, base_url) - server.db 로 테이블 내용 확인, 끝나면 server.shutdown()
+    """
+    db = db or FakeDatabase()
+    handler = type('Handler', (PostgrestStubHandler,), {'db': db, 'latency': latency, 'log': log})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.db = db
+    thread = threading.Thread(target=server.serve_forever, name='postgrest-stub', daemon=True)
+    thread.start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='In-memory PostgREST stub for the import scripts')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=54321)
+    parser.add_argument('--latency', type=float, default=0.0, help='요청마다 추가 지연 (초)')
+    args = parser.parse_args()
+
+    handler = type('Handler', (PostgrestStubHandler,), {'db': FakeDatabase(), 'latency': args.latency})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"PostgREST stub listening on http://{args.host}:{args.port}/rest/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
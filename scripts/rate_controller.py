@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+업스트림 API 요청 속도 적응 제어 (AIMD)
+
+고정 time.sleep(0.1) 이나 고정 토큰 버킷은 업스트림이 멀쩡할 때는 너무 느리고,
+업스트림이 제한(429)을 걸거나 느려질 때는 너무 공격적임.
+AimdRateController 는 응답을 보고 초당 요청 수(rate)와 동시 요청 한도(limit)를 바꿈:
+
+    증가 (additive)        interval 마다, 그 구간에 429/5xx/타임아웃이 없고 평균 지연이 기준 이하이고
+                           지금 속도를 실제로 다 쓰고 있었으면 rate += increase, limit += 1
+                           (max_rate / max_concurrency 까지)
+    감소 (multiplicative)  429 / 5xx / 타임아웃 / 연결 에러면 rate, limit × decrease
+                           (이미 보낸 요청의 에러가 한꺼번에 돌아와도 interval 에 한 번만)
+    Retry-After            그 시간 동안은 아무 워커도 새 요청을 보내지 않음
+    지연 기준              지금까지 본 가장 짧은 지연 × slow_factor (MIN_SLOW_SECONDS 이상).
+                           넘으면 올리지 않고 그대로 유지 (지연 폭증 구간)
+    요청 타임아웃          지연 EWMA × TIMEOUT_FACTOR (MIN_TIMEOUT 이상, timeout 이하).
+                           타임아웃은 그 길이의 지연으로 쳐서 다음 타임아웃이 늘어남
+
+스레드 안전 (잠금 안에서는 계산만 함). 번역본 여러 개를 동시에 가져올 때 이벤트 루프가
+번역본마다 따로 있어도 컨트롤러 하나를 같이 써서 업스트림 전체 요청 수를 제한함.
+
+METRICS:
+    fetch_rate{target}                    지금 초당 요청 수 (게이지)
+    fetch_concurrency{target}             지금 동시 요청 한도 (게이지)
+    rate_changes_total{target,direction}  올린/내린 횟수
+    throttled_total{target,reason}        429 / 5xx / timeout 응답 수
+
+사용 예 (동기):
+    controller = AimdRateController(rate=10)
+    response = controller.send(lambda timeout: requests.get(url, timeout=timeout))
+
+사용 예 (asyncio):
+    async with controller.slot():
+        await asyncio.sleep(controller.reserve())
+        ...
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from metrics import METRICS
+
+MIN_RATE = 0.5               # 초당 요청 수 하한
+MIN_SLOW_SECONDS = 0.05      # 지연 기준 하한 (로컬 스텁처럼 ms 단위 지연에서 잡음에 흔들리지 않게)
+MIN_TIMEOUT = 2.0            # 적응 타임아웃 하한 (초)
+TIMEOUT_FACTOR = 8.0
+EWMA_ALPHA = 0.2
+MAX_RETRY_AFTER = 120.0      # 이보다 긴 Retry-After 는 잘라냄 (초)
+SLOT_POLL_SECONDS = 0.02     # 동시 요청 한도가 차 있을 때 다시 확인하는 간격
+UTILIZATION = 0.5            # 구간 요청 수가 rate × 구간 길이의 이만큼은 되어야 "다 쓰고 있음"
+
+
+def parse_retry_after(value, now=None):
+    """
+    Retry-After 헤더 → 기다릴 초 (초 단위 숫자 또는 HTTP 날짜, 없거나 잘못되면 None)
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - (now or datetime.now(timezone.utc))).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def is_congestion(status):
+    """업스트림이 버거워한다는 신호인지 (None = 타임아웃 / 연결 에러)"""
+    return status is None or status == 429 or status >= 500
+
+
+class AimdRateController:
+    """
+    AIMD 요청 속도 / 동시 요청 한도 제어기
+
+    Args:
+        rate: 시작 초당 요청 수
+        concurrency: 시작 동시 요청 한도
+        max_rate: 초당 요청 수 상한 (기본 rate × 4)
+        max_concurrency: 동시 요청 한도 상한 (기본 concurrency × 4)
+        increase: 한 번에 올리는 초당 요청 수 (기본 rate / 10)
+        decrease: 내릴 때 곱하는 값
+        interval: 올리는 판단 / 내리는 최소 간격 (초)
+        slow_factor: 가장 짧은 지연의 몇 배부터 느린 것으로 볼지
+        timeout: 요청 타임아웃 상한 (초)
+        adaptive: False 면 rate / concurrency 고정 (Retry-After 는 그래도 지킴)
+        target: 메트릭 라벨
+    """
+
+    def __init__(self, rate, concurrency=1, max_rate=None, max_concurrency=None, increase=None,
+                 decrease=0.5, interval=1.0, slow_factor=3.0, timeout=10.0, adaptive=True, target='bolls'):
+        self.rate = float(rate)
+        self.limit = float(concurrency)
+        self.max_rate = float(max_rate or rate * 4) if adaptive else self.rate
+        self.max_concurrency = int(max_concurrency or concurrency * 4) if adaptive else int(concurrency)
+        self.increase = float(increase or max(1.0, rate / 10))
+        self.decrease = decrease
+        self.interval = interval
+        self.slow_factor = slow_factor
+        self.max_timeout = timeout
+        self.adaptive = adaptive
+        self.target = target
+
+        self.start_rate, self.start_limit = self.rate, self.limit
+        self.peak_rate, self.peak_limit = self.rate, self.limit
+        self.increases = self.decreases = 0
+        self.paused_seconds = 0.0
+
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+        self._in_flight = 0
+        self._min_latency = None
+        self._ewma = None
+        self._reset_window(time.monotonic())
+        self._publish()
+
+    def _reset_window(self, now):
+        self._window_start = now
+        self._window_count = 0
+        self._window_seconds = 0.0
+        self._window_errors = 0
+        self._window_saturated = False
+
+    def _publish(self):
+        METRICS.set('fetch_rate', round(self.rate, 2), target=self.target)
+        METRICS.set('fetch_concurrency', int(self.limit), target=self.target)
+
+    def reserve(self):
+        """
+        요청 하나 보낼 차례를 예약하고 그때까지 기다릴 초를 돌려줌 (rate 간격 + Retry-After)
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at, self._paused_until)
+            self._next_at = start + 1.0 / self.rate
+            return start - now
+
+    def timeout(self):
+        """이번 요청의 타임아웃 (초)"""
+        with self._lock:
+            if self._ewma is None:
+                return self.max_timeout
+            return min(self.max_timeout, max(MIN_TIMEOUT, self._ewma * TIMEOUT_FACTOR))
+
+    def _try_start(self):
+        with self._lock:
+            if self._in_flight < int(self.limit):
+                self._in_flight += 1
+                return True
+            self._window_saturated = True
+            return False
+
+    def _finish(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """동시 요청 한도 안에서 요청 하나 (여러 스레드의 이벤트 루프가 같이 써도 됨)"""
+        while not self._try_start():
+            await asyncio.sleep(SLOT_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            self._finish()
+
+    def send(self, request):
+        """
+        동기 요청 하나 (requests 같은 동기 클라이언트용): 차례를 기다렸다가 보내고 응답을 반영
+
+        Args:
+            request: 타임아웃(초)을 받아서 응답(.status_code, .headers)을 돌려주는 함수
+
+        Returns:
+            request 의 응답
+        """
+        time.sleep(self.reserve())
+        started = time.perf_counter()
+        try:
+            response = request(self.timeout())
+        except OSError:
+            # requests 의 Timeout / ConnectionError 도 OSError
+            self.record(None, time.perf_counter() - started)
+            raise
+        self.record(response.status_code, time.perf_counter() - started,
+                    parse_retry_after(response.headers.get('Retry-After')))
+        return response
+
+    def record(self, status, seconds, retry_after=None):
+        """
+        응답 하나 반영
+
+        Args:
+            status: HTTP 상태 코드 (타임아웃 / 연결 에러면 None)
+            seconds: 요청에 걸린 시간
+            retry_after: parse_retry_after 결과 (초, 선택)
+        """
+        changed = None
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                until = now + retry_after
+                if until > self._paused_until:
+                    self.paused_seconds += until - max(now, self._paused_until)
+                    self._paused_until = until
+
+            if is_congestion(status):
+                self._window_errors += 1
+                if status is None:
+                    # 타임아웃은 그만큼 걸린 것으로 쳐서 다음 타임아웃을 늘림
+                    self._ewma = max(self._ewma or 0.0, seconds)
+                if self.adaptive and now - self._last_decrease >= self.interval:
+                    self.rate = max(MIN_RATE, self.rate * self.decrease)
+                    self.limit = max(1.0, self.limit * self.decrease)
+                    self._last_decrease = now
+                    self.decreases += 1
+                    self._reset_window(now)
+                    changed = 'down'
+            else:
+                self._min_latency = seconds if self._min_latency is None else min(self._min_latency, seconds)
+                self._ewma = seconds if self._ewma is None else self._ewma + EWMA_ALPHA * (seconds - self._ewma)
+                self._window_count += 1
+                self._window_seconds += seconds
+
+                elapsed = now - self._window_start
+                if elapsed >= self.interval:
+                    slow = max(MIN_SLOW_SECONDS, self._min_latency * self.slow_factor)
+                    healthy = self._window_errors == 0 and self._window_seconds / self._window_count <= slow
+                    busy = self._window_saturated or self._window_count >= UTILIZATION * self.rate * elapsed
+                    if (self.adaptive and healthy and busy and now - self._last_decrease >= self.interval
+                            and (self.rate < self.max_rate or self.limit < self.max_concurrency)):
+                        self.rate = min(self.max_rate, self.rate + self.increase)
+                        self.limit = min(float(self.max_concurrency), self.limit + 1.0)
+                        self.increases += 1
+                        self.peak_rate = max(self.peak_rate, self.rate)
+                        self.peak_limit = max(self.peak_limit, self.limit)
+                        changed = 'up'
+                    self._reset_window(now)
+
+            if changed:
+                self._publish()
+
+        if status is not None and is_congestion(status):
+            METRICS.inc('throttled_total', target=self.target, reason='429' if status == 429 else '5xx')
+        elif status is None:
+            METRICS.inc('throttled_total', target=self.target, reason='timeout')
+        if changed:
+            METRICS.inc('rate_changes_total', target=self.target, direction=changed)
+
+    def describe(self):
+        """한 줄 요약 (실행 끝에 출력)"""
+        if not self.adaptive:
+            return (f"{self.target} rate fixed {self.rate:g} req/s, concurrency {int(self.limit)}, "
+                    f"paused {self.paused_seconds:.1f}s for Retry-After")
+        return (f"{self.target} rate {self.start_rate:g} -> {self.rate:.1f} req/s (peak {self.peak_rate:.1f}, "
+                f"max {self.max_rate:g}), concurrency {int(self.start_limit)} -> {int(self.limit)} "
+                f"(peak {int(self.peak_limit)}), {self.increases} up / {self.decreases} down, "
+                f"paused {self.paused_seconds:.1f}s for Retry-After")
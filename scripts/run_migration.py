@@ -1,61 +1,408 @@
 #!/usr/bin/env python3
+# -*- coding: utf-8 -*-
 """
-Run migration SQL directly via Supabase Python client
+단계별 / 온라인 마이그레이션 실행기 (Postgres 직접 연결)
+
+예전에는 마이그레이션 파일 전체를 exec_sql RPC 한 번으로 보냈음. 그러면 verse_translations
+백필(INSERT ... SELECT 전체 구절)까지 BEGIN ... COMMIT 하나 안에서 돌아서, 복사하는 내내
+운영 테이블 잠금을 잡고 있고 진행 상황도 재시작 지점도 없었음.
+
+이제 마이그레이션 파일을 "-- @" 표시 줄로 단계를 나눠서 실행함:
+
+    -- @step <이름>
+        DDL / 작은 데이터 변경. 한 트랜잭션으로 실행 (lock_timeout 을 걸고, 잠금을 못 잡으면 재시도)
+    -- @backfill <이름> keyset=<표>.<컬럼>
+        큰 데이터 복사. 문장 하나에 %(lo)s / %(hi)s 자리를 두면 <표>.<컬럼> 기준으로
+        chunk-size 개씩 (lo, hi] 구간을 잘라서 구간마다 실행 + 커밋 (잠금은 구간 하나 동안만)
+    -- @concurrent <이름>
+        CREATE INDEX CONCURRENTLY 같은 문장. 트랜잭션 밖에서 문장마다 실행
+        (중간에 실패해서 INVALID 로 남은 인덱스는 지우고 다시 만듦)
+
+표시가 없는 파일은 파일 전체를 그대로 한 번에 실행함 (파일 안의 BEGIN/COMMIT 사용).
+
+진행 상황은 DB 의 schema_migration_progress 에 기록함. 구간/단계 결과와 같은 트랜잭션으로
+기록하므로, 중간에 끊기면 같은 명령을 다시 실행해서 마지막으로 커밋된 구간 다음부터 이어감.
+
+접속 정보: SUPABASE_DB_URL (pg_copy_sink.connect 와 같음)
+
+사용 예:
+    python3 scripts/run_migration.py supabase/migrations/20260116_normalized_schema.sql
+    python3 scripts/run_migration.py <파일> --chunk-size 2000 --sleep 0.2   # 운영 중 부하 줄이기
+    python3 scripts/run_migration.py <파일> --plan      # 단계 목록 + 진행 상황만 출력
+    python3 scripts/run_migration.py <파일> --render    # SQL Editor 용 트랜잭션 하나짜리 SQL 출력
+    python3 scripts/run_migration.py <파일> --restart   # 진행 기록을 지우고 처음부터
 """
-import os
+
+import argparse
+import re
+import time
 from pathlib import Path
-from supabase import create_client, Client
-
-# Load environment variables
-def load_env():
-    env_path = Path(__file__).parent.parent / '.env.local'
-    env_vars = {}
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                env_vars[key] = value
-    return env_vars
-
-# Get Supabase connection
-env = load_env()
-url = env['NEXT_PUBLIC_SUPABASE_URL']
-service_role_key = env['SUPABASE_SERVICE_ROLE_KEY']
-
-supabase: Client = create_client(url, service_role_key)
-
-# Read migration file
-migration_path = Path(__file__).parent.parent / 'supabase' / 'migrations' / '20260116_normalized_schema.sql'
-with open(migration_path, 'r', encoding='utf-8') as f:
-    migration_sql = f.read()
-
-print("🚀 Running migration...")
-print(f"📄 File: {migration_path.name}")
-print(f"📏 Size: {len(migration_sql)} characters")
-print("-" * 50)
+from typing import NamedTuple, Optional
+
+from metrics import METRICS, add_metrics_arguments, metrics_run
+from pg_copy_sink import connect
+from supabase_env import load_env
 
 try:
-    # Execute migration SQL
-    response = supabase.rpc('exec_sql', {'query': migration_sql}).execute()
+    import psycopg
+except ImportError:  # connect() 가 설치 안내와 함께 실패함
+    psycopg = None
+
+DEFAULT_MIGRATION = Path(__file__).parent.parent / 'supabase' / 'migrations' / '20260116_normalized_schema.sql'
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_LOCK_TIMEOUT = '5s'
+DDL_RETRIES = 5
+
+MARKER_PATTERN = re.compile(r'^-- @(step|backfill|concurrent)\s+(\S+)(.*)$')
+KEYSET_PATTERN = re.compile(r'keyset=([A-Za-z_][A-Za-z0-9_]*)\.([A-Za-z_][A-Za-z0-9_]*)')
+INDEX_NAME_PATTERN = re.compile(
+    r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?([A-Za-z0-9_."]+)', re.I)
+
+# render 할 때 백필 구간을 전체로 (BIGINT 범위)
+KEY_MIN = -9223372036854775808
+KEY_MAX = 9223372036854775807
+
+PROGRESS_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migration_progress (
+  migration TEXT NOT NULL,
+  step TEXT NOT NULL,
+  status TEXT NOT NULL,          -- running | done
+  last_key BIGINT,               -- 백필: 마지막으로 커밋된 구간의 hi
+  rows BIGINT NOT NULL DEFAULT 0,
+  seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (migration, step)
+)
+"""
+
+
+class Section(NamedTuple):
+    kind: str                    # step | backfill | concurrent
+    name: str
+    sql: str
+    keyset: Optional[tuple] = None   # backfill: (table, column)
+
+
+def parse_migration(text):
+    """
+    마이그레이션 파일 → [Section, ...]
+
+    첫 표시 줄 앞에 주석만 있으면 버리고, SQL 이 있으면 'preamble' 단계로 둠.
+    표시 줄이 하나도 없으면 빈 목록 (파일 전체를 그대로 실행해야 함).
+    """
+    sections = []
+    current = None
+    lines = []
+
+    def flush():
+        body = '\n'.join(lines).strip()
+        if current is None:
+            if _has_sql(body):
+                sections.append(Section('step', 'preamble', body))
+        elif current[0] == 'backfill':
+            match = KEYSET_PATTERN.search(current[2])
+            if not match:
+                raise ValueError(f"@backfill {current[1]}: keyset=<table>.<column> 가 필요함")
+            if '%(lo)s' not in body or '%(hi)s' not in body:
+                raise ValueError(f"@backfill {current[1]}: 문장에 %(lo)s / %(hi)s 구간 조건이 필요함")
+            sections.append(Section('backfill', current[1], body, (match.group(1), match.group(2))))
+        else:
+            sections.append(Section(current[0], current[1], body))
+
+    for line in text.splitlines():
+        match = MARKER_PATTERN.match(line)
+        if match:
+            flush()
+            current = match.groups()
+            lines = []
+        else:
+            lines.append(line)
+    if current is None:
+        return []
+    flush()
+
+    names = [s.name for s in sections]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"duplicate section names: {', '.join(sorted(duplicates))}")
+    return sections
+
+
+def _has_sql(body):
+    return any(line.strip() and not line.strip().startswith('--') for line in body.splitlines())
+
+
+def split_statements(body):
+    """@concurrent 본문 → 문장 목록 (줄 끝의 ; 기준, $$ 블록은 쓰지 않는다고 가정)"""
+    statements, lines = [], []
+    for line in body.splitlines():
+        lines.append(line)
+        if line.rstrip().endswith(';'):
+            statement = '\n'.join(lines).strip()
+            if _has_sql(statement):
+                statements.append(statement)
+            lines = []
+    rest = '\n'.join(lines).strip()
+    if _has_sql(rest):
+        statements.append(rest)
+    return statements
+
+
+def render(sections):
+    """SQL Editor 용: 전체를 트랜잭션 하나로 (백필은 전체 구간, CONCURRENTLY 제거)"""
+    out = ['BEGIN;', '']
+    for section in sections:
+        out.append(f'-- [{section.kind}] {section.name}')
+        if section.kind == 'backfill':
+            out.append(section.sql.replace('%(lo)s', str(KEY_MIN)).replace('%(hi)s', str(KEY_MAX)))
+        elif section.kind == 'concurrent':
+            out.append(re.sub(r'\s+CONCURRENTLY\b', '', section.sql, flags=re.I))
+        else:
+            out.append(section.sql)
+        out.append('')
+    out.append('COMMIT;')
+    return '\n'.join(out) + '\n'
+
+
+class MigrationRunner:
+    """
+    Section 목록을 차례대로 실행하고 schema_migration_progress 에 기록
+
+    Args:
+        conn: psycopg 연결 (autocommit 으로 바꿔서 씀)
+        migration: 진행 기록 키 (파일 이름)
+    """
+
+    def __init__(self, conn, migration, chunk_size=DEFAULT_CHUNK_SIZE, sleep=0.0,
+                 lock_timeout=DEFAULT_LOCK_TIMEOUT):
+        self.conn = conn
+        self.conn.autocommit = True
+        self.migration = migration
+        self.chunk_size = chunk_size
+        self.sleep = sleep
+        self.lock_timeout = lock_timeout
+        self.conn.execute(PROGRESS_DDL)
+
+    # ---- 진행 기록 ----
+
+    def progress(self):
+        """{step: {status, last_key, rows, seconds}}"""
+        rows = self.conn.execute(
+            "SELECT step, status, last_key, rows, seconds FROM schema_migration_progress WHERE migration = %s",
+            (self.migration,),
+        ).fetchall()
+        return {step: {'status': status, 'last_key': last_key, 'rows': count, 'seconds': seconds}
+                for step, status, last_key, count, seconds in rows}
+
+    def reset(self):
+        self.conn.execute("DELETE FROM schema_migration_progress WHERE migration = %s", (self.migration,))
+
+    def _record(self, cur, step, status, last_key=None, rows=0, seconds=0.0):
+        """진행 기록 (rows / seconds 는 누적). cur 의 트랜잭션과 함께 커밋됨"""
+        cur.execute("""
+            INSERT INTO schema_migration_progress (migration, step, status, last_key, rows, seconds)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (migration, step) DO UPDATE SET
+              status = EXCLUDED.status,
+              last_key = COALESCE(EXCLUDED.last_key, schema_migration_progress.last_key),
+              rows = schema_migration_progress.rows + EXCLUDED.rows,
+              seconds = schema_migration_progress.seconds + EXCLUDED.seconds,
+              updated_at = NOW()
+        """, (self.migration, step, status, last_key, rows, seconds))
+
+    # ---- 단계 실행 ----
+
+    def run(self, sections):
+        progress = self.progress()
+        for section in sections:
+            state = progress.get(section.name, {})
+            if state.get('status') == 'done':
+                print(f"[skip] {section.kind} {section.name} (done, {state['rows']} rows, "
+                      f"{state['seconds']:.1f}s)", flush=True)
+                continue
+            print(f"[{section.kind}] {section.name}", flush=True)
+            started = time.perf_counter()
+            with METRICS.stage('migration', kind=section.kind, step=section.name):
+                if section.kind == 'backfill':
+                    self.run_backfill(section, state.get('last_key'))
+                elif section.kind == 'concurrent':
+                    self.run_concurrent(section)
+                else:
+                    self.run_step(section)
+            print(f"  done in {time.perf_counter() - started:.2f}s", flush=True)
+
+    def run_step(self, section):
+        """한 트랜잭션. lock_timeout 에 걸리면 (읽기 요청을 줄 세우지 않도록) 물러났다가 재시도"""
+        for attempt in range(1, DDL_RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                with self.conn.transaction(), self.conn.cursor() as cur:
+                    cur.execute(f"SET LOCAL lock_timeout = '{self.lock_timeout}'")
+                    cur.execute(section.sql)
+                    rows = max(cur.rowcount, 0)
+                    self._record(cur, section.name, 'done', rows=rows, seconds=time.perf_counter() - started)
+                return
+            except psycopg.errors.LockNotAvailable:
+                if attempt == DDL_RETRIES:
+                    raise
+                METRICS.inc('retries_total', target='migration')
+                wait = 2 ** attempt
+                print(f"  lock_timeout ({self.lock_timeout}), retry {attempt}/{DDL_RETRIES - 1} in {wait}s",
+                      flush=True)
+                time.sleep(wait)
+
+    def _key_range(self, table, column):
+        return self.conn.execute(f'SELECT min({column}), max({column}) FROM {table}').fetchone()
+
+    def _next_hi(self, table, column, lo):
+        """lo 다음 chunk_size 번째 키 (keyset, 인덱스 범위 스캔)"""
+        row = self.conn.execute(
+            f'SELECT max({column}) FROM (SELECT {column} FROM {table} WHERE {column} > %s '
+            f'ORDER BY {column} LIMIT %s) chunk',
+            (lo, self.chunk_size),
+        ).fetchone()
+        return row[0]
+
+    def run_backfill(self, section, last_key):
+        """keyset 구간마다 실행 + 커밋 (진행 기록도 같은 트랜잭션)"""
+        table, column = section.keyset
+        key_min, key_max = self._key_range(table, column)
+        if key_min is None:
+            with self.conn.transaction(), self.conn.cursor() as cur:
+                self._record(cur, section.name, 'done')
+            print(f"  {table} is empty", flush=True)
+            return
+
+        lo = last_key if last_key is not None else key_min - 1
+        if last_key is not None:
+            print(f"  resuming after {column}={last_key}", flush=True)
+        span = max(key_max - key_min + 1, 1)
+        total_rows = 0
+        started = time.perf_counter()
+
+        while True:
+            hi = self._next_hi(table, column, lo)
+            if hi is None:
+                break
+            chunk_started = time.perf_counter()
+            with self.conn.transaction(), self.conn.cursor() as cur:
+                cur.execute(f"SET LOCAL lock_timeout = '{self.lock_timeout}'")
+                cur.execute(section.sql, {'lo': lo, 'hi': hi})
+                rows = max(cur.rowcount, 0)
+                seconds = time.perf_counter() - chunk_started
+                self._record(cur, section.name, 'running', last_key=hi, rows=rows, seconds=seconds)
+
+            METRICS.observe('stage_seconds', seconds, stage='backfill_chunk', step=section.name)
+            METRICS.inc('rows_total', rows, stage='backfill', table=section.name)
+            total_rows += rows
+            elapsed = time.perf_counter() - started
+            done = min((hi - key_min + 1) / span, 1.0)
+            eta = elapsed / done - elapsed if done else 0.0
+            print(f"  ({lo}, {hi}] {rows} rows in {seconds:.2f}s | {done:6.1%} "
+                  f"{total_rows} rows, {total_rows / elapsed if elapsed else 0:,.0f} rows/s, "
+                  f"eta {eta:.0f}s", flush=True)
+            lo = hi
+            if self.sleep:
+                time.sleep(self.sleep)
+
+        with self.conn.transaction(), self.conn.cursor() as cur:
+            self._record(cur, section.name, 'done')
+
+    def _drop_invalid_index(self, statement):
+        match = INDEX_NAME_PATTERN.search(statement)
+        if not match:
+            return
+        name = match.group(1)
+        row = self.conn.execute(
+            "SELECT NOT i.indisvalid FROM pg_index i WHERE i.indexrelid = to_regclass(%s)", (name,)
+        ).fetchone()
+        if row and row[0]:
+            print(f"  dropping INVALID index {name} left by an earlier attempt", flush=True)
+            self.conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+    def run_concurrent(self, section):
+        """문장마다 autocommit (CONCURRENTLY 는 트랜잭션 블록 안에서 실행할 수 없음)"""
+        for statement in split_statements(section.sql):
+            self._drop_invalid_index(statement)
+            started = time.perf_counter()
+            self.conn.execute(statement)
+            seconds = time.perf_counter() - started
+            first_line = ' '.join(statement.split())[:100]
+            print(f"  {first_line} ({seconds:.2f}s)", flush=True)
+            with self.conn.transaction(), self.conn.cursor() as cur:
+                self._record(cur, section.name, 'running', seconds=seconds)
+        with self.conn.transaction(), self.conn.cursor() as cur:
+            self._record(cur, section.name, 'done')
+
+
+def print_plan(sections, progress):
+    for section in sections:
+        state = progress.get(section.name, {})
+        status = state.get('status', 'pending')
+        detail = ''
+        if section.kind == 'backfill':
+            detail = f" keyset={'.'.join(section.keyset)}"
+            if state.get('last_key') is not None:
+                detail += f" last_key={state['last_key']}"
+        if state:
+            detail += f" rows={state['rows']} {state['seconds']:.1f}s"
+        print(f"  {status:<8} {section.kind:<10} {section.name}{detail}")
+
+
+def run(args):
+    """main 본문 (인자 파싱 후, 계측 안에서 실행)"""
+    path = Path(args.migration)
+    text = path.read_text(encoding='utf-8')
+    sections = parse_migration(text)
+
+    if args.render:
+        print(render(sections) if sections else text, end='')
+        return
+
+    print(f"Migration: {path.name} ({len(text)} characters, {len(sections) or 'no'} sections)", flush=True)
+    conn = connect(env=load_env())
+    try:
+        if not sections:
+            # 표시 없는 예전 형식: 파일 전체를 그대로 (파일 안의 BEGIN/COMMIT 사용)
+            conn.autocommit = True
+            with METRICS.stage('migration', kind='file', step=path.name):
+                conn.execute(text)
+            print("[OK] Migration executed", flush=True)
+            return
 
-    print("✅ Migration executed successfully!")
-    print("\n📊 Verifying tables...")
+        runner = MigrationRunner(conn, path.name, chunk_size=args.chunk_size, sleep=args.sleep,
+                                 lock_timeout=args.lock_timeout)
+        if args.restart:
+            runner.reset()
+        if args.plan:
+            print_plan(sections, runner.progress())
+            return
+        runner.run(sections)
+        print("[OK] Migration completed", flush=True)
+        print_plan(sections, runner.progress())
+    finally:
+        conn.close()
 
-    # Verify tables were created
-    tables_to_check = ['new_books', 'book_names', 'translations', 'new_verses', 'verse_translations']
 
-    for table in tables_to_check:
-        try:
-            # Try to query each table
-            result = supabase.table(table).select('count').execute()
-            print(f"  ✓ {table}: exists")
-        except Exception as e:
-            print(f"  ✗ {table}: {str(e)}")
+def main():
+    parser = argparse.ArgumentParser(description='Run a migration in online phases (DDL, chunked backfills, concurrent indexes)')
+    parser.add_argument('migration', nargs='?', default=str(DEFAULT_MIGRATION), help='마이그레이션 SQL 파일')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='백필 구간 하나의 키 개수')
+    parser.add_argument('--sleep', type=float, default=0.0, help='백필 구간 사이 쉬는 시간 (초, 운영 부하 조절)')
+    parser.add_argument('--lock-timeout', default=DEFAULT_LOCK_TIMEOUT,
+                        help='단계/구간이 잠금을 기다리는 최대 시간 (넘으면 물러났다가 재시도)')
+    parser.add_argument('--restart', action='store_true', help='진행 기록을 지우고 처음부터')
+    parser.add_argument('--plan', action='store_true', help='단계 목록과 진행 상황만 출력')
+    parser.add_argument('--render', action='store_true', help='SQL Editor 용 트랜잭션 하나짜리 SQL 출력 (DB 접속 안 함)')
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
 
-except Exception as e:
-    print(f"❌ Migration failed!")
-    print(f"Error: {str(e)}")
-    exit(1)
+    if args.render:
+        run(args)
+        return
+    with metrics_run(args):
+        run(args)
 
-print("\n🎉 Migration complete!")
+if __name__ == '__main__':
+    main()
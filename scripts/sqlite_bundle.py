@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오프라인 번들: 정규화 스키마를 SQLite 파일 하나로 (번역본별 FTS5 검색 색인 포함)
+
+로컬 개발 / 테스트 / 오프라인 읽기 모드에서 Supabase 없이 읽는 읽기 전용 데이터 묶음.
+임포트 엔진의 --sink sqlite (import_sinks.BundleSink) 가 채움:
+    python3 scripts/import_engine.py --sink sqlite --translation korHRV --translation NIV --offline
+
+테이블 (Postgres 스키마와 같은 이름 / 열, 읽는 데 필요한 것만):
+    books, book_names, translations   20260116_clean_schema.sql 의 INSERT 문에서 (books.seed_rows)
+    verses               id = verse_key(book_id, chapter, verse) (서버 ID 와 별개, 다시 만들어도 같은 ID)
+    verse_translations   text (표시용), search_text (검색용, search_fold)
+    verse_headings       소제목
+    bundle_translations  번들에 들어 있는 번역본 (구절 수, 만든 시각)
+    verse_fts_{translation_id}   번역본별 FTS5 (trigram, contentless, rowid = verse_id)
+
+빌드 (SqliteBundle, 실행 전체가 트랜잭션 하나 → 실패하면 예전 번들 그대로):
+    - 빌드 중에는 WAL (읽는 쪽은 커밋 전까지 예전 번들을 봄) + synchronous=OFF (다시 만들 수 있는 파일)
+    - 보조 인덱스와 FTS 는 시작할 때 지우고, 모든 행을 넣은 뒤 finish() 에서 한 번에 만듦
+      (행마다 인덱스를 고치는 대신 정렬 한 번)
+    - 끝나면 journal_mode=DELETE 로 돌려서 파일 하나로 (-wal / -shm 없이 복사 / 배포)
+
+검색 (search): search_fold 한 검색어가 3글자 이상이면 FTS5 trigram MATCH
+(부분 문자열 검색이라 ilike '%q%' 와 같은 결과), 2글자 이하는 trigram 으로 찾을 수 없으므로
+search_text 를 훑음 (search_verses 의 strpos 대체 경로와 같음).
+
+사용 예:
+    python3 scripts/sqlite_bundle.py info
+    python3 scripts/sqlite_bundle.py search --translation korHRV 하나님이
+    python3 scripts/sqlite_bundle.py chapter --translation NIV Gen 1
+"""
+
+import argparse
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from books import seed_rows
+from metrics import METRICS
+from text_normalize import search_fold
+from verse_index import VerseIdIndex
+
+DEFAULT_BUNDLE_PATH = Path(__file__).parent.parent / '.cache' / 'bundle' / 'bible.sqlite'
+DEFAULT_SEARCH_LIMIT = 50
+FTS_MIN_CHARS = 3   # trigram 토크나이저가 찾을 수 있는 최소 검색어 길이
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+  id INTEGER PRIMARY KEY,
+  abbr_eng TEXT NOT NULL UNIQUE,
+  testament TEXT NOT NULL,
+  book_order INTEGER NOT NULL,
+  chapters INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS book_names (
+  book_id INTEGER NOT NULL REFERENCES books(id),
+  language TEXT NOT NULL,
+  name TEXT NOT NULL,
+  abbr TEXT NOT NULL,
+  PRIMARY KEY (book_id, language)
+);
+CREATE TABLE IF NOT EXISTS translations (
+  id INTEGER PRIMARY KEY,
+  code TEXT NOT NULL UNIQUE,
+  name TEXT NOT NULL,
+  language TEXT NOT NULL,
+  available INTEGER NOT NULL,
+  display_order INTEGER
+);
+CREATE TABLE IF NOT EXISTS verses (
+  id INTEGER PRIMARY KEY,
+  book_id INTEGER NOT NULL,
+  chapter INTEGER NOT NULL,
+  verse INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verse_translations (
+  translation_id INTEGER NOT NULL,
+  verse_id INTEGER NOT NULL,
+  text TEXT NOT NULL,
+  search_text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verse_headings (
+  translation_id INTEGER NOT NULL,
+  verse_id INTEGER NOT NULL,
+  heading TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bundle_translations (
+  translation_id INTEGER PRIMARY KEY,
+  verse_count INTEGER NOT NULL,
+  heading_count INTEGER NOT NULL,
+  built_at TEXT NOT NULL
+);
+"""
+
+# finish() 에서 만드는 보조 인덱스 (begin() 에서 지움)
+DEFERRED_INDEXES = {
+    'idx_verses_ref': 'CREATE UNIQUE INDEX idx_verses_ref ON verses (book_id, chapter, verse)',
+    'idx_verse_translations_key':
+        'CREATE UNIQUE INDEX idx_verse_translations_key ON verse_translations (translation_id, verse_id)',
+    'idx_verse_headings_key': 'CREATE UNIQUE INDEX idx_verse_headings_key ON verse_headings (translation_id, verse_id)',
+}
+
+
+def fts_table(translation_id):
+    """번역본의 FTS5 테이블 이름"""
+    return f'verse_fts_{int(translation_id)}'
+
+
+class SqliteBundle:
+    """
+    번들 파일 하나 빌드 (스레드 공용: 연결 하나를 lock 으로 나눠 씀)
+
+    begin() → start_translation() / load_rows() ... → finish()  (실패하면 abort())
+    번역본 여러 개를 동시에 임포트해도 모두 같은 트랜잭션에 들어가므로, 나중 번역본이
+    기준 번역본이 같은 실행에서 만든 정규 구절을 그대로 봄.
+
+    Args:
+        path: 번들 파일 (없으면 만듦)
+    """
+
+    def __init__(self, path=DEFAULT_BUNDLE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.lock = threading.Lock()
+        self._built = {}   # 이번 실행에서 다시 만든 translation_id → [구절 수, 소제목 수]
+
+    def begin(self):
+        """빌드 시작: WAL, 트랜잭션 하나, 메타데이터 채움, 보조 인덱스 지움"""
+        with self.lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=OFF')
+            self.conn.execute('PRAGMA temp_store=MEMORY')
+            self.conn.executescript(SCHEMA)
+            self.conn.execute('BEGIN IMMEDIATE')
+
+            seed = seed_rows()
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO books (id, abbr_eng, testament, book_order, chapters) VALUES (?, ?, ?, ?, ?)',
+                [(i, b['abbr_eng'], b['testament'], b['book_order'], b['chapters'])
+                 for i, b in enumerate(seed['books'], start=1)],
+            )
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO book_names (book_id, language, name, abbr) VALUES (?, ?, ?, ?)',
+                [(n['book_id'], n['language'], n['name'], n['abbr']) for n in seed['book_names']],
+            )
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO translations (id, code, name, language, available, display_order) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(i, t['code'], t['name'], t['language'], t['available'], t['display_order'])
+                 for i, t in enumerate(seed['translations'], start=1)],
+            )
+            for name in DEFERRED_INDEXES:
+                self.conn.execute(f'DROP INDEX IF EXISTS {name}')
+
+    def books(self):
+        """books 행 [{id, abbr_eng, book_order, chapters}, ...] (book_order 순)"""
+        with self.lock:
+            rows = self.conn.execute('SELECT id, abbr_eng, book_order, chapters FROM books ORDER BY book_order')
+            return [{'id': r[0], 'abbr_eng': r[1], 'book_order': r[2], 'chapters': r[3]} for r in rows]
+
+    def translation_ids(self):
+        """{translations.code: id}"""
+        with self.lock:
+            return dict(self.conn.execute('SELECT code, id FROM translations'))
+
+    def verse_index(self):
+        """번들의 정규 구절 (이번 실행에서 만든 것 포함) → VerseIdIndex"""
+        with self.lock:
+            return VerseIdIndex.from_rows(self.conn.execute('SELECT id, book_id, chapter, verse FROM verses'))
+
+    def start_translation(self, translation_id):
+        """번역본 하나를 처음부터 다시: 예전 본문 / 소제목 / FTS 를 지움"""
+        with self.lock:
+            self.conn.execute('DELETE FROM verse_translations WHERE translation_id = ?', (translation_id,))
+            self.conn.execute('DELETE FROM verse_headings WHERE translation_id = ?', (translation_id,))
+            self.conn.execute('DELETE FROM bundle_translations WHERE translation_id = ?', (translation_id,))
+            self.conn.execute(f'DROP TABLE IF EXISTS {fts_table(translation_id)}')
+            self._built[translation_id] = [0, 0]
+
+    def load_rows(self, translation_id, verses, rows, headings):
+        """
+        장 하나(또는 여러 개)의 행 추가
+
+        Args:
+            verses: 새 정규 구절 [(id, book_id, chapter, verse), ...] (이미 있으면 무시)
+            rows: verse_translations [(verse_id, text, search_text), ...] (구절 중복 없음)
+            headings: verse_headings [(verse_id, heading), ...]
+        """
+        with self.lock, METRICS.stage('insert', table='bundle'):
+            if verses:
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO verses (id, book_id, chapter, verse) VALUES (?, ?, ?, ?)', verses)
+            self.conn.executemany(
+                'INSERT INTO verse_translations (translation_id, verse_id, text, search_text) VALUES (?, ?, ?, ?)',
+                [(translation_id, *row) for row in rows])
+            if headings:
+                self.conn.executemany(
+                    'INSERT INTO verse_headings (translation_id, verse_id, heading) VALUES (?, ?, ?)',
+                    [(translation_id, *row) for row in headings])
+            counts = self._built[translation_id]
+            counts[0] += len(rows)
+            counts[1] += len(headings)
+        METRICS.inc('rows_total', len(rows), stage='insert', table='verse_translations')
+
+    def _build_fts(self, translation_id):
+        table = fts_table(translation_id)
+        self.conn.execute(f"CREATE VIRTUAL TABLE {table} USING fts5(search_text, content='', tokenize='trigram')")
+        self.conn.execute(
+            f'INSERT INTO {table} (rowid, search_text) '
+            'SELECT verse_id, search_text FROM verse_translations WHERE translation_id = ? ORDER BY verse_id',
+            (translation_id,))
+        self.conn.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+
+    def finish(self):
+        """
+        보조 인덱스와 다시 만든 번역본의 FTS 를 만들고 커밋, 파일 하나로 정리
+
+        Returns:
+            dict: {translation_id: (구절 수, 소제목 수)} (이번 실행에서 다시 만든 번역본)
+        """
+        with self.lock:
+            with METRICS.stage('index', table='bundle'):
+                for ddl in DEFERRED_INDEXES.values():
+                    self.conn.execute(ddl)
+            with METRICS.stage('fts', table='bundle'):
+                for translation_id in self._built:
+                    self._build_fts(translation_id)
+            built_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+            self.conn.executemany(
+                'INSERT INTO bundle_translations (translation_id, verse_count, heading_count, built_at) '
+                'VALUES (?, ?, ?, ?)',
+                [(tid, verses, headings, built_at) for tid, (verses, headings) in self._built.items()])
+            self.conn.execute('ANALYZE')
+            self.conn.execute('COMMIT')
+            self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            self.conn.execute('PRAGMA journal_mode=DELETE')
+            self.conn.close()
+        return {tid: tuple(counts) for tid, counts in self._built.items()}
+
+    def abort(self):
+        """빌드 취소 (예전 번들 그대로)"""
+        with self.lock:
+            if self.conn.in_transaction:
+                self.conn.execute('ROLLBACK')
+            self.conn.close()
+
+
+def open_bundle(path=DEFAULT_BUNDLE_PATH):
+    """읽기 전용 연결"""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f'{path} not found (build it with import_engine.py --sink sqlite)')
+    return sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+
+
+def translation_id(conn, code):
+    """번역본 코드 → id (번들에 본문이 없으면 ValueError)"""
+    row = conn.execute(
+        'SELECT t.id FROM translations t JOIN bundle_translations b ON b.translation_id = t.id WHERE t.code = ?',
+        (code,)).fetchone()
+    if row is None:
+        raise ValueError(f'{code} is not in the bundle')
+    return row[0]
+
+
+def search_needle(query):
+    """검색어 → search_text 와 비교할 문자열 (search_fold + 공백 정리)"""
+    return ' '.join(search_fold(query).split())
+
+
+def search(conn, translation_id, query, limit=DEFAULT_SEARCH_LIMIT):
+    """
+    부분 문자열 검색 (search_fold 기준, 성경 순서)
+
+    Returns:
+        list: [(verse_id, abbr_eng, chapter, verse, text), ...]
+    """
+    needle = search_needle(query)
+    if not needle:
+        return []
+    if len(needle) >= FTS_MIN_CHARS:
+        table = fts_table(translation_id)
+        hits = f'SELECT rowid AS verse_id FROM {table} WHERE {table} MATCH ? ORDER BY rowid LIMIT ?'
+        params = ('"' + needle.replace('"', '""') + '"', limit)
+    else:
+        hits = ('SELECT verse_id FROM verse_translations '
+                'WHERE translation_id = ? AND instr(search_text, ?) > 0 ORDER BY verse_id LIMIT ?')
+        params = (translation_id, needle, limit)
+    return conn.execute(
+        f'SELECT vt.verse_id, b.abbr_eng, v.chapter, v.verse, vt.text FROM ({hits}) h '
+        'JOIN verse_translations vt ON vt.translation_id = ? AND vt.verse_id = h.verse_id '
+        'JOIN verses v ON v.id = vt.verse_id '
+        'JOIN books b ON b.id = v.book_id '
+        'ORDER BY vt.verse_id',
+        (*params, translation_id)).fetchall()
+
+
+def read_chapter(conn, translation_id, abbr_eng, chapter):
+    """
+    장 하나 (오프라인 읽기 모드)
+
+    Returns:
+        list: [(verse, text, heading 또는 None), ...]
+    """
+    return conn.execute(
+        'SELECT v.verse, vt.text, h.heading FROM verses v '
+        'JOIN books b ON b.id = v.book_id '
+        'JOIN verse_translations vt ON vt.translation_id = ? AND vt.verse_id = v.id '
+        'LEFT JOIN verse_headings h ON h.translation_id = vt.translation_id AND h.verse_id = v.id '
+        'WHERE b.abbr_eng = ? AND v.chapter = ? ORDER BY v.verse',
+        (translation_id, abbr_eng, chapter)).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and query the offline SQLite bundle')
+    parser.add_argument('--bundle', default=DEFAULT_BUNDLE_PATH, help='번들 파일')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('info', help='번들에 들어 있는 번역본')
+    find = sub.add_parser('search', help='부분 문자열 검색')
+    find.add_argument('--translation', required=True)
+    find.add_argument('--limit', type=int, default=DEFAULT_SEARCH_LIMIT)
+    find.add_argument('query')
+    read = sub.add_parser('chapter', help='장 하나 읽기')
+    read.add_argument('--translation', required=True)
+    read.add_argument('book', help='영어 약어 (예: Gen)')
+    read.add_argument('chapter', type=int)
+    args = parser.parse_args()
+
+    conn = open_bundle(args.bundle)
+    if args.command == 'info':
+        print(f"{args.bundle} ({Path(args.bundle).stat().st_size / 1024 / 1024:.1f} MB)")
+        for code, verses, headings, built_at in conn.execute(
+            'SELECT t.code, b.verse_count, b.heading_count, b.built_at FROM bundle_translations b '
+            'JOIN translations t ON t.id = b.translation_id ORDER BY t.display_order'
+        ):
+            print(f"  {code:<10} {verses:>7} verses  {headings:>5} headings  built {built_at}")
+    elif args.command == 'search':
+        for _, abbr, chapter, verse, text in search(conn, translation_id(conn, args.translation), args.query,
+                                                    args.limit):
+            print(f"{abbr} {chapter}:{verse}  {text}")
+    else:
+        for verse, text, heading in read_chapter(conn, translation_id(conn, args.translation), args.book,
+                                                 args.chapter):
+            if heading:
+                print(f"  [{heading}]")
+            print(f"{verse:>3} {text}")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
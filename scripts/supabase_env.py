@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.env.local 읽기 + Supabase 클라이언트 생성 (모든 스크립트 공용)
+
+.env.local 값이 우선이고, 없는 키는 환경 변수에서 채움
+(예전 스크립트들은 load_env / python-dotenv / os.getenv 를 제각각 썼음).
+
+사용 예:
+    from supabase_env import create_supabase, load_env
+
+    env = load_env()
+    supabase = create_supabase(env)
+"""
+
+import os
+from pathlib import Path
+
+from supabase import Client, create_client
+
+from metrics import instrument_supabase
+
+ENV_PATH = Path(__file__).parent.parent / '.env.local'
+REQUIRED_KEYS = ('NEXT_PUBLIC_SUPABASE_URL', 'SUPABASE_SERVICE_ROLE_KEY')
+
+
+def load_env(path=ENV_PATH):
+    """
+    .env.local 을 dict 로 읽음 (KEY=VALUE, # 주석)
+
+    Returns:
+        dict: 파일 값 + 파일에 없는 키는 os.environ 값
+    """
+    env_vars = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    key, value = line.split('=', 1)
+                    env_vars[key] = value
+    except FileNotFoundError:
+        pass
+
+    for key, value in os.environ.items():
+        env_vars.setdefault(key, value)
+    return env_vars
+
+
+def create_supabase(env=None, instrument=True) -> Client:
+    """
+    service role 키로 Supabase 클라이언트 생성
+
+    Args:
+        env: load_env() 결과 (None 이면 새로 읽음)
+        instrument: True 면 요청마다 metrics 에 기록 (instrument_supabase)
+    """
+    env = load_env() if env is None else env
+    missing = [key for key in REQUIRED_KEYS if not env.get(key)]
+    if missing:
+        raise RuntimeError(f"환경 변수가 설정되지 않았습니다: {', '.join(missing)} (.env.local 확인)")
+
+    client = create_client(env['NEXT_PUBLIC_SUPABASE_URL'], env['SUPABASE_SERVICE_ROLE_KEY'])
+    return instrument_supabase(client) if instrument else client
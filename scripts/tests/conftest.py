@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+scripts/ 모듈 테스트 공용 설정
+
+스크립트들은 패키지가 아니라 scripts/ 를 기준으로 서로 import 하므로 (from metrics import METRICS),
+테스트에서도 scripts/ 를 import 경로에 넣음.
+
+실행:
+    python -m pytest scripts/tests
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""chapter_cache: 저장 / 조회, LRU 삭제, 해시가 맞지 않는 파일, index.json 합치기"""
+
+import itertools
+import json
+
+import pytest
+
+import chapter_cache
+from chapter_cache import CacheMiss, ChapterCache
+
+
+def body(verse_count, text='x'):
+    return json.dumps([{'verse': v, 'text': text} for v in range(1, verse_count + 1)]).encode('utf-8')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """'used' 시각이 저장 / 조회 순서대로 늘어나도록 (같은 시각이면 LRU 순서가 정해지지 않음)"""
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(chapter_cache.time, 'time', lambda: float(next(ticks)))
+
+
+def test_store_and_lookup(tmp_path):
+    cache = ChapterCache(tmp_path)
+    assert cache.lookup('NIV2011', 19, 23) is None
+    cache.store('NIV2011', 19, 23, body(6))
+    assert cache.lookup('NIV2011', 19, 23) == json.loads(body(6))
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_empty_response_is_not_stored(tmp_path):
+    cache = ChapterCache(tmp_path)
+    cache.store('NIV2011', 1, 1, b'[]')
+    assert cache.lookup('NIV2011', 1, 1) is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_lru_evicts_least_recently_used(tmp_path, clock):
+    size = len(body(3, 'a'))
+    cache = ChapterCache(tmp_path, max_bytes=2 * size)
+    cache.store('NIV2011', 1, 1, body(3, 'a'))
+    cache.store('NIV2011', 1, 2, body(3, 'b'))
+    cache.lookup('NIV2011', 1, 1)                  # 1장이 2장보다 최근
+    cache.store('NIV2011', 1, 3, body(3, 'c'))     # 넘침 → 2장 삭제
+
+    assert cache.lookup('NIV2011', 1, 2) is None
+    assert cache.lookup('NIV2011', 1, 1) is not None
+    assert cache.lookup('NIV2011', 1, 3) is not None
+    assert len(list((tmp_path / 'objects').glob('*/*'))) == 2
+
+
+def test_shared_object_survives_eviction_of_one_key(tmp_path, clock):
+    size = len(body(3, 'a'))
+    cache = ChapterCache(tmp_path, max_bytes=size)
+    cache.store('NIV2011', 1, 1, body(3, 'a'))
+    cache.store('NIV', 1, 1, body(3, 'a'))         # 같은 내용 = 같은 object, 크기는 한 번만
+    assert cache.lookup('NIV2011', 1, 1) is not None
+    assert cache.lookup('NIV', 1, 1) is not None
+
+
+def test_corrupt_object_is_dropped(tmp_path):
+    cache = ChapterCache(tmp_path)
+    cache.store('NIV2011', 1, 1, body(2))
+    [path] = (tmp_path / 'objects').glob('*/*')
+    path.write_bytes(body(2, 'tampered'))
+
+    assert cache.lookup('NIV2011', 1, 1) is None
+    assert cache.corrupt == 1
+    assert cache.stats()['entries'] == 0
+
+
+def test_missing_object_is_dropped(tmp_path):
+    cache = ChapterCache(tmp_path)
+    cache.store('NIV2011', 1, 1, body(2))
+    [path] = (tmp_path / 'objects').glob('*/*')
+    path.unlink()
+
+    assert cache.lookup('NIV2011', 1, 1) is None
+    assert cache.corrupt == 1
+
+
+def test_offline_miss_raises(tmp_path):
+    cache = ChapterCache(tmp_path, offline=True)
+    with pytest.raises(CacheMiss):
+        cache.lookup('NIV2011', 1, 1)
+
+
+def test_save_merges_with_index_on_disk(tmp_path):
+    first, second = ChapterCache(tmp_path), ChapterCache(tmp_path)
+    first.store('NIV2011', 1, 1, body(1, 'a'))
+    second.store('NIV2011', 1, 2, body(1, 'b'))
+    first.save()
+    second.save()
+
+    reopened = ChapterCache(tmp_path)
+    assert reopened.lookup('NIV2011', 1, 1) is not None
+    assert reopened.lookup('NIV2011', 1, 2) is not None
+
+
+def test_iter_translation_in_book_order(tmp_path):
+    cache = ChapterCache(tmp_path)
+    for book, chapter in [(2, 1), (1, 10), (1, 2)]:
+        cache.store('NIV2011', book, chapter, body(1, f'{book}:{chapter}'))
+    cache.store('KJV', 1, 1, body(1, 'other'))
+    assert [(b, c) for b, c, _ in cache.iter_translation('NIV2011')] == [(1, 2), (1, 10), (2, 1)]
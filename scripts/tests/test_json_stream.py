@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""json_stream.iter_array: 청크 경계에서 잘린 요소 / 숫자 / 문자열, 형식 오류"""
+
+import io
+import json
+
+import pytest
+
+from json_stream import iter_array
+
+DOCUMENT = json.dumps([
+    {'book': 1, 'chapter': 1, 'verse': 1, 'text': 'In the beginning God created the heavens and the earth.'},
+    {'book': 19, 'chapter': 23, 'verse': 1, 'text': '여호와는 나의 목자시니 "내게 부족함이 없으리로다" \\ [1]'},
+    12345,
+    -0.5e-3,
+    1.25E+10,
+    'string with , and ] inside',
+    [1, [2, 3], {'a': []}],
+    True,
+    None,
+    {},
+], ensure_ascii=False, indent=1)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 16, 64, len(DOCUMENT), 1 << 16])
+def test_matches_json_loads_at_every_chunk_size(chunk_size):
+    assert list(iter_array(io.StringIO(DOCUMENT), chunk_size=chunk_size)) == json.loads(DOCUMENT)
+
+
+@pytest.mark.parametrize('chunk_size', range(1, 12))
+def test_numbers_split_at_chunk_boundary(chunk_size):
+    text = '[1234567, 12.5e3, -7, 0.125, 42]'
+    assert list(iter_array(io.StringIO(text), chunk_size=chunk_size)) == [1234567, 12.5e3, -7, 0.125, 42]
+
+
+def test_empty_array_and_whitespace():
+    assert list(iter_array(io.StringIO('  \n[ \n ]  '), chunk_size=1)) == []
+
+
+def test_yields_lazily():
+    items = iter_array(io.StringIO('[1, 2, oops'), chunk_size=4)
+    assert next(items) == 1
+    assert next(items) == 2
+    with pytest.raises(ValueError):
+        next(items)
+
+
+@pytest.mark.parametrize('text', ['', '{"a": 1}', '[1, 2', '[1 2]', '[1,,2]', '[{"a": 1]'])
+def test_invalid_input_raises(text):
+    with pytest.raises(ValueError):
+        list(iter_array(io.StringIO(text), chunk_size=3))
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""rate_controller: Retry-After 해석, AIMD 증가 / 감소, 예약 간격"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import rate_controller
+from rate_controller import MAX_RETRY_AFTER, AimdRateController, is_congestion, parse_retry_after
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_controller.time, 'monotonic', clock)
+    return clock
+
+
+def test_parse_retry_after():
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(' 1.5 ') == 1.5
+    assert parse_retry_after(format_datetime(now + timedelta(seconds=30), usegmt=True), now=now) == 30.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after('99999') == MAX_RETRY_AFTER
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_is_congestion():
+    assert is_congestion(None)
+    assert is_congestion(429)
+    assert is_congestion(503)
+    assert not is_congestion(200)
+    assert not is_congestion(404)
+
+
+def test_congestion_halves_once_per_interval(clock):
+    controller = AimdRateController(rate=20, concurrency=8)
+    controller.record(429, 0.1)
+    assert (controller.rate, controller.limit) == (10.0, 4.0)
+
+    controller.record(503, 0.1)          # 이미 보낸 요청의 에러: 같은 구간이면 다시 내리지 않음
+    assert controller.rate == 10.0
+
+    clock.now += controller.interval
+    controller.record(None, 5.0)         # 타임아웃
+    assert (controller.rate, controller.limit) == (5.0, 2.0)
+    assert controller.decreases == 2
+
+
+def test_healthy_busy_window_increases(clock):
+    controller = AimdRateController(rate=10, concurrency=2)
+    for _ in range(10):
+        clock.now += 0.1
+        controller.record(200, 0.02)
+    assert controller.rate == 10.0 + controller.increase
+    assert controller.limit == 3.0
+    assert controller.increases == 1
+
+
+def test_idle_window_does_not_increase(clock):
+    controller = AimdRateController(rate=10, concurrency=2)
+    clock.now += 1.0
+    controller.record(200, 0.02)         # 구간에 요청 하나: 지금 속도를 다 쓰고 있지 않음
+    assert controller.rate == 10.0
+    assert controller.increases == 0
+
+
+def test_increase_stops_at_max(clock):
+    controller = AimdRateController(rate=10, concurrency=1, max_rate=11, max_concurrency=1)
+    for _ in range(40):
+        clock.now += 0.1
+        controller.record(200, 0.02)
+    assert (controller.rate, controller.limit) == (11.0, 1.0)
+
+
+def test_fixed_rate_ignores_errors(clock):
+    controller = AimdRateController(rate=10, concurrency=4, adaptive=False)
+    controller.record(429, 0.1)
+    assert (controller.rate, controller.limit) == (10.0, 4.0)
+
+
+def test_reserve_spaces_requests_and_honors_retry_after(clock):
+    controller = AimdRateController(rate=4)
+    assert controller.reserve() == 0.0
+    assert controller.reserve() == pytest.approx(0.25)
+
+    controller.record(429, 0.1, retry_after=10.0)
+    assert controller.reserve() == pytest.approx(10.0)
+    assert controller.paused_seconds == pytest.approx(10.0)
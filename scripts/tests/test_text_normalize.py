@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""text_normalize: 표시용 본문 정리(clean_texts), 검색용 정규화(search_fold), 장 정리(normalize_chapter)"""
+
+import unicodedata
+
+import pytest
+
+from import_sources import Chapter
+from text_normalize import SEPARATOR, clean_text, clean_texts, normalize_chapter, search_fold, search_folds
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('In the <i>beginning</i><S>7225</S> God', 'In the beginning God'),
+    ('created<sup>a</sup> the heavens', 'created the heavens'),
+    ('word <sup>b</sup>, next', 'word, next'),
+    ('line one<br/>line two', 'line one line two'),
+    ('&quot;Let there be light&quot; &amp; light', '"Let there be light" & light'),
+    ('a&nbsp;b', 'a b'),
+    ('  spaced \t out \n ', 'spaced out'),
+    ('zero\u200bwidth\ufeff', 'zerowidth'),
+    ('if a < b and c > d', 'if a < b and c > d'),
+    ('<note>drop me</note>kept', 'kept'),
+])
+def test_clean_text(raw, expected):
+    assert clean_text(raw) == expected
+
+
+def test_clean_texts_keeps_order_and_count():
+    texts = ['<i>a</i>', '', 'b<br>', 'c' + SEPARATOR + 'd']
+    assert clean_texts(texts) == ['a', '', 'b', 'cd']
+    assert clean_texts([]) == []
+
+
+def test_clean_text_composes_hangul():
+    decomposed = unicodedata.normalize('NFD', '하나님')
+    assert clean_text(decomposed) == '하나님'
+    assert len(clean_text(decomposed)) == 3
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Hello WORLD', 'hello world'),
+    ('Straße', 'strasse'),
+    ('ΣΟΦΟΣ σοφος', 'σοφοσ σοφοσ'),
+    ('ſabbath', 'sabbath'),
+    ('ﬁrst', 'ﬁrst'),                                    # 합자는 DB search_fold 처럼 그대로
+    (unicodedata.normalize('NFD', '태초에'), '태초에'),
+])
+def test_search_fold(text, expected):
+    assert search_fold(text) == expected
+
+
+def test_search_fold_matches_sql_steps():
+    # SQL: translate(replace(lower(normalize(q, NFC)), 'ß', 'ss'), 'ςſ', 'σs')
+    for text in ['Straße ὈΔΥΣΣΕΎΣ ſ ẞ', 'In The Beginning', '여호와는 나의 목자']:
+        sql = unicodedata.normalize('NFC', text).lower().replace('ß', 'ss')
+        sql = sql.translate(str.maketrans('ςſ', 'σs'))
+        assert search_fold(text) == sql
+
+
+def test_search_folds_keeps_order():
+    assert search_folds(['A', 'Bß', '']) == ['a', 'bss', '']
+    assert search_folds([]) == []
+
+
+def test_normalize_chapter_cleans_verses_and_drops_empty_headings():
+    chapter = Chapter(19, 23, [(1, '<i>The</i> LORD'), (2, 'green&nbsp;pastures')],
+                      [(1, '<b>Psalm</b> 23'), (2, '<S>1</S>')])
+    normalized = normalize_chapter(chapter)
+    assert normalized.verses == [(1, 'The LORD'), (2, 'green pastures')]
+    assert normalized.headings == [(1, 'Psalm 23')]
+
+
+def test_normalize_chapter_without_headings_or_verses():
+    assert normalize_chapter(Chapter(1, 1, [(1, 'a<br/>b')])).headings is None
+    missing = Chapter(1, 2, None)
+    assert normalize_chapter(missing) is missing
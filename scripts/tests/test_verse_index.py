@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""verse_index: 배열 인덱스 조회 / 빈 자리 / 범위 밖"""
+
+from verse_index import BOOK_BITS, CHAPTER_BITS, VerseIdIndex, verse_key
+
+ROWS = [
+    # (verse_id, book_id, chapter, verse) - 순서 무관, 2권 1장 2절은 빠짐
+    (12, 2, 1, 3),
+    (1, 1, 1, 1),
+    (2, 1, 1, 2),
+    (3, 1, 2, 1),
+    (10, 2, 1, 1),
+]
+
+
+def test_get_returns_verse_ids():
+    index = VerseIdIndex.from_rows(ROWS)
+    for verse_id, book_id, chapter, verse in ROWS:
+        assert index.get(book_id, chapter, verse) == verse_id
+    assert len(index) == len(ROWS)
+
+
+def test_gap_and_out_of_range_are_none():
+    index = VerseIdIndex.from_rows(ROWS)
+    assert index.get(2, 1, 2) is None      # 빈 자리
+    assert index.get(1, 1, 3) is None      # 장의 마지막 절 뒤
+    assert index.get(1, 3, 1) is None      # 없는 장
+    assert index.get(0, 1, 1) is None      # 없는 책
+    assert index.get(3, 1, 1) is None
+    assert index.get(1, 0, 1) is None
+    assert index.get(1, 1, 0) is None
+
+
+def test_chapter_verse_count():
+    index = VerseIdIndex.from_rows(ROWS)
+    assert index.chapter_verse_count(1, 1) == 2
+    assert index.chapter_verse_count(2, 1) == 3
+    assert index.chapter_verse_count(2, 2) == 0
+
+
+def test_from_columns_matches_from_rows():
+    columns = [list(column) for column in zip(*ROWS)]
+    by_columns = VerseIdIndex.from_columns(*columns)
+    by_rows = VerseIdIndex.from_rows(ROWS)
+    assert list(by_columns.verse_ids) == list(by_rows.verse_ids)
+    assert by_columns.nbytes == by_rows.nbytes
+
+
+def test_empty_index():
+    index = VerseIdIndex.from_rows([])
+    assert len(index) == 0
+    assert index.get(1, 1, 1) is None
+
+
+def test_verse_key_sorts_in_bible_order():
+    keys = [verse_key(1, 1, 1023), verse_key(1, 2, 1), verse_key(2, 1, 1)]
+    assert keys == sorted(keys)
+    assert verse_key(3, 4, 5) == 3 << BOOK_BITS | 4 << CHAPTER_BITS | 5
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""versification: 번호가 같은 절 / 규칙으로 옮긴 절 / 앞·뒤 구절로 합치기 / 정렬 못한 장"""
+
+from import_sources import Chapter
+from verse_index import VerseIdIndex
+from versification import AlignmentRow, VerseAligner
+
+BOOK_ORDER, BOOK_ID = 19, 7
+BOOKS = [{'id': BOOK_ID, 'book_order': BOOK_ORDER}]
+
+
+def verse_id(chapter, verse):
+    return chapter * 100 + verse
+
+
+def make_aligner(rules=()):
+    # 정규 구절: 3장 1-8절, 4장 1-3절, 5장 2-3절 (1절 없음). 6장은 없음
+    refs = [(3, v) for v in range(1, 9)] + [(4, v) for v in range(1, 4)] + [(5, 2), (5, 3)]
+    index = VerseIdIndex.from_rows([(verse_id(c, v), BOOK_ID, c, v) for c, v in refs])
+    return VerseAligner.from_index(index, BOOKS, rules)
+
+
+def test_identity_chapter_has_no_alignment_rows():
+    chapter = Chapter(BOOK_ORDER, 4, [(1, 'a'), (2, 'b'), (3, 'c')])
+    aligned, alignment, unaligned = make_aligner().align([chapter])
+    assert aligned == [chapter]
+    assert alignment == []
+    assert unaligned == []
+
+
+def test_extra_verse_merges_into_previous_canonical_verse():
+    chapter = Chapter(BOOK_ORDER, 4, [(1, 'a'), (2, 'b'), (3, 'c'), (4, 'd')], [(4, 'heading')])
+    [aligned], alignment, unaligned = make_aligner().align([chapter])
+
+    assert aligned.verses == [(1, 'a'), (2, 'b'), (3, 'c d')]
+    assert aligned.headings == [(3, 'heading')]
+    # 여러 절이 모인 정규 구절은 IDENTITY 절까지 행으로 (native_refs 가 이어 붙인 본문과 맞도록)
+    assert sorted(alignment) == [
+        AlignmentRow(BOOK_ID, 4, 3, verse_id(4, 3), 'identity'),
+        AlignmentRow(BOOK_ID, 4, 4, verse_id(4, 3), 'merge'),
+    ]
+    assert unaligned == []
+
+
+def test_verse_before_first_canonical_verse_merges_forward():
+    chapter = Chapter(BOOK_ORDER, 5, [(1, 'a'), (2, 'b'), (3, 'c')])
+    [aligned], alignment, _ = make_aligner().align([chapter])
+
+    assert aligned.verses == [(2, 'a b'), (3, 'c')]
+    assert {row.kind for row in alignment} == {'merge', 'identity'}
+    assert {row.verse_id for row in alignment} == {verse_id(5, 2)}
+
+
+def test_shift_rule_renumbers_verses():
+    # 표제를 1절로 세는 번역본: 2-9절 → 정규 1-8절, 표제(1절)는 정규 1절에 같이
+    verses = [(v, f't{v}') for v in range(1, 10)]
+    aligner = make_aligner(rules=[(BOOK_ORDER, 3, 2, 999, -1)])
+    [aligned], alignment, unaligned = aligner.align([Chapter(BOOK_ORDER, 3, verses)])
+
+    assert aligned.verses[0] == (1, 't1 t2')
+    assert aligned.verses[-1] == (8, 't9')
+    assert len(aligned.verses) == 8
+    assert AlignmentRow(BOOK_ID, 3, 9, verse_id(3, 8), 'shift') in alignment
+    assert unaligned == []
+
+
+def test_chapter_without_canonical_verses_is_unaligned():
+    chapters = [Chapter(BOOK_ORDER, 6, [(1, 'a'), (2, 'b')], [(1, 'heading')]), Chapter(BOOK_ORDER, 4, None)]
+    aligned, alignment, unaligned = make_aligner().align(chapters)
+
+    assert unaligned == [(BOOK_ORDER, 6, 1), (BOOK_ORDER, 6, 2)]
+    assert aligned[0].verses == [] and aligned[0].headings == []
+    assert aligned[1].verses is None
+    assert alignment == []
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+임포트 본문 정규화 (표시용 본문 + 검색용 본문)
+
+bolls.life 본문에는 인라인 마크업이 섞여 있음 (Strong 번호 <S>7225</S>, 각주 <sup>a</sup>,
+<i>, <br/>, &nbsp; 같은 HTML 엔티티). 유니코드 정규화도 번역본마다 제각각임 (NFD 한글 등).
+예전 임포터는 이것을 verse_translations.text 에 그대로 넣었음.
+
+    clean_texts(texts)    표시용: 번호/각주 태그는 내용째 지우고, 줄바꿈 태그는 공백,
+                          나머지 태그는 벗기고 내용만 남김 → HTML 엔티티 풀기 → NFC → 공백 정리
+    search_folds(texts)   검색용: NFC + 소문자 + ß/ς/ſ 접기 (DB: search_fold(), 20260118_text_normalization.sql)
+    normalize_chapter(ch) Chapter 하나의 본문과 소제목을 clean_texts 로
+
+장 단위로 본문을 구분자(\\0) 하나로 이어 붙여서 정규식 / unescape / NFC 를 장마다 한 번씩만 돌림
+(구절마다 따로 돌리면 함수 호출이 구절 수 × 단계 수만큼 생김).
+
+사용 예:
+    texts = clean_texts(['In the <i>beginning</i><S>7225</S>', '&quot;Let there be light&quot;'])
+    folded = search_folds(texts)
+"""
+
+import html
+import re
+import unicodedata
+
+SEPARATOR = '\0'
+
+# 내용까지 지우는 태그 (Strong 번호, 각주 / 주석)
+DROP_PATTERN = re.compile(r'<(S|sup|note|f)\b[^<>\0]*>[^<\0]*</\1\s*>', re.IGNORECASE)
+# 공백으로 바꾸는 태그 (줄바꿈 / 문단)
+BREAK_PATTERN = re.compile(r'<(?:br|/?p)\b[^<>\0]*>', re.IGNORECASE)
+# 나머지 태그는 벗기고 내용만 ("a < b" 같은 본문의 꺾쇠는 건드리지 않도록 글자로 시작하는 것만)
+TAG_PATTERN = re.compile(r'</?[A-Za-z][^<>\0]*>')
+# 폭 없는 공백 / 단어 연결자 / BOM / 소프트 하이픈
+ZERO_WIDTH_PATTERN = re.compile(r'[\u200b\u2060\ufeff\u00ad]')
+# 구분자(\0)는 공백이 아니므로 \s 로 묶여 사라지지 않음
+SPACE_PATTERN = re.compile(r'\s+')
+# 지운 각주 뒤에 남는 "word ," → "word,"
+SPACE_BEFORE_PUNCT_PATTERN = re.compile(r' +(?=[,.;:!?])')
+EDGE_SPACE_PATTERN = re.compile(r' ?\0 ?')
+# lower() 뒤에 추가로 접는 글자 (DB search_fold() 의 replace / translate 와 같은 목록)
+FOLD_TABLE = str.maketrans({'ß': 'ss', 'ς': 'σ', 'ſ': 's'})
+
+
+def clean_texts(texts):
+    """
+    본문 여러 개 → 표시용 본문 (입력 순서 그대로, 개수 같음)
+
+    Args:
+        texts: 본문 문자열 시퀀스
+
+    Returns:
+        list: 정리된 본문
+    """
+    if not texts:
+        return []
+    # 본문에 구분자가 들어 있으면 나눌 때 개수가 어긋나므로 미리 지움 (실제 본문에는 없음)
+    joined = SEPARATOR.join(text.replace(SEPARATOR, '') for text in texts)
+    joined = DROP_PATTERN.sub('', joined)
+    joined = BREAK_PATTERN.sub(' ', joined)
+    joined = TAG_PATTERN.sub('', joined)
+    joined = html.unescape(joined)
+    joined = unicodedata.normalize('NFC', joined)
+    joined = ZERO_WIDTH_PATTERN.sub('', joined)
+    joined = SPACE_PATTERN.sub(' ', joined)
+    joined = SPACE_BEFORE_PUNCT_PATTERN.sub('', joined)
+    joined = EDGE_SPACE_PATTERN.sub(SEPARATOR, joined).strip(' ')
+    return joined.split(SEPARATOR)
+
+
+def clean_text(text):
+    """본문 하나 → 표시용 본문"""
+    return clean_texts([text])[0]
+
+
+def search_folds(texts):
+    """본문 여러 개 → 검색용 본문 (search_fold, 입력 순서 그대로)"""
+    if not texts:
+        return []
+    return search_fold(SEPARATOR.join(texts)).split(SEPARATOR)
+
+
+def search_fold(text):
+    """
+    검색용 정규화 (NFC + 소문자 + ß → ss, ς → σ, ſ → s)
+
+    DB 의 search_fold() 와 같은 단계를 같은 순서로 밟음 (casefold 는 ﬁ 합자 등 DB 가 접지 않는 글자까지
+    접어서 쓰지 않음). 소문자 변환은 DB 로캘을 따르므로 İ 처럼 특수한 글자는 다를 수 있음.
+    """
+    return unicodedata.normalize('NFC', text).lower().translate(FOLD_TABLE)
+
+
+def normalize_chapter(ch):
+    """
+    Chapter 하나의 본문과 소제목을 정리 (verses 가 없으면 그대로)
+
+    본문과 소제목을 한 번에 clean_texts 로 넘기고, 정리 후 빈 소제목은 버림.
+    """
+    if not ch.verses:
+        return ch
+    headings = ch.headings or []
+    cleaned = clean_texts([text for _, text in ch.verses] + [heading for _, heading in headings])
+    verses = [(verse, text) for (verse, _), text in zip(ch.verses, cleaned)]
+    if ch.headings is None:
+        return ch._replace(verses=verses)
+    cleaned_headings = [(verse, heading) for (verse, _), heading in zip(headings, cleaned[len(verses):]) if heading]
+    return ch._replace(verses=verses, headings=cleaned_headings)
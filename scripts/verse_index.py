@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+정규 구절 ID 인덱스: (book_id, chapter, verse) -> verses.id
+
+장마다 verses 테이블을 조회하던 방식(번역본당 1,189번 왕복) 대신,
+임포트 시작 시 verses 테이블 전체를 몇 번의 페이지 조회로 읽어서
+배열 기반의 작은 인덱스로 만들어 둠.
+
+구조 (dict 수천 개 대신 array 세 개):
+    book_base[book_id]      - 해당 책의 첫 번째 장 슬롯 번호
+    chapter_start[slot]     - 해당 장의 1절이 verse_ids 에서 시작하는 위치
+    verse_ids[pos]          - verses.id (빈 자리는 0)
+
+조회는 배열 인덱싱 세 번이라 O(1), 31k 구절 기준 약 260KB.
+읽는 동안에도 행을 (id, book_id, chapter, verse) 튜플 3만여 개로 모으지 않고 array 네 개(열)에 바로 쌓음.
+
+구절 하나를 dict 키로 쓸 때는 튜플 대신 verse_key() 정수 하나 (book_id << 20 | chapter << 10 | verse,
+versification 의 numpy 키와 같은 배치).
+
+사용 예:
+    index = VerseIdIndex.load(supabase)
+    verse_id = index.get(book_id, chapter, verse)
+"""
+
+from array import array
+
+from metrics import METRICS
+
+DEFAULT_PAGE_SIZE = 1000  # Supabase PostgREST 기본 max-rows
+
+CHAPTER_BITS = 10   # 절 번호 자리 (장당 1023절까지)
+BOOK_BITS = 20      # 장 + 절 번호 자리
+
+
+def verse_key(book_id, chapter, verse):
+    """(book_id, chapter, verse) → 정수 키 하나 (정렬하면 성경 순서)"""
+    return book_id << BOOK_BITS | chapter << CHAPTER_BITS | verse
+
+
+class VerseIdIndex:
+    """(book_id, chapter, verse) -> verse_id 조회용 배열 인덱스"""
+
+    __slots__ = ('book_base', 'chapter_start', 'verse_ids', 'count')
+
+    def __init__(self, book_base, chapter_start, verse_ids, count):
+        self.book_base = book_base
+        self.chapter_start = chapter_start
+        self.verse_ids = verse_ids
+        self.count = count
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        verses 행 목록으로 인덱스 생성
+
+        Args:
+            rows: [(verse_id, book_id, chapter, verse), ...] (순서 무관)
+        """
+        columns = (array('q'), array('I'), array('I'), array('I'))
+        for row in rows:
+            for column, value in zip(columns, row):
+                column.append(value)
+        return cls.from_columns(*columns)
+
+    @classmethod
+    def from_columns(cls, ids, book_ids, chapters, verses):
+        """
+        열 배열 네 개로 인덱스 생성 (같은 위치 = 같은 구절, 순서 무관)
+        """
+        rows = zip(ids, book_ids, chapters, verses)
+        # 책별 최대 장, 장별 최대 절 계산
+        max_chapter = {}
+        max_verse = {}
+        for _, book_id, chapter, verse in rows:
+            if chapter > max_chapter.get(book_id, 0):
+                max_chapter[book_id] = chapter
+            key = (book_id, chapter)
+            if verse > max_verse.get(key, 0):
+                max_verse[key] = verse
+
+        max_book = max(max_chapter, default=0)
+
+        book_base = array('I', [0] * (max_book + 2))
+        slot = 0
+        for book_id in range(max_book + 1):
+            book_base[book_id] = slot
+            slot += max_chapter.get(book_id, 0)
+        book_base[max_book + 1] = slot
+
+        chapter_start = array('I', [0] * (slot + 1))
+        pos = 0
+        for book_id in range(max_book + 1):
+            base = book_base[book_id]
+            for chapter in range(1, max_chapter.get(book_id, 0) + 1):
+                chapter_start[base + chapter - 1] = pos
+                pos += max_verse.get((book_id, chapter), 0)
+        chapter_start[slot] = pos
+
+        verse_ids = array('q', [0] * pos)
+        for verse_id, book_id, chapter, verse in zip(ids, book_ids, chapters, verses):
+            verse_ids[chapter_start[book_base[book_id] + chapter - 1] + verse - 1] = verse_id
+
+        return cls(book_base, chapter_start, verse_ids, len(ids))
+
+    @classmethod
+    def load(cls, supabase, page_size=DEFAULT_PAGE_SIZE, book_ids=None):
+        """
+        verses 테이블 전체를 id 기준 keyset 페이지네이션으로 읽어서 인덱스 생성
+
+        Args:
+            supabase: supabase Client
+            page_size: 한 번에 읽을 행 수 (PostgREST max-rows 이하)
+            book_ids: 일부 책만 필요할 때 book_id 목록 (None 이면 전체)
+        """
+        with METRICS.stage('verse_index_load'):
+            return cls._load(supabase, page_size, book_ids)
+
+    @classmethod
+    def _load(cls, supabase, page_size, book_ids):
+        ids, books, chapters, verses = array('q'), array('I'), array('I'), array('I')
+        last_id = 0
+
+        while True:
+            query = supabase.table('verses').select('id, book_id, chapter, verse').gt('id', last_id)
+            if book_ids is not None:
+                query = query.in_('book_id', list(book_ids))
+            result = query.order('id').limit(page_size).execute()
+            page = result.data
+            if not page:
+                break
+
+            for r in page:
+                ids.append(r['id'])
+                books.append(r['book_id'])
+                chapters.append(r['chapter'])
+                verses.append(r['verse'])
+            last_id = page[-1]['id']
+
+            if len(page) < page_size:
+                break
+
+        return cls.from_columns(ids, books, chapters, verses)
+
+    def _slot(self, book_id, chapter):
+        if not 0 <= book_id < len(self.book_base) - 1:
+            return -1
+        base = self.book_base[book_id]
+        if not 1 <= chapter <= self.book_base[book_id + 1] - base:
+            return -1
+        return base + chapter - 1
+
+    def get(self, book_id, chapter, verse):
+        """verse_id 반환, 없으면 None"""
+        slot = self._slot(book_id, chapter)
+        if slot < 0:
+            return None
+        start = self.chapter_start[slot]
+        if not 1 <= verse <= self.chapter_start[slot + 1] - start:
+            return None
+        return self.verse_ids[start + verse - 1] or None
+
+    def chapter_verse_count(self, book_id, chapter):
+        """해당 장의 마지막 절 번호 (장이 없으면 0)"""
+        slot = self._slot(book_id, chapter)
+        if slot < 0:
+            return 0
+        return self.chapter_start[slot + 1] - self.chapter_start[slot]
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        """배열 버퍼 크기 (bytes)"""
+        return sum(a.itemsize * len(a) for a in (self.book_base, self.chapter_start, self.verse_ids))
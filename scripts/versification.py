@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+절 번호 체계(versification) 정렬: 번역본 자체의 (책, 장, 절) → 정규 구절(verses.id)
+
+정규 구절은 기준 번역본(korHRV)의 절 번호 체계임. 다른 번역본은 대부분 번호가 같지만
+시편 표제를 1절로 세거나, 장 끝의 절을 둘로 나누는 등 어긋나는 곳이 있음.
+예전 임포터는 정규 구절에 없는 번호의 절을 조용히 버렸음.
+
+정렬 규칙 (장 안에서만, 순서대로):
+    1. SHIFT     번역본 설정의 규칙 (book_order, chapter, first_verse, last_verse, verse_offset) 에
+                 걸리는 절은 번호를 옮겨서 맞춤 (예: 표제가 1절인 시편 → (19, 3, 2, 999, -1))
+    2. IDENTITY  같은 번호의 정규 구절
+    3. MERGE     그래도 없으면 같은 장의 바로 앞 정규 구절에 (장 처음이면 바로 뒤 구절에) 합침
+정규 구절로 여러 절이 모이면 본문은 번역본 절 순서대로 공백 하나로 이어 붙임 (본문을 버리지 않음).
+장 전체에 정규 구절이 없으면 UNALIGNED (임포트가 그 장을 실패로 기록 → 규칙을 추가해야 함).
+
+키 하나 = book_id << 20 | chapter << 10 | verse 인 int64 배열로 만들어서
+np.searchsorted 로 배치 전체를 한 번에 조인함.
+
+verse_alignment 테이블에는 IDENTITY 가 아닌 절과, 그런 절이 모인 정규 구절의 IDENTITY 절을 저장함
+(supabase/migrations/20260118_verse_alignment.sql, 정규 구절에 행이 없음 = 번호가 같은 절 하나).
+예: 14절(IDENTITY) + 15절(MERGE) → 정규 14절에 행 둘 (3:14 identity, 3:15 merge).
+
+사용 예:
+    aligner = VerseAligner.from_index(verse_index, books, rules=[(19, 3, 2, 999, -1)])
+    aligned, alignment, unaligned = aligner.align(chapters)
+"""
+
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from import_sources import Chapter
+from verse_index import BOOK_BITS, CHAPTER_BITS
+
+IDENTITY, SHIFT, MERGE, UNALIGNED = 0, 1, 2, -1
+KIND_NAMES = {IDENTITY: 'identity', SHIFT: 'shift', MERGE: 'merge'}
+
+
+def ref_keys(book_ids, chapters, verses):
+    """(book_id, chapter, verse) 배열들 → int64 키 배열 (정렬하면 성경 순서, verse_index.verse_key 의 배열판)"""
+    return ((np.asarray(book_ids, dtype=np.int64) << BOOK_BITS)
+            | (np.asarray(chapters, dtype=np.int64) << CHAPTER_BITS)
+            | np.asarray(verses, dtype=np.int64))
+
+
+class AlignmentRow(NamedTuple):
+    book_id: int
+    chapter: int
+    verse: int          # 번역본 자체 절 번호
+    verse_id: int       # 정규 구절
+    kind: str           # identity | shift | merge
+
+
+class VerseAligner:
+    """
+    번역본 하나의 절 번호 → 정규 구절 정렬기 (스레드 공용, 읽기 전용)
+
+    Args:
+        keys: 정규 구절 키 (정렬됨, ref_keys)
+        verse_ids: keys 와 같은 순서의 verses.id
+        book_ids: {book_order: book_id}
+        rules: [(book_order, chapter, first_verse, last_verse, verse_offset), ...]
+    """
+
+    def __init__(self, keys, verse_ids, book_ids, rules=()):
+        self.keys = keys
+        self.verse_ids = verse_ids
+        self.book_ids = book_ids
+        self.rules = [(book_ids[order], chapter, first, last, offset)
+                      for order, chapter, first, last, offset in rules if order in book_ids]
+
+    @classmethod
+    def from_index(cls, index, books, rules=()):
+        """
+        VerseIdIndex 의 배열에서 바로 정규 구절 키를 만듦 (행 단위 반복 없음)
+
+        Args:
+            index: VerseIdIndex
+            books: books 테이블 행 [{id, book_order, ...}, ...]
+        """
+        ids = np.frombuffer(index.verse_ids, dtype=np.int64)
+        starts = np.frombuffer(index.chapter_start, dtype=np.uint32).astype(np.int64)
+        book_base = np.frombuffer(index.book_base, dtype=np.uint32).astype(np.int64)
+
+        pos = np.flatnonzero(ids)
+        # 빈 장은 시작 위치가 다음 장과 같으므로 side='right' 로 실제 장을 고름
+        slot = np.searchsorted(starts, pos, side='right') - 1
+        book_id = np.searchsorted(book_base, slot, side='right') - 1
+        keys = ref_keys(book_id, slot - book_base[book_id] + 1, pos - starts[slot] + 1)
+
+        order = np.argsort(keys, kind='stable')
+        return cls(keys[order], ids[pos][order], {book['book_order']: book['id'] for book in books}, rules)
+
+    def align_keys(self, book_ids, chapters, verses):
+        """
+        번역본 절 배열 → (정규 구절 위치, 종류) 배열 (위치는 self.keys 인덱스, UNALIGNED 는 -1)
+        """
+        book_ids = np.asarray(book_ids, dtype=np.int64)
+        chapters = np.asarray(chapters, dtype=np.int64)
+        target = np.array(verses, dtype=np.int64)
+        kinds = np.zeros(len(target), dtype=np.int8)
+
+        for book_id, chapter, first, last, offset in self.rules:
+            mask = (book_ids == book_id) & (chapters == chapter) & (target >= first) & (target <= last)
+            target[mask] += offset
+            kinds[mask] = SHIFT
+
+        keys = ref_keys(book_ids, chapters, target)
+        size = len(self.keys)
+        pos = np.searchsorted(self.keys, keys)
+        at = np.minimum(pos, size - 1)
+        found = (pos < size) & (self.keys[at] == keys)
+
+        # 같은 장(키 >> CHAPTER_BITS 가 같음)의 앞 구절, 없으면 뒤 구절
+        chapter_key = keys >> CHAPTER_BITS
+        before = np.maximum(pos - 1, 0)
+        has_before = (pos > 0) & ((self.keys[before] >> CHAPTER_BITS) == chapter_key)
+        has_after = (pos < size) & ((self.keys[at] >> CHAPTER_BITS) == chapter_key)
+
+        index = np.where(found, at, np.where(has_before, before, np.where(has_after, at, -1)))
+        kinds = np.where(found, kinds, np.where(has_before | has_after, MERGE, UNALIGNED)).astype(np.int8)
+        return index, kinds
+
+    def align(self, chapters) -> Tuple[List[Chapter], List[AlignmentRow], List[Tuple[int, int, int]]]:
+        """
+        장 묶음을 정규 절 번호로 정렬
+
+        Returns:
+            aligned: 정규 절 번호의 Chapter 들 (여러 절이 모인 구절은 본문을 이어 붙임, 소제목도 정규 절로)
+            alignment: IDENTITY 가 아닌 절 + 그런 절이 모인 정규 구절의 IDENTITY 절의 AlignmentRow 들
+            unaligned: 정렬하지 못한 (book_order, chapter, verse) 들
+        """
+        refs = [(ch.book_order, ch.chapter, verse, text) for ch in chapters if ch.verses for verse, text in ch.verses]
+        if not refs:
+            return [Chapter(ch.book_order, ch.chapter, ch.verses, ch.headings) for ch in chapters], [], []
+
+        orders, chapter_numbers, verses, texts = zip(*refs)
+        book_ids = np.array([self.book_ids.get(order, 0) for order in orders], dtype=np.int64)
+        index, kinds = self.align_keys(book_ids, chapter_numbers, verses)
+
+        merged = {}   # (book_order, chapter, 정규 절) → [(번역본 절, 본문, refs 위치), ...]
+        canonical_of = {}   # (book_order, chapter, 번역본 절) → 정규 절 (소제목 옮기기용)
+        unaligned = []
+        canonical_verses = (self.keys & ((1 << CHAPTER_BITS) - 1)) if len(self.keys) else self.keys
+        for i, (order, chapter, verse, text) in enumerate(refs):
+            if kinds[i] == UNALIGNED:
+                unaligned.append((order, chapter, verse))
+                continue
+            canonical = int(canonical_verses[index[i]])
+            merged.setdefault((order, chapter, canonical), []).append((verse, text, i))
+            canonical_of[(order, chapter, verse)] = canonical
+
+        by_chapter = {}
+        alignment = []
+        for (order, chapter, canonical), parts in merged.items():
+            parts.sort(key=lambda part: part[0])
+            text = ' '.join(text for _, text, _ in parts)
+            by_chapter.setdefault((order, chapter), []).append((canonical, text))
+            # 번호가 같은 절 하나뿐인 정규 구절은 행 없음, 아니면 모인 절 전부 (native_refs 가 본문과 맞도록)
+            if len(parts) == 1 and kinds[parts[0][2]] == IDENTITY:
+                continue
+            alignment.extend(AlignmentRow(int(book_ids[i]), chapter, verse, int(self.verse_ids[index[i]]),
+                                          KIND_NAMES[int(kinds[i])]) for verse, _, i in parts)
+
+        aligned = [Chapter(ch.book_order, ch.chapter,
+                           sorted(by_chapter.get((ch.book_order, ch.chapter), [])) if ch.verses else ch.verses,
+                           self._align_headings(ch, canonical_of))
+                   for ch in chapters]
+        return aligned, alignment, unaligned
+
+    @staticmethod
+    def _align_headings(ch, canonical_of):
+        """소제목도 그 절이 간 정규 절로 (같은 정규 절로 모이면 이어 붙임, 정렬 못한 절의 소제목은 버림)"""
+        if ch.headings is None:
+            return None
+        headings = {}
+        for verse, heading in ch.headings:
+            canonical = canonical_of.get((ch.book_order, ch.chapter, verse))
+            if canonical is not None:
+                headings.setdefault(canonical, []).append(heading)
+        return [(verse, ' '.join(parts)) for verse, parts in sorted(headings.items())]
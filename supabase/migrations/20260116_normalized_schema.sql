@@ -3,13 +3,23 @@
 -- Date: 2026-01-16
 -- Purpose: Migrate from wide table to normalized structure
 -- ============================================
-
-BEGIN;
+--
+-- 실행: python3 scripts/run_migration.py supabase/migrations/20260116_normalized_schema.sql
+--   (SUPABASE_DB_URL 필요. SQL Editor 에 붙여넣으려면 --render 로 트랜잭션 하나짜리 SQL 을 출력)
+--
+-- "-- @" 줄이 단계 경계 (scripts/run_migration.py 참고):
+--   @step <이름>                          한 트랜잭션으로 실행
+--   @backfill <이름> keyset=<표>.<컬럼>   %(lo)s < 키 <= %(hi)s 구간씩 나눠 실행, 구간마다 커밋
+--   @concurrent <이름>                    문장마다 트랜잭션 밖에서 실행 (CREATE INDEX CONCURRENTLY)
+-- 단계/구간 진행 상황은 schema_migration_progress 에 같은 트랜잭션으로 기록되므로
+-- 중간에 끊겨도 같은 명령으로 이어서 실행됨.
 
 -- ============================================
 -- STEP 1: Create New Normalized Tables
 -- ============================================
 
+-- @step create_tables
+
 -- 1. BOOKS: Canonical book structure (language-agnostic)
 CREATE TABLE new_books (
   id SERIAL PRIMARY KEY,
@@ -88,13 +98,7 @@ CREATE TABLE verse_translations (
   created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
-CREATE INDEX idx_verse_translations_verse_id ON verse_translations(verse_id);
-CREATE INDEX idx_verse_translations_translation_id ON verse_translations(translation_id);
-CREATE INDEX idx_verse_translations_composite ON verse_translations(translation_id, verse_id);
-
--- Full-text search indexes
-CREATE INDEX idx_verse_translations_text_gin ON verse_translations
-  USING gin(to_tsvector('simple', text));
+-- verse_translations 의 보조 인덱스는 백필이 끝난 뒤 CONCURRENTLY 로 만듦 (STEP 2.9)
 
 COMMENT ON TABLE verse_translations IS 'Translated verse text for each translation';
 
@@ -102,6 +106,8 @@ COMMENT ON TABLE verse_translations IS 'Translated verse text for each translati
 -- STEP 2: Migrate Data from Old Tables
 -- ============================================
 
+-- @step copy_books
+
 -- 2.1 Migrate books
 INSERT INTO new_books (id, abbr_eng, testament, book_order, chapters)
 SELECT id, abbr_eng, testament, book_order, chapters
@@ -127,6 +133,7 @@ INSERT INTO translations (code, name, language, available, display_order, year)
 
 -- 2.4 Migrate verses (canonical structure)
 -- This preserves the original verse IDs to maintain user data references
+-- @backfill new_verses keyset=verses.id
 INSERT INTO new_verses (id, book_id, chapter, verse)
 SELECT
   v.id,
@@ -135,13 +142,16 @@ SELECT
   v.verse
 FROM verses v
 INNER JOIN books b ON b.name = v.book
-ORDER BY v.id;
+WHERE v.id > %(lo)s AND v.id <= %(hi)s
+ORDER BY v.id
+ON CONFLICT (id) DO NOTHING;
 
 -- Reset sequence to continue from max id
+-- @step new_verses_sequence
 SELECT setval('new_verses_id_seq', (SELECT MAX(id) FROM new_verses));
 
 -- 2.5 Migrate verse_translations for korHRV
-RAISE NOTICE 'Migrating korHRV translations...';
+-- @backfill korhrv_translations keyset=new_verses.id
 INSERT INTO verse_translations (verse_id, translation_id, text)
 SELECT
   v.id,
@@ -149,10 +159,12 @@ SELECT
   old_v.korhrv
 FROM new_verses v
 INNER JOIN verses old_v ON old_v.id = v.id
-WHERE old_v.korhrv IS NOT NULL AND old_v.korhrv != '';
+WHERE old_v.korhrv IS NOT NULL AND old_v.korhrv != ''
+  AND v.id > %(lo)s AND v.id <= %(hi)s
+ON CONFLICT (verse_id, translation_id) DO NOTHING;
 
 -- 2.6 Migrate verse_translations for NIV
-RAISE NOTICE 'Migrating NIV translations...';
+-- @backfill niv_translations keyset=new_verses.id
 INSERT INTO verse_translations (verse_id, translation_id, text)
 SELECT
   v.id,
@@ -160,10 +172,12 @@ SELECT
   old_v.niv
 FROM new_verses v
 INNER JOIN verses old_v ON old_v.id = v.id
-WHERE old_v.niv IS NOT NULL AND old_v.niv != '';
+WHERE old_v.niv IS NOT NULL AND old_v.niv != ''
+  AND v.id > %(lo)s AND v.id <= %(hi)s
+ON CONFLICT (verse_id, translation_id) DO NOTHING;
 
 -- 2.7 Migrate verse_translations for korRV (if exists)
-RAISE NOTICE 'Migrating korRV translations...';
+-- @backfill korrv_translations keyset=new_verses.id
 INSERT INTO verse_translations (verse_id, translation_id, text)
 SELECT
   v.id,
@@ -171,10 +185,12 @@ SELECT
   old_v.korrv
 FROM new_verses v
 INNER JOIN verses old_v ON old_v.id = v.id
-WHERE old_v.korrv IS NOT NULL AND old_v.korrv != '';
+WHERE old_v.korrv IS NOT NULL AND old_v.korrv != ''
+  AND v.id > %(lo)s AND v.id <= %(hi)s
+ON CONFLICT (verse_id, translation_id) DO NOTHING;
 
 -- 2.8 Migrate verse_translations for korNRSV (if exists)
-RAISE NOTICE 'Migrating korNRSV translations...';
+-- @backfill kornrsv_translations keyset=new_verses.id
 INSERT INTO verse_translations (verse_id, translation_id, text)
 SELECT
   v.id,
@@ -182,12 +198,25 @@ SELECT
   old_v.kornrsv
 FROM new_verses v
 INNER JOIN verses old_v ON old_v.id = v.id
-WHERE old_v.kornrsv IS NOT NULL AND old_v.kornrsv != '';
+WHERE old_v.kornrsv IS NOT NULL AND old_v.kornrsv != ''
+  AND v.id > %(lo)s AND v.id <= %(hi)s
+ON CONFLICT (verse_id, translation_id) DO NOTHING;
+
+-- 2.9 Secondary indexes (online build, readers are not blocked)
+-- @concurrent verse_translations_indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_verse_translations_verse_id ON verse_translations(verse_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_verse_translations_translation_id ON verse_translations(translation_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_verse_translations_composite ON verse_translations(translation_id, verse_id);
+
+-- Full-text search indexes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_verse_translations_text_gin ON verse_translations
+  USING gin(to_tsvector('simple', text));
 
 -- ============================================
 -- STEP 3: Verify Migration
 -- ============================================
 
+-- @step verify
 DO $$
 DECLARE
   old_verse_count BIGINT;
@@ -243,6 +272,7 @@ END $$;
 -- Since we preserved the verse IDs, these references remain valid!
 -- No migration needed for user data!
 
+-- @step verify_user_data
 -- Verify user data integrity
 DO $$
 DECLARE
@@ -276,6 +306,8 @@ END $$;
 -- STEP 5: Rename Tables (Swap Old and New)
 -- ============================================
 
+-- @step swap_tables
+
 -- Backup old tables
 ALTER TABLE books RENAME TO old_books_backup_20260116;
 ALTER TABLE verses RENAME TO old_verses_backup_20260116;
@@ -308,6 +340,8 @@ ALTER TABLE bookmarks ADD CONSTRAINT bookmarks_verse_id_fkey
 -- STEP 6: Final Verification
 -- ============================================
 
+-- @step final_verification
+
 DO $$
 DECLARE
   books_count INT;
@@ -352,8 +386,6 @@ BEGIN
   RAISE NOTICE '====================================';
 END $$;
 
-COMMIT;
-
 -- ============================================
 -- ROLLBACK SCRIPT (Run this if migration fails)
 -- ============================================
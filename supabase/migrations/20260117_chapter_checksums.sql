@@ -0,0 +1,39 @@
+-- ============================================
+-- Bible Soom: 장 단위 체크섬 (delta sync)
+-- Date: 2026-01-17
+-- Purpose: 재임포트 시 내용이 바뀐 장만 다시 쓰도록
+--          번역본 전체의 장별 해시를 집계 쿼리 한 번으로 돌려줌
+-- ============================================
+--
+-- 해시 규칙 (scripts/chapter_checksum.py 와 반드시 같아야 함):
+--   md5( 절 번호 순으로 "{verse}\t{text}" 를 "\n" 으로 이어 붙인 UTF-8 문자열 )
+--
+-- 반환값: {"1:1": "<md5>", "1:2": "<md5>", ...}  (키 = "book_order:chapter")
+-- 행 집합 대신 JSONB 하나를 돌려주므로 PostgREST max-rows(1000) 에 잘리지 않음.
+--
+-- 사용 예 (supabase-py):
+--   supabase.rpc('chapter_checksums', {'p_translation_id': 1}).execute().data
+
+CREATE OR REPLACE FUNCTION chapter_checksums(p_translation_id INT)
+RETURNS JSONB
+LANGUAGE sql STABLE AS $$
+  SELECT coalesce(jsonb_object_agg(c.key, c.checksum), '{}'::jsonb)
+  FROM (
+    SELECT
+      b.book_order || ':' || v.chapter AS key,
+      md5(string_agg(v.verse || E'\t' || vt.text, E'\n' ORDER BY v.verse)) AS checksum
+    FROM verse_translations vt
+    JOIN verses v ON v.id = vt.verse_id
+    JOIN books b ON b.id = v.book_id
+    WHERE vt.translation_id = p_translation_id
+    GROUP BY b.book_order, v.chapter
+  ) c
+$$;
+
+COMMENT ON FUNCTION chapter_checksums IS 'Per-chapter md5 of a translation for delta imports (see scripts/chapter_checksum.py)';
+
+-- ============================================
+-- ROLLBACK
+-- ============================================
+--
+-- DROP FUNCTION IF EXISTS chapter_checksums(INT);
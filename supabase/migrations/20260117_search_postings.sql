@@ -0,0 +1,128 @@
+-- ============================================
+-- Bible Soom: n-gram 검색 색인 (posting list)
+-- Date: 2026-01-17
+-- Purpose: verse_translations 전체를 훑는 ilike '%q%' 검색 대신
+--          미리 만든 역색인으로 순위 검색
+-- ============================================
+--
+-- 색인은 scripts/build_search_index.py 가 번역본 단위로 만들어 채움.
+-- 토큰 규칙 (scripts/ngram_tokenizer.py 와 반드시 같아야 함):
+--   - 한글: 음절 bigram + trigram
+--   - 영문/숫자: 소문자 단어 (두 글자 이상)
+--
+-- 번역본이 늘어도 조회는 (translation_id, term) 기본 키로 용어 몇 개만 읽으므로
+-- 검색 시간이 전체 행 수에 비례해서 늘지 않음.
+
+BEGIN;
+
+-- 1. SEARCH_POSTINGS: 번역본별 용어 → 구절 목록
+CREATE TABLE IF NOT EXISTS search_postings (
+  translation_id INT NOT NULL REFERENCES translations(id) ON DELETE CASCADE,
+  term TEXT NOT NULL,
+  doc_freq INT NOT NULL,       -- 용어가 나오는 구절 수
+  idf REAL NOT NULL,           -- ln(번역본 구절 수 / doc_freq)
+  verse_ids BIGINT[] NOT NULL, -- 오름차순
+  tfs SMALLINT[] NOT NULL,     -- verse_ids 와 같은 순서의 구절 내 등장 횟수
+  PRIMARY KEY (translation_id, term)
+);
+
+COMMENT ON TABLE search_postings IS 'n-gram inverted index built by scripts/build_search_index.py';
+
+-- 2. SEARCH_INDEX_BUILDS: 색인이 만들어진 번역본
+CREATE TABLE IF NOT EXISTS search_index_builds (
+  translation_id INT PRIMARY KEY REFERENCES translations(id) ON DELETE CASCADE,
+  verse_count INT NOT NULL,
+  term_count INT NOT NULL,
+  posting_count BIGINT NOT NULL,
+  built_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMENT ON TABLE search_index_builds IS 'Translations that have a search_postings index (search_verses falls back to a substring scan otherwise)';
+
+-- 3. 검색어 → 용어 목록 (ngram_tokenizer.query_terms 와 같은 규칙)
+--    3음절 이상 한글 덩어리는 trigram, 2음절은 bigram, 한 음절은 색인 불가
+CREATE OR REPLACE FUNCTION search_query_terms(q TEXT)
+RETURNS TEXT[]
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+  tok TEXT;
+  gram TEXT;
+  n INT;
+  terms TEXT[] := '{}';
+BEGIN
+  FOR tok IN
+    SELECT m[1] FROM regexp_matches(lower(normalize(q, NFC)), '([가-힣]+|[a-z0-9]+)', 'g') AS m
+  LOOP
+    IF tok ~ '^[가-힣]' THEN
+      n := CASE WHEN char_length(tok) >= 3 THEN 3 ELSE 2 END;
+      FOR i IN 1 .. char_length(tok) - n + 1 LOOP
+        gram := substr(tok, i, n);
+        IF NOT gram = ANY(terms) THEN
+          terms := terms || gram;
+        END IF;
+      END LOOP;
+    ELSIF char_length(tok) >= 2 AND NOT tok = ANY(terms) THEN
+      terms := terms || tok;
+    END IF;
+  END LOOP;
+  RETURN terms;
+END $$;
+
+-- 4. 순위 검색 RPC
+--    모든 용어가 들어 있는 구절만 후보로 삼고, sum(tf * idf) 로 점수를 매김.
+--    검색어가 그대로 들어 있는 구절(부분 문자열 일치)을 먼저 보여줌.
+--    용어가 없거나(한 음절 검색어) 색인이 없는 번역본이면 부분 문자열 검색으로 대체.
+CREATE OR REPLACE FUNCTION search_verses(p_translation_id INT, p_query TEXT, p_limit INT DEFAULT 50)
+RETURNS TABLE (verse_id BIGINT, score REAL)
+LANGUAGE plpgsql STABLE AS $$
+#variable_conflict use_column
+DECLARE
+  terms TEXT[] := search_query_terms(p_query);
+  needle TEXT := btrim(lower(normalize(p_query, NFC)));
+BEGIN
+  IF needle = '' THEN
+    RETURN;
+  END IF;
+
+  IF cardinality(terms) = 0
+     OR NOT EXISTS (SELECT 1 FROM search_index_builds b WHERE b.translation_id = p_translation_id) THEN
+    RETURN QUERY
+      SELECT vt.verse_id, 0::REAL
+      FROM verse_translations vt
+      WHERE vt.translation_id = p_translation_id
+        AND strpos(lower(vt.text), needle) > 0
+      ORDER BY vt.verse_id
+      LIMIT p_limit;
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+    WITH hits AS (
+      SELECT u.verse_id, sum(u.tf * p.idf) AS score
+      FROM search_postings p
+      CROSS JOIN LATERAL unnest(p.verse_ids, p.tfs) AS u(verse_id, tf)
+      WHERE p.translation_id = p_translation_id
+        AND p.term = ANY(terms)
+      GROUP BY u.verse_id
+      HAVING count(*) = cardinality(terms)
+    )
+    SELECT h.verse_id, h.score::REAL
+    FROM hits h
+    JOIN verse_translations vt
+      ON vt.translation_id = p_translation_id AND vt.verse_id = h.verse_id
+    ORDER BY (strpos(lower(vt.text), needle) > 0) DESC, h.score DESC, h.verse_id
+    LIMIT p_limit;
+END $$;
+
+COMMENT ON FUNCTION search_verses IS 'Ranked verse search over search_postings: supabase.rpc("search_verses", { p_translation_id, p_query, p_limit })';
+
+COMMIT;
+
+-- ============================================
+-- ROLLBACK
+-- ============================================
+--
+-- DROP FUNCTION IF EXISTS search_verses(INT, TEXT, INT);
+-- DROP FUNCTION IF EXISTS search_query_terms(TEXT);
+-- DROP TABLE IF EXISTS search_index_builds;
+-- DROP TABLE IF EXISTS search_postings;
@@ -0,0 +1,71 @@
+-- ============================================
+-- Bible Soom: 본문 완결성 점검 (corpus audit)
+-- Date: 2026-01-18
+-- Purpose: 번역본별 (책, 장) 구절 수를 GROUP BY 한 번으로 돌려줌
+--          (scripts/audit_corpus.py 가 books.chapters / 정규 구절 / 다른 번역본과 배열로 비교)
+-- ============================================
+--
+-- 반환값 (키 = "book_order:chapter"):
+--   {
+--     "canonical":    {"19:31": 24, "19:32": [1, 2, 3, 5], ...},
+--     "translations": {"1": {"19:31": 24, ...}, "2": {...}}
+--   }
+--   값이 숫자면 그 장의 구절 수이고 구절 번호가 빠짐없이 이어짐
+--     (canonical: 1..n, 번역본: 정규 구절과 같은 수).
+--   값이 배열이면 구절 수가 맞지 않는 장이라 실제 있는 절 번호 목록 (빠진 절을 바로 알 수 있음).
+-- 행 집합 대신 JSONB 하나라서 PostgREST max-rows(1000) 에 잘리지 않음.
+--
+-- 사용 예 (supabase-py):
+--   supabase.rpc('corpus_audit', {}).execute().data                    # 전체 번역본
+--   supabase.rpc('corpus_audit', {'p_translation_id': 2}).execute().data
+
+CREATE OR REPLACE FUNCTION corpus_audit(p_translation_id INT DEFAULT NULL)
+RETURNS JSONB
+LANGUAGE sql STABLE AS $$
+  WITH canon AS (
+    SELECT v.book_id, v.chapter, count(*) AS n, max(v.verse) AS max_verse,
+           array_agg(v.verse ORDER BY v.verse) AS verses
+    FROM verses v
+    GROUP BY v.book_id, v.chapter
+  ),
+  tr AS (
+    SELECT vt.translation_id, v.book_id, v.chapter, count(*) AS n,
+           array_agg(v.verse ORDER BY v.verse) AS verses
+    FROM verse_translations vt
+    JOIN verses v ON v.id = vt.verse_id
+    WHERE p_translation_id IS NULL OR vt.translation_id = p_translation_id
+    GROUP BY vt.translation_id, v.book_id, v.chapter
+  ),
+  per_translation AS (
+    SELECT tr.translation_id,
+           jsonb_object_agg(
+             b.book_order || ':' || tr.chapter,
+             CASE WHEN tr.n = c.n THEN to_jsonb(tr.n) ELSE to_jsonb(tr.verses) END
+           ) AS chapters
+    FROM tr
+    JOIN books b ON b.id = tr.book_id
+    LEFT JOIN canon c ON c.book_id = tr.book_id AND c.chapter = tr.chapter
+    GROUP BY tr.translation_id
+  )
+  SELECT jsonb_build_object(
+    'canonical', (
+      SELECT coalesce(jsonb_object_agg(
+               b.book_order || ':' || c.chapter,
+               CASE WHEN c.n = c.max_verse THEN to_jsonb(c.n) ELSE to_jsonb(c.verses) END
+             ), '{}'::jsonb)
+      FROM canon c JOIN books b ON b.id = c.book_id
+    ),
+    'translations', (
+      SELECT coalesce(jsonb_object_agg(translation_id::text, chapters), '{}'::jsonb)
+      FROM per_translation
+    )
+  )
+$$;
+
+COMMENT ON FUNCTION corpus_audit IS 'Per-chapter verse counts of the canonical verses and every translation (see scripts/audit_corpus.py)';
+
+-- ============================================
+-- ROLLBACK
+-- ============================================
+--
+-- DROP FUNCTION IF EXISTS corpus_audit(INT);
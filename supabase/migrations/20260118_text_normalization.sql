@@ -0,0 +1,137 @@
+-- ============================================
+-- Bible Soom: 본문 정규화 (검색용 본문 + 소제목)
+-- Date: 2026-01-18
+-- Purpose: verse_translations 에 검색용 본문(search_text)을 두고, 소제목을 verse_headings 로 분리
+-- ============================================
+--
+-- 실행: python3 scripts/run_migration.py supabase/migrations/20260118_text_normalization.sql
+--   (SUPABASE_DB_URL 필요. SQL Editor 에 붙여넣으려면 --render 로 트랜잭션 하나짜리 SQL 을 출력)
+--
+-- 임포트 엔진(scripts/import_engine.py)은 쓰기 전에 본문을 정리함 (scripts/text_normalize.py):
+--   text         표시용. 인라인 마크업(<S>, <sup>, <i>, <br/> ...)과 HTML 엔티티를 정리하고 NFC
+--   search_text  검색용. NFC + 소문자 + ß/ς/ſ 접기 (= search_fold(text))
+--   소제목       HRV 의 <소제목> → verse_headings (그 절 앞에 표시)
+-- 이미 들어 있는 본문은 아래 백필로 search_text 만 채움. 마크업 정리까지 하려면
+-- 이 마이그레이션 후에 번역본마다 --delta 로 다시 임포트할 것 (정리 후 해시가 달라진 장만 다시 씀).
+--
+-- "-- @" 줄이 단계 경계 (scripts/run_migration.py 참고).
+
+-- @step columns
+
+-- 1. 검색용 정규화: NFC + 소문자 + ß → ss, ς → σ, ſ → s
+--    (scripts/text_normalize.search_fold 도 같은 단계: lower() + 같은 세 글자. str.casefold 와는 다름)
+CREATE OR REPLACE FUNCTION search_fold(q TEXT)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+  SELECT translate(replace(lower(normalize(q, NFC)), 'ß', 'ss'), 'ςſ', 'σs')
+$$;
+
+COMMENT ON FUNCTION search_fold IS 'Search normalization (NFC + lower + ß/ς/ſ folding), same steps as scripts/text_normalize.search_fold';
+
+-- 2. 검색용 본문 (NULL 이면 search_fold(text) 로 대신함)
+ALTER TABLE verse_translations ADD COLUMN IF NOT EXISTS search_text TEXT;
+
+-- 3. 소제목 (절 하나에 하나, 그 절 앞에 표시)
+CREATE TABLE IF NOT EXISTS verse_headings (
+  translation_id INT NOT NULL REFERENCES translations(id) ON DELETE CASCADE,
+  verse_id BIGINT NOT NULL REFERENCES verses(id) ON DELETE CASCADE,
+  heading TEXT NOT NULL,
+  PRIMARY KEY (translation_id, verse_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_verse_headings_verse ON verse_headings (verse_id, translation_id);
+
+COMMENT ON TABLE verse_headings IS 'Section headings shown before a verse (e.g. HRV <소제목>), written by scripts/import_engine.py';
+
+-- 4. 기존 본문의 검색용 본문
+-- @backfill search_text keyset=verse_translations.id
+UPDATE verse_translations
+SET search_text = search_fold(text)
+WHERE id > %(lo)s AND id <= %(hi)s
+  AND search_text IS NULL;
+
+-- @step search_functions
+
+-- 5. 검색어 → 용어 목록 (정규화만 search_fold 로 바뀜)
+CREATE OR REPLACE FUNCTION search_query_terms(q TEXT)
+RETURNS TEXT[]
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+  tok TEXT;
+  gram TEXT;
+  n INT;
+  terms TEXT[] := '{}';
+BEGIN
+  FOR tok IN
+    SELECT m[1] FROM regexp_matches(search_fold(q), '([가-힣]+|[a-z0-9]+)', 'g') AS m
+  LOOP
+    IF tok ~ '^[가-힣]' THEN
+      n := CASE WHEN char_length(tok) >= 3 THEN 3 ELSE 2 END;
+      FOR i IN 1 .. char_length(tok) - n + 1 LOOP
+        gram := substr(tok, i, n);
+        IF NOT gram = ANY(terms) THEN
+          terms := terms || gram;
+        END IF;
+      END LOOP;
+    ELSIF char_length(tok) >= 2 AND NOT tok = ANY(terms) THEN
+      terms := terms || tok;
+    END IF;
+  END LOOP;
+  RETURN terms;
+END $$;
+
+-- 6. 순위 검색 RPC: 부분 문자열 비교를 마크업 없는 검색용 본문으로
+CREATE OR REPLACE FUNCTION search_verses(p_translation_id INT, p_query TEXT, p_limit INT DEFAULT 50)
+RETURNS TABLE (verse_id BIGINT, score REAL)
+LANGUAGE plpgsql STABLE AS $$
+#variable_conflict use_column
+DECLARE
+  terms TEXT[] := search_query_terms(p_query);
+  needle TEXT := btrim(search_fold(p_query));
+BEGIN
+  IF needle = '' THEN
+    RETURN;
+  END IF;
+
+  IF cardinality(terms) = 0
+     OR NOT EXISTS (SELECT 1 FROM search_index_builds b WHERE b.translation_id = p_translation_id) THEN
+    RETURN QUERY
+      SELECT vt.verse_id, 0::REAL
+      FROM verse_translations vt
+      WHERE vt.translation_id = p_translation_id
+        AND strpos(COALESCE(vt.search_text, search_fold(vt.text)), needle) > 0
+      ORDER BY vt.verse_id
+      LIMIT p_limit;
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+    WITH hits AS (
+      SELECT u.verse_id, sum(u.tf * p.idf) AS score
+      FROM search_postings p
+      CROSS JOIN LATERAL unnest(p.verse_ids, p.tfs) AS u(verse_id, tf)
+      WHERE p.translation_id = p_translation_id
+        AND p.term = ANY(terms)
+      GROUP BY u.verse_id
+      HAVING count(*) = cardinality(terms)
+    )
+    SELECT h.verse_id, h.score::REAL
+    FROM hits h
+    JOIN verse_translations vt
+      ON vt.translation_id = p_translation_id AND vt.verse_id = h.verse_id
+    ORDER BY (strpos(COALESCE(vt.search_text, search_fold(vt.text)), needle) > 0) DESC, h.score DESC, h.verse_id
+    LIMIT p_limit;
+END $$;
+
+COMMENT ON FUNCTION search_verses IS 'Ranked verse search over search_postings: supabase.rpc("search_verses", { p_translation_id, p_query, p_limit })';
+
+-- ============================================
+-- ROLLBACK
+-- ============================================
+--
+-- BEGIN;
+-- (20260117_search_postings.sql 의 search_query_terms / search_verses 를 다시 실행)
+-- DROP TABLE IF EXISTS verse_headings;
+-- ALTER TABLE verse_translations DROP COLUMN IF EXISTS search_text;
+-- DROP FUNCTION IF EXISTS search_fold(TEXT);
+-- COMMIT;
@@ -0,0 +1,63 @@
+-- ============================================
+-- Bible Soom: 절 번호 체계 정렬 (versification alignment)
+-- Date: 2026-01-18
+-- Purpose: 번역본 자체의 (책, 장, 절) 번호 → 정규 구절(verses.id) 매핑을 저장하고,
+--          여러 번역본을 정규 구절 기준으로 나란히 읽는 쿼리를 하나로
+-- ============================================
+--
+-- 정규 구절 = 기준 번역본(korHRV)의 절 번호 체계.
+-- 다른 번역본은 임포트할 때 scripts/versification.py 가 정규 절 번호로 정렬해서
+-- verse_translations 에 씀 (여러 절이 한 정규 구절로 모이면 본문을 이어 붙임 → 본문을 버리지 않음).
+--
+-- verse_alignment 에는 번호가 같지 않은 절과, 그런 절이 모인 정규 구절의 나머지 절을 저장함
+-- (정규 구절에 행이 없으면 번역본 절 하나, 번호도 같음):
+--   kind = 'shift'     번역본 설정 규칙으로 번호를 옮김 (예: 표제를 1절로 세는 시편)
+--   kind = 'merge'     정규 구절에 없는 절 → 같은 장의 앞(또는 뒤) 구절에 합침
+--   kind = 'identity'  번호가 같은 절인데 같은 정규 구절에 shift / merge 절이 같이 모임
+--
+-- 사용 예 (supabase-js):
+--   supabase.rpc('parallel_chapter', { p_book_id: 19, p_chapter: 3, p_translation_ids: [1, 2] })
+
+CREATE TABLE IF NOT EXISTS verse_alignment (
+  translation_id INT NOT NULL REFERENCES translations(id) ON DELETE CASCADE,
+  book_id INT NOT NULL REFERENCES books(id) ON DELETE CASCADE,
+  chapter INT NOT NULL,   -- 번역본 자체 번호
+  verse INT NOT NULL,
+  verse_id BIGINT NOT NULL REFERENCES verses(id) ON DELETE CASCADE,
+  kind TEXT NOT NULL CHECK (kind IN ('identity', 'shift', 'merge')),
+  PRIMARY KEY (translation_id, book_id, chapter, verse)
+);
+
+-- 'identity' 가 없던 예전 CHECK 를 이미 만든 DB 용
+ALTER TABLE verse_alignment DROP CONSTRAINT IF EXISTS verse_alignment_kind_check;
+ALTER TABLE verse_alignment ADD CONSTRAINT verse_alignment_kind_check
+  CHECK (kind IN ('identity', 'shift', 'merge'));
+
+CREATE INDEX IF NOT EXISTS idx_verse_alignment_verse ON verse_alignment (verse_id, translation_id);
+
+COMMENT ON TABLE verse_alignment IS 'Translation-native verse numbers that differ from the canonical verse (see scripts/versification.py)';
+
+-- 정규 구절 기준으로 번역본 여러 개를 나란히 (장 하나, 인덱스 조회 한 번)
+--   native_refs: 그 정규 구절에 들어간 번역본 자체 절 번호 (번역본 절 순서, 번호가 같은 절 하나면 NULL),
+--                예: '3:14,3:15'
+CREATE OR REPLACE FUNCTION parallel_chapter(p_book_id INT, p_chapter INT, p_translation_ids INT[])
+RETURNS TABLE (verse_id BIGINT, verse INT, translation_id INT, text TEXT, native_refs TEXT)
+LANGUAGE sql STABLE AS $$
+  SELECT v.id, v.verse, vt.translation_id, vt.text,
+         (SELECT string_agg(a.chapter || ':' || a.verse, ',' ORDER BY a.chapter, a.verse)
+          FROM verse_alignment a
+          WHERE a.verse_id = v.id AND a.translation_id = vt.translation_id)
+  FROM verses v
+  JOIN verse_translations vt ON vt.verse_id = v.id AND vt.translation_id = ANY (p_translation_ids)
+  WHERE v.book_id = p_book_id AND v.chapter = p_chapter
+  ORDER BY v.verse, array_position(p_translation_ids, vt.translation_id)
+$$;
+
+COMMENT ON FUNCTION parallel_chapter IS 'Side-by-side chapter for several translations, aligned on canonical verses';
+
+-- ============================================
+-- ROLLBACK
+-- ============================================
+--
+-- DROP FUNCTION IF EXISTS parallel_chapter(INT, INT, INT[]);
+-- DROP TABLE IF EXISTS verse_alignment;
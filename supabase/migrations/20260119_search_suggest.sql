@@ -0,0 +1,31 @@
+-- ============================================
+-- Bible Soom: 검색창 자동 완성 사전
+-- Date: 2026-01-19
+-- Purpose: 번역본별 용어(한글 어절 / 영문 단어) + 구절 수를 컴파일한 배열 한 행으로 저장해서
+--          API 서버가 메모리에 올려 두고 입력할 때마다 DB 조회 없이 제안
+-- ============================================
+--
+-- scripts/build_suggest_index.py 가 채움 (임포트가 끝날 때 import_engine.py 도 바뀐 장만 반영해서 다시 씀).
+-- 조회는 lib/suggest.ts (GET /api/v1/search/suggest): 번역본마다 이 행을 한 번 읽어서
+-- 접두어 → 이진 탐색 구간 → 구간에서 구절 수 상위 N 개.
+--
+--   terms   용어 오름차순을 '\n' 으로 이어 붙인 문자열 (성경 한 권 기준 수십만 자 안팎)
+--   counts  terms 와 같은 순서의 "그 용어가 나오는 구절 수"
+
+-- @step tables
+
+CREATE TABLE IF NOT EXISTS search_suggest_dicts (
+  translation_id INT PRIMARY KEY REFERENCES translations(id) ON DELETE CASCADE,
+  term_count INT NOT NULL,
+  terms TEXT NOT NULL,
+  counts INT[] NOT NULL,
+  built_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMENT ON TABLE search_suggest_dicts IS 'Compiled autocomplete dictionary per translation (sorted terms + verse counts), built by scripts/build_suggest_index.py';
+
+-- ============================================
+-- ROLLBACK
+-- ============================================
+--
+-- DROP TABLE IF EXISTS search_suggest_dicts;
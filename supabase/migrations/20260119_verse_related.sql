@@ -0,0 +1,43 @@
+-- ============================================
+-- Bible Soom: 관련 구절 (TF-IDF 유사도 top-k)
+-- Date: 2026-01-19
+-- Purpose: 구절마다 본문이 비슷한 다른 구절 k 개를 미리 계산해서 저장 (교차 참조 / "관련 구절" 보기)
+-- ============================================
+--
+-- scripts/build_related_verses.py 가 번역본 단위로 채움 (오프라인 배치, 다시 실행하면 바뀐 장 주변만 다시 씀).
+-- 유사도는 같은 번역본 본문끼리의 코사인 유사도 (한글: 음절 bigram/trigram, 영문: 단어, TF-IDF)
+-- → 번역본마다 결과가 다르므로 translation_id 가 키에 들어감.
+-- 같은 장의 구절은 기본으로 이웃에서 뺌 (앞뒤 절이 늘 가장 비슷하게 나오므로).
+--
+-- 사용 예 (supabase-js):
+--   supabase.from('verse_related').select('related_verse_id, score')
+--     .eq('translation_id', 1).eq('verse_id', 1001).order('score', { ascending: false })
+
+-- @step tables
+
+CREATE TABLE IF NOT EXISTS verse_related (
+  translation_id INT NOT NULL REFERENCES translations(id) ON DELETE CASCADE,
+  verse_id BIGINT NOT NULL REFERENCES verses(id) ON DELETE CASCADE,
+  related_verse_id BIGINT NOT NULL REFERENCES verses(id) ON DELETE CASCADE,
+  score REAL NOT NULL,   -- 코사인 유사도 (0, 1]
+  PRIMARY KEY (translation_id, verse_id, related_verse_id)
+);
+
+COMMENT ON TABLE verse_related IS 'Top-k most similar verses per verse and translation, built by scripts/build_related_verses.py';
+
+CREATE TABLE IF NOT EXISTS verse_related_builds (
+  translation_id INT PRIMARY KEY REFERENCES translations(id) ON DELETE CASCADE,
+  verse_count INT NOT NULL,
+  top_k INT NOT NULL,
+  pair_count BIGINT NOT NULL,
+  built_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+COMMENT ON TABLE verse_related_builds IS 'Translations that have a verse_related index';
+
+-- ============================================
+-- ROLLBACK
+-- ============================================
+--
+-- DROP TABLE IF EXISTS verse_related_builds;
+-- DROP TABLE IF EXISTS verse_related;